@@ -1,6 +1,6 @@
 import streamlit as st
 import pandas as pd
-from datetime import datetime
+from datetime import datetime, time
 import itertools
 from typing import List, Dict, Tuple
 import json
@@ -9,9 +9,32 @@ from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, Tabl
 from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
 from reportlab.lib.units import inch
 from reportlab.lib import colors
+import copy
+import math
 import io
+import random
+import os
 from pathlib import Path
 
+from archive import age_group_of, is_season_archive, list_upload, season_of
+from balance import DEFAULT_RATING, balanced_teams, fill_ratings
+from crosstable import CrossTable
+from fieldplan import apply_shared_plan, plan_shared_fields
+from formats import advance_bracket, plan_group_tournament, teams_pending
+from live_state import get_shared_tournament, rebase
+from elo import recompute_ratings, update_from_game
+from metrics import METRIC_LABELS, analyze_schedule, metrics_summary
+from optimizer import build_candidate, optimize_round_robin
+from persistence import apply_event, diff_states, get_autosave_worker, rating_event, save_stats, score_event
+from repair import repair_fixed_teams, repair_rotating, roster_changed, teams_changed
+from schedule_utils import assign_game_ids, get_game, iter_games
+from scheduling import minimal_slots, resting_teams, round_robin_slots, schedule_report, slot_lower_bound
+from standings import Standings, table_rows
+from storage import DEFAULT_TOURNAMENT, ROSTERS, export_key, get_storage, sanitize_tournament_id
+from swiss import pair_next_round, round_complete, swiss_entries, swiss_table
+from tiebreak import CRITERIA as TIE_BREAK_LABELS, DEFAULT_TIE_BREAKERS, TIE_BREAKERS
+from timeline import apply_timeline, fit_configurations, parse_clock, plan_timeline
+
 # Alle lokalen Dateien immer relativ zum Ordner dieser App verwenden.
 # Dadurch funktioniert die App unabhängig vom aktuellen Arbeitsverzeichnis.
 BASE_DIR = Path(__file__).resolve().parent
@@ -19,6 +42,9 @@ BASE_DIR = Path(__file__).resolve().parent
 def app_file(filename: str) -> Path:
     return BASE_DIR / filename
 
+# Zeitfenster, in dem Änderungen vor dem Speichern gesammelt werden
+AUTOSAVE_DELAY = int(os.environ.get('TURNIER_AUTOSAVE_MS', '500')) / 1000
+
 # Page configuration
 st.set_page_config(
     page_title="AKA-Turnier",
@@ -55,6 +81,22 @@ if 'team_selection' not in st.session_state:
     st.session_state.team_selection = 'U15'
 if 'games_per_player' not in st.session_state:
     st.session_state.games_per_player = 3
+if 'schedule_seed' not in st.session_state:
+    st.session_state.schedule_seed = None
+if 'groups' not in st.session_state:
+    st.session_state.groups = {}
+if 'fixed_format' not in st.session_state:
+    st.session_state.fixed_format = "Jeder gegen jeden"
+if 'swiss_rounds' not in st.session_state:
+    st.session_state.swiss_rounds = 5
+if 'timing' not in st.session_state:
+    st.session_state.timing = {}
+if 'rating_log' not in st.session_state:
+    st.session_state.rating_log = {}
+if 'tie_breakers' not in st.session_state:
+    st.session_state.tie_breakers = list(DEFAULT_TIE_BREAKERS)
+if 'tie_break_seed' not in st.session_state:
+    st.session_state.tie_break_seed = random.randrange(1, 1000000)  # Los-Seed, wird mit dem Turnier gespeichert
 
 # Verfügbare Team-Farben
 TEAM_COLORS = {
@@ -78,31 +120,18 @@ def get_team_color_icon(team_name):
     color = st.session_state.team_colors.get(team_key, "gelb")
     return TEAM_COLORS.get(color, "⚪")
 
+def get_app_storage():
+    """Speicher-Backend der App (JSON-Dateien oder SQLite, siehe storage.py)"""
+    return get_storage(BASE_DIR)
+
 def load_players_from_file():
     """Lädt Spieler aus einer JSON-Datei"""
-    try:
-        with app_file('players.json').open('r', encoding='utf-8') as f:
-            data = json.load(f)
-            if isinstance(data, dict):
-                return data.get('players', []), data.get('unavailable_players', []), data.get('team_colors', {})
-            else:
-                # Alte Format - nur Spielerliste
-                return data, [], {}
-    except FileNotFoundError:
-        return [], [], {}
+    return get_app_storage().load_players()
 
 def load_team_players(team_name):
-    """Lädt Spieler für ein spezifisches Team aus der entsprechenden JSON-Datei"""
-    filename = app_file(f"{team_name}.json")
-    try:
-        with filename.open('r', encoding='utf-8') as f:
-            data = json.load(f)
-            if isinstance(data, dict):
-                return data.get('players', [])
-            else:
-                # Alte Format - nur Spielerliste
-                return data
-    except FileNotFoundError:
+    """Lädt Spieler für ein spezifisches Team aus dem Speicher"""
+    players = get_app_storage().load_roster(team_name)
+    if players is None:
         # Erstelle Standard-Spieler für das Team
         default_players = {
             "U15": ["Max Mustermann", "Anna Schmidt", "Tom Weber", "Lisa Müller", "Ben Klein", "Emma Groß"],
@@ -111,53 +140,54 @@ def load_team_players(team_name):
             "JWR": ["Alex Meyer", "Julia Hoffmann", "Simon Weber", "Laura Fischer", "Daniel Klein", "Nina Wolf"]
         }
         players = default_players.get(team_name, [])
-        # Speichere die Standard-Spieler in der Datei
+        # Speichere die Standard-Spieler
         save_team_players(team_name, players)
-        return players
+    return players
 
 def save_team_players(team_name, players):
-    """Speichert Spieler für ein spezifisches Team in der entsprechenden JSON-Datei"""
-    filename = app_file(f"{team_name}.json")
-    data = {
-        'players': players,
-        'team_name': team_name,
-        'last_updated': datetime.now().isoformat()
-    }
-    with filename.open('w', encoding='utf-8') as f:
-        json.dump(data, f, ensure_ascii=False, indent=2)
+    """Speichert Spieler für ein spezifisches Team"""
+    get_app_storage().save_roster(team_name, players)
+
+def load_player_ratings(preferred_team=None):
+    """Spielstärken aus allen Kadern - bei Spielern in mehreren Kadern gilt preferred_team"""
+    storage = get_app_storage()
+    ratings = {}
+    for roster in sorted(ROSTERS, key=lambda roster: roster == preferred_team):
+        ratings.update(storage.load_ratings(roster))
+    return ratings
+
+def save_player_rating(team_name, player, widget_key):
+    """Speichert die im Eingabefeld geänderte Spielstärke eines Spielers im Kader"""
+    storage = get_app_storage()
+    ratings = storage.load_ratings(team_name)
+    ratings[player] = float(st.session_state[widget_key])
+    storage.save_ratings(team_name, ratings)
+
+def recompute_roster_ratings(team_name):
+    """Berechnet die Spielstärken eines Kaders aus allen archivierten Turnieren der Altersklasse neu"""
+    storage = get_app_storage()
+    tournaments = [storage.load_export(entry['key']) for entry in storage.search_tournaments(age_group=team_name)]
+    computed, report = recompute_ratings(tournaments)
+    # Spieler ohne archivierte Spiele behalten ihre Stärke
+    storage.save_ratings(team_name, {**storage.load_ratings(team_name), **computed})
+    return report
 
 def migrate_players_to_team_files():
     """Migriert die aktuellen Spieler aus players.json zu JWR.json"""
-    try:
-        # Lade aktuelle Spieler
-        with app_file('players.json').open('r', encoding='utf-8') as f:
-            data = json.load(f)
-            if isinstance(data, dict):
-                players = data.get('players', [])
-            else:
-                players = data
-        
-        if players:
-            # Speichere in JWR.json
-            save_team_players("JWR", players)
-            return True
-    except FileNotFoundError:
-        pass
+    players, _, _ = load_players_from_file()
+    if players:
+        # Speichere in JWR
+        save_team_players("JWR", players)
+        return True
     return False
 
 def save_players_to_file(players, unavailable_players, team_colors):
-    """Speichert Spieler in einer JSON-Datei"""
-    data = {
-        'players': players,
-        'unavailable_players': unavailable_players,
-        'team_colors': team_colors
-    }
-    with app_file('players.json').open('w', encoding='utf-8') as f:
-        json.dump(data, f, ensure_ascii=False, indent=2)
+    """Speichert Spieler im Speicher-Backend"""
+    get_app_storage().save_players(players, unavailable_players, team_colors)
 
-def save_tournament_data():
-    """Speichert alle Turnierdaten"""
-    data = {
+def collect_tournament_state():
+    """Sammelt den aktuellen Turnierzustand aus der Session als JSON-fähiges Dictionary"""
+    return {
         'players': st.session_state.players,
         'unavailable_players': st.session_state.unavailable_players,
         'teams': st.session_state.teams,
@@ -169,10 +199,247 @@ def save_tournament_data():
         'num_teams': st.session_state.num_teams,
         'home_away': st.session_state.home_away,
         'players_per_team': st.session_state.players_per_team,
-        'num_fields': st.session_state.num_fields
+        'num_fields': st.session_state.num_fields,
+        'schedule_seed': st.session_state.schedule_seed,
+        'groups': st.session_state.groups,
+        'swiss_rounds': st.session_state.swiss_rounds,
+        'timing': st.session_state.timing,
+        'rating_log': st.session_state.rating_log,
+        'tie_breakers': st.session_state.tie_breakers,
+        'tie_break_seed': st.session_state.tie_break_seed
     }
-    with app_file('tournament_data.json').open('w', encoding='utf-8') as f:
-        json.dump(data, f, ensure_ascii=False, indent=2)
+
+def apply_tournament_state(data):
+    """Übernimmt einen gespeicherten Turnierzustand in die Session"""
+    st.session_state.players = data.get('players', [])
+    st.session_state.unavailable_players = data.get('unavailable_players', [])
+    st.session_state.teams = data.get('teams', {})
+    st.session_state.team_colors = data.get('team_colors', {})
+    st.session_state.tournament_type = data.get('tournament_type', "Feste Teams")
+    st.session_state.schedule = data.get('schedule', [])
+    assign_game_ids(st.session_state.schedule)
+    st.session_state.tournament_name = data.get('tournament_name', "JWR-Turnier")
+    
+    # Datum konvertieren
+    date_str = data.get('tournament_date', datetime.now().date().isoformat())
+    if isinstance(date_str, str):
+        st.session_state.tournament_date = datetime.fromisoformat(date_str).date()
+    else:
+        st.session_state.tournament_date = datetime.now().date()
+        
+    st.session_state.num_teams = data.get('num_teams', 4)
+    st.session_state.home_away = data.get('home_away', False)
+    st.session_state.players_per_team = data.get('players_per_team', 2)
+    st.session_state.num_fields = data.get('num_fields', 1)
+    st.session_state.schedule_seed = data.get('schedule_seed')
+    st.session_state.groups = data.get('groups', {})
+    st.session_state.swiss_rounds = data.get('swiss_rounds', 5)
+    st.session_state.timing = data.get('timing', {})
+    st.session_state.rating_log = data.get('rating_log', {})
+    # Ältere Turniere führen die Punkte noch als Kriterium - sie zählen ohnehin immer zuerst
+    st.session_state.tie_breakers = [name for name in data.get('tie_breakers', DEFAULT_TIE_BREAKERS) if name in TIE_BREAKERS]
+    # Ältere Turniere ohne Los-Seed behalten den Seed dieser Sitzung (wird beim nächsten Speichern mitgeschrieben)
+    st.session_state.tie_break_seed = data.get('tie_break_seed') or st.session_state.get('tie_break_seed') \
+        or random.randrange(1, 1000000)
+
+def current_tournament_id():
+    """ID des Turniers dieser Sitzung (aus ?turnier=... in der URL)"""
+    if 'tournament_id' not in st.session_state:
+        st.session_state.tournament_id = sanitize_tournament_id(st.query_params.get("turnier"))
+    return st.session_state.tournament_id
+
+def get_autosave():
+    """Hintergrund-Speicherung für das Turnier dieser Sitzung - jedes Turnier hat einen eigenen Worker"""
+    storage = get_app_storage()
+    tournament_id = current_tournament_id()
+    return get_autosave_worker(
+        f"{storage.name}:{BASE_DIR}:{tournament_id}",
+        lambda state: storage.save_tournament(state, tournament_id=tournament_id),
+        AUTOSAVE_DELAY,
+        lambda events: append_tournament_events(storage, tournament_id, events)
+    )
+
+def append_tournament_events(storage, tournament_id, events):
+    """Autosave: veröffentlichte Ereignisse anhängen - ist noch nichts gespeichert, den ganzen Zustand"""
+    if not storage.record_events(events, tournament_id=tournament_id):
+        storage.save_tournament(get_shared_tournament(f"{BASE_DIR}:{tournament_id}").snapshot()[1], tournament_id=tournament_id)
+
+def get_shared_state():
+    """Gemeinsamer Turnierzustand aller Sitzungen - Änderungen daran speichert der Autosave"""
+    shared = get_shared_tournament(f"{BASE_DIR}:{current_tournament_id()}")
+    worker = get_autosave()
+    # Ereignisse direkt ins Journal; nur ein ersetzter Zustand (events None) wird komplett verglichen
+    shared.subscribe('autosave', lambda version, events: worker.mark_dirty(shared.snapshot()[1]) if events is None
+                     else worker.mark_events(events))
+    return shared
+
+def adopt_shared_state(version, state):
+    """Übernimmt einen Stand des gemeinsamen Zustands als Basis dieser Sitzung"""
+    apply_tournament_state(state)
+    st.session_state.live_version = version
+    st.session_state.live_base = copy.deepcopy(state)
+
+def pull_shared_state():
+    """Holt nur die Änderungen der anderen Sitzungen seit der zuletzt gesehenen Version"""
+    if 'live_version' not in st.session_state:
+        return False
+    shared = get_shared_state()
+    version, events = shared.changes_since(st.session_state.live_version)
+    if version == st.session_state.live_version:
+        return False
+    if events is None:
+        version, state = shared.snapshot()
+        adopt_shared_state(version, state)
+        return True
+    base, state = rebase(st.session_state.live_base, collect_tournament_state(), events)
+    apply_tournament_state(state)
+    st.session_state.live_version = version
+    st.session_state.live_base = base
+    sync_standings(events)
+    return True
+
+def get_standings():
+    """Tabelle des aktuellen Spielplans - einmal aufgebaut, danach pro Ergebnis fortgeschrieben"""
+    engine = st.session_state.get('standings')
+    if engine is None or not engine.tracks(st.session_state.schedule):
+        engine = Standings(st.session_state.schedule)
+        st.session_state.standings = engine
+    return engine
+
+def get_cross_table():
+    """Kreuztabellen-Index des aktuellen Spielplans - die Tabellen selbst gelten bis zum nächsten Ergebnis"""
+    index = st.session_state.get('cross_table')
+    if index is None or not index.tracks(st.session_state.schedule):
+        index = CrossTable(st.session_state.schedule)
+        st.session_state.cross_table = index
+    return index
+
+def sync_standings(events):
+    """Übernimmt die Ergebnisse anderer Sitzungen in die Tabelle (ein neuer Spielplan baut sie neu auf)"""
+    engine = st.session_state.get('standings')
+    if engine is None or not engine.tracks(st.session_state.schedule):
+        return
+    for event in events:
+        if event['op'] == 'score_set':
+            game = engine.game(event['game']) if 'game' in event else get_game(st.session_state.schedule, event['path'])
+            if game is not None:
+                engine.record(game)
+
+def publish_tournament_state(events=None):
+    """Veröffentlicht die eigenen Änderungen - die der anderen kommen beim nächsten Durchlauf dazu
+
+    events: bereits bekannte Änderungen (z.B. ein Ergebnis) - sonst wird der ganze Zustand verglichen.
+    """
+    shared = get_shared_state()
+    if 'live_version' not in st.session_state:
+        # Sitzung war noch nicht verbunden: ihr Stand wird der gemeinsame
+        state = collect_tournament_state()
+        st.session_state.live_version = shared.replace(state)
+        st.session_state.live_base = copy.deepcopy(state)
+        return shared
+    if events is None:
+        events = diff_states(st.session_state.live_base, collect_tournament_state())
+    if not events:
+        return shared
+    version = shared.publish(events)
+    if version == st.session_state.live_version + len(events):
+        # Niemand sonst hat inzwischen etwas geändert
+        st.session_state.live_version = version
+    for event in events:
+        apply_event(st.session_state.live_base, copy.deepcopy(event))
+    return shared
+
+def save_tournament_data(compact=False):
+    """Speichert alle Turnierdaten im Hintergrund - mit compact=True sofort und vollständig"""
+    shared = publish_tournament_state()
+    if compact:
+        get_autosave().flush()
+        get_app_storage().save_tournament(shared.snapshot()[1], compact=True, tournament_id=current_tournament_id())
+
+def rating_roster():
+    """Kader, in dem die Spielstärken dieses Turniers gewertet werden (Altersklasse aus dem Namen)"""
+    return age_group_of({'tournament_name': st.session_state.tournament_name}) or st.session_state.team_selection
+
+def update_player_ratings(game):
+    """Wertet ein gespeichertes Ergebnis für die Spielstärken des Kaders (Elo)"""
+    storage = get_app_storage()
+    roster = rating_roster()
+    ratings = storage.load_ratings(roster)
+    update_from_game(ratings, st.session_state.rating_log, game, st.session_state.teams)
+    storage.save_ratings(roster, ratings)
+
+def save_game_score(game, score1, score2):
+    """Speichert ein Ergebnis sofort dauerhaft - geschrieben wird nur dieses eine Spiel"""
+    game['score1'] = str(score1)
+    game['score2'] = str(score2)
+    if 'id' not in game:
+        # Spielplan ohne Spiel-IDs (alte Datei): IDs vergeben und einmal komplett speichern
+        assign_game_ids(st.session_state.schedule)
+        st.session_state.pop('standings', None)  # Tabelle mit den neuen IDs neu aufbauen
+        st.session_state.pop('cross_table', None)
+        update_player_ratings(game)
+        publish_tournament_state()
+        get_autosave().flush()
+        return
+    get_standings().record(game)
+    update_player_ratings(game)
+    # Offene Änderungen zuerst schreiben, damit sie das Ergebnis nicht überholen
+    get_autosave().flush()
+    # Elo-Wertung des Spiels im selben Schreibvorgang wie das Ergebnis (die Spielstärken im Kader sind schon gespeichert)
+    if not get_app_storage().save_score(game['id'], game['score1'], game['score2'], tournament_id=current_tournament_id(),
+                                        rating_changes=st.session_state.rating_log.get(game['id'], {})):
+        # Spielplan noch nicht gespeichert: Ergebnis mit dem ganzen Zustand schreiben
+        save_tournament_data(compact=True)
+    # Danach an die anderen Sitzungen verteilen (der Autosave findet dann nichts mehr zu schreiben)
+    publish_tournament_state([score_event(game), rating_event(game['id'], st.session_state.rating_log.get(game['id'], {}))])
+    # Gruppen- oder K.o.-Spiel entschieden: Teams der folgenden Spiele eintragen
+    if st.session_state.groups and advance_bracket(st.session_state.schedule, st.session_state.teams, *tie_break_options(),
+                                                  standings=get_standings()):
+        save_tournament_data()
+
+def tie_break_options():
+    """Tie-Breaker und Los-Seed des Turniers (für Standings.table und advance_bracket)"""
+    return st.session_state.tie_breakers, st.session_state.tie_break_seed
+
+def change_tie_breakers():
+    """Neue Reihenfolge bzw. neuer Seed: Tabellen ändern sich, K.o.-Teams ggf. auch"""
+    if st.session_state.groups:
+        advance_bracket(st.session_state.schedule, st.session_state.teams, *tie_break_options(), standings=get_standings())
+    save_tournament_data()
+
+def tie_break_note(table):
+    """Hinweis, welche Gleichstände per direktem Vergleich oder Los entschieden wurden"""
+    parts = []
+    for criterion in ('head_to_head', 'lots'):
+        # Aufeinanderfolgende punktgleiche Zeilen bilden einen Entscheid ("Team C vor Team D")
+        blocks = []
+        for row in table:
+            if row.get('decided_by') != criterion or not row['played']:
+                continue
+            if blocks and blocks[-1][-1]['points'] == row['points']:
+                blocks[-1].append(row)
+            else:
+                blocks.append([row])
+        if blocks:
+            label = TIE_BREAK_LABELS[criterion] + (f" (Seed {st.session_state.tie_break_seed})" if criterion == 'lots' else "")
+            parts.append(f"{label}: " + ", ".join(" vor ".join(row['team'] for row in block) for block in blocks))
+    return " · ".join(parts)
+
+@st.fragment(run_every=1)
+def show_save_status():
+    """Zeigt an, ob noch Änderungen auf das Speichern warten"""
+    # Neue Änderungen anderer Sitzungen: ganze Seite neu aufbauen
+    if 'live_version' in st.session_state and get_shared_state().version != st.session_state.live_version:
+        st.rerun(scope="app")
+    status = get_autosave().status()
+    stats = save_stats.as_dict()
+    stats_help = f"{stats['performed']} Schreibvorgänge, {stats['skipped']} übersprungen (unverändert)"
+    if status == 'pending':
+        st.caption("⏳ Änderungen werden gespeichert …", help=stats_help)
+    elif status == 'error':
+        st.caption(f"⚠️ Speichern fehlgeschlagen: {get_autosave().last_error}", help=stats_help)
+    else:
+        st.caption("💾 Alle Änderungen gespeichert", help=stats_help)
 
 def save_tournament_as_file():
     """Speichert das Turnier als benannte Datei"""
@@ -181,213 +448,189 @@ def save_tournament_as_file():
         return None
     
     # Erstelle Dateiname aus Turnier-Name und Datum
-    safe_name = "".join(c for c in st.session_state.tournament_name if c.isalnum() or c in (' ', '-', '_')).rstrip()
-    safe_name = safe_name.replace(' ', '_')
-    date_str = st.session_state.tournament_date.strftime('%Y%m%d')
-    filename = f"turnier_{safe_name}_{date_str}.json"
-    file_path = app_file(filename)
+    key = export_key(st.session_state.tournament_name, st.session_state.tournament_date)
     
-    data = {
-        'players': st.session_state.players,
-        'unavailable_players': st.session_state.unavailable_players,
-        'teams': st.session_state.teams,
-        'team_colors': st.session_state.team_colors,
-        'tournament_type': st.session_state.tournament_type,
-        'schedule': st.session_state.schedule,
-        'tournament_name': st.session_state.tournament_name,
-        'tournament_date': st.session_state.tournament_date.isoformat(),
-        'num_teams': st.session_state.num_teams,
-        'home_away': st.session_state.home_away,
-        'players_per_team': st.session_state.players_per_team,
-        'num_fields': st.session_state.num_fields,
-        'saved_at': datetime.now().isoformat()
-    }
+    data = collect_tournament_state()
+    data['saved_at'] = datetime.now().isoformat()
     
     try:
-        with file_path.open('w', encoding='utf-8') as f:
-            json.dump(data, f, ensure_ascii=False, indent=2)
-        return filename
+        return get_app_storage().export_tournament(key, data)
     except Exception as e:
         st.error(f"Fehler beim Speichern: {e}")
         return None
 
-def load_tournament_from_file(uploaded_file):
-    """Lädt ein Turnier aus einer hochgeladenen Datei"""
+def load_tournament_from_file(uploaded_file, index=0):
+    """Lädt ein Turnier aus einer hochgeladenen Datei (JSON oder Saison-Archiv .gz/.xz)"""
     try:
-        data = json.load(uploaded_file)
-        
-        st.session_state.players = data.get('players', [])
-        st.session_state.unavailable_players = data.get('unavailable_players', [])
-        st.session_state.teams = data.get('teams', {})
-        st.session_state.team_colors = data.get('team_colors', {})
-        st.session_state.tournament_type = data.get('tournament_type', "Feste Teams")
-        st.session_state.schedule = data.get('schedule', [])
-        st.session_state.tournament_name = data.get('tournament_name', "JWR-Turnier")
-        
-        # Datum konvertieren
-        date_str = data.get('tournament_date', datetime.now().date().isoformat())
-        if isinstance(date_str, str):
-            st.session_state.tournament_date = datetime.fromisoformat(date_str).date()
-        else:
-            st.session_state.tournament_date = datetime.now().date()
-            
-        st.session_state.num_teams = data.get('num_teams', 4)
-        st.session_state.home_away = data.get('home_away', False)
-        st.session_state.players_per_team = data.get('players_per_team', 2)
-        st.session_state.num_fields = data.get('num_fields', 1)
+        data = get_app_storage().import_tournament(uploaded_file, index)
+        apply_tournament_state(data)
         
         return True
     except Exception as e:
         st.error(f"Fehler beim Laden der Datei: {e}")
         return False
 
+def load_archived_tournament(key):
+    """Öffnet ein Turnier aus dem Archiv der exportierten Dateien"""
+    try:
+        data = get_app_storage().load_export(key)
+        apply_tournament_state(data)
+        return True
+    except Exception as e:
+        st.error(f"Fehler beim Laden aus dem Archiv: {e}")
+        return False
+
+def show_tournament_archive():
+    """Durchsuchen und Öffnen exportierter Turniere (über den Archiv-Index)"""
+    col_query, col_group = st.columns([3, 1])
+    with col_query:
+        query = st.text_input("Suche:", placeholder="Turniername", key="archive_query")
+    with col_group:
+        age_group = st.selectbox("Altersklasse:", ["Alle", "U15", "U16", "U18", "JWR"], key="archive_age_group")
+    entries = get_app_storage().search_tournaments(query.strip(), "" if age_group == "Alle" else age_group)
+    if not entries:
+        st.info("Keine archivierten Turniere gefunden")
+        return
+    st.dataframe(pd.DataFrame([{
+        'Datum': entry['date'],
+        'Turnier': entry['name'],
+        'Klasse': entry['age_group'],
+        'Teams': entry['teams'],
+        'Spiele': f"{entry['played']}/{entry['games']}"
+    } for entry in entries]), hide_index=True)
+    labels = {entry['key']: f"{entry['date']} - {entry['name']}" for entry in entries}
+    if st.session_state.get("archive_selection") not in labels:
+        # Auswahl gehört zu einer inzwischen archivierten oder gelöschten Datei
+        st.session_state.pop("archive_selection", None)
+    selected = st.selectbox("Turnier auswählen:", list(labels), format_func=lambda key: labels[key], key="archive_selection")
+    if st.button("📂 Öffnen", key="archive_open"):
+        if load_archived_tournament(selected):
+            st.success("Turnier geladen!")
+            st.rerun()
+    archive = getattr(get_app_storage(), 'archive', None)
+    seasons = sorted({season_of(entry['date']) for entry in entries if entry['date'] and '#' not in entry['key']})
+    if archive is not None and seasons:
+        col_season, col_pack = st.columns([3, 1])
+        with col_season:
+            season = st.selectbox("Saison:", seasons, key="archive_season")
+        with col_pack:
+            if st.button("📦 Saison archivieren", help="Exportierte Turniere der Saison in ein komprimiertes Archiv verschieben"):
+                path, count = archive.pack_season(season)
+                st.success(f"{count} Turniere in {path.name}")
+                st.rerun()
+
+def switch_tournament(tournament_id):
+    """Wechselt zu einem anderen Turnier und bindet es an die URL"""
+    get_autosave().flush()
+    st.session_state.tournament_id = tournament_id
+    if tournament_id == DEFAULT_TOURNAMENT:
+        st.query_params.pop("turnier", None)
+    else:
+        st.query_params["turnier"] = tournament_id
+    # Sitzung neu aufbauen, damit nichts vom bisherigen Turnier übernommen wird
+    del st.session_state.fresh_session_initialized
+
+def show_tournament_selection():
+    """Auswahl und Anlegen der gleichzeitig laufenden Turniere"""
+    storage = get_app_storage()
+    tournaments = storage.list_live_tournaments()
+    ids = [entry['id'] for entry in tournaments]
+    labels = {entry['id']: entry['name'] or entry['id'] for entry in tournaments}
+    labels[DEFAULT_TOURNAMENT] = "Standard-Turnier"
+    current = current_tournament_id()
+    if current not in ids:
+        ids.append(current)
+        labels[current] = current
+    selected = st.selectbox("Turnier:", ids, index=ids.index(current), format_func=lambda tid: labels[tid])
+    if selected != current:
+        switch_tournament(selected)
+        st.rerun()
+    with st.expander("➕ Neues Turnier"):
+        new_name = st.text_input("Name des neuen Turniers:", key="new_tournament_name")
+        if st.button("Anlegen", key="create_tournament") and new_name.strip():
+            switch_tournament(storage.create_tournament(new_name.strip()))
+            st.rerun()
+
+def load_any_tournament(tournament_id):
+    """Stand eines laufenden Turniers - aus dem gemeinsamen Zustand, falls dort gerade jemand arbeitet"""
+    if tournament_id == current_tournament_id():
+        return copy.deepcopy(collect_tournament_state())
+    shared = get_shared_tournament(f"{BASE_DIR}:{tournament_id}")
+    if shared.joined:
+        return shared.snapshot()[1]
+    return get_app_storage().load_tournament(tournament_id)
+
+def save_any_tournament(tournament_id, state):
+    """Speichert ein (anderes) Turnier - offene Sitzungen bekommen die Änderungen als Ereignisse"""
+    if tournament_id == current_tournament_id():
+        # Nur den Spielplan übernehmen - die Eingabefelder dieser Sitzung sind schon aufgebaut
+        st.session_state.schedule = state['schedule']
+        save_tournament_data()
+        return
+    shared = get_shared_tournament(f"{BASE_DIR}:{tournament_id}")
+    if shared.joined:
+        shared.publish(diff_states(shared.snapshot()[1], state))
+    else:
+        get_app_storage().save_tournament(state, compact=True, tournament_id=tournament_id)
+
 def load_tournament_data():
-    """Lädt alle Turnierdaten"""
+    """Lädt alle Turnierdaten (Snapshot plus Journal)"""
     try:
-        with app_file('tournament_data.json').open('r', encoding='utf-8') as f:
-            data = json.load(f)
-            
-            st.session_state.players = data.get('players', [])
-            st.session_state.unavailable_players = data.get('unavailable_players', [])
-            st.session_state.teams = data.get('teams', {})
-            st.session_state.team_colors = data.get('team_colors', {})
-            st.session_state.tournament_type = data.get('tournament_type', "Feste Teams")
-            st.session_state.schedule = data.get('schedule', [])
-            st.session_state.tournament_name = data.get('tournament_name', "JWR-Turnier")
-            
-            # Datum konvertieren
-            date_str = data.get('tournament_date', datetime.now().date().isoformat())
-            if isinstance(date_str, str):
-                st.session_state.tournament_date = datetime.fromisoformat(date_str).date()
-            else:
-                st.session_state.tournament_date = datetime.now().date()
-                
-            st.session_state.num_teams = data.get('num_teams', 4)
-            st.session_state.home_away = data.get('home_away', False)
-            st.session_state.players_per_team = data.get('players_per_team', 2)
-            st.session_state.num_fields = data.get('num_fields', 1)
-            
+        # Noch ausstehende Änderungen zuerst schreiben
+        get_autosave().flush()
+        shared = get_shared_state()
+        if shared.joined:
+            # Andere Sitzungen arbeiten bereits an diesem Turnier: deren Stand ist der aktuellste
+            adopt_shared_state(*shared.snapshot())
             return True
-    except FileNotFoundError:
+        data = get_app_storage().load_tournament(current_tournament_id())
+    except ValueError as e:
+        st.error(f"Turnierdaten beschädigt: {e}")
+        return False
+    if data is None:
         return False
+    apply_tournament_state(data)
+    shared.replace(collect_tournament_state())
+    adopt_shared_state(*shared.snapshot())
+    return True
 
-def generate_round_robin_schedule(players: List[str], players_per_team: int = 2, num_fields: int = 1, games_per_player: int = 3) -> List[Dict]:
-    """Generiert einen Round-Robin Spielplan - jeder Spieler hat genau games_per_player Spiele"""
+def generate_round_robin_schedule(players: List[str], players_per_team: int = 2, num_fields: int = 1, games_per_player: int = 3,
+                                  budget: float = 0.0, seed: int = None) -> List[Dict]:
+    """Generiert einen Round-Robin Spielplan mit wechselnden Partnern - jeder Spieler hat genau games_per_player Spiele
+
+    Mit budget > 0 sucht der Optimierer so viele Sekunden parallel nach dem besten
+    Plan, mit seed wird ein früher optimierter Plan exakt wiederhergestellt
+    (Seed 0 ist die Standard-Konstruktion).
+    """
     if len(players) < 4:
         return []
     
-    # Berechne die Anzahl der Teams
-    num_teams = len(players) // players_per_team
-    if len(players) % players_per_team != 0:
-        st.warning(f"Anzahl der Spieler ({len(players)}) ist nicht durch {players_per_team} teilbar. Es werden {num_teams * players_per_team} Spieler verwendet.")
-        players = players[:num_teams * players_per_team]
-    
-    rounds = []
-    import random
-    
-    # Zähle Spiele pro Spieler
-    player_game_count = {player: 0 for player in players}
-    
-    # Berechne maximale Anzahl der Spiele pro Runde
-    max_games_per_round = min(num_fields, num_teams // 2)
+    if budget > 0:
+        rounds, extra, report = optimize_round_robin(players, players_per_team, num_fields, games_per_player, budget=budget)
+        st.session_state.schedule_seed = report['seed']
+        st.info(f"🔍 {report['candidates']} Kandidaten in {report['elapsed']} s auf {report['workers']} Kernen geprüft - "
+                f"Bewertung {report['score']['total']} (wiederholte Partner: {report['score']['repeated_partners']}, "
+                f"Gegner: {report['score']['repeated_opponents']})")
+    else:
+        rounds, extra, _ = build_candidate(players, players_per_team, num_fields, games_per_player, seed or 0)
+        st.session_state.schedule_seed = seed or 0
+    if extra:
+        st.warning(f"{len(players)} Spieler × {games_per_player} Spiele lassen sich nicht auf Spiele mit "
+                   f"{2 * players_per_team} Spielern aufteilen. Ein Zusatzspiel bekommen: {', '.join(extra)}")
     
-    # Generiere so viele Runden, bis jeder Spieler genug Spiele hat
-    round_num = 0
-    while any(count < games_per_player for count in player_game_count.values()):
-        round_num += 1
-        
-        # Mische die Spieler für diese Runde
-        shuffled_players = players.copy()
-        random.shuffle(shuffled_players)
-        
-        # Erstelle Teams für diese Runde
-        teams = []
-        for team_num in range(num_teams):
-            start_idx = team_num * players_per_team
-            end_idx = start_idx + players_per_team
-            team_players = shuffled_players[start_idx:end_idx]
-            teams.append(team_players)
-        
-        # Erstelle Spiele für diese Runde
-        games = []
-        games_this_round = 0
-        
-        # Erstelle Paarungen basierend auf Spieler, die noch Spiele brauchen
-        for i in range(0, len(teams) - 1, 2):
-            if games_this_round >= max_games_per_round:
-                break
-                
-            team1 = teams[i]
-            team2 = teams[i + 1]
-            
-            # Prüfe ob beide Teams Spieler haben, die noch Spiele brauchen
-            team1_needs_games = any(player_game_count[player] < games_per_player for player in team1)
-            team2_needs_games = any(player_game_count[player] < games_per_player for player in team2)
-            
-            if team1_needs_games and team2_needs_games:
-                games.append({
-                    'team1': team1,
-                    'team2': team2,
-                    'score1': '',
-                    'score2': ''
-                })
-                
-                # Erhöhe Spielzähler nur für Spieler, die noch Spiele brauchen
-                for player in team1 + team2:
-                    if player_game_count[player] < games_per_player:
-                        player_game_count[player] += 1
-                
-                games_this_round += 1
-        
-        # Wenn keine Spiele erstellt wurden, aber noch Spieler Spiele brauchen,
-        # erstelle mindestens ein Spiel
-        if games_this_round == 0 and any(count < games_per_player for count in player_game_count.values()):
-            for i in range(0, len(teams) - 1, 2):
-                if games_this_round >= max_games_per_round:
-                    break
-                    
-                team1 = teams[i]
-                team2 = teams[i + 1]
-                
-                games.append({
-                    'team1': team1,
-                    'team2': team2,
-                    'score1': '',
-                    'score2': ''
-                })
-                
-                # Erhöhe Spielzähler nur für Spieler, die noch Spiele brauchen
-                for player in team1 + team2:
-                    if player_game_count[player] < games_per_player:
-                        player_game_count[player] += 1
-                
-                games_this_round += 1
-        
-        rounds.append({
-            'round': round_num,
-            'games': games
-        })
-        
-        # Sicherheitsabschaltung: Maximal 20 Runden
-        if round_num >= 20:
-            break
+    def make_game(team1, team2):
+        return {'team1': team1, 'team2': team2, 'score1': '', 'score2': ''}
     
-    # Verteile Runden auf Spielfelder
     if num_fields == 1:
-        return rounds
-    else:
-        # Gruppiere Runden basierend auf Anzahl der Spielfelder
-        grouped_rounds = []
-        for i in range(0, len(rounds), num_fields):
-            round_group = rounds[i:i + num_fields]
-            grouped_rounds.append({
-                'round': len(grouped_rounds) + 1,
-                'sub_rounds': round_group
-            })
-        return grouped_rounds
+        return [{'round': r, 'games': [make_game(*game) for game in games]}
+                for r, games in enumerate(rounds, 1)]
+    # Mehrere Spielfelder: pro Runde ein Eintrag je Feld
+    return [{'round': r,
+             'sub_rounds': [{'round': field, 'games': [make_game(*game)]} for field, game in enumerate(games, 1)]}
+            for r, games in enumerate(rounds, 1)]
 
 def generate_fixed_teams_schedule(teams: Dict[str, List[str]], home_away: bool = False, num_fields: int = 1) -> List[Dict]:
-    """Generiert einen Spielplan für feste Teams - optimiert für 5 Teams mit 4 Spielern auf 2 Spielfeldern"""
+    """Generiert einen Spielplan für feste Teams nach der Kreismethode - minimale Anzahl Runden für jede Teamzahl"""
     # Nur Teams mit Spielern berücksichtigen
     teams_with_players = {name: players for name, players in teams.items() if players}
     team_names = list(teams_with_players.keys())
@@ -395,315 +638,285 @@ def generate_fixed_teams_schedule(teams: Dict[str, List[str]], home_away: bool =
     if len(team_names) < 2:
         return []
     
-    # Spezielle Optimierung für 4 Teams mit 2 Spielfeldern
-    if len(team_names) == 4 and num_fields == 2:
-        return generate_optimized_4_teams_schedule(teams_with_players, home_away)
-    
-    # Spezielle Optimierung für 5 Teams mit 2 Spielfeldern
-    if len(team_names) == 5 and num_fields == 2:
-        return generate_optimized_5_teams_schedule(teams_with_players, home_away)
+    slots = round_robin_slots(team_names, num_fields)
     
-    # Erstelle alle möglichen Paarungen
-    hinrunde_games = []
-    ruckrunde_games = []
-    
-    # Zuerst alle Hinrunden-Spiele
-    for i in range(len(team_names)):
-        for j in range(i + 1, len(team_names)):
-            hinrunde_games.append({
-                'team1': team_names[i],
-                'team2': team_names[j],
-                'players1': teams_with_players[team_names[i]],
-                'players2': teams_with_players[team_names[j]],
-                'score1': '',
-                'score2': ''
-            })
-    
-    # Dann alle Rückrunden-Spiele (nur wenn aktiviert)
-    if home_away:
-        for i in range(len(team_names)):
-            for j in range(i + 1, len(team_names)):
-                ruckrunde_games.append({
-                    'team1': team_names[j],
-                    'team2': team_names[i],
-                    'players1': teams_with_players[team_names[j]],
-                    'players2': teams_with_players[team_names[i]],
-                    'score1': '',
-                    'score2': ''
-            })
+    def make_game(team1, team2):
+        return {
+            'team1': team1,
+            'team2': team2,
+            'players1': teams_with_players[team1],
+            'players2': teams_with_players[team2],
+            'score1': '',
+            'score2': ''
+        }
     
-    # Verteile Spiele auf Runden basierend auf Anzahl der Spielfelder
+    # Ein Spielfeld: alle Spiele nacheinander in der Reihenfolge der Zeitfenster
     if num_fields == 1:
-        # Alle Spiele in einer Runde
-        all_games = hinrunde_games + ruckrunde_games
+        all_games = [dict(make_game(team1, team2), round='Hinrunde') for slot in slots for team1, team2 in slot]
+        if home_away:
+            all_games += [dict(make_game(team2, team1), round='Rückrunde') for slot in slots for team1, team2 in slot]
         return all_games
-    else:
-        rounds = []
-        
-        # Verarbeite Hinrunde
-        if hinrunde_games:
-            hinrunde_rounds = distribute_games_to_rounds(hinrunde_games, num_fields, "Hinrunde", start_round=1)
-            rounds.extend(hinrunde_rounds)
-        
-        # Verarbeite Rückrunde mit Feldwechsel - Runden-Nummerierung fortsetzen
-        if ruckrunde_games:
-            start_round = len(rounds) + 1
-            ruckrunde_rounds = distribute_games_to_rounds(ruckrunde_games, num_fields, "Rückrunde", swap_fields=True, start_round=start_round)
-            rounds.extend(ruckrunde_rounds)
-        
-        # Stelle sicher, dass alle Spiele die players1 und players2 Felder haben
-        for round_data in rounds:
-            for game in round_data['games']:
-                if 'players1' not in game:
-                    game['players1'] = teams_with_players.get(game['team1'], [])
-                if 'players2' not in game:
-                    game['players2'] = teams_with_players.get(game['team2'], [])
-        
-        return rounds
-
-def generate_optimized_5_teams_schedule(teams_with_players: Dict[str, List[str]], home_away: bool = False) -> List[Dict]:
-    """Generiert einen optimierten Spielplan für 5 Teams auf 2 Spielfeldern"""
-    team_names = list(teams_with_players.keys())
-    
-    # Optimaler Spielplan für 5 Teams auf 2 Spielfeldern
-    # Jede Runde hat 2 Spiele, ein Team pausiert
-    # Insgesamt 5 Runden für Hinrunde (jedes Team spielt 4 mal, pausiert 1 mal)
-    
-    hinrunde_schedule = [
-        # Runde 1: Team A vs Team B, Team C vs Team D (Team E pausiert)
-        [('A', 'B'), ('C', 'D')],
-        # Runde 2: Team A vs Team C, Team B vs Team E (Team D pausiert)
-        [('A', 'C'), ('B', 'E')],
-        # Runde 3: Team A vs Team D, Team C vs Team E (Team B pausiert)
-        [('A', 'D'), ('C', 'E')],
-        # Runde 4: Team A vs Team E, Team B vs Team D (Team C pausiert)
-        [('A', 'E'), ('B', 'D')],
-        # Runde 5: Team B vs Team C, Team D vs Team E (Team A pausiert)
-        [('B', 'C'), ('D', 'E')]
-    ]
-    
-    # Konvertiere Team-Buchstaben zu tatsächlichen Team-Namen
-    team_mapping = {chr(65 + i): team_names[i] for i in range(len(team_names))}
     
     rounds = []
-    
-    # Erstelle Hinrunde
-    for round_num, round_games in enumerate(hinrunde_schedule, 1):
-        games = []
-        for team1_letter, team2_letter in round_games:
-            team1 = team_mapping[team1_letter]
-            team2 = team_mapping[team2_letter]
-            games.append({
-                'team1': team1,
-                'team2': team2,
-                'players1': teams_with_players[team1],
-                'players2': teams_with_players[team2],
-                'score1': '',
-                'score2': ''
-            })
-        
-        # Finde das pausierende Team
-        playing_teams = set()
-        for team1_letter, team2_letter in round_games:
-            playing_teams.add(team1_letter)
-            playing_teams.add(team2_letter)
-        resting_team_letter = [letter for letter in 'ABCDE' if letter not in playing_teams][0]
-        resting_team = team_mapping[resting_team_letter]
-        
+    for round_num, slot in enumerate(slots, 1):
         rounds.append({
             'round': f"Hinrunde {round_num}.Spieltag",
-            'games': games,
-            'resting_teams': [resting_team]
+            'games': [make_game(team1, team2) for team1, team2 in slot],
+            'resting_teams': resting_teams(slot, team_names)
         })
     
-    # Erstelle Rückrunde (nur wenn aktiviert)
+    # Rückrunde: gleiche Zeitfenster mit getauschtem Heimrecht und getauschten Spielfeldern
     if home_away:
-        ruckrunde_schedule = [
-            # Runde 6: Team B vs Team A, Team D vs Team C (Team E pausiert)
-            [('B', 'A'), ('D', 'C')],
-            # Runde 7: Team C vs Team A, Team E vs Team B (Team D pausiert)
-            [('C', 'A'), ('E', 'B')],
-            # Runde 8: Team D vs Team A, Team E vs Team C (Team B pausiert)
-            [('D', 'A'), ('E', 'C')],
-            # Runde 9: Team E vs Team A, Team D vs Team B (Team C pausiert)
-            [('E', 'A'), ('D', 'B')],
-            # Runde 10: Team C vs Team B, Team E vs Team D (Team A pausiert)
-            [('C', 'B'), ('E', 'D')]
-        ]
-        
-        for round_num, round_games in enumerate(ruckrunde_schedule, 6):
-            games = []
-            for team1_letter, team2_letter in round_games:
-                team1 = team_mapping[team1_letter]
-                team2 = team_mapping[team2_letter]
-                games.append({
-                    'team1': team1,
-                    'team2': team2,
-                    'players1': teams_with_players[team1],
-                    'players2': teams_with_players[team2],
-                    'score1': '',
-                    'score2': ''
-                })
-            
-            # Finde das pausierende Team
-            playing_teams = set()
-            for team1_letter, team2_letter in round_games:
-                playing_teams.add(team1_letter)
-                playing_teams.add(team2_letter)
-            resting_team_letter = [letter for letter in 'ABCDE' if letter not in playing_teams][0]
-            resting_team = team_mapping[resting_team_letter]
-            
+        for round_num, slot in enumerate(slots, 1):
             rounds.append({
-                'round': f"Rückrunde {round_num-5}.Spieltag",
-                'games': games,
-                'resting_teams': [resting_team]
+                'round': f"Rückrunde {round_num}.Spieltag",
+                'games': [make_game(team2, team1) for team1, team2 in reversed(slot)],
+                'resting_teams': resting_teams(slot, team_names)
             })
     
     return rounds
 
-def generate_optimized_4_teams_schedule(teams_with_players: Dict[str, List[str]], home_away: bool = False) -> List[Dict]:
-    """Generiert einen optimierten Spielplan für 4 Teams auf 2 Spielfeldern"""
-    team_names = list(teams_with_players.keys())
-    
-    # Optimaler Spielplan für 4 Teams auf 2 Spielfeldern
-    # Jede Runde hat 2 Spiele, alle Teams spielen gleichzeitig
-    # Insgesamt 3 Runden für Hinrunde (jedes Team spielt 3 mal)
-    
-    hinrunde_schedule = [
-        # Runde 1: Team A vs Team B, Team C vs Team D
-        [('A', 'B'), ('C', 'D')],
-        # Runde 2: Team A vs Team C, Team B vs Team D
-        [('A', 'C'), ('B', 'D')],
-        # Runde 3: Team A vs Team D, Team B vs Team C
-        [('A', 'D'), ('B', 'C')]
-    ]
-    
-    # Konvertiere Team-Buchstaben zu tatsächlichen Team-Namen
-    team_mapping = {chr(65 + i): team_names[i] for i in range(len(team_names))}
-    
-    rounds = []
-    
-    # Erstelle Hinrunde
-    for round_num, round_games in enumerate(hinrunde_schedule, 1):
-        games = []
-        for team1_letter, team2_letter in round_games:
-            team1 = team_mapping[team1_letter]
-            team2 = team_mapping[team2_letter]
-            games.append({
-                'team1': team1,
-                'team2': team2,
-                'players1': teams_with_players[team1],
-                'players2': teams_with_players[team2],
-                'score1': '',
-                'score2': ''
-            })
-        
-        rounds.append({
-            'round': f"Hinrunde {round_num}.Spieltag",
-            'games': games,
-            'resting_teams': []  # Keine pausierenden Teams bei 4 Teams
-        })
-    
-    # Erstelle Rückrunde (nur wenn aktiviert)
-    if home_away:
-        ruckrunde_schedule = [
-            # Runde 4: Team B vs Team A, Team D vs Team C
-            [('B', 'A'), ('D', 'C')],
-            # Runde 5: Team C vs Team A, Team D vs Team B
-            [('C', 'A'), ('D', 'B')],
-            # Runde 6: Team D vs Team A, Team C vs Team B
-            [('D', 'A'), ('C', 'B')]
-        ]
-        
-        for round_num, round_games in enumerate(ruckrunde_schedule, 4):
-            games = []
-            for team1_letter, team2_letter in round_games:
-                team1 = team_mapping[team1_letter]
-                team2 = team_mapping[team2_letter]
-                games.append({
-                    'team1': team1,
-                    'team2': team2,
-                    'players1': teams_with_players[team1],
-                    'players2': teams_with_players[team2],
-                    'score1': '',
-                    'score2': ''
-                })
-            
-            rounds.append({
-                'round': f"Rückrunde {round_num-3}.Spieltag",
-                'games': games,
-                'resting_teams': []  # Keine pausierenden Teams bei 4 Teams
-            })
-    
-    return rounds
+def kickoff_label(game):
+    return f"🕒 {game['kickoff']} · " if game.get('kickoff') else ""
 
-def distribute_games_to_rounds(games, num_fields, round_type, swap_fields=False, start_round=1):
-    """Verteilt Spiele auf Runden und tauscht optional die Spielfelder"""
-    if not games:
-        return []
-    
-    # Sammle alle Teams aus den Spielen
-    all_teams = set()
-    for game in games:
-        all_teams.add(game['team1'])
-        all_teams.add(game['team2'])
-    all_teams = list(all_teams)
-    
-    rounds = []
-    remaining_games = games.copy()
-    round_counter = start_round
-    team_pause_count = {team: 0 for team in all_teams}  # Zähle Pausen pro Team
-    
-    while remaining_games:
-        current_round_games = []
-        current_round_teams = set()
-        games_to_remove = []
-        
-        # Fülle die aktuelle Runde mit maximal num_fields Spielen
-        for game in remaining_games:
-            # Prüfe ob eines der Teams bereits in dieser Runde spielt
-            if game['team1'] not in current_round_teams and game['team2'] not in current_round_teams:
-                # Team spielt noch nicht in dieser Runde
-                if len(current_round_games) < num_fields:
-                    # Noch Platz in dieser Runde
-                    current_round_games.append(game)
-                    current_round_teams.add(game['team1'])
-                    current_round_teams.add(game['team2'])
-                    games_to_remove.append(game)
-        
-        # Entferne die verarbeiteten Spiele
-        for game in games_to_remove:
-            remaining_games.remove(game)
-        
-        # Füge die Runde hinzu, auch wenn sie nicht voll ist
-        if current_round_games:
-            # Tausche Spielfelder in der Rückrunde
-            if swap_fields and len(current_round_games) == num_fields:
-                # Vertausche die Reihenfolge der Spiele (Feld 1 <-> Feld 2)
-                current_round_games.reverse()
-            
-            # Zähle Pausen für Teams, die in dieser Runde nicht spielen
-            playing_teams = set()
-            for game in current_round_games:
-                playing_teams.add(game['team1'])
-                playing_teams.add(game['team2'])
-            
-            # Finde Teams, die in dieser Runde pausieren
-            resting_teams = [team for team in all_teams if team not in playing_teams]
-            for team in resting_teams:
-                team_pause_count[team] += 1
-            
-            rounds.append({
-                'round': f"{round_type} {round_counter}.Spieltag",
-                'games': current_round_games,
-                'resting_teams': resting_teams  # Füge pausierende Teams hinzu
-            })
-            round_counter += 1
+def planned_slots(num_fields):
+    """Zeitfenster, die der aktuelle Turniermodus mit num_fields Feldern braucht"""
+    teams = {name: players for name, players in st.session_state.teams.items() if players} \
+        if isinstance(st.session_state.teams, dict) else {}
+    if st.session_state.tournament_type != "Feste Teams":
+        available = [p for p in st.session_state.players if p not in st.session_state.unavailable_players]
+        per_game = 2 * st.session_state.players_per_team
+        fields = min(num_fields, len(available) // per_game)
+        total_games = math.ceil(len(available) * st.session_state.games_per_player / per_game)
+        return math.ceil(total_games / fields) if fields else 0
+    if swiss_entries(st.session_state.schedule):
+        return st.session_state.swiss_rounds * math.ceil(len(teams) // 2 / num_fields)
+    if st.session_state.groups:
+        return plan_group_tournament(teams, len(st.session_state.groups), st.session_state.get('group_qualifiers', 2),
+                                     num_fields, st.session_state.get('third_place', True))[2]['slots']
+    # Die Kreismethode erreicht immer die Mindestzahl Zeitfenster
+    return minimal_slots(len(teams), num_fields) * (2 if st.session_state.home_away else 1)
+
+def show_timeline():
+    """Anstoßzeiten planen: Spieldauer, Wechselzeit, Pause und spätestes Ende"""
+    schedule = st.session_state.schedule
+    if not schedule:
+        return
+    timing = st.session_state.timing
+    with st.expander("⏱️ Zeitplan"):
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            start = st.time_input("Beginn:", value=time.fromisoformat(timing.get('start', '09:00')), key="tl_start")
+            deadline = st.time_input("Spätestes Ende:", value=time.fromisoformat(timing.get('deadline', '17:00')), key="tl_deadline")
+        with col2:
+            game_minutes = st.slider("Spieldauer (Min.):", 5, 30, timing.get('game_minutes', 12), key="tl_game")
+            changeover = st.slider("Wechselzeit (Min.):", 0, 15, timing.get('changeover', 3), key="tl_changeover")
+        with col3:
+            break_start = st.time_input("Pause ab:", value=time.fromisoformat(timing.get('break_start', '12:00')), key="tl_break_start")
+            break_minutes = st.slider("Pause (Min.):", 0, 90, timing.get('break_minutes', 0), step=5, key="tl_break")
+        settings = {'start': start.strftime('%H:%M'), 'deadline': deadline.strftime('%H:%M'), 'game_minutes': game_minutes,
+                    'changeover': changeover, 'break_start': break_start.strftime('%H:%M'), 'break_minutes': break_minutes}
+        breaks = [(parse_clock(settings['break_start']), break_minutes)] if break_minutes else []
+        rows, report = plan_timeline(schedule, settings['start'], game_minutes, changeover, breaks, st.session_state.num_fields)
+        fits = parse_clock(report['end']) <= parse_clock(settings['deadline'])
+        message = f"{report['games']} Spiele in {report['slots']} Zeitfenstern: {report['start']} bis {report['end']} Uhr"
+        (st.success if fits else st.warning)(message if fits else f"{message} - später als {settings['deadline']} Uhr")
+
+        options = fit_configurations({fields: planned_slots(fields) for fields in range(1, 5)}, settings['start'],
+                                     settings['deadline'], changeover, breaks)
+        st.caption("Längste Spieldauer je Feldanzahl bis zum spätesten Ende (Spielplan wird dafür neu generiert):")
+        st.dataframe(pd.DataFrame([{'Felder': o['fields'], 'Zeitfenster': o['slots'],
+                                    'Spieldauer (Min.)': o['game_minutes'] or 'passt nicht', 'Ende': o['end']}
+                                   for o in sorted(options, key=lambda o: o['fields'])]),
+                     hide_index=True, use_container_width=True)
+        if st.button("🕒 Anstoßzeiten übernehmen"):
+            apply_timeline(rows)
+            st.session_state.timing = settings
+            save_tournament_data()
+            st.rerun()
+
+def show_shared_field_plan():
+    """Ein Platzplan für mehrere gleichzeitig laufende Turniere (z.B. U15 und U18 auf denselben Plätzen)"""
+    tournaments = get_app_storage().list_live_tournaments()
+    labels = {entry['id']: entry['name'] or entry['id'] for entry in tournaments}
+    labels[DEFAULT_TOURNAMENT] = "Standard-Turnier"
+    labels.setdefault(current_tournament_id(), current_tournament_id())
+    with st.expander("🗓️ Gemeinsamer Platzplan (mehrere Turniere)"):
+        selected = st.multiselect("Turniere:", list(labels), default=[current_tournament_id()],
+                                  format_func=labels.get, key="fp_tournaments")
+        col1, col2, col3, col4 = st.columns(4)
+        with col1:
+            num_fields = st.number_input("Plätze:", min_value=1, max_value=12, value=4, key="fp_fields")
+        with col2:
+            start = st.time_input("Beginn:", value=time(9, 0), key="fp_start").strftime('%H:%M')
+        with col3:
+            changeover = st.number_input("Wechselzeit (Min.):", min_value=0, max_value=15, value=2, key="fp_changeover")
+        with col4:
+            break_minutes = st.number_input("Pause ab 12:00 (Min.):", min_value=0, max_value=90, value=0, step=5, key="fp_break")
+
+        states, entries = {}, []
+        for tournament_id in selected:
+            state = load_any_tournament(tournament_id)
+            if not state or not state.get('schedule'):
+                st.caption(f"{labels[tournament_id]}: noch kein Spielplan")
+                continue
+            states[tournament_id] = state
+            timing = state.get('timing', {})
+            col1, col2, col3 = st.columns([2, 1, 1])
+            with col1:
+                game_minutes = st.number_input(f"Spieldauer {labels[tournament_id]} (Min.):", min_value=3, max_value=60,
+                                               value=timing.get('game_minutes', 12), key=f"fp_minutes_{tournament_id}")
+            with col2:
+                allowed = st.text_input("Plätze (z.B. 1,2):", key=f"fp_allowed_{tournament_id}")
+            with col3:
+                earliest = st.text_input("Frühestens (HH:MM):", key=f"fp_earliest_{tournament_id}")
+            entries.append({'name': labels[tournament_id], 'schedule': state['schedule'], 'game_minutes': game_minutes,
+                            'fields': [int(f) for f in allowed.replace(' ', '').split(',') if f.isdigit()],
+                            'start': earliest if len(earliest) == 5 and earliest[2] == ':' else None})
+        if not entries:
+            return
+
+        breaks = [(12 * 60, break_minutes)] if break_minutes else []
+        rows, report = plan_shared_fields(entries, num_fields, start, changeover, breaks)
+        st.success(f"{len(rows)} Spiele von {start} bis {report['end']} Uhr · "
+                   + " · ".join(f"{name} bis {end}" for name, end in report['ends'].items()))
+        if report['gap'] > 0:
+            st.info(f"ℹ️ {report['gap']} Minuten länger als die untere Schranke ({report['lower_bound']} Uhr)")
+        if report['unplaced']:
+            st.warning(f"⚠️ {report['unplaced']} Spiele ohne erlaubten Platz")
+        st.dataframe(pd.DataFrame([{'Zeit': row['kickoff'], 'Platz': row['field'], 'Turnier': row['tournament'],
+                                    'Spiel': f"{team_label(row['game']['team1'])} vs {team_label(row['game']['team2'])}"}
+                                   for row in rows]),
+                     hide_index=True, use_container_width=True)
+        if st.button("🕒 Zeiten in alle Turniere übernehmen"):
+            apply_shared_plan(rows)
+            for tournament_id, state in states.items():
+                save_any_tournament(tournament_id, state)
+            st.rerun()
+
+def team_label(team):
+    return ', '.join(team) if isinstance(team, list) else team
+
+def show_group_tables():
+    """Zeigt die Tabellen der Gruppenphase"""
+    groups = st.session_state.groups
+    if not groups or not st.session_state.schedule:
+        return
+    st.subheader("Gruppen")
+    cols = st.columns(min(len(groups), 4))
+    standings = get_standings()
+    for i, group in enumerate(groups):
+        table = standings.table(group, *tie_break_options())
+        with cols[i % len(cols)]:
+            st.markdown(f"**Gruppe {group}**")
+            st.dataframe(pd.DataFrame([{'Platz': rank, 'Team': row['team'], 'Sp': row['played'],
+                                        'Tore': f"{row['goals_for']}:{row['goals_against']}", 'Pkt': row['points']}
+                                       for rank, row in enumerate(table, 1)]),
+                         hide_index=True, use_container_width=True)
+            note = tie_break_note(table)
+            if note:
+                st.caption(f"⚖️ {note}")
+
+def show_standings():
+    """Zeigt die Tabelle (feste Teams) bzw. die Spielerwertung (Round Robin) aus der Standings-Engine"""
+    schedule = st.session_state.schedule
+    if not schedule or st.session_state.groups or swiss_entries(schedule):
+        return  # Gruppen und Schweizer System haben eigene Tabellen
+    table = get_standings().table(None, *tie_break_options())
+    if not table:
+        return
+    rotating = st.session_state.tournament_type != "Feste Teams"
+    st.subheader("Spielerwertung" if rotating else "Tabelle")
+    st.dataframe(pd.DataFrame(table_rows(table, 'Spieler' if rotating else 'Team')),
+                 hide_index=True, use_container_width=True)
+    note = tie_break_note(table)
+    if note:
+        st.caption(f"⚖️ Gleichstand entschieden - {note}")
+
+def show_cross_table():
+    """Zeigt die Kreuztabellen (pro Gruppe, getrennt nach Hin- und Rückrunde)"""
+    index = get_cross_table()
+    sections = [section for section in index.sections() if len(index.teams(section)) > 1]
+    if not sections:
+        return
+    with st.expander("🔢 Kreuztabelle"):
+        for section in sections:
+            for rows in create_cross_table(st.session_state.schedule, section):
+                st.markdown(f"**Gruppe {section} · {rows[0][0]}**" if section else f"**{rows[0][0]}**")
+                st.dataframe(pd.DataFrame([row[1:] for row in rows[1:]], columns=rows[0][1:],
+                                          index=[row[0] for row in rows[1:]]),
+                             use_container_width=True)
+
+def show_swiss_standings():
+    """Zeigt den Stand im Schweizer System und lost die nächste Runde aus"""
+    schedule = st.session_state.schedule
+    entries = swiss_entries(schedule)
+    if not entries:
+        return
+    teams = {name: players for name, players in st.session_state.teams.items() if players}
+    table = swiss_table(schedule, list(teams))
+    played = entries[-1]['swiss_round']
+    st.subheader(f"Stand nach Runde {played - (not round_complete(schedule))} von {st.session_state.swiss_rounds}")
+    st.dataframe(pd.DataFrame([{'Platz': rank, 'Team': row['team'], 'Sp': row['played'], 'Pkt': row['points'],
+                                'Buchholz': row['buchholz'], 'Tore': f"{row['goals_for']}:{row['goals_against']}"}
+                               for rank, row in enumerate(table, 1)]),
+                 hide_index=True, use_container_width=True)
+    if played < st.session_state.swiss_rounds and round_complete(schedule):
+        if st.button(f"🎲 {played + 1}. Runde auslosen"):
+            new_entries, report = pair_next_round(schedule, teams, st.session_state.num_fields)
+            st.session_state.schedule = schedule + new_entries
+            assign_game_ids(st.session_state.schedule)  # IDs fortlaufend über den ganzen Plan
+            save_tournament_data()
+            if report['rematches']:
+                st.warning(f"⚠️ {report['rematches']} Wiederholung(en) waren nicht zu vermeiden")
+            st.rerun()
+
+def schedule_quality(schedule, num_fields):
+    """Anzahl Runden eines Spielplans für feste Teams im Vergleich zum Optimum"""
+    pairs = [(game['team1'], game['team2']) for _, game in iter_games(schedule)]
+    num_slots = len(pairs) if num_fields == 1 else len(schedule)
+    return schedule_report(num_slots, slot_lower_bound(pairs, num_fields))
+
+def show_schedule_metrics():
+    """Zeigt die Fairness-Kennzahlen des aktuellen Spielplans"""
+    if not st.session_state.schedule:
+        return
+    teams = st.session_state.teams if isinstance(st.session_state.teams, dict) else {}
+    metrics = analyze_schedule(st.session_state.schedule, teams)
+    with st.expander("📊 Fairness-Kennzahlen"):
+        st.caption(metrics_summary(metrics))
+        st.dataframe(pd.DataFrame([{'Kennzahl': label, 'Wert': metrics[key]} for key, label in METRIC_LABELS.items()]),
+                     hide_index=True, use_container_width=True)
+
+def show_schedule_repair():
+    """Bietet an, die offenen Runden an geänderte Spieler oder Teams anzupassen - gespielte Runden bleiben"""
+    schedule = st.session_state.schedule
+    if not schedule:
+        return
+    if st.session_state.groups or swiss_entries(schedule):
+        return  # Gruppenturniere und Schweizer System werden über die Tabellen fortgeschrieben, nicht umgeplant
+    fixed_teams = st.session_state.tournament_type == "Feste Teams"
+    if fixed_teams:
+        teams = st.session_state.teams if isinstance(st.session_state.teams, dict) else {}
+        if not teams or not teams_changed(schedule, teams):
+            return
+    else:
+        available_players = [p for p in st.session_state.players if p not in st.session_state.unavailable_players]
+        if not roster_changed(schedule, available_players):
+            return
+    st.warning("⚠️ Spieler oder Teams haben sich geändert. Die offenen Runden können angepasst werden, "
+               "ohne die Runden mit Ergebnissen zu verändern.")
+    if st.button("🔧 Offene Runden anpassen"):
+        if fixed_teams:
+            new_schedule, report = repair_fixed_teams(schedule, teams, st.session_state.num_fields)
         else:
-            # Falls keine Spiele mehr hinzugefügt werden können, breche ab
-            break
-    
-    return rounds
+            new_schedule, report = repair_rotating(schedule, available_players)
+        assign_game_ids(new_schedule)
+        st.session_state.schedule = new_schedule
+        save_tournament_data()
+        st.success(f"{report['frozen_rounds']} Runden unverändert · {report['changed_games']} Spiele angepasst · "
+                   f"{report['removed_games']} entfallen · {report['added_games']} neu · "
+                   f"{report['games_min']}-{report['games_max']} Spiele pro {'Team' if fixed_teams else 'Spieler'}")
 
 def get_logo():
     """Lädt das Logo für das PDF - spezifisch ried.png"""
@@ -733,74 +946,11 @@ def get_logo():
     
     return logo
 
-def create_cross_table(schedule, team_colors=None):
-    """Erstellt eine Kreuztabelle der Spiele mit getrennten Hin- und Rückrunden"""
-    # Sammle alle Teams - sichere Zugriffe
-    teams = set()
-    for game in schedule:
-        team1 = game.get('team1', '')
-        team2 = game.get('team2', '')
-        if team1:
-            teams.add(team1)
-        if team2:
-            teams.add(team2)
-    
-    teams = sorted(list(teams))
-    
-    # Trenne Hin- und Rückrunde
-    hinrunde_games = [game for game in schedule if game.get('round') == 'Hinrunde']
-    ruckrunde_games = [game for game in schedule if game.get('round') == 'Rückrunde']
-    
-    # Erstelle Kreuztabelle für Hinrunde
-    hinrunde_data = create_round_table_data(hinrunde_games, teams, "Hinrunde")
-    
-    # Erstelle Kreuztabelle für Rückrunde
-    ruckrunde_data = create_round_table_data(ruckrunde_games, teams, "Rückrunde")
-    
-    return hinrunde_data, ruckrunde_data
-
-def create_round_table_data(games, teams, round_name):
-    """Erstellt Tabellendaten für eine bestimmte Runde"""
-    table_data = []
-    
-    # Header-Zeile
-    header = [f"{round_name}"] + [f"{team}" for team in teams]
-    table_data.append(header)
-    
-    # Daten-Zeilen
-    for team1 in teams:
-        row = [f"{team1}"]
-        for team2 in teams:
-            if team1 == team2:
-                row.append("-")
-            else:
-                # Suche Spiele zwischen team1 und team2
-                game_found = None
-                for game in games:
-                    game_team1 = game.get('team1', '')
-                    game_team2 = game.get('team2', '')
-                    if (game_team1 == team1 and game_team2 == team2) or \
-                       (game_team1 == team2 and game_team2 == team1):
-                        game_found = game
-                        break
-                
-                if game_found:
-                    # Bestimme Ergebnis basierend auf Team-Position
-                    game_team1 = game_found.get('team1', '')
-                    score1 = game_found.get('score1', '')
-                    score2 = game_found.get('score2', '')
-                    
-                    if game_team1 == team1:
-                        score = f"{score1}:{score2}"
-                    else:
-                        score = f"{score2}:{score1}"
-                    
-                    row.append(score)
-                else:
-                    row.append("")
-        table_data.append(row)
-    
-    return table_data
+def create_cross_table(schedule, section=None):
+    """Erstellt die Kreuztabellen der Spiele mit getrennten Hin- und Rückrunden"""
+    if schedule is st.session_state.get('schedule'):
+        return get_cross_table().tables(get_standings().version, section)
+    return CrossTable(schedule).tables(None, section)
 
 def create_pdf_tournament_schedule(schedule, tournament_type, tournament_name, date, team_colors=None, num_fields=1):
     """Erstellt einen PDF-Turnierplan - kompakt auf einer Seite"""
@@ -954,7 +1104,8 @@ def create_pdf_tournament_schedule(schedule, tournament_type, tournament_name, d
                     score2 = game.get('score2', '')
                     
                     # Erstelle Spiel-Text mit ausgerichtetem Ergebnis
-                    game_text = f"Feld {field_num}: {team1}{team1_color} vs {team2}{team2_color}"
+                    kickoff = f"{game['kickoff']} " if game.get('kickoff') else ""
+                    game_text = f"{kickoff}Feld {game.get('field', field_num)}: {team1}{team1_color} vs {team2}{team2_color}"
                     result_text = "Ergebnis:"
                     
                     # Erstelle eine Tabelle mit fester Breite für besseren Abstand
@@ -997,7 +1148,8 @@ def create_pdf_tournament_schedule(schedule, tournament_type, tournament_name, d
                 score2 = game.get('score2', '')
                 
                 # Erstelle Spiel-Text mit ausgerichtetem Ergebnis
-                game_text = f"Spiel {i}{round_info}: {team1}{team1_color} vs {team2}{team2_color}"
+                kickoff = f"{game['kickoff']} " if game.get('kickoff') else ""
+                game_text = f"{kickoff}Spiel {i}{round_info}: {team1}{team1_color} vs {team2}{team2_color}"
                 result_text = "Ergebnis:"
                 
                 # Erstelle eine Tabelle mit fester Breite für besseren Abstand
@@ -1083,7 +1235,7 @@ def create_pdf_tournament_schedule(schedule, tournament_type, tournament_name, d
                         team1_display = ', '.join(game.get('team1', [])) if isinstance(game.get('team1', []), list) else game.get('team1', 'Unbekannt')
                         team2_display = ', '.join(game.get('team2', [])) if isinstance(game.get('team2', []), list) else game.get('team2', 'Unbekannt')
                         round_data.append([
-                            f"R{round_num}",
+                            f"R{round_num} {game.get('kickoff', '')}".strip(),
                             f"F{field_num}S{i}",
                             team1_display,
                             team2_display,
@@ -1097,7 +1249,7 @@ def create_pdf_tournament_schedule(schedule, tournament_type, tournament_name, d
                     team1_display = ', '.join(game.get('team1', [])) if isinstance(game.get('team1', []), list) else game.get('team1', 'Unbekannt')
                     team2_display = ', '.join(game.get('team2', [])) if isinstance(game.get('team2', []), list) else game.get('team2', 'Unbekannt')
                     round_data.append([
-                        f"R{round_num}",
+                        f"R{round_num} {game.get('kickoff', '')}".strip(),
                         f"S{i}",
                         team1_display,
                         team2_display,
@@ -1133,6 +1285,63 @@ def create_pdf_tournament_schedule(schedule, tournament_type, tournament_name, d
             story.append(header_table)
             story.append(round_table)
     
+    # Tabellen aus der Standings-Engine - der Spielplan wird dafür nicht erneut durchlaufen
+    if schedule and not swiss_entries(schedule):
+        standings = get_standings() if schedule is st.session_state.schedule else Standings(schedule)
+        label = 'Team' if tournament_type == "Feste Teams" else 'Spieler'
+        for section in standings.sections():
+            rows = table_rows(standings.table(section, *tie_break_options()), label)
+            if not rows:
+                continue
+            title = f"Gruppe {section}" if section else ("Tabelle" if label == 'Team' else "Spielerwertung")
+            story.append(Spacer(1, 8))
+            story.append(Paragraph(title, heading_style))
+            standings_table = Table([list(rows[0])] + [list(row.values()) for row in rows],
+                                    colWidths=[0.45*inch, 2.2*inch] + [0.4*inch] * 4 + [0.6*inch, 0.45*inch, 0.45*inch])
+            standings_table.setStyle(TableStyle([
+                ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+                ('ALIGN', (1, 1), (1, -1), 'LEFT'),
+                ('FONTNAME', (0, 0), (-1, -1), 'Helvetica'),
+                ('FONTSIZE', (0, 0), (-1, -1), 7),
+                ('GRID', (0, 0), (-1, -1), 0.3, colors.black),
+                ('BACKGROUND', (0, 0), (-1, 0), colors.lightgrey),  # Header
+                ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),  # Header fett
+                ('PADDING', (0, 0), (-1, -1), 3),
+            ]))
+            story.append(standings_table)
+    
+    # Kreuztabellen (feste Teams) - Zellen aus dem Paar-Index statt Suche über alle Spiele
+    if schedule and tournament_type == "Feste Teams":
+        index = get_cross_table() if schedule is st.session_state.schedule else CrossTable(schedule)
+        for section in index.sections():
+            teams = index.teams(section)
+            if len(teams) < 2:
+                continue
+            for rows in create_cross_table(schedule, section):
+                story.append(Spacer(1, 8))
+                story.append(Paragraph(f"Kreuztabelle Gruppe {section} - {rows[0][0]}" if section
+                                       else f"Kreuztabelle {rows[0][0]}", heading_style))
+                cell_width = min(0.8 * inch, 5.6 * inch / len(teams))
+                cross_table = Table(rows, colWidths=[1.6*inch] + [cell_width] * len(teams))
+                cross_table.setStyle(TableStyle([
+                    ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+                    ('ALIGN', (0, 1), (0, -1), 'LEFT'),
+                    ('FONTNAME', (0, 0), (-1, -1), 'Helvetica'),
+                    ('FONTSIZE', (0, 0), (-1, -1), 6 if len(teams) > 8 else 7),
+                    ('GRID', (0, 0), (-1, -1), 0.3, colors.black),
+                    ('BACKGROUND', (0, 0), (-1, 0), colors.lightgrey),  # Header
+                    ('BACKGROUND', (0, 1), (0, -1), colors.lightgrey),  # Teamspalte
+                    ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+                    ('PADDING', (0, 0), (-1, -1), 2),
+                ]))
+                story.append(cross_table)
+    
+    # Fairness-Kennzahlen unter dem Spielplan
+    if schedule:
+        teams = st.session_state.teams if isinstance(st.session_state.teams, dict) else {}
+        story.append(Spacer(1, 8))
+        story.append(Paragraph(f"Fairness: {metrics_summary(analyze_schedule(schedule, teams))}", styles['Normal']))
+    
     # Build PDF
     doc.build(story)
     buffer.seek(0)
@@ -1169,6 +1378,8 @@ def main():
         st.session_state.teams = {}
         st.session_state.team_colors = {}
         st.session_state.schedule = []
+        st.session_state.groups = {}
+        st.session_state.rating_log = {}
         st.session_state.tournament_name = "U15-Turnier"
         st.session_state.tournament_name_input = "U15-Turnier"
         st.session_state.tournament_date = datetime.now().date()
@@ -1179,9 +1390,20 @@ def main():
         st.session_state.team_selection = "U15"
         st.session_state.tournament_name_team = "U15"
         st.session_state.fresh_session_initialized = True
-    
+        st.session_state.pop('live_version', None)
+        st.session_state.pop('live_base', None)
+        # Über die URL geöffnete Turniere (?turnier=...) direkt laden
+        if current_tournament_id() != DEFAULT_TOURNAMENT:
+            load_tournament_data()
+    
+    # Änderungen anderer Sitzungen (z.B. Ergebnisse vom zweiten Schiedsrichter) übernehmen
+    pull_shared_state()
+
     # Sidebar für Navigation
     st.sidebar.title("Navigation")
+    with st.sidebar:
+        show_tournament_selection()
+        show_save_status()
     tournament_type = st.sidebar.selectbox(
         "Turniertyp auswählen:",
         ["Feste Teams", "Round Robin (jeder mit jedem)"],
@@ -1191,6 +1413,8 @@ def main():
     # Wenn sich der Turniertyp ändert, lösche den aktuellen Spielplan
     if hasattr(st.session_state, 'tournament_type') and st.session_state.tournament_type != tournament_type:
         st.session_state.schedule = []
+        st.session_state.groups = {}
+        st.session_state.rating_log = {}
         st.session_state.teams = {}  # Auch Teams zurücksetzen bei Wechsel
         st.session_state.team_colors = {}
     
@@ -1266,6 +1490,7 @@ def main():
                 # Filtere Spieler basierend auf ausgewähltem Team
                 selected_team = st.session_state.team_selection
                 team_players = load_team_players(selected_team)
+                team_ratings = get_app_storage().load_ratings(selected_team)
                 
                 # Zeige nur Spieler des ausgewählten Teams
                 filtered_players = [p for p in st.session_state.players if p in team_players]
@@ -1303,8 +1528,20 @@ def main():
                                 save_tournament_data()
                                 st.rerun()
                         with col_d:
-                            # Leer für bessere Ausrichtung
-                            pass
+                            # Anzeige immer aus dem Speicher (Elo-Wertung ändert ihn nach jedem Ergebnis)
+                            rating_key = f"rating_{selected_team}_{player}"
+                            st.session_state[rating_key] = int(round(team_ratings.get(player, DEFAULT_RATING)))
+                            st.number_input(
+                                "Spielstärke", min_value=0, max_value=3000, step=50,
+                                key=rating_key, label_visibility="collapsed",
+                                on_change=save_player_rating, args=(selected_team, player, rating_key),
+                                help="Spielstärke für ausgeglichene Teams"
+                            )
+                    if st.button("📈 Spielstärken aus Archiv berechnen", key="recompute_ratings",
+                                 help=f"Elo-Wertung aller archivierten {selected_team}-Turniere neu berechnen"):
+                        report = recompute_roster_ratings(selected_team)
+                        st.success(f"{report['games']} Spiele aus {report['tournaments']} Turnieren gewertet")
+                        st.rerun()
                 else:
                     st.info(f"Keine Spieler von {selected_team} gefunden. Wählen Sie ein anderes Team oder laden Sie Spieler.")
             else:
@@ -1315,7 +1552,7 @@ def main():
         col_save1, col_save2, col_save3, col_save4 = st.columns(4)
         with col_save1:
             if st.button("💾 Speichern", help="Daten speichern"):
-                save_tournament_data()
+                save_tournament_data(compact=True)
                 st.success("Gespeichert!")
         with col_save2:
             if st.button("📁 Laden", help="Daten laden"):
@@ -1330,6 +1567,8 @@ def main():
                 st.session_state.teams = {}
                 st.session_state.team_colors = {}
                 st.session_state.schedule = []
+                st.session_state.groups = {}
+                st.session_state.rating_log = {}
                 st.session_state.tournament_name = "U15-Turnier"
                 st.session_state.tournament_name_input = "U15-Turnier"
                 st.session_state.tournament_date = datetime.now().date()
@@ -1350,18 +1589,29 @@ def main():
         
         # Turnier-Datei hochladen - kompakt
         uploaded_file = st.file_uploader(
-            "Turnier-Datei hochladen (.json)", 
-            type=['json'],
-            help="Gespeicherte Turnier-Datei auswählen"
+            "Turnier-Datei hochladen (.json, .gz, .xz)", 
+            type=['json', 'gz', 'xz'],
+            help="Gespeicherte Turnier-Datei oder Saison-Archiv auswählen"
         )
         
         if uploaded_file is not None:
+            archive_index = 0
+            if is_season_archive(uploaded_file):
+                # Saison-Archiv: Turnier auswählen (die Liste wird als Strom gelesen)
+                season_entries = list_upload(uploaded_file)
+                archive_index = st.selectbox(
+                    "Turnier aus dem Archiv:", range(len(season_entries)),
+                    format_func=lambda i: f"{season_entries[i]['date']} - {season_entries[i]['name']}"
+                )
             if st.button("📥 Turnier laden"):
-                if load_tournament_from_file(uploaded_file):
+                if load_tournament_from_file(uploaded_file, archive_index):
                     st.success("Turnier geladen!")
                     st.rerun()
                 else:
                     st.error("Fehler beim Laden!")
+
+        st.markdown("**🗂️ Archiv**")
+        show_tournament_archive()
     
     # Aktuelle Turnier-Info - kompakt
     if st.session_state.tournament_name and st.session_state.tournament_name != "JWR-Turnier":
@@ -1400,6 +1650,32 @@ def main():
                         if st.session_state.num_fields < 4:
                             st.session_state.num_fields += 1
                             st.rerun()
+            
+            fixed_format = st.radio("Modus:", ["Jeder gegen jeden", "Gruppen + K.o.", "Schweizer System"], key="fixed_format",
+                                    horizontal=True, help="Bei vielen Teams: Gruppenphase mit K.o.-Runde oder Schweizer System "
+                                                          "(feste Rundenzahl, Gegner mit ähnlicher Bilanz)")
+            if fixed_format == "Gruppen + K.o.":
+                col_g1, col_g2, col_g3 = st.columns(3)
+                with col_g1:
+                    st.number_input("Gruppen:", min_value=1, max_value=8, value=2, key="num_groups")
+                with col_g2:
+                    st.number_input("Weiter pro Gruppe:", min_value=1, max_value=4, value=2, key="group_qualifiers",
+                                    help="So viele Teams jeder Gruppe ziehen in die K.o.-Runde ein")
+                with col_g3:
+                    st.checkbox("Spiel um Platz 3", value=True, key="third_place")
+                st.caption("Die Reihenfolge der Teams ist die Setzliste. Die übrigen Teams spielen gruppenübergreifend um die Plätze.")
+            elif fixed_format == "Schweizer System":
+                st.number_input("Runden:", min_value=1, max_value=15, key="swiss_rounds",
+                                help="Jede Runde wird nach dem aktuellen Stand gelost - ohne Wiederholungen, solange möglich")
+            if fixed_format != "Schweizer System":
+                with st.expander("⚖️ Bei Punktgleichheit"):
+                    st.multiselect("Reihenfolge der Kriterien nach den Punkten:", list(TIE_BREAKERS), key="tie_breakers",
+                                   format_func=TIE_BREAK_LABELS.get, on_change=change_tie_breakers,
+                                   help="Der direkte Vergleich wertet nur die Spiele der punktgleichen Teams "
+                                        "untereinander; zuletzt entscheidet das Los")
+                    st.number_input("Los-Seed:", min_value=1, max_value=999999, key="tie_break_seed",
+                                    on_change=change_tie_breakers,
+                                    help="Wird mit dem Turnier gespeichert - derselbe Seed ergibt dieselbe Auslosung")
         
             # Teams erstellen
             team_names = [f"Team {chr(65 + i)}" for i in range(st.session_state.num_teams)]
@@ -1424,8 +1700,8 @@ def main():
             with col_strategy:
                 strategy = st.selectbox(
                     "Strategie:",
-                    ["Zufällig", "Gleichmäßig", "Round Robin"],
-                    help="Zufällig: Zufällige Aufteilung\nGleichmäßig: Gleichmäßige Verteilung\nRound Robin: Für Turnier mit wechselnden Teams"
+                    ["Zufällig", "Gleichmäßig", "Ausgeglichen (Spielstärke)", "Round Robin"],
+                    help="Zufällig: Zufällige Aufteilung\nGleichmäßig: Gleichmäßige Verteilung\nAusgeglichen: Teams mit möglichst gleicher Spielstärke\nRound Robin: Für Turnier mit wechselnden Teams"
                 )
             with col_generate:
                 if st.button("🎲 Generieren", type="primary"):
@@ -1476,6 +1752,24 @@ def main():
                             team_name = team_names[team_index]
                             st.session_state.teams[team_name].append(player)
                         
+                    elif strategy == "Ausgeglichen (Spielstärke)":
+                        # Teams mit möglichst gleicher Durchschnittsstärke - nur verfügbare Spieler
+                        available_players = [p for p in st.session_state.players if p not in st.session_state.unavailable_players]
+                        if len(available_players) < 2:
+                            st.error("Nicht genügend verfügbare Spieler für Teams!")
+                            st.stop()
+                        
+                        ratings = load_player_ratings(st.session_state.get("team_selection"))
+                        balanced, _ = balanced_teams(available_players, ratings, st.session_state.num_teams)
+                        
+                        st.session_state.teams = {}
+                        available_colors = list(TEAM_COLORS.keys())
+                        
+                        for i, team_name in enumerate(team_names):
+                            st.session_state.teams[team_name] = balanced[i]
+                            # Weise Farbe zu
+                            st.session_state.team_colors[team_name] = available_colors[i % len(available_colors)]
+                        
                     elif strategy == "Round Robin":
                         # Für Round Robin Turnier - erstelle Teams für erste Runde - nur verfügbare Spieler
                         available_players = [p for p in st.session_state.players if p not in st.session_state.unavailable_players]
@@ -1518,13 +1812,17 @@ def main():
             
             # Erstelle Übersichtstabelle
             team_data = []
+            ratings = load_player_ratings(st.session_state.get("team_selection"))
             for team_name, players in st.session_state.teams.items():
                 team_color_icon = get_team_color_icon(team_name)
-                team_data.append({
+                row = {
                     "Team": f"{team_color_icon} {team_name}",
                     "Spieler": ", ".join(players) if players else "Keine Spieler",
                     "Anzahl": len(players)
-                })
+                }
+                if ratings and players:
+                    row["Ø Spielstärke"] = round(sum(fill_ratings(players, ratings)) / len(players))
+                team_data.append(row)
             
             df = pd.DataFrame(team_data)
             st.dataframe(df, use_container_width=True, hide_index=True)
@@ -1607,12 +1905,40 @@ def main():
                 st.error(f"Mindestens 2 Teams mit Spielern erforderlich! Aktuell: {len(teams_with_players)} Teams")
                 return
             
-            schedule = generate_fixed_teams_schedule(st.session_state.teams, st.session_state.home_away, st.session_state.num_fields)
-            if schedule:
+            if st.session_state.fixed_format == "Gruppen + K.o.":
+                schedule, groups, report = plan_group_tournament(st.session_state.teams, st.session_state.num_groups,
+                                                                 st.session_state.group_qualifiers, st.session_state.num_fields,
+                                                                 st.session_state.third_place)
+                assign_game_ids(schedule)
+                st.session_state.schedule = schedule
+                st.session_state.groups = groups
+                st.session_state.rating_log = {}
+                save_tournament_data()
+                st.success(f"Spielplan generiert! {len(teams_with_players)} Teams in {len(groups)} Gruppen, "
+                           f"{sum(1 for _ in iter_games(schedule))} Spiele in {report['slots']} Runden "
+                           f"({report['group_slots']} Runden Gruppenphase)")
+                if report['gap'] > 0:
+                    st.info(f"ℹ️ {report['gap']} Runde(n) mehr als die untere Schranke von {report['lower_bound']}")
+            elif st.session_state.fixed_format == "Schweizer System":
+                schedule, report = pair_next_round([], st.session_state.teams, st.session_state.num_fields)
+                assign_game_ids(schedule)
                 st.session_state.schedule = schedule
+                st.session_state.groups = {}
+                st.session_state.rating_log = {}
+                save_tournament_data()
+                st.success(f"1. Runde gelost! {len(teams_with_players)} Teams, {st.session_state.swiss_rounds} Runden geplant")
+            elif schedule := generate_fixed_teams_schedule(st.session_state.teams, st.session_state.home_away, st.session_state.num_fields):
+                assign_game_ids(schedule)
+                st.session_state.schedule = schedule
+                st.session_state.groups = {}
+                st.session_state.rating_log = {}
                 save_tournament_data()  # Automatisch speichern
                 round_type = "Hin- und Rückrunde" if st.session_state.home_away else "Einfache Runde"
-                st.success(f"Spielplan generiert! {len(teams_with_players)} Teams, {len(schedule)} Spiele ({round_type})")
+                quality = schedule_quality(schedule, st.session_state.num_fields)
+                num_games = sum(1 for _ in iter_games(schedule))
+                st.success(f"Spielplan generiert! {len(teams_with_players)} Teams, {num_games} Spiele in {quality['slots']} Runden ({round_type})")
+                if quality['gap'] > 0:
+                    st.info(f"ℹ️ {quality['gap']} Runde(n) mehr als die untere Schranke von {quality['lower_bound']}")
             else:
                 st.error("Kein gültiger Spielplan möglich!")
     
@@ -1651,6 +1977,15 @@ def main():
                 help="Wie viele Spiele soll jeder Spieler spielen?"
             )
         
+        col_opt1, col_opt2 = st.columns(2)
+        with col_opt1:
+            optimize = st.checkbox("🔍 Optimieren (mehrere Versuche parallel)", key="rr_optimize",
+                                   help="Baut viele Varianten auf allen Prozessorkernen und nimmt die mit den wenigsten Wiederholungen")
+            budget = st.slider("Rechenzeit (Sekunden):", min_value=1, max_value=30, value=5, key="rr_budget", disabled=not optimize)
+        with col_opt2:
+            seed_text = st.text_input("Seed (optional):", key="rr_seed",
+                                      help="Seed eines früheren Spielplans - erzeugt genau denselben Plan wieder")
+        
         if st.button("Round Robin Spielplan generieren"):
             # Nur verfügbare Spieler für Round Robin verwenden
             available_players = [p for p in st.session_state.players if p not in st.session_state.unavailable_players]
@@ -1658,11 +1993,15 @@ def main():
                 st.error("Mindestens 4 verfügbare Spieler für Round Robin erforderlich!")
                 return
             
-            schedule = generate_round_robin_schedule(available_players, st.session_state.players_per_team, st.session_state.num_fields, st.session_state.games_per_player)
+            seed = int(seed_text) if seed_text.strip().isdigit() else None
+            schedule = generate_round_robin_schedule(available_players, st.session_state.players_per_team, st.session_state.num_fields, st.session_state.games_per_player,
+                                                     budget=budget if optimize and seed is None else 0, seed=seed)
             if schedule:
+                assign_game_ids(schedule)
                 st.session_state.schedule = schedule
+                st.session_state.rating_log = {}
                 save_tournament_data()  # Automatisch speichern
-                st.success("Round Robin Spielplan generiert!")
+                st.success(f"Round Robin Spielplan generiert! (Seed {st.session_state.schedule_seed})")
             else:
                 st.error("Kein gültiger Spielplan möglich!")
     
@@ -1688,7 +2027,16 @@ def main():
         with col2:
             tournament_date = st.date_input("Datum:", key="tournament_date")
         
+        show_schedule_repair()
+        show_schedule_metrics()
+        show_timeline()
+        show_shared_field_plan()
+        show_standings()
+        
         if st.session_state.tournament_type == "Feste Teams":
+            show_group_tables()
+            show_swiss_standings()
+            show_cross_table()
             st.subheader("Spiele")
             
             # Prüfe ob Schedule in Runden strukturiert ist (mehrere Spielfelder)
@@ -1736,9 +2084,9 @@ def main():
                             with cols[i % len(cols)]:
                                 team1_color = get_team_color_icon(game['team1'])
                                 team2_color = get_team_color_icon(game['team2'])
-                                field_num = (i % 2) + 1  # Immer Feld 1 oder Feld 2
+                                field_num = i + 1
                                 
-                                with st.expander(f"Feld {field_num}: {team1_color} {game['team1']} vs {team2_color} {game['team2']}"):
+                                with st.expander(f"{kickoff_label(game)}Feld {field_num}: {team1_color} {game['team1']} vs {team2_color} {game['team2']}"):
                                     col1, col2 = st.columns(2)
                                     with col1:
                                         players1 = game.get('players1', [])
@@ -1752,10 +2100,8 @@ def main():
                                         score2 = st.number_input(f"Tore {game['team2']}:", min_value=0, key=f"round_{round_data['round']}_field_{field_num}_score2")
                                     
                                     # Update scores
-                                    if st.button(f"Ergebnis speichern - Runde {round_data['round']}, Feld {field_num}", key=f"round_{round_data['round']}_field_{field_num}_save"):
-                                        game_index = round_data['games'].index(game)
-                                        st.session_state.schedule[round_data['round']-1]['games'][game_index]['score1'] = str(score1)
-                                        st.session_state.schedule[round_data['round']-1]['games'][game_index]['score2'] = str(score2)
+                                    if st.button(f"Ergebnis speichern - Runde {round_data['round']}, Feld {field_num}", key=f"round_{round_data['round']}_field_{field_num}_save", disabled=teams_pending(game, st.session_state.teams)):
+                                        save_game_score(game, score1, score2)
                                         st.success("Ergebnis gespeichert!")
                                         st.rerun()
                     else:
@@ -1764,7 +2110,7 @@ def main():
                         team1_color = get_team_color_icon(game['team1'])
                         team2_color = get_team_color_icon(game['team2'])
                         
-                        with st.expander(f"Spiel: {team1_color} {game['team1']} vs {team2_color} {game['team2']}"):
+                        with st.expander(f"{kickoff_label(game)}Spiel: {team1_color} {game['team1']} vs {team2_color} {game['team2']}"):
                             col1, col2 = st.columns(2)
                             with col1:
                                 players1 = game.get('players1', [])
@@ -1778,10 +2124,8 @@ def main():
                                 score2 = st.number_input(f"Tore {game['team2']}:", min_value=0, key=f"round_{round_data['round']}_score2")
                             
                             # Update scores
-                            if st.button(f"Ergebnis speichern - Runde {round_data['round']}", key=f"round_{round_data['round']}_save"):
-                                game_index = round_data['games'].index(game)
-                                st.session_state.schedule[round_data['round']-1]['games'][game_index]['score1'] = str(score1)
-                                st.session_state.schedule[round_data['round']-1]['games'][game_index]['score2'] = str(score2)
+                            if st.button(f"Ergebnis speichern - Runde {round_data['round']}", key=f"round_{round_data['round']}_save", disabled=teams_pending(game, st.session_state.teams)):
+                                save_game_score(game, score1, score2)
                                 st.success("Ergebnis gespeichert!")
                                 st.rerun()
             else:
@@ -1797,7 +2141,7 @@ def main():
                     for i, game in enumerate(hinrunde_games, 1):
                         team1_color = get_team_color_icon(game['team1'])
                         team2_color = get_team_color_icon(game['team2'])
-                        with st.expander(f"Spiel {i}: {team1_color} {game['team1']} vs {team2_color} {game['team2']} (Hinrunde)"):
+                        with st.expander(f"{kickoff_label(game)}Spiel {i}: {team1_color} {game['team1']} vs {team2_color} {game['team2']} (Hinrunde)"):
                             col1, col2 = st.columns(2)
                             with col1:
                                 st.write(f"**{team1_color} {game['team1']}:** {', '.join(game['players1'])}")
@@ -1807,10 +2151,8 @@ def main():
                                 score2 = st.number_input(f"Tore {game['team2']}:", min_value=0, key=f"hin_score2_{i}")
                             
                             # Update scores
-                            if st.button(f"Ergebnis speichern - Hinrunde Spiel {i}", key=f"hin_save_{i}"):
-                                game_index = st.session_state.schedule.index(game)
-                                st.session_state.schedule[game_index]['score1'] = str(score1)
-                                st.session_state.schedule[game_index]['score2'] = str(score2)
+                            if st.button(f"Ergebnis speichern - Hinrunde Spiel {i}", key=f"hin_save_{i}", disabled=teams_pending(game, st.session_state.teams)):
+                                save_game_score(game, score1, score2)
                                 st.success("Ergebnis gespeichert!")
                                 st.rerun()
                 
@@ -1820,7 +2162,7 @@ def main():
                     for i, game in enumerate(ruckrunde_games, 1):
                         team1_color = get_team_color_icon(game['team1'])
                         team2_color = get_team_color_icon(game['team2'])
-                        with st.expander(f"Spiel {len(hinrunde_games) + i}: {team1_color} {game['team1']} vs {team2_color} {game['team2']} (Rückrunde)"):
+                        with st.expander(f"{kickoff_label(game)}Spiel {len(hinrunde_games) + i}: {team1_color} {game['team1']} vs {team2_color} {game['team2']} (Rückrunde)"):
                             col1, col2 = st.columns(2)
                             with col1:
                                 st.write(f"**{team1_color} {game['team1']}:** {', '.join(game['players1'])}")
@@ -1830,10 +2172,8 @@ def main():
                                 score2 = st.number_input(f"Tore {game['team2']}:", min_value=0, key=f"ruck_score2_{i}")
                             
                             # Update scores
-                            if st.button(f"Ergebnis speichern - Rückrunde Spiel {i}", key=f"ruck_save_{i}"):
-                                game_index = st.session_state.schedule.index(game)
-                                st.session_state.schedule[game_index]['score1'] = str(score1)
-                                st.session_state.schedule[game_index]['score2'] = str(score2)
+                            if st.button(f"Ergebnis speichern - Rückrunde Spiel {i}", key=f"ruck_save_{i}", disabled=teams_pending(game, st.session_state.teams)):
+                                save_game_score(game, score1, score2)
                                 st.success("Ergebnis gespeichert!")
                                 st.rerun()
                 
@@ -1841,7 +2181,7 @@ def main():
                 if other_games:
                     st.markdown("### ⚽ Weitere Spiele")
                     for i, game in enumerate(other_games, 1):
-                        with st.expander(f"Spiel {i}: {game['team1']} vs {game['team2']}"):
+                        with st.expander(f"{kickoff_label(game)}Spiel {i}: {game['team1']} vs {game['team2']}"):
                             col1, col2 = st.columns(2)
                             with col1:
                                 st.write(f"**{game['team1']}:** {', '.join(game['players1'])}")
@@ -1851,10 +2191,8 @@ def main():
                                 score2 = st.number_input(f"Tore {game['team2']}:", min_value=0, key=f"other_score2_{i}")
                             
                             # Update scores
-                            if st.button(f"Ergebnis speichern - Spiel {i}", key=f"other_save_{i}"):
-                                game_index = st.session_state.schedule.index(game)
-                                st.session_state.schedule[game_index]['score1'] = str(score1)
-                                st.session_state.schedule[game_index]['score2'] = str(score2)
+                            if st.button(f"Ergebnis speichern - Spiel {i}", key=f"other_save_{i}", disabled=teams_pending(game, st.session_state.teams)):
+                                save_game_score(game, score1, score2)
                                 st.success("Ergebnis gespeichert!")
                                 st.rerun()
         
@@ -1865,24 +2203,18 @@ def main():
                 for round_data in st.session_state.schedule:
                     st.subheader(f"🏟️ Runde {round_data['round']}")
                     
-                    # Zeige Spiele korrekt auf Feldern verteilt
-                    # Sammle alle Spiele aus allen sub_rounds
-                    all_games = []
-                    for sub_round in round_data['sub_rounds']:
-                        for game in sub_round['games']:
-                            all_games.append(game)
+                    # Jede sub_round ist ein Spielfeld
+                    all_games = [(sub_round['round'], game) for sub_round in round_data['sub_rounds'] for game in sub_round['games']]
                     
-                    # Verteile Spiele auf Felder: Spiel 1 -> Feld 1, Spiel 2 -> Feld 2, etc.
-                    for i, game in enumerate(all_games, 1):
-                        field_num = ((i - 1) % 2) + 1  # Feld 1, 2, 1, 2, ...
+                    for i, (field_num, game) in enumerate(all_games, 1):
                         team1_display = ', '.join(game['team1']) if isinstance(game['team1'], list) else game['team1']
                         team2_display = ', '.join(game['team2']) if isinstance(game['team2'], list) else game['team2']
                         
                         # Zeige Feld-Überschrift nur beim ersten Spiel des Feldes
-                        if i == 1 or (i > 1 and field_num != ((i - 2) % 2) + 1):
+                        if i == 1 or field_num != all_games[i - 2][0]:
                             st.markdown(f"**Feld {field_num}:**")
                         
-                        with st.expander(f"Spiel {i}: {team1_display} vs {team2_display}"):
+                        with st.expander(f"{kickoff_label(game)}Spiel {i}: {team1_display} vs {team2_display}"):
                                 col1, col2 = st.columns(2)
                                 with col1:
                                     st.write(f"**Team 1:** {team1_display}")
@@ -1893,11 +2225,7 @@ def main():
                                 
                                 # Update scores
                                 if st.button(f"Ergebnis speichern - Runde {round_data['round']}, Feld {field_num}, Spiel {i}", key=f"rr_save_{round_data['round']}_{field_num}_{i}"):
-                                    # Finde den korrekten Index
-                                    round_idx = round_data['round'] - 1
-                                    field_idx = field_num - 1
-                                    st.session_state.schedule[round_idx]['sub_rounds'][field_idx]['games'][i-1]['score1'] = str(score1)
-                                    st.session_state.schedule[round_idx]['sub_rounds'][field_idx]['games'][i-1]['score2'] = str(score2)
+                                    save_game_score(game, score1, score2)
                                     st.success("Ergebnis gespeichert!")
                                     st.rerun()
             else:
@@ -1909,7 +2237,7 @@ def main():
                             team1_display = ', '.join(game['team1']) if isinstance(game['team1'], list) else game['team1']
                             team2_display = ', '.join(game['team2']) if isinstance(game['team2'], list) else game['team2']
                             
-                            with st.expander(f"Spiel {i}: {team1_display} vs {team2_display}"):
+                            with st.expander(f"{kickoff_label(game)}Spiel {i}: {team1_display} vs {team2_display}"):
                                 col1, col2 = st.columns(2)
                                 with col1:
                                     st.write(f"**Team 1:** {team1_display}")
@@ -1920,8 +2248,7 @@ def main():
                                 
                                 # Update scores
                                 if st.button(f"Ergebnis speichern - Runde {round_data['round']}, Spiel {i}", key=f"rr_save_{round_data['round']}_{i}"):
-                                    st.session_state.schedule[round_data['round']-1]['games'][i-1]['score1'] = str(score1)
-                                    st.session_state.schedule[round_data['round']-1]['games'][i-1]['score2'] = str(score2)
+                                    save_game_score(game, score1, score2)
                                     st.success("Ergebnis gespeichert!")
                                     st.rerun()
                 else:
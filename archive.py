@@ -0,0 +1,298 @@
+"""
+Archiv der exportierten Turniere (turnier_<name>_<datum>.json).
+
+Damit alte Turniere ohne erneutes Hochladen gefunden werden, führt das Archiv
+eine kleine Index-Datei mit den Eckdaten jedes Turniers (Name, Datum,
+Altersklasse, Anzahl Teams und Spiele, Prüfsumme, Änderungszeit). Beim Export
+wird nur der Eintrag der neuen Datei aktualisiert; beim Durchsuchen werden nur
+Dateien neu gelesen, deren Änderungszeit oder Größe sich geändert hat.
+
+Ältere Turniere lassen sich pro Saison in eine komprimierte Datei packen
+(archiv_<saison>.jsonl.gz oder .xz): ein Turnier pro Zeile, kompaktes JSON,
+ohne die in jedem Spiel wiederholten Spielerlisten der Teams. iter_season liest
+ein solches Archiv als Strom - immer nur ein Turnier auf einmal im Speicher.
+"""
+import gzip
+import hashlib
+import io
+import json
+import lzma
+import re
+import threading
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from persistence import CHECKSUM_KEY, atomic_write_json, read_json_checked
+from schedule_utils import iter_games
+
+INDEX_FILENAME = 'archiv_index.json'
+EXPORT_PATTERN = 'turnier_*.json'
+SEASON_PATTERN = 'archiv_*.jsonl.*'
+AGE_GROUPS = ["U15", "U16", "U18", "JWR"]
+SEASON_START_MONTH = 8
+
+_GZIP_MAGIC = b'\x1f\x8b'
+_XZ_MAGIC = b'\xfd7zXZ\x00'
+
+
+def age_group_of(data: Dict) -> str:
+    """Altersklasse aus dem Turniernamen (z.B. 'U15-Turnier' -> 'U15')"""
+    name = (data.get('tournament_name') or '').upper()
+    for group in AGE_GROUPS:
+        if re.search(rf'\b{group}\b', name):
+            return group
+    return ''
+
+
+def summarize(data: Dict) -> Dict:
+    """Eckdaten eines Turniers für den Index"""
+    games = [game for _, game in iter_games(data.get('schedule', []))]
+    teams = set(data.get('teams') or {})
+    if not teams:
+        for game in games:
+            for side in ('team1', 'team2'):
+                team = game.get(side)
+                teams.add(' & '.join(team) if isinstance(team, list) else team)
+    return {
+        'name': data.get('tournament_name', ''),
+        'date': data.get('tournament_date', ''),
+        'age_group': age_group_of(data),
+        'tournament_type': data.get('tournament_type', ''),
+        'teams': len(teams),
+        'games': len(games),
+        'played': sum(1 for game in games if game.get('score1') not in ('', None)),
+        'saved_at': data.get('saved_at', '')
+    }
+
+
+def season_of(date: str) -> str:
+    """Saison eines Turniers (ab August): 2025-09-13 -> '2025-26', 2026-03-07 -> '2025-26'"""
+    year, month = int(date[:4]), int(date[5:7])
+    if month < SEASON_START_MONTH:
+        year -= 1
+    return f"{year}-{(year + 1) % 100:02d}"
+
+
+def season_filename(season: str, compression: str = 'gz') -> str:
+    return f"archiv_{season}.jsonl.{compression}"
+
+
+def _shrink(data: Dict) -> Dict:
+    """Entfernt Spielerlisten aus den Spielen, die schon in data['teams'] stehen"""
+    teams = data.get('teams') or {}
+    data = dict(data)
+    data.pop(CHECKSUM_KEY, None)
+    data['schedule'] = json.loads(json.dumps(data.get('schedule', [])))
+    for _, game in iter_games(data['schedule']):
+        for side in ('1', '2'):
+            team = game.get('team' + side)
+            if isinstance(team, str) and team in teams and game.get('players' + side) == teams[team]:
+                del game['players' + side]
+    return data
+
+
+def _expand(data: Dict) -> Dict:
+    """Gegenstück zu _shrink: ergänzt die Spielerlisten der Teams wieder in jedem Spiel"""
+    teams = data.get('teams') or {}
+    for _, game in iter_games(data.get('schedule', [])):
+        for side in ('1', '2'):
+            team = game.get('team' + side)
+            if 'players' + side not in game and isinstance(team, str) and team in teams:
+                game['players' + side] = list(teams[team])
+    return data
+
+
+def _compression(fileobj) -> Optional[str]:
+    """Erkennt gzip oder xz anhand der ersten Bytes - None für unkomprimierte Dateien"""
+    fileobj.seek(0)
+    magic = fileobj.read(6)
+    fileobj.seek(0)
+    if isinstance(magic, bytes) and magic.startswith(_GZIP_MAGIC):
+        return 'gz'
+    if isinstance(magic, bytes) and magic.startswith(_XZ_MAGIC):
+        return 'xz'
+    return None
+
+
+def is_season_archive(fileobj) -> bool:
+    return _compression(fileobj) is not None
+
+
+def iter_season(source) -> Iterator[Dict]:
+    """Liest ein Saison-Archiv (Pfad oder Dateiobjekt) Turnier für Turnier"""
+    fileobj = open(source, 'rb') if isinstance(source, (str, Path)) else source
+    try:
+        compression = _compression(fileobj)
+        if compression is None:
+            raise ValueError("Kein gzip- oder xz-Archiv")
+        stream = gzip.GzipFile(fileobj=fileobj, mode='rb') if compression == 'gz' else lzma.LZMAFile(fileobj, mode='rb')
+        with io.TextIOWrapper(stream, encoding='utf-8') as lines:
+            for line in lines:
+                if line.strip():
+                    yield _expand(json.loads(line))
+    finally:
+        if fileobj is not source:
+            fileobj.close()
+
+
+def write_season(path, tournaments: Iterable[Dict]) -> int:
+    """Schreibt ein Saison-Archiv (Endung .gz oder .xz) - die Turniere werden einzeln durchgereicht"""
+    path = Path(path)
+    tmp_path = path.with_name(f".{path.name}.tmp")
+    opener = lzma.open if path.suffix == '.xz' else gzip.open
+    count = 0
+    with opener(tmp_path, 'wt', encoding='utf-8') as f:
+        for data in tournaments:
+            f.write(json.dumps(_shrink(data), ensure_ascii=False, separators=(',', ':')))
+            f.write('\n')
+            count += 1
+    tmp_path.replace(path)
+    return count
+
+
+def read_upload(fileobj, index: int = 0) -> Dict:
+    """Turnier aus einer hochgeladenen Datei: JSON oder das index-te Turnier eines Saison-Archivs"""
+    if not is_season_archive(fileobj):
+        return json.load(fileobj)
+    for i, data in enumerate(iter_season(fileobj)):
+        if i == index:
+            return data
+    raise ValueError(f"Archiv enthält kein Turnier Nr. {index + 1}")
+
+
+def list_upload(fileobj) -> List[Dict]:
+    """Eckdaten aller Turniere eines hochgeladenen Saison-Archivs"""
+    entries = [summarize(data) for data in iter_season(fileobj)]
+    fileobj.seek(0)
+    return entries
+
+
+def _file_checksum(path: Path, data: Dict) -> str:
+    # Von atomic_write_json geschriebene Dateien tragen ihre Prüfsumme schon in sich
+    if data.get(CHECKSUM_KEY):
+        return data[CHECKSUM_KEY]
+    return hashlib.blake2b(path.read_bytes(), digest_size=16).hexdigest()
+
+
+class TournamentArchive:
+    """Index über alle exportierten Turnier-Dateien eines Ordners"""
+
+    def __init__(self, base_dir):
+        self.base_dir = Path(base_dir)
+        self.index_path = self.base_dir / INDEX_FILENAME
+        self._lock = threading.Lock()
+        self._entries: Optional[Dict[str, Dict]] = None
+
+    def _load_index(self) -> Dict[str, Dict]:
+        if self._entries is None:
+            try:
+                self._entries = read_json_checked(self.index_path).get('entries', {})
+            except (FileNotFoundError, ValueError):
+                # Fehlender oder beschädigter Index wird einfach neu aufgebaut
+                self._entries = {}
+        return self._entries
+
+    def _save_index(self) -> None:
+        atomic_write_json(self.index_path, {'entries': self._entries}, generations=0, indent=None)
+
+    def _entry(self, path: Path, data: Dict) -> Dict:
+        stat = path.stat()
+        entry = summarize(data)
+        entry.update(checksum=_file_checksum(path, data), mtime=stat.st_mtime, size=stat.st_size)
+        return entry
+
+    def record(self, path, data: Dict) -> Dict:
+        """Aktualisiert den Eintrag einer gerade gespeicherten Datei"""
+        path = Path(path)
+        with self._lock:
+            entries = self._load_index()
+            entries[path.name] = self._entry(path, data)
+            self._save_index()
+            return entries[path.name]
+
+    def _season_entries(self, path: Path) -> Dict[str, Dict]:
+        stat = path.stat()
+        entries = {}
+        for i, data in enumerate(iter_season(path)):
+            entry = summarize(data)
+            entry.update(checksum='', mtime=stat.st_mtime, size=stat.st_size)
+            entries[f"{path.name}#{i}"] = entry
+        return entries
+
+    def refresh(self) -> Dict[str, Dict]:
+        """Gleicht den Index mit dem Ordner ab - gelesen werden nur neue oder geänderte Dateien"""
+        with self._lock:
+            entries = self._load_index()
+            changed = False
+            present = set()
+            for path in list(self.base_dir.glob(EXPORT_PATTERN)) + list(self.base_dir.glob(SEASON_PATTERN)):
+                present.add(path.name)
+                stat = path.stat()
+                known = [name for name in entries if name.split('#')[0] == path.name]
+                if known and all(entries[name]['mtime'] == stat.st_mtime and entries[name]['size'] == stat.st_size
+                                 for name in known):
+                    continue
+                for name in known:
+                    del entries[name]
+                try:
+                    if path.name.startswith('archiv_'):
+                        entries.update(self._season_entries(path))
+                    else:
+                        entries[path.name] = self._entry(path, read_json_checked(path))
+                except (ValueError, OSError, EOFError):
+                    continue
+                changed = True
+            for name in [name for name in entries if name.split('#')[0] not in present]:
+                del entries[name]
+                changed = True
+            if changed:
+                self._save_index()
+            return dict(entries)
+
+    def search(self, query: str = '', age_group: str = '', date_from: str = None, date_to: str = None) -> List[Dict]:
+        """Durchsucht den Index (neueste Turniere zuerst)"""
+        result = []
+        for filename, entry in self.refresh().items():
+            if query and query.lower() not in entry['name'].lower():
+                continue
+            if age_group and entry['age_group'] != age_group:
+                continue
+            if date_from and entry['date'] < date_from:
+                continue
+            if date_to and entry['date'] > date_to:
+                continue
+            key = filename if '#' in filename else Path(filename).stem
+            result.append(dict(entry, key=key))
+        return sorted(result, key=lambda entry: (entry['date'], entry['name']), reverse=True)
+
+    def load(self, key: str) -> Dict:
+        """Öffnet ein archiviertes Turnier (Export-Datei oder 'archiv_<saison>.jsonl.gz#<nr>')"""
+        if '#' in key:
+            filename, index = key.split('#')
+            for i, data in enumerate(iter_season(self.base_dir / filename)):
+                if i == int(index):
+                    return data
+            raise FileNotFoundError(key)
+        return read_json_checked(self.base_dir / f"{key}.json")
+
+    def pack_season(self, season: str, compression: str = 'gz') -> Tuple[Path, int]:
+        """Verschiebt alle exportierten Turniere einer Saison in ihr komprimiertes Archiv"""
+        exports = sorted((entry for entry in self.search()
+                          if '#' not in entry['key'] and entry['date'] and season_of(entry['date']) == season),
+                         key=lambda entry: entry['key'])
+        replaced = {(entry['name'], entry['date']) for entry in exports}
+        path = self.base_dir / season_filename(season, compression)
+
+        def tournaments():
+            if path.exists():
+                # Bereits archivierte Turniere bleiben erhalten, neu exportierte ersetzen sie
+                for data in iter_season(path):
+                    if (data.get('tournament_name', ''), data.get('tournament_date', '')) not in replaced:
+                        yield data
+            for entry in exports:
+                yield self.load(entry['key'])
+
+        count = write_season(path, tournaments())
+        for entry in exports:
+            (self.base_dir / f"{entry['key']}.json").unlink()
+        return path, count
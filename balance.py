@@ -0,0 +1,114 @@
+"""
+Ausgeglichene Teams nach Spielstärke.
+
+Die verfügbaren Spieler werden so auf num_teams Teams verteilt, dass die
+Teamgrößen sich höchstens um eins unterscheiden und die Spielstärken der
+Teams möglichst nah beieinander liegen.
+
+1. Startlösung nach Karmarkar-Karp (Differenzenmethode für k Teams): Die
+   Spieler werden nach Stärke sortiert in Blöcke zu je num_teams geteilt, jeder
+   Block ist eine Teil-Aufteilung mit einem Spieler pro Team. Immer die zwei
+   Teil-Aufteilungen mit der größten Spannweite werden zusammengelegt, das
+   stärkste Team der einen mit dem schwächsten der anderen. So bekommt jedes
+   Team genau einen Spieler pro Block. Fehlen Spieler für den letzten Block,
+   füllen Platzhalter mit Durchschnittsstärke auf - diese Teams haben einen
+   Spieler weniger und werden so verglichen, als stünde dort ein
+   durchschnittlicher Spieler (sonst bekämen kleinere Teams die Stärksten).
+2. Lokale Suche: Tausch zweier Spieler (oder Spieler gegen Platzhalter) zwischen
+   zwei Teams, solange die Summe der quadrierten Abweichungen sinkt. Die
+   Änderung eines Tauschs ist in O(1) berechenbar. Kein Team bekommt einen
+   zweiten Platzhalter, die Teamgrößen bleiben also erhalten.
+
+Spieler ohne Bewertung gehen mit DEFAULT_RATING ein.
+"""
+import heapq
+from typing import Dict, List, Optional, Sequence, Tuple
+
+DEFAULT_RATING = 1500.0
+
+
+def fill_ratings(players: Sequence[str], ratings: Dict[str, float]) -> List[float]:
+    """Spielstärke je Spieler - Unbewertete mit DEFAULT_RATING"""
+    return [float(ratings.get(p, DEFAULT_RATING)) for p in players]
+
+
+def _karmarkar_karp(values: List[float], num_teams: int, placeholder: int) -> List[List[int]]:
+    """Startlösung: Indizes je Team, der letzte Wert in values ist der Platzhalter"""
+    order = sorted(range(placeholder), key=lambda i: -values[i])
+    order += [placeholder] * (-len(order) % num_teams)
+    heap = []
+    for count, begin in enumerate(range(0, len(order), num_teams)):
+        # Teil-Aufteilung: Liste von (Summe, Indizes), stärkstes Team zuerst
+        part = sorted(((values[i], [i]) for i in order[begin:begin + num_teams]), key=lambda team: -team[0])
+        heapq.heappush(heap, (-(part[0][0] - part[-1][0]), count, part))
+    count = len(heap)
+    while len(heap) > 1:
+        _, _, first = heapq.heappop(heap)
+        _, _, second = heapq.heappop(heap)
+        merged = [(s1 + s2, m1 + m2) for (s1, m1), (s2, m2) in zip(first, reversed(second))]
+        merged.sort(key=lambda team: -team[0])
+        heapq.heappush(heap, (-(merged[0][0] - merged[-1][0]), count, merged))
+        count += 1
+    return [members for _, members in heap[0][2]] if heap else [[] for _ in range(num_teams)]
+
+
+def _local_search(teams: List[List[int]], values: List[float], placeholder: int, max_swaps: int) -> int:
+    """Bester Tausch pro Durchgang, bis keiner mehr verbessert - gibt die Anzahl Täusche zurück"""
+    sums = [sum(values[i] for i in team) for team in teams]
+    swaps = 0
+    while swaps < max_swaps:
+        short = [placeholder in team for team in teams]
+        # Tausch x (Team a) gegen y (Team b) mit d = y - x ändert die Quadratsumme um 2 * d * (S_a - S_b + d)
+        best, choice = -1e-9, None
+        for a in range(len(teams)):
+            for b in range(a + 1, len(teams)):
+                diff = sums[a] - sums[b]
+                if diff == 0:
+                    continue
+                for x_pos, x in enumerate(teams[a]):
+                    vx = values[x]
+                    for y_pos, y in enumerate(teams[b]):
+                        if (x == placeholder and short[b]) or (y == placeholder and short[a]):
+                            continue
+                        d = values[y] - vx
+                        change = d * (diff + d)
+                        if change < best:
+                            best, choice = change, (a, x_pos, b, y_pos, d)
+        if choice is None:
+            break
+        a, x_pos, b, y_pos, d = choice
+        teams[a][x_pos], teams[b][y_pos] = teams[b][y_pos], teams[a][x_pos]
+        sums[a] += d
+        sums[b] -= d
+        swaps += 1
+    return swaps
+
+
+def balanced_teams(players: Sequence[str], ratings: Dict[str, float], num_teams: int,
+                   max_swaps: Optional[int] = None) -> Tuple[List[List[str]], Dict]:
+    """Teilt die Spieler in num_teams Teams mit möglichst gleicher Spielstärke
+
+    Gibt die Teams (Spieler in der Reihenfolge von players) und einen Bericht
+    (averages, spread, seed_spread, swaps) zurück; spread ist der Abstand der
+    Durchschnittsstärke zwischen stärkstem und schwächstem Team, seed_spread
+    derselbe Wert nach Karmarkar-Karp.
+    """
+    if num_teams < 1:
+        raise ValueError("Mindestens ein Team erforderlich")
+    players = list(players)
+    values = fill_ratings(players, ratings)
+    placeholder = len(values)
+    values.append(sum(values) / len(values) if values else DEFAULT_RATING)
+    teams = _karmarkar_karp(values, num_teams, placeholder)
+
+    def spread():
+        averages = [sum(values[i] for i in team if i != placeholder) / max(1, len(team) - team.count(placeholder))
+                    for team in teams if len(team) > team.count(placeholder)]
+        return averages, (max(averages) - min(averages) if averages else 0.0)
+
+    _, seed_spread = spread()
+    swaps = _local_search(teams, values, placeholder, len(players) ** 2 if max_swaps is None else max_swaps)
+    averages, final_spread = spread()
+    result = [[players[i] for i in sorted(team) if i != placeholder] for team in teams]
+    report = {'averages': averages, 'spread': final_spread, 'seed_spread': seed_spread, 'swaps': swaps}
+    return result, report
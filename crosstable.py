@@ -0,0 +1,90 @@
+"""
+Kreuztabelle (Team gegen Team) für alle Spielplan-Formen.
+
+CrossTable durchläuft den Spielplan einmal und legt jedes Spiel unter dem
+ungeordneten Teampaar und seiner Runde (Hinrunde/Rückrunde) ab. Eine
+Kreuztabelle liest danach nur noch pro Zelle das Paar nach - O(G + T²)
+statt einer Suche über alle Spiele pro Zelle.
+
+- Rückrunde: Spiele mit round 'Rückrunde' (ein Spielfeld) bzw. in Runden,
+  deren Bezeichnung mit 'Rückrunde' beginnt; alles andere ist Hinrunde
+- Gruppenphase: eine Kreuztabelle pro Gruppe (section = Gruppenname)
+- K.o.-/Platzierungsspiele und Round Robin (Spielerlisten statt Teams)
+  gehören in keine Kreuztabelle
+
+Die fertigen Tabellen werden zwischengespeichert, bis sich die Version des
+Spielplans ändert (Standings.version zählt jedes eingetragene Ergebnis).
+"""
+from typing import Dict, List, Optional, Tuple
+
+from schedule_utils import iter_games
+
+LEGS = ('Hinrunde', 'Rückrunde')
+_NO_TABLE = ('knockout', 'placement')
+
+
+def _leg(label) -> int:
+    return 1 if str(label or '').startswith(LEGS[1]) else 0
+
+
+class CrossTable:
+    """Spiele je (section, Teampaar, Runde) - gebaut in einem Durchlauf über den Spielplan"""
+
+    def __init__(self, schedule: List[Dict]):
+        self.schedule = schedule
+        self._teams: Dict[Optional[str], set] = {}
+        self._pairs: Dict[Tuple[Optional[str], str, str, int], Dict] = {}
+        self._legs: Dict[Optional[str], set] = {}
+        self._cache: Tuple[object, Dict] = (None, {})
+        for path, game in iter_games(schedule):
+            team1, team2 = game.get('team1'), game.get('team2')
+            if game.get('phase') in _NO_TABLE or not isinstance(team1, str) or not isinstance(team2, str) \
+                    or not team1 or not team2:
+                continue
+            section = game.get('group') if game.get('phase') == 'group' else None
+            leg = _leg(game.get('round') if len(path) == 1 else schedule[path[0]].get('round'))
+            self._teams.setdefault(section, set()).update((team1, team2))
+            self._legs.setdefault(section, set()).add(leg)
+            # Gleiche Paarung in derselben Runde mehrfach: das erste Spiel zählt
+            self._pairs.setdefault((section, *sorted((team1, team2)), leg), game)
+
+    def tracks(self, schedule: List[Dict]) -> bool:
+        """Gehört der Index zu genau diesem Spielplan?"""
+        return schedule is self.schedule
+
+    def sections(self) -> List[Optional[str]]:
+        return sorted(self._teams, key=lambda section: (section is not None, section or ''))
+
+    def teams(self, section: Optional[str] = None) -> List[str]:
+        return sorted(self._teams.get(section, ()))
+
+    def _cell(self, section, team, opponent, leg) -> str:
+        if team == opponent:
+            return "-"
+        game = self._pairs.get((section, *sorted((team, opponent)), leg))
+        if game is None:
+            return ""
+        score1, score2 = game.get('score1', ''), game.get('score2', '')
+        if score1 == '' or score2 == '':
+            return "–:–"
+        return f"{score1}:{score2}" if game.get('team1') == team else f"{score2}:{score1}"
+
+    def _build(self, section: Optional[str]) -> List[List[List[str]]]:
+        teams = self.teams(section)
+        return [[[LEGS[leg]] + teams] + [[team] + [self._cell(section, team, opponent, leg) for opponent in teams]
+                                         for team in teams]
+                for leg in sorted(self._legs.get(section, ()))]
+
+    def tables(self, version, section: Optional[str] = None) -> List[List[List[str]]]:
+        """Kreuztabellen (Kopfzeile + eine Zeile je Team) für jede gespielte Runde eines Abschnitts
+
+        Ergebnisse aus Sicht des Zeilen-Teams. Neu aufgebaut wird nur, wenn sich
+        version seit dem letzten Aufruf geändert hat.
+        """
+        cached_version, tables = self._cache
+        if cached_version != version:
+            tables = {}
+            self._cache = (version, tables)
+        if section not in tables:
+            tables[section] = self._build(section)
+        return tables[section]
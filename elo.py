@@ -0,0 +1,155 @@
+"""
+Elo-Wertung der Spieler aus den eingetragenen Ergebnissen.
+
+Die Spielstärken sind dieselben wie für die ausgeglichene Team-Generierung
+(balance.py) und liegen pro Kader im Speicher (storage.load_ratings). Eine
+Mannschaft hat die durchschnittliche Stärke ihrer Spieler:
+
+- Feste Teams: die Spieler des Teams (players1/players2 im Spiel oder
+  teams[name]). Ein Spiel, bei dem eine Seite keine Spieler hat - etwa ein
+  K.o.-Spiel mit Platzhalter "1. Gruppe A" -, wird nicht gewertet.
+- Round Robin: team1/team2 sind die Spielerlisten selbst.
+
+Nach einem Ergebnis ändert sich die Teamwertung um K * (Ergebnis - Erwartung);
+diese Änderung bekommt jeder Spieler des Teams, der Teamdurchschnitt bewegt
+sich also genau um die Elo-Änderung.
+
+update_from_game arbeitet inkrementell: Die Änderung jedes Spiels wird im
+Protokoll (Spiel-ID -> Änderungen je Spieler) vermerkt, damit ein korrigiertes
+Ergebnis zuerst zurückgenommen wird. recompute_ratings rechnet dagegen alle
+archivierten Turniere in einem Durchgang neu: Spiele einer Runde haben keine
+gemeinsamen Spieler und werden gemeinsam mit NumPy gewertet - das Ergebnis
+ist dasselbe wie beim Eintragen Spiel für Spiel in Rundenreihenfolge.
+"""
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from balance import DEFAULT_RATING
+from schedule_utils import iter_games
+
+K_FACTOR = 24
+SCALE = 400
+
+
+def outcome(game: Dict) -> Optional[float]:
+    """1 bei Sieg von team1, 0.5 bei Unentschieden, 0 bei Niederlage - None ohne Ergebnis"""
+    try:
+        score1, score2 = int(game.get('score1')), int(game.get('score2'))
+    except (TypeError, ValueError):
+        return None
+    return 1.0 if score1 > score2 else 0.5 if score1 == score2 else 0.0
+
+
+def members(game: Dict, side: str, teams: Dict[str, List[str]]) -> List[str]:
+    """Gewertete Spieler einer Seite ('1' oder '2') - leer bei einem Platzhalter ohne Spielerliste"""
+    team = game.get('team' + side)
+    if isinstance(team, list):
+        return team
+    return game.get('players' + side) or teams.get(team) or []
+
+
+def expected_score(rating1: float, rating2: float) -> float:
+    return 1.0 / (1.0 + 10 ** ((rating2 - rating1) / SCALE))
+
+
+def team_rating(players: List[str], ratings: Dict[str, float]) -> float:
+    return sum(ratings.get(p, DEFAULT_RATING) for p in players) / len(players) if players else DEFAULT_RATING
+
+
+def game_changes(game: Dict, ratings: Dict[str, float], teams: Dict[str, List[str]],
+                 k: float = K_FACTOR) -> Dict[str, float]:
+    """Änderung je Spieler durch das Ergebnis eines Spiels (leer ohne Ergebnis oder ohne Spieler einer Seite)"""
+    result = outcome(game)
+    side1, side2 = members(game, '1', teams), members(game, '2', teams)
+    if result is None or not side1 or not side2:
+        return {}
+    change = k * (result - expected_score(team_rating(side1, ratings), team_rating(side2, ratings)))
+    changes: Dict[str, float] = {}
+    for player in side1:
+        changes[player] = changes.get(player, 0.0) + change
+    for player in side2:
+        changes[player] = changes.get(player, 0.0) - change
+    return changes
+
+
+def _add(ratings: Dict[str, float], changes: Dict[str, float], sign: float) -> None:
+    for player, change in changes.items():
+        ratings[player] = ratings.get(player, DEFAULT_RATING) + sign * change
+
+
+def update_from_game(ratings: Dict[str, float], log: Dict[str, Dict[str, float]], game: Dict,
+                     teams: Dict[str, List[str]], k: float = K_FACTOR) -> Dict[str, float]:
+    """Wertet ein gespeichertes Ergebnis inkrementell (ratings und log werden verändert)
+
+    Ein bereits gewertetes Spiel wird zuerst zurückgenommen; ein gelöschtes
+    Ergebnis nimmt die Wertung nur zurück. Gibt die neuen Änderungen zurück.
+    """
+    _add(ratings, log.pop(game['id'], {}), -1)
+    changes = game_changes(game, ratings, teams, k)
+    if changes:
+        _add(ratings, changes, 1)
+        log[game['id']] = changes
+    return changes
+
+
+def recompute_ratings(tournaments: Iterable[Dict], k: float = K_FACTOR,
+                      initial: Optional[Dict[str, float]] = None) -> Tuple[Dict[str, float], Dict]:
+    """Wertet alle Ergebnisse der Turniere neu (nach Datum, innerhalb eines Turniers nach Runden)
+
+    initial: Startwerte (sonst DEFAULT_RATING). Gibt die Spielstärken und einen
+    Bericht (tournaments, games, rounds) zurück.
+    """
+    index: Dict[str, int] = {}
+    entry_player, entry_game, entry_sign = [], [], []
+    results, game_round = [], []
+    num_tournaments, num_rounds = 0, 0
+    for data in sorted(tournaments, key=lambda data: data.get('tournament_date') or ''):
+        num_tournaments += 1
+        teams = data.get('teams') or {}
+        last = None
+        for path, game in iter_games(data.get('schedule', [])):
+            result = outcome(game)
+            sides = (members(game, '1', teams), members(game, '2', teams))
+            if result is None or not all(sides):
+                continue
+            # Flache Liste: jedes Spiel ist eine eigene Runde
+            round_key = path[0] if len(path) > 1 else None
+            if round_key is None or round_key != last:
+                num_rounds += 1
+                last = round_key
+            g = len(results)
+            results.append(result)
+            game_round.append(num_rounds - 1)
+            for side, sign in zip(sides, (1.0, -1.0)):
+                for player in side:
+                    entry_player.append(index.setdefault(player, len(index)))
+                    entry_game.append(g)
+                    entry_sign.append(sign)
+
+    initial = initial or {}
+    ratings = np.array([float(initial.get(p, DEFAULT_RATING)) for p in index])
+    players = np.array(entry_player, dtype=np.int64)
+    games = np.array(entry_game, dtype=np.int64)
+    signs = np.array(entry_sign)
+    results = np.array(results)
+    side1 = signs > 0
+    sizes1 = np.bincount(games[side1], minlength=len(results))
+    sizes2 = np.bincount(games[~side1], minlength=len(results))
+    # Spiele und Einträge liegen nach Runden sortiert vor: Grenzen per searchsorted
+    game_bounds = np.searchsorted(np.array(game_round, dtype=np.int64), np.arange(num_rounds + 1))
+    entry_bounds = np.searchsorted(games, game_bounds)
+    for r in range(num_rounds):
+        g0, g1 = game_bounds[r], game_bounds[r + 1]
+        e0, e1 = entry_bounds[r], entry_bounds[r + 1]
+        local, round_signs = games[e0:e1] - g0, signs[e0:e1]
+        current = ratings[players[e0:e1]]
+        count = g1 - g0
+        sums1 = np.bincount(local, weights=current * (round_signs > 0), minlength=count)
+        sums2 = np.bincount(local, weights=current * (round_signs < 0), minlength=count)
+        rating1 = sums1 / np.maximum(sizes1[g0:g1], 1)
+        rating2 = sums2 / np.maximum(sizes2[g0:g1], 1)
+        change = k * (results[g0:g1] - 1.0 / (1.0 + 10 ** ((rating2 - rating1) / SCALE)))
+        np.add.at(ratings, players[e0:e1], round_signs * change[local])
+    report = {'tournaments': num_tournaments, 'games': len(results), 'rounds': num_rounds}
+    return dict(zip(index, ratings.tolist())), report
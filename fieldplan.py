@@ -0,0 +1,113 @@
+"""
+Gemeinsamer Platzplan für mehrere Turniere am selben Tag (z.B. U15, U16, U18, JWR).
+
+Jedes Turnier behält seinen Spielplan: die Zeitfenster (siehe
+timeline.time_slots) werden der Reihe nach gespielt, ein Zeitfenster beginnt
+erst, wenn alle Spiele des vorigen beendet sind. Das Turnier darf eigene
+Vorgaben haben: Spieldauer, erlaubte Plätze (z.B. U18 nur auf den großen
+Feldern 1 und 2), höchstens gleichzeitig belegte Plätze und frühester Beginn.
+
+Die Plätze werden per Listenplanung vergeben: Es wird immer das Spiel
+angesetzt, das am frühesten beginnen kann; bei gleicher Zeit das Turnier mit
+dem längsten verbleibenden Rest (kritischer Pfad), damit kein Turnier am Ende
+allein übrig bleibt. Kein Platz ist doppelt belegt, kein Spiel läuft in eine
+Pause. Der Bericht vergleicht das Tagesende mit der unteren Schranke
+max(längstes Turnier allein, Gesamtspielzeit / Plätze).
+"""
+import heapq
+import math
+from typing import Dict, List, Sequence, Tuple
+
+from timeline import Break, format_clock, parse_clock, time_slots
+
+
+def _after_breaks(start: int, minutes: int, breaks: Sequence[Break]) -> int:
+    """Frühester Beginn ab start, bei dem das Spiel in keine Pause läuft"""
+    for begin, length in sorted(breaks):
+        if start < begin + length and start + minutes > begin:
+            start = begin + length
+    return start
+
+
+def _finish(begin: int, work: int, breaks: Sequence[Break]) -> int:
+    """Frühestes Ende von work Minuten Spielzeit ab begin - in Pausen wird nicht gespielt"""
+    end = begin + work
+    for break_start, length in sorted(breaks):
+        if break_start < end and break_start + length > begin:
+            end += break_start + length - max(break_start, begin)
+    return end
+
+
+def plan_shared_fields(tournaments: List[Dict], num_fields: int, start: str, changeover: int = 0,
+                       breaks: Sequence[Break] = ()) -> Tuple[List[Dict], Dict]:
+    """Gemeinsame Zeittafel für mehrere Turniere auf num_fields Plätzen (1..num_fields)
+
+    tournaments: {'name', 'schedule', 'game_minutes'} und optional 'fields'
+    (erlaubte Plätze), 'max_fields' und 'start' ("HH:MM"). Gibt die Zeilen
+    (tournament, kickoff, end, field, game) nach Anstoßzeit sortiert und einen
+    Bericht (start, end, lower_bound, gap in Minuten, ends je Turnier) zurück.
+    """
+    day_start = parse_clock(start)
+    field_free = {field: day_start for field in range(1, num_fields + 1)}
+    plans = []
+    for t in tournaments:
+        fields = [f for f in t.get('fields') or field_free if f in field_free]
+        slots = time_slots(t['schedule'])
+        cap = max(1, min(t.get('max_fields') or len(fields), len(fields))) if fields else 0
+        step = t['game_minutes'] + changeover
+        # Restdauer ab jedem Zeitfenster, wenn das Turnier seine Plätze für sich allein hätte
+        tail = [0] * (len(slots) + 1)
+        for k in range(len(slots) - 1, -1, -1):
+            tail[k] = tail[k + 1] + math.ceil(len(slots[k]) / max(cap, 1)) * step
+        begin = max(day_start, parse_clock(t['start'])) if t.get('start') else day_start
+        plans.append({'name': t['name'], 'fields': fields, 'cap': cap, 'minutes': t['game_minutes'], 'slots': slots,
+                      'tail': tail, 'begin': begin, 'k': 0, 'pending': list(slots[0]) if slots and fields else [],
+                      'lanes': [begin] * cap, 'slot_end': begin, 'end': begin})
+
+    rows = []
+    while True:
+        best = None
+        for i, plan in enumerate(plans):
+            if not plan['pending']:
+                continue
+            lane = plan['lanes'][0]
+            for field in plan['fields']:
+                kickoff = _after_breaks(max(field_free[field], lane), plan['minutes'], breaks)
+                key = (kickoff, -plan['tail'][plan['k']], field, i)
+                if best is None or key < best:
+                    best = key
+        if best is None:
+            break
+        kickoff, _, field, i = best
+        plan = plans[i]
+        _, game = plan['pending'].pop(0)
+        end = kickoff + plan['minutes']
+        rows.append({'tournament': plan['name'], 'kickoff': format_clock(kickoff), 'end': format_clock(end),
+                     'field': field, 'game': game})
+        field_free[field] = end + changeover
+        heapq.heapreplace(plan['lanes'], end + changeover)
+        plan['slot_end'] = max(plan['slot_end'], end)
+        plan['end'] = max(plan['end'], end)
+        if not plan['pending']:
+            # Zeitfenster fertig angesetzt: das nächste beginnt nach dessen letztem Spiel
+            plan['k'] += 1
+            if plan['k'] < len(plan['slots']):
+                plan['pending'] = list(plan['slots'][plan['k']])
+                plan['lanes'] = [plan['slot_end'] + changeover] * plan['cap']
+
+    day_end = max((plan['end'] for plan in plans), default=day_start)
+    total = sum(len(slot) * (plan['minutes'] + changeover) for plan in plans for slot in plan['slots'])
+    lower_bound = max([_finish(day_start, math.ceil(total / max(num_fields, 1)) - changeover, breaks)] +
+                      [_finish(plan['begin'], plan['tail'][0] - changeover, breaks) for plan in plans if plan['slots']])
+    report = {'start': start, 'end': format_clock(day_end), 'lower_bound': format_clock(lower_bound),
+              'gap': max(0, day_end - lower_bound), 'ends': {plan['name']: format_clock(plan['end']) for plan in plans},
+              'unplaced': sum(len(slot) for plan in plans if not plan['fields'] for slot in plan['slots'])}
+    rows.sort(key=lambda row: (row['kickoff'], row['field']))
+    return rows, report
+
+
+def apply_shared_plan(rows: List[Dict]) -> None:
+    """Schreibt Anstoßzeit und Platz in die Spiele der einzelnen Turniere"""
+    for row in rows:
+        row['game']['kickoff'] = row['kickoff']
+        row['game']['field'] = row['field']
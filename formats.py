@@ -0,0 +1,276 @@
+"""
+Turniere in mehreren Phasen: Gruppenphase, K.o.-Runde und Platzierungsspiele.
+
+- Gruppen: Die Teams werden in Setzreihenfolge in Schlangenlinie verteilt
+  (A B C D D C B A ...), jede Gruppe spielt jeder gegen jeden.
+- K.o.-Runde: Die besten `qualifiers` jeder Gruppe ziehen ein. Gesetzt wird
+  nach Platz und Gruppe (A1, B1, ..., A2, B2, ...) im Standard-Turnierbaum
+  (1 gegen 8, 4 gegen 5, ...), Gruppensieger bekommen die Freilose. In der
+  ersten Runde treffen nach Möglichkeit keine Teams derselben Gruppe aufeinander.
+- Platzierungsspiele: Die übrigen Teams spielen gruppenübergreifend nach Platz
+  (A3 gegen B3 um Platz 5 usw.); bei ungerader Gruppenzahl spielt das übrige
+  Team gegen das beste des nächsten Platzes (C3 gegen A4).
+
+Zeitplanung über alle Phasen: Die Gruppenspiele aller Gruppen werden gemeinsam
+als Kantenfärbung auf die Felder verteilt (scheduling.schedule_games). Danach
+werden K.o.- und Platzierungsspiele per Listenplanung eingefügt - jedes Spiel,
+sobald seine Gruppen beendet und seine Vorgängerspiele gespielt sind, auch auf
+freien Feldern der letzten Gruppenrunden. Vorrang hat das Spiel mit der längsten
+noch folgenden Kette (Finale zuletzt). Der Bericht nennt den Abstand zur
+unteren Schranke max(Spiele / Felder, Gruppenrunden + Länge der K.o.-Kette).
+
+Noch offene Paarungen stehen als Platzhalter im Plan ("Sieger Halbfinale 1").
+advance_bracket trägt die echten Teams ein, sobald die Ergebnisse feststehen.
+Die Gruppenplätze liest advance_bracket aus standings.Standings (wie die Tabelle der App).
+"""
+import math
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from schedule_utils import iter_games
+from scheduling import resting_teams, schedule_games, schedule_report, slot_lower_bound
+from standings import Standings, game_goals
+from tiebreak import DEFAULT_TIE_BREAKERS
+
+GROUP_NAMES = "ABCDEFGH"
+STAGE_NAMES = {2: 'Finale', 4: 'Halbfinale', 8: 'Viertelfinale', 16: 'Achtelfinale', 32: 'Sechzehntelfinale'}
+THIRD_PLACE = 'Spiel um Platz 3'
+
+
+def seed_groups(teams: List[str], num_groups: int) -> Dict[str, List[str]]:
+    """Verteilt die Teams (in Setzreihenfolge) in Schlangenlinie auf die Gruppen"""
+    groups = {GROUP_NAMES[g]: [] for g in range(num_groups)}
+    names = list(groups)
+    for i, team in enumerate(teams):
+        row, col = divmod(i, num_groups)
+        groups[names[col if row % 2 == 0 else num_groups - 1 - col]].append(team)
+    return groups
+
+
+def source_label(source: Dict) -> str:
+    """Platzhaltertext für ein noch offenes Team"""
+    if 'group' in source:
+        return f"{source['rank']}. Gruppe {source['group']}"
+    if 'winner' in source:
+        return f"Sieger {source['winner']}"
+    return f"Verlierer {source['loser']}"
+
+
+def teams_pending(game: Dict, teams: Dict[str, List[str]]) -> bool:
+    """K.o.- oder Platzierungsspiel, in dem noch ein Platzhalter statt eines Teams steht"""
+    return game.get('phase') in ('knockout', 'placement') and not all(game.get('team' + s) in teams for s in '12')
+
+
+def _bracket_order(size: int) -> List[int]:
+    """Setzpositionen im Turnierbaum: 1 trifft erst im Finale auf 2 (z.B. 1 8 4 5 2 7 3 6)"""
+    order = [1]
+    while len(order) < size:
+        n = 2 * len(order)
+        order = [seed for s in order for seed in (s, n + 1 - s)]
+    return order
+
+
+def _avoid_group_clashes(seeds: List[Dict], order: List[int]) -> List[Dict]:
+    """Tauscht gleich platzierte Teams, damit in Runde 1 keine Gruppe gegen sich selbst spielt"""
+    seeds = list(seeds)
+    pairs = [(order[i] - 1, order[i + 1] - 1) for i in range(0, len(order), 2)]
+    pairs = [(a, b) for a, b in pairs if b < len(seeds)]
+
+    def clashes():
+        return sum(seeds[a]['group'] == seeds[b]['group'] for a, b in pairs)
+
+    for a, b in pairs:
+        if seeds[a]['group'] != seeds[b]['group']:
+            continue
+        for _, d in pairs:
+            if d != b and seeds[d]['rank'] == seeds[b]['rank']:
+                before = clashes()
+                seeds[b], seeds[d] = seeds[d], seeds[b]
+                if clashes() < before:
+                    break
+                seeds[b], seeds[d] = seeds[d], seeds[b]
+    return seeds
+
+
+def _knockout_games(groups: Dict[str, List[str]], qualifiers: int, third_place: bool) -> List[Dict]:
+    """Spiele der K.o.-Runde mit ihren Quellen (Gruppenplatz, Sieger oder Verlierer)"""
+    seeds = [{'group': group, 'rank': rank} for rank in range(1, qualifiers + 1)
+             for group, members in groups.items() if len(members) >= rank]
+    if len(seeds) < 2:
+        return []
+    size = 2 ** math.ceil(math.log2(len(seeds)))
+    order = _bracket_order(size)
+    seeds = _avoid_group_clashes(seeds, order)
+    current: List[Optional[Dict]] = [seeds[s - 1] if s <= len(seeds) else None for s in order]
+    games, semifinals = [], []
+    while len(current) > 1:
+        stage = STAGE_NAMES.get(len(current), f"Runde der letzten {len(current)}")
+        count = sum(1 for i in range(0, len(current), 2) if current[i] and current[i + 1])
+        following, number = [], 0
+        for i in range(0, len(current), 2):
+            a, b = current[i], current[i + 1]
+            if a is None or b is None:
+                following.append(a or b)  # Freilos
+                continue
+            number += 1
+            label = stage if count == 1 else f"{stage} {number}"
+            games.append({'phase': 'knockout', 'stage': stage, 'label': label, 'source1': a, 'source2': b})
+            following.append({'winner': label})
+            if stage == 'Halbfinale':
+                semifinals.append(label)
+        current = following
+    if third_place and len(semifinals) == 2:
+        games.append({'phase': 'knockout', 'stage': THIRD_PLACE, 'label': THIRD_PLACE,
+                      'source1': {'loser': semifinals[0]}, 'source2': {'loser': semifinals[1]}})
+    return games
+
+
+def _placement_games(groups: Dict[str, List[str]], qualifiers: int) -> List[Dict]:
+    """Gruppenübergreifende Spiele der ausgeschiedenen Teams nach Platz (A3-B3, C3-D3, ...)
+
+    Bleibt ein Team übrig (ungerade Gruppenzahl, kleinere Gruppen), spielt es gegen
+    das beste Team des nächsten Platzes (A3-B3, C3-A4, B4-C4). Nur wer keinen Gegner
+    aus einer anderen Gruppe mehr findet, bekommt kein Platzierungsspiel.
+    """
+    ranks = range(qualifiers + 1, max(len(members) for members in groups.values()) + 1)
+    left = [{'group': group, 'rank': rank} for rank in ranks for group, members in groups.items() if len(members) >= rank]
+    place = qualifiers * len(groups) + 1
+    games = []
+    while len(left) > 1:
+        if left[0]['group'] == left[1]['group']:
+            left.pop(0)
+            place += 1
+            continue
+        source1, source2 = left.pop(0), left.pop(0)
+        games.append({'phase': 'placement', 'stage': 'Platzierung', 'label': f"Platz {place}",
+                      'source1': source1, 'source2': source2})
+        place += 2
+    return games
+
+
+def _requirements(game: Dict) -> Tuple[set, set]:
+    """Gruppen und Vorgängerspiele, die vor einem Spiel der K.o.-/Platzierungsphase fertig sein müssen"""
+    groups, previous = set(), set()
+    for side in ('source1', 'source2'):
+        source = game[side]
+        if 'group' in source:
+            groups.add(source['group'])
+        else:
+            previous.add(source.get('winner') or source.get('loser'))
+    return groups, previous
+
+
+def _chain_lengths(games: List[Dict]) -> Dict[str, int]:
+    """Länge der längsten Kette ab jedem Spiel bis zum letzten Spiel (Finale = 1)"""
+    successors: Dict[str, List[str]] = {game['label']: [] for game in games}
+    for game in games:
+        for label in _requirements(game)[1]:
+            successors[label].append(game['label'])
+    lengths: Dict[str, int] = {}
+
+    def length(label):
+        if label not in lengths:
+            lengths[label] = 1 + max((length(s) for s in successors[label]), default=0)
+        return lengths[label]
+
+    for game in games:
+        length(game['label'])
+    return lengths
+
+
+def _make_game(team1: str, team2: str, teams: Dict[str, List[str]], **extra) -> Dict:
+    return dict({'team1': team1, 'team2': team2, 'players1': teams.get(team1, []), 'players2': teams.get(team2, []),
+                 'score1': '', 'score2': ''}, **extra)
+
+
+def plan_group_tournament(teams: Dict[str, List[str]], num_groups: int, qualifiers: int, num_fields: int,
+                          third_place: bool = True, placement: bool = True) -> Tuple[List[Dict], Dict[str, List[str]], Dict]:
+    """Plant Gruppenphase, K.o.-Runde und Platzierungsspiele als einen Tagesplan
+
+    Die Reihenfolge von teams gilt als Setzliste. Gibt den Spielplan (Runden mit
+    'games'), die Gruppen und einen Bericht (slots, lower_bound, gap, group_slots) zurück.
+    """
+    active = {name: players for name, players in teams.items() if players}
+    num_groups = max(1, min(num_groups, len(active) // 2, len(GROUP_NAMES)))
+    groups = seed_groups(list(active), num_groups)
+
+    group_games = [_make_game(a, b, active, phase='group', group=group)
+                   for group, members in groups.items() for i, a in enumerate(members) for b in members[i + 1:]]
+    pairs = [(game['team1'], game['team2']) for game in group_games]
+    group_slots, _ = schedule_games(pairs, num_fields)
+    finished = {group: -1 for group in groups}
+    for t, slot in enumerate(group_slots):
+        for index in slot:
+            finished[group_games[index]['group']] = t
+
+    later = _knockout_games(groups, qualifiers, third_place) + (_placement_games(groups, qualifiers) if placement else [])
+    chain = _chain_lengths(later)
+    slots: List[List[Dict]] = [[group_games[index] for index in slot] for slot in group_slots]
+    placed: Dict[str, int] = {}
+    waiting = sorted(later, key=lambda game: -chain[game['label']])  # stabil: Turnierbaum-Reihenfolge bleibt
+    t = 0
+    while waiting:
+        if t == len(slots):
+            slots.append([])
+        for game in list(waiting):
+            if len(slots[t]) >= num_fields:
+                break
+            groups_needed, previous = _requirements(game)
+            if all(finished[g] < t for g in groups_needed) and all(placed.get(p, t) < t for p in previous):
+                names = [source_label(game['source1']), source_label(game['source2'])]
+                slots[t].append(_make_game(*names, active, **game))
+                placed[game['label']] = t
+                waiting.remove(game)
+        t += 1
+
+    all_teams = list(active)
+    schedule = []
+    for number, games in enumerate(slots, 1):
+        stages = list(dict.fromkeys('Gruppenphase' if game['phase'] == 'group' else game['stage'] for game in games))
+        entry = {'round': f"{number}. Runde ({', '.join(stages)})", 'games': games}
+        if all(game['phase'] == 'group' for game in games):
+            entry['resting_teams'] = resting_teams([(g['team1'], g['team2']) for g in games], all_teams)
+        schedule.append(entry)
+
+    lower_bound = slot_lower_bound(pairs, num_fields) + max(chain.values(), default=0)
+    lower_bound = max(lower_bound, math.ceil((len(group_games) + len(later)) / num_fields))
+    report = dict(schedule_report(len(schedule), lower_bound), group_slots=len(group_slots))
+    return schedule, groups, report
+
+
+def advance_bracket(schedule: List[Dict], teams: Dict[str, List[str]],
+                    tie_breakers: Sequence[str] = DEFAULT_TIE_BREAKERS, seed: Optional[int] = None,
+                    standings: Optional[Standings] = None) -> int:
+    """Trägt die feststehenden Teams in K.o.- und Platzierungsspiele ein - gibt die Anzahl geänderter Spiele zurück
+
+    Die Gruppenplätze kommen aus standings (sonst aus dem Spielplan aufgebaut),
+    also nach denselben Tie-Breakern wie in der angezeigten Tabelle.
+    """
+    if standings is None:
+        standings = Standings(schedule)
+    later = [game for _, game in iter_games(schedule) if game.get('phase') in ('knockout', 'placement')]
+    by_label = {game['label']: game for game in later}
+    tables: Dict[str, List[Dict]] = {}
+
+    def resolve(source) -> Optional[str]:
+        if 'group' in source:
+            group = source['group']
+            if group not in tables:
+                tables[group] = standings.table(group, tie_breakers, seed) if standings.complete(group) else []
+            table = tables[group]
+            return table[source['rank'] - 1]['team'] if len(table) >= source['rank'] else None
+        game = by_label.get(source.get('winner') or source.get('loser'))
+        goals = game_goals(game) if game else None
+        if goals is None or goals[0] == goals[1] or not all(game['team' + s] in teams for s in '12'):
+            return None  # offen, unentschieden (Ergebnis nach Elfmeterschießen eintragen) oder Teams unbekannt
+        first_wins = goals[0] > goals[1]
+        return game['team1'] if first_wins == ('winner' in source) else game['team2']
+
+    changed = 0
+    for game in later:  # Vorgänger stehen im Plan immer früher
+        before = (game['team1'], game['team2'])
+        for side in ('1', '2'):
+            team = resolve(game['source' + side]) or source_label(game['source' + side])
+            game['team' + side] = team
+            game['players' + side] = teams.get(team, [])
+        changed += (game['team1'], game['team2']) != before
+    return changed
@@ -0,0 +1,123 @@
+"""
+Gemeinsamer Turnierzustand aller Streamlit-Sitzungen eines Servers.
+
+Jede Sitzung (z.B. zwei Schiedsrichter auf verschiedenen Geräten) hat ihre
+eigene Kopie in st.session_state. Änderungen werden als Ereignisse (siehe
+persistence.diff_states) in einen gemeinsamen, gesperrten Zustand im Speicher
+veröffentlicht; jede Veröffentlichung erhöht die Versionsnummer. Sitzungen
+holen sich nur die Ereignisse seit ihrer zuletzt gesehenen Version - die
+JSON-Datei muss dafür nicht neu gelesen werden.
+"""
+import copy
+import threading
+from collections import deque
+from typing import Callable, Dict, List, Optional, Tuple
+
+from persistence import apply_event
+
+HISTORY = 1000
+
+
+class SharedTournament:
+    """Turnierzustand im Speicher mit Versionszähler, Änderungsprotokoll und Abonnenten"""
+
+    def __init__(self, history: int = HISTORY):
+        self._cond = threading.Condition()
+        self.version = 0
+        self._state: Optional[Dict] = None
+        self._log = deque(maxlen=history)  # (Version, Ereignis)
+        self._subscribers: Dict[str, Callable[[int, List[Dict]], None]] = {}
+
+    @property
+    def joined(self) -> bool:
+        return self._state is not None
+
+    def snapshot(self) -> Tuple[int, Optional[Dict]]:
+        """Aktuelle Version und eine Kopie des Zustands"""
+        with self._cond:
+            return self.version, copy.deepcopy(self._state)
+
+    def replace(self, state: Dict) -> int:
+        """Ersetzt den kompletten Zustand (Laden, erstes Speichern) - ältere Sitzungen laden neu"""
+        with self._cond:
+            self._state = copy.deepcopy(state)
+            self.version += 1
+            self._log.clear()
+            version = self.version
+            self._cond.notify_all()
+        self._notify(version, None)
+        return version
+
+    def publish(self, events: List[Dict]) -> int:
+        """Wendet Ereignisse an; jedes Ereignis bekommt eine eigene Version"""
+        if not events:
+            return self.version
+        events = copy.deepcopy(events)
+        with self._cond:
+            if self._state is None:
+                self._state = {}
+            for event in events:
+                apply_event(self._state, copy.deepcopy(event))
+                self.version += 1
+                self._log.append((self.version, event))
+            version = self.version
+            self._cond.notify_all()
+        self._notify(version, events)
+        return version
+
+    def changes_since(self, version: int) -> Tuple[int, Optional[List[Dict]]]:
+        """Ereignisse nach `version` - None, wenn die Sitzung den kompletten Zustand neu holen muss"""
+        with self._cond:
+            if version == self.version:
+                return version, []
+            if version > self.version or not self._log or self._log[0][0] > version + 1:
+                return self.version, None
+            return self.version, [copy.deepcopy(event) for v, event in self._log if v > version]
+
+    def wait_for_change(self, version: int, timeout: float = None) -> bool:
+        """Blockiert, bis es eine neuere Version als `version` gibt (oder das Zeitlimit abläuft)"""
+        with self._cond:
+            return self._cond.wait_for(lambda: self.version != version, timeout)
+
+    def subscribe(self, name: str, callback: Callable[[int, List[Dict]], None]) -> None:
+        """Ruft callback(version, ereignisse) nach jeder Änderung auf - bei replace() mit None"""
+        with self._cond:
+            self._subscribers[name] = callback
+
+    def unsubscribe(self, name: str) -> None:
+        with self._cond:
+            self._subscribers.pop(name, None)
+
+    def _notify(self, version: int, events: Optional[List[Dict]]) -> None:
+        # Außerhalb der Sperre, damit langsame Abonnenten niemanden blockieren
+        with self._cond:
+            subscribers = list(self._subscribers.values())
+        for callback in subscribers:
+            callback(version, events)
+
+
+def apply_events(state: Dict, events: List[Dict]) -> Dict:
+    """Kopie des Zustands mit angewendeten Ereignissen"""
+    state = copy.deepcopy(state)
+    for event in events:
+        apply_event(state, copy.deepcopy(event))
+    return state
+
+
+def rebase(base: Dict, local: Dict, events: List[Dict]) -> Tuple[Dict, Dict]:
+    """Wendet fremde Ereignisse auf Basis und lokalen Zustand an - lokale Änderungen bleiben erhalten"""
+    for event in events:
+        apply_event(local, copy.deepcopy(event))
+    return apply_events(base, events), local
+
+
+_shared: Dict[str, SharedTournament] = {}
+_shared_lock = threading.Lock()
+
+
+def get_shared_tournament(key: str) -> SharedTournament:
+    """Ein gemeinsamer Zustand pro Turnier und Prozess"""
+    with _shared_lock:
+        if key not in _shared:
+            _shared[key] = SharedTournament()
+        return _shared[key]
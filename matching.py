@@ -0,0 +1,357 @@
+"""
+Gewichtetes Matching in allgemeinen Graphen (Edmonds' Blüten-Algorithmus).
+
+max_weight_matching findet ein Matching mit maximalem Gesamtgewicht, mit
+max_cardinality=True unter allen größtmöglichen Matchings. Primal-duales
+Verfahren mit Blüten (ungerade Kreise werden zu einem Knoten zusammengezogen)
+in O(n^3) - 64 Teams mit allen 2016 möglichen Paarungen in wenigen
+hundertstel Sekunden. Gewichte sollten ganzzahlig sein; intern werden sie
+verdoppelt, damit alle Dualvariablen ganzzahlig bleiben.
+
+Aufbau nach der bekannten Darstellung von Galil ("Efficient algorithms for
+finding maximum matching in graphs", 1986) bzw. J. van Rantwijk.
+"""
+from typing import List, Tuple
+
+Edge = Tuple[int, int, int]
+
+
+def max_weight_matching(edges: List[Edge], max_cardinality: bool = False) -> List[int]:
+    """Gibt für jeden Knoten den Partner zurück (-1 = ungepaart)
+
+    edges: (i, j, Gewicht) mit Knoten 0..n-1, jede Kante höchstens einmal.
+    """
+    if not edges:
+        return []
+    edges = [(i, j, 2 * w) for i, j, w in edges]
+    num_edges = len(edges)
+    n = 1 + max(max(i, j) for i, j, _ in edges)
+    max_weight = max(0, max(w for _, _, w in edges))
+
+    # Kantenenden: Ende p gehört zu Kante p // 2, endpoint[p ^ 1] ist das andere Ende
+    endpoint = [edges[p // 2][p % 2] for p in range(2 * num_edges)]
+    neighbend: List[List[int]] = [[] for _ in range(n)]
+    for k, (i, j, _) in enumerate(edges):
+        neighbend[i].append(2 * k + 1)
+        neighbend[j].append(2 * k)
+
+    mate = [-1] * n                       # Kantenende zum Partner
+    label = [0] * (2 * n)                 # 0 frei, 1 = S, 2 = T (für Knoten und Blüten)
+    labelend = [-1] * (2 * n)             # Kantenende, über das das Label vergeben wurde
+    inblossom = list(range(n))            # äußerste Blüte je Knoten
+    blossomparent = [-1] * (2 * n)
+    blossomchilds: List = [None] * (2 * n)
+    blossombase = list(range(n)) + [-1] * n
+    blossomendps: List = [None] * (2 * n)
+    bestedge = [-1] * (2 * n)             # kleinste Schlupf-Kante zu einem S-Knoten
+    blossombestedges: List = [None] * (2 * n)
+    unusedblossoms = list(range(n, 2 * n))
+    dualvar = [max_weight] * n + [0] * n
+    allowedge = [False] * num_edges
+    queue: List[int] = []
+
+    def slack(k):
+        i, j, w = edges[k]
+        return dualvar[i] + dualvar[j] - 2 * w
+
+    def leaves(b):
+        if b < n:
+            yield b
+        else:
+            for child in blossomchilds[b]:
+                yield from leaves(child)
+
+    def assign_label(w, t, p):
+        b = inblossom[w]
+        label[w] = label[b] = t
+        labelend[w] = labelend[b] = p
+        bestedge[w] = bestedge[b] = -1
+        if t == 1:
+            queue.extend(leaves(b))
+        else:
+            base = blossombase[b]
+            assign_label(endpoint[mate[base]], 1, mate[base] ^ 1)
+
+    def scan_blossom(v, w):
+        """Verfolgt beide Pfade zurück - gemeinsame Basis (neue Blüte) oder -1 (augmentierender Pfad)"""
+        path, base = [], -1
+        while v != -1 or w != -1:
+            b = inblossom[v]
+            if label[b] & 4:
+                base = blossombase[b]
+                break
+            path.append(b)
+            label[b] = 5
+            if labelend[b] == -1:
+                v = -1
+            else:
+                v = endpoint[labelend[b]]
+                b = inblossom[v]
+                v = endpoint[labelend[b]]
+            if w != -1:
+                v, w = w, v
+        for b in path:
+            label[b] = 1
+        return base
+
+    def add_blossom(base, k):
+        v, w, _ = edges[k]
+        bb, bv, bw = inblossom[base], inblossom[v], inblossom[w]
+        b = unusedblossoms.pop()
+        blossombase[b] = base
+        blossomparent[b] = -1
+        blossomparent[bb] = b
+        blossomchilds[b] = path = []
+        blossomendps[b] = endps = []
+        while bv != bb:
+            blossomparent[bv] = b
+            path.append(bv)
+            endps.append(labelend[bv])
+            v = endpoint[labelend[bv]]
+            bv = inblossom[v]
+        path.append(bb)
+        path.reverse()
+        endps.reverse()
+        endps.append(2 * k)
+        while bw != bb:
+            blossomparent[bw] = b
+            path.append(bw)
+            endps.append(labelend[bw] ^ 1)
+            w = endpoint[labelend[bw]]
+            bw = inblossom[w]
+        label[b] = 1
+        labelend[b] = labelend[bb]
+        dualvar[b] = 0
+        for v in leaves(b):
+            if label[inblossom[v]] == 2:
+                queue.append(v)  # frühere T-Knoten sind jetzt S-Knoten
+            inblossom[v] = b
+        # Beste Kanten der neuen Blüte zu anderen S-Blüten
+        bestedgeto = [-1] * (2 * n)
+        for bv in path:
+            if blossombestedges[bv] is None:
+                lists = [[p // 2 for p in neighbend[v]] for v in leaves(bv)]
+            else:
+                lists = [blossombestedges[bv]]
+            for edge_list in lists:
+                for k in edge_list:
+                    i, j, _ = edges[k]
+                    if inblossom[j] == b:
+                        i, j = j, i
+                    bj = inblossom[j]
+                    if bj != b and label[bj] == 1 and (bestedgeto[bj] == -1 or slack(k) < slack(bestedgeto[bj])):
+                        bestedgeto[bj] = k
+            blossombestedges[bv] = None
+            bestedge[bv] = -1
+        blossombestedges[b] = [k for k in bestedgeto if k != -1]
+        bestedge[b] = -1
+        for k in blossombestedges[b]:
+            if bestedge[b] == -1 or slack(k) < slack(bestedge[b]):
+                bestedge[b] = k
+
+    def expand_blossom(b, endstage):
+        for s in blossomchilds[b]:
+            blossomparent[s] = -1
+            if s < n:
+                inblossom[s] = s
+            elif endstage and dualvar[s] == 0:
+                expand_blossom(s, endstage)
+            else:
+                for v in leaves(s):
+                    inblossom[v] = s
+        if not endstage and label[b] == 2:
+            # T-Blüte mitten in der Suche: Labels der Teilblüten auf dem Pfad neu vergeben
+            entrychild = inblossom[endpoint[labelend[b] ^ 1]]
+            j = blossomchilds[b].index(entrychild)
+            if j & 1:
+                j -= len(blossomchilds[b])
+                jstep, endptrick = 1, 0
+            else:
+                jstep, endptrick = -1, 1
+            p = labelend[b]
+            while j != 0:
+                label[endpoint[p ^ 1]] = 0
+                label[endpoint[blossomendps[b][j - endptrick] ^ endptrick ^ 1]] = 0
+                assign_label(endpoint[p ^ 1], 2, p)
+                allowedge[blossomendps[b][j - endptrick] // 2] = True
+                j += jstep
+                p = blossomendps[b][j - endptrick] ^ endptrick
+                allowedge[p // 2] = True
+                j += jstep
+            bv = blossomchilds[b][j]
+            label[endpoint[p ^ 1]] = label[bv] = 2
+            labelend[endpoint[p ^ 1]] = labelend[bv] = p
+            bestedge[bv] = -1
+            j += jstep
+            while blossomchilds[b][j] != entrychild:
+                bv = blossomchilds[b][j]
+                if label[bv] == 1:
+                    j += jstep
+                    continue
+                for v in leaves(bv):
+                    if label[v] != 0:
+                        break
+                if label[v] != 0:
+                    label[v] = 0
+                    label[endpoint[mate[blossombase[bv]]]] = 0
+                    assign_label(v, 2, labelend[v])
+                j += jstep
+        label[b] = labelend[b] = -1
+        blossomchilds[b] = blossomendps[b] = None
+        blossombase[b] = -1
+        blossombestedges[b] = None
+        bestedge[b] = -1
+        unusedblossoms.append(b)
+
+    def augment_blossom(b, v):
+        """Tauscht gepaarte und ungepaarte Kanten innerhalb der Blüte, sodass v die neue Basis ist"""
+        t = v
+        while blossomparent[t] != b:
+            t = blossomparent[t]
+        if t >= n:
+            augment_blossom(t, v)
+        i = j = blossomchilds[b].index(t)
+        if i & 1:
+            j -= len(blossomchilds[b])
+            jstep, endptrick = 1, 0
+        else:
+            jstep, endptrick = -1, 1
+        while j != 0:
+            j += jstep
+            t = blossomchilds[b][j]
+            p = blossomendps[b][j - endptrick] ^ endptrick
+            if t >= n:
+                augment_blossom(t, endpoint[p])
+            j += jstep
+            t = blossomchilds[b][j]
+            if t >= n:
+                augment_blossom(t, endpoint[p ^ 1])
+            mate[endpoint[p]] = p ^ 1
+            mate[endpoint[p ^ 1]] = p
+        blossomchilds[b] = blossomchilds[b][i:] + blossomchilds[b][:i]
+        blossomendps[b] = blossomendps[b][i:] + blossomendps[b][:i]
+        blossombase[b] = blossombase[blossomchilds[b][0]]
+
+    def augment_matching(k):
+        v, w, _ = edges[k]
+        for s, p in ((v, 2 * k + 1), (w, 2 * k)):
+            while True:
+                bs = inblossom[s]
+                if bs >= n:
+                    augment_blossom(bs, s)
+                mate[s] = p
+                if labelend[bs] == -1:
+                    break  # freier Knoten erreicht
+                t = endpoint[labelend[bs]]
+                bt = inblossom[t]
+                s = endpoint[labelend[bt]]
+                j = endpoint[labelend[bt] ^ 1]
+                if bt >= n:
+                    augment_blossom(bt, j)
+                mate[j] = labelend[bt]
+                p = labelend[bt] ^ 1
+
+    for _ in range(n):
+        # Eine Phase: alternierende Bäume von allen freien Knoten, bis ein augmentierender Pfad gefunden ist
+        label[:] = [0] * (2 * n)
+        bestedge[:] = [-1] * (2 * n)
+        blossombestedges[n:] = [None] * n
+        allowedge[:] = [False] * num_edges
+        queue[:] = []
+        for v in range(n):
+            if mate[v] == -1 and label[inblossom[v]] == 0:
+                assign_label(v, 1, -1)
+        augmented = False
+        while True:
+            while queue and not augmented:
+                v = queue.pop()
+                for p in neighbend[v]:
+                    k = p // 2
+                    w = endpoint[p]
+                    if inblossom[v] == inblossom[w]:
+                        continue
+                    if not allowedge[k]:
+                        kslack = slack(k)
+                        if kslack <= 0:
+                            allowedge[k] = True
+                    if allowedge[k]:
+                        if label[inblossom[w]] == 0:
+                            assign_label(w, 2, p ^ 1)
+                        elif label[inblossom[w]] == 1:
+                            base = scan_blossom(v, w)
+                            if base >= 0:
+                                add_blossom(base, k)
+                            else:
+                                augment_matching(k)
+                                augmented = True
+                                break
+                        elif label[w] == 0:
+                            label[w] = 2
+                            labelend[w] = p ^ 1
+                    elif label[inblossom[w]] == 1:
+                        b = inblossom[v]
+                        if bestedge[b] == -1 or kslack < slack(bestedge[b]):
+                            bestedge[b] = k
+                    elif label[w] == 0:
+                        if bestedge[w] == -1 or kslack < slack(bestedge[w]):
+                            bestedge[w] = k
+            if augmented:
+                break
+
+            # Keine zulässige Kante mehr: Dualvariablen um delta anpassen
+            delta_type, delta, delta_edge, delta_blossom = -1, None, None, None
+            if not max_cardinality:
+                delta_type, delta = 1, min(dualvar[:n])
+            for v in range(n):
+                if label[inblossom[v]] == 0 and bestedge[v] != -1:
+                    d = slack(bestedge[v])
+                    if delta_type == -1 or d < delta:
+                        delta_type, delta, delta_edge = 2, d, bestedge[v]
+            for b in range(2 * n):
+                if blossomparent[b] == -1 and label[b] == 1 and bestedge[b] != -1:
+                    d = slack(bestedge[b]) // 2
+                    if delta_type == -1 or d < delta:
+                        delta_type, delta, delta_edge = 3, d, bestedge[b]
+            for b in range(n, 2 * n):
+                if blossombase[b] >= 0 and blossomparent[b] == -1 and label[b] == 2 and \
+                        (delta_type == -1 or dualvar[b] < delta):
+                    delta_type, delta, delta_blossom = 4, dualvar[b], b
+            if delta_type == -1:
+                # Größtmögliches Matching erreicht - Dualvariablen trotzdem noch optimal anpassen
+                delta_type, delta = 1, max(0, min(dualvar[:n]))
+
+            for v in range(n):
+                if label[inblossom[v]] == 1:
+                    dualvar[v] -= delta
+                elif label[inblossom[v]] == 2:
+                    dualvar[v] += delta
+            for b in range(n, 2 * n):
+                if blossombase[b] >= 0 and blossomparent[b] == -1:
+                    if label[b] == 1:
+                        dualvar[b] += delta
+                    elif label[b] == 2:
+                        dualvar[b] -= delta
+
+            if delta_type == 1:
+                break  # optimal
+            elif delta_type == 2:
+                allowedge[delta_edge] = True
+                i, j, _ = edges[delta_edge]
+                if label[inblossom[i]] == 0:
+                    i, j = j, i
+                queue.append(i)
+            elif delta_type == 3:
+                allowedge[delta_edge] = True
+                i, j, _ = edges[delta_edge]
+                queue.append(i)
+            else:
+                expand_blossom(delta_blossom, False)
+
+        if not augmented:
+            break
+        # S-Blüten mit Dualvariable 0 am Ende der Phase auflösen
+        for b in range(n, 2 * n):
+            if blossomparent[b] == -1 and blossombase[b] >= 0 and label[b] == 1 and dualvar[b] == 0:
+                expand_blossom(b, True)
+
+    return [endpoint[p] if p >= 0 else -1 for p in mate]
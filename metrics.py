@@ -0,0 +1,176 @@
+"""
+Kennzahlen zur Qualität eines Spielplans (vektorisiert mit NumPy).
+
+ScheduleMatrices übersetzt jeden Spielplan der App (flache Liste, Runden mit
+'games' oder mit 'sub_rounds', siehe schedule_utils) in ganzzahlig indizierte
+Matrizen:
+
+- side1 / side2: Spieler x Spiel (1, wenn der Spieler auf dieser Seite spielt)
+- partner = side1 @ side1.T + side2 @ side2.T: wie oft zwei Spieler zusammen spielen
+- opponent = side1 @ side2.T + side2 @ side1.T: wie oft sie gegeneinander spielen
+- rest: Einheit x Runde (True = pausiert); Einheiten sind die Teams bei festen
+  Teams und die Spieler beim Round Robin
+- fields: Spieler x Spielfeld (Anzahl Spiele auf dem Feld)
+
+K.o.- und Platzierungsspiele, in denen noch Platzhalter wie "1. Gruppe A"
+stehen, zählen nicht mit - sie haben noch keine Spieler.
+
+fairness_metrics rechnet daraus alle Kennzahlen ohne Python-Schleifen über
+Spiele oder Spielerpaare - auch 1000 Spiele dauern nur Millisekunden.
+"""
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from formats import teams_pending
+from schedule_utils import iter_games
+
+METRIC_LABELS = {
+    'games': 'Spiele',
+    'rounds': 'Runden',
+    'games_min': 'Wenigste Spiele pro Spieler',
+    'games_max': 'Meiste Spiele pro Spieler',
+    'repeated_partners': 'Partner-Wiederholungen',
+    'max_partner': 'Höchstens gleiche Partner',
+    'partner_coverage': 'Anteil Spielerpaare als Partner',
+    'repeated_opponents': 'Gegner-Wiederholungen',
+    'max_opponent': 'Höchstens gleiche Gegner',
+    'back_to_back': 'Vermeidbare Doppelrunden',
+    'max_play_streak': 'Längste Serie ohne Pause (Runden)',
+    'max_rest': 'Längste Pause (Runden)',
+    'field_spread': 'Ungleiche Feldverteilung'
+}
+
+
+def _players_of(game: Dict, side: str, teams: Dict[str, List[str]]) -> List[str]:
+    team = game.get('team' + side)
+    if isinstance(team, list):
+        return team
+    return game.get('players' + side) or teams.get(team) or [team]
+
+
+class ScheduleMatrices:
+    """Matrix-Darstellung eines Spielplans (Indizes siehe players, units)"""
+
+    def __init__(self, schedule: List[Dict], teams: Optional[Dict[str, List[str]]] = None):
+        teams = teams or {}
+        player_index: Dict[str, int] = {}
+        unit_index: Dict[str, int] = {}
+        sides = ([], [], [], [])  # Spieler/Spiel für Seite 1, Spieler/Spiel für Seite 2
+        unit_rounds = ([], [])
+        rounds, fields = [], []
+        for path, game in iter_games(schedule):
+            if teams_pending(game, teams):
+                continue
+            g = len(rounds)
+            rounds.append(path[0])
+            fields.append(path[2] if path[1:2] == ('sub_rounds',) else path[-1] if len(path) > 1 else 0)
+            for s, side in enumerate(('1', '2')):
+                for player in _players_of(game, side, teams):
+                    sides[2 * s].append(player_index.setdefault(player, len(player_index)))
+                    sides[2 * s + 1].append(g)
+                team = game.get('team' + side)
+                for unit in (team if isinstance(team, list) else [team]):
+                    unit_rounds[0].append(unit_index.setdefault(unit, len(unit_index)))
+                    unit_rounds[1].append(path[0])
+
+        self.players = list(player_index)
+        self.units = list(unit_index)
+        num_games = len(rounds)
+        # Runden durchnummerieren (Index im Spielplan -> 0..R-1)
+        round_ids, self.game_round = np.unique(np.array(rounds, dtype=np.int64), return_inverse=True)
+        self.num_rounds = len(round_ids)
+        self.game_field = np.array(fields, dtype=np.int64)
+
+        shape = (len(self.players), num_games)
+        self.side1 = np.zeros(shape, dtype=np.int32)
+        self.side2 = np.zeros(shape, dtype=np.int32)
+        np.add.at(self.side1, (np.array(sides[0], dtype=np.int64), np.array(sides[1], dtype=np.int64)), 1)
+        np.add.at(self.side2, (np.array(sides[2], dtype=np.int64), np.array(sides[3], dtype=np.int64)), 1)
+        self.participation = self.side1 + self.side2
+
+        # Gleitkomma-Produkte laufen über BLAS (Ganzzahl-Matmul nicht) und sind für Zählwerte exakt
+        s1, s2 = self.side1.astype(np.float64), self.side2.astype(np.float64)
+        self.partner = (s1 @ s1.T + s2 @ s2.T).astype(np.int32)
+        self.opponent = (s1 @ s2.T + s2 @ s1.T).astype(np.int32)
+        np.fill_diagonal(self.partner, 0)
+        np.fill_diagonal(self.opponent, 0)
+
+        playing = np.zeros((len(self.units), self.num_rounds), dtype=bool)
+        if unit_rounds[0]:
+            playing[np.array(unit_rounds[0]), np.searchsorted(round_ids, unit_rounds[1])] = True
+        self.rest = ~playing
+
+        num_fields = int(self.game_field.max()) + 1 if num_games else 0
+        self.fields = np.zeros((len(self.players), num_fields), dtype=np.int32)
+        rows, cols = np.nonzero(self.participation)
+        np.add.at(self.fields, (rows, self.game_field[cols]), self.participation[rows, cols])
+
+
+def _longest_runs(matrix: np.ndarray, inner: bool = False) -> np.ndarray:
+    """Längste Folge von True pro Zeile - mit inner nur Folgen, die weder am Anfang noch am Ende liegen"""
+    rows, cols = matrix.shape
+    padded = np.zeros((rows, cols + 2), dtype=np.int8)
+    padded[:, 1:-1] = matrix
+    steps = np.diff(padded, axis=1)
+    start_rows, starts = np.nonzero(steps == 1)
+    _, ends = np.nonzero(steps == -1)  # gleiche Zeilenreihenfolge wie die Anfänge
+    lengths = ends - starts
+    if inner:
+        keep = (starts > 0) & (ends < cols)
+        start_rows, lengths = start_rows[keep], lengths[keep]
+    longest = np.zeros(rows, dtype=np.int64)
+    np.maximum.at(longest, start_rows, lengths)
+    return longest
+
+
+def _repeats(matrix: np.ndarray) -> int:
+    """Wiederholungen über alle Paare (jedes Paar einmal gezählt)"""
+    return int(np.triu(np.maximum(matrix - 1, 0), 1).sum())
+
+
+def fairness_metrics(m: ScheduleMatrices) -> Dict:
+    """Fairness-Kennzahlen aus den Matrizen (JSON-fähig)"""
+    games = m.participation.sum(axis=1)
+    playing = ~m.rest
+    together = playing[:, 1:] & playing[:, :-1]
+    # Spielen in zwei Runden zusammen mehr Einheiten, als es gibt, sind Doppelrunden unvermeidbar
+    counts = playing.sum(axis=0)
+    unavoidable = np.maximum(counts[1:] + counts[:-1] - len(m.units), 0)
+    fields = m.fields if m.fields.shape[1] > 1 else np.zeros((len(m.players), 1), dtype=np.int32)
+    pairs = len(m.players) * (len(m.players) - 1) // 2
+    return {
+        'players': len(m.players),
+        'units': len(m.units),
+        'games': int(m.participation.shape[1]),
+        'rounds': m.num_rounds,
+        'games_min': int(games.min()) if len(games) else 0,
+        'games_max': int(games.max()) if len(games) else 0,
+        'game_spread': int(games.max() - games.min()) if len(games) else 0,
+        'max_partner': int(m.partner.max(initial=0)),
+        'repeated_partners': _repeats(m.partner),
+        'partner_coverage': round(float(np.count_nonzero(np.triu(m.partner, 1))) / pairs, 3) if pairs else 0.0,
+        'max_opponent': int(m.opponent.max(initial=0)),
+        'repeated_opponents': _repeats(m.opponent),
+        'back_to_back': int(together.sum() - unavoidable.sum()),
+        'max_play_streak': int(_longest_runs(playing).max(initial=0)),
+        'max_rest': int(_longest_runs(m.rest, inner=True).max(initial=0)),
+        'field_spread': int((fields.max(axis=1) - fields.min(axis=1)).sum()) if len(m.players) else 0
+    }
+
+
+def analyze_schedule(schedule: List[Dict], teams: Optional[Dict[str, List[str]]] = None) -> Dict:
+    """Fairness-Kennzahlen für einen Spielplan beliebiger Struktur"""
+    return fairness_metrics(ScheduleMatrices(schedule, teams))
+
+
+def metrics_summary(metrics: Dict) -> str:
+    """Einzeilige Zusammenfassung für UI und PDF"""
+    parts = [f"{metrics['games']} Spiele in {metrics['rounds']} Runden",
+             f"{metrics['games_min']}-{metrics['games_max']} Spiele pro Spieler"]
+    if metrics['units'] == metrics['players']:
+        # Wechselnde Partner (bei festen Teams sind Partner immer dieselben)
+        parts += [f"Partner-Wiederholungen: {metrics['repeated_partners']}",
+                  f"Gegner-Wiederholungen: {metrics['repeated_opponents']}"]
+    parts += [f"längste Pause: {metrics['max_rest']} Runden", f"Doppelrunden: {metrics['back_to_back']}"]
+    return " · ".join(parts)
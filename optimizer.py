@@ -0,0 +1,180 @@
+"""
+Mehrfachstart-Optimierung für Round Robin mit wechselnden Partnern.
+
+Statt von Hand immer wieder neu zu generieren, baut optimize_round_robin in
+einem Prozess-Pool viele Kandidaten: die Standard-Konstruktion (Seed 0)
+und weitere mit gemischter Spielerreihenfolge (Seed 1, 2, ...). Jeder Kandidat
+wird lokal verbessert (Spiele einer Runde so auf die Felder gelegt, dass jeder
+Spieler möglichst gleich oft auf jedem Feld steht) und bewertet. Nach Ablauf
+des Zeitbudgets gewinnt der Kandidat mit der niedrigsten Bewertung.
+
+Der Seed des Gewinners wird mit dem Spielplan gespeichert: build_candidate mit
+demselben Seed liefert genau denselben Plan.
+
+Der Prozess-Pool wird einmal gestartet und von allen Aufrufen (und Sitzungen)
+geteilt. Nach dem Budget werden wartende Kandidaten verworfen; ein Kandidat,
+der erst nach dem Budget an die Reihe kommt, rechnet nicht mehr.
+"""
+import itertools
+import multiprocessing
+import os
+import threading
+import time
+from collections import Counter, defaultdict
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+from typing import Dict, List, Optional, Tuple
+
+from metrics import ScheduleMatrices, fairness_metrics
+from rotation import Game, rotating_partner_rounds
+
+# Gewichte der Bewertung (kleiner ist besser)
+SCORE_WEIGHTS = {
+    'game_spread': 100,        # Unterschied der Spielzahlen (über ein unvermeidbares Zusatzspiel hinaus)
+    'repeated_partners': 10,   # wiederholte Partner
+    'repeated_opponents': 1,   # wiederholte Gegner
+    'back_to_back': 2,         # Spiele in direkt aufeinanderfolgenden Runden (über das Nötige hinaus)
+    'field_spread': 1          # ungleich verteilte Spielfelder pro Spieler
+}
+DEFAULT_BUDGET = 5.0
+
+_pool: Optional[ProcessPoolExecutor] = None
+_pool_workers = 0
+_pool_lock = threading.Lock()
+
+
+def balance_fields(rounds: List[List[Game]]) -> List[List[Game]]:
+    """Legt die Spiele jeder Runde so auf die Felder, dass jeder Spieler die Felder gleichmäßig nutzt"""
+    on_field: Dict[str, Counter] = defaultdict(Counter)
+    balanced = []
+    for games in rounds:
+        def load(order):
+            return sum(on_field[p][field] for field, (team1, team2) in enumerate(order) for p in team1 + team2)
+
+        # Bis zu 4 Felder: alle Reihenfolgen probieren, sonst die gegebene behalten
+        orders = itertools.permutations(games) if len(games) <= 4 else [games]
+        best = list(min(orders, key=load))
+        for field, (team1, team2) in enumerate(best):
+            for p in team1 + team2:
+                on_field[p][field] += 1
+        balanced.append(best)
+    return balanced
+
+
+def score_rounds(rounds: List[List[Game]], players: List[str]) -> Dict[str, int]:
+    """Bewertet einen Spielplan: einzelne Kennzahlen und die gewichtete Summe 'total'"""
+    schedule = [{'games': [{'team1': team1, 'team2': team2} for team1, team2 in games]} for games in rounds]
+    matrices = ScheduleMatrices(schedule)
+    metrics = fairness_metrics(matrices)
+    # Spieler ohne Spiel kommen in den Matrizen nicht vor
+    games = [metrics['games_min'], metrics['games_max']] if len(matrices.players) == len(players) \
+        else [0, metrics['games_max']]
+    appearances = int(matrices.participation.sum())
+    score = {
+        'game_spread': games[1] - games[0] - (appearances % max(len(players), 1) > 0),
+        'repeated_partners': metrics['repeated_partners'],
+        'repeated_opponents': metrics['repeated_opponents'],
+        'back_to_back': metrics['back_to_back'],
+        'field_spread': metrics['field_spread']
+    }
+    score['total'] = sum(SCORE_WEIGHTS[key] * value for key, value in score.items())
+    return score
+
+
+def build_candidate(players: List[str], players_per_team: int, num_fields: int, games_per_player: int,
+                    seed: int) -> Tuple[List[List[Game]], List[str], Dict[str, int]]:
+    """Ein Kandidat: Konstruktion mit Seed, Feldausgleich und Bewertung - reproduzierbar"""
+    rounds, extra = rotating_partner_rounds(players, players_per_team, num_fields, games_per_player, seed=seed)
+    rounds = balance_fields(rounds)
+    return rounds, extra, score_rounds(rounds, players)
+
+
+def _run_candidate(args):
+    # Auf Modulebene, damit der Prozess-Pool die Funktion in die Worker übertragen kann
+    *problem, seed, deadline = args
+    if deadline is not None and time.time() >= deadline:
+        return None  # Budget schon abgelaufen, als der Kandidat an die Reihe kam
+    rounds, extra, score = build_candidate(*problem, seed)
+    return seed, rounds, extra, score
+
+
+def _process_pool(workers: int) -> ProcessPoolExecutor:
+    """Gemeinsamer Pool - neu gestartet nur bei anderer Prozesszahl oder nach einem Absturz"""
+    global _pool, _pool_workers
+    with _pool_lock:
+        if _pool is None or _pool_workers != workers:
+            if _pool is not None:
+                _pool.shutdown(wait=False, cancel_futures=True)
+            # forkserver: Worker nicht aus dem Streamlit-Server mit seinen Threads forken
+            methods = multiprocessing.get_all_start_methods()
+            context = multiprocessing.get_context('forkserver') if 'forkserver' in methods else None
+            _pool, _pool_workers = ProcessPoolExecutor(max_workers=workers, mp_context=context), workers
+        return _pool
+
+
+def _discard_pool(pool: ProcessPoolExecutor) -> None:
+    global _pool
+    with _pool_lock:
+        if _pool is pool:
+            _pool = None
+    pool.shutdown(wait=False, cancel_futures=True)
+
+
+def optimize_round_robin(players: List[str], players_per_team: int, num_fields: int, games_per_player: int,
+                         budget: float = DEFAULT_BUDGET, workers: Optional[int] = None,
+                         max_candidates: Optional[int] = None) -> Tuple[List[List[Game]], List[str], Dict]:
+    """Baut Kandidaten parallel bis zum Zeitbudget (Sekunden) und gibt den besten zurück
+
+    Der Bericht enthält seed (zum Reproduzieren), score, candidates (bewertete
+    Kandidaten), workers und elapsed.
+    """
+    start = time.perf_counter()
+    deadline = start + budget
+    stop_at = time.time() + budget  # Uhrzeit für die Worker-Prozesse (perf_counter gilt nur im eigenen Prozess)
+    workers = workers or os.cpu_count() or 1
+    problem = (list(players), players_per_team, num_fields, games_per_player)
+    seeds = itertools.count(1)
+    best = _run_candidate((*problem, 0, None))  # Standard-Konstruktion ist immer dabei
+    candidates = 1
+
+    def better(result):
+        nonlocal best, candidates
+        if result is None:
+            return
+        candidates += 1
+        if result[3]['total'] < best[3]['total']:
+            best = result
+
+    def more():
+        return time.perf_counter() < deadline and (max_candidates is None or candidates < max_candidates)
+
+    if workers > 1:
+        pool = None
+        pending = set()
+        try:
+            pool = _process_pool(workers)
+            while more():
+                while more() and len(pending) < 2 * workers:
+                    pending.add(pool.submit(_run_candidate, (*problem, next(seeds), stop_at)))
+                done, pending = wait(pending, timeout=max(0.0, deadline - time.perf_counter()),
+                                     return_when=FIRST_COMPLETED)
+                for future in done:
+                    better(future.result())
+        except (OSError, NotImplementedError, BrokenProcessPool):
+            # Ohne Prozesse (z.B. eingeschränkte Umgebung) im eigenen Prozess weiterrechnen
+            if pool is not None:
+                _discard_pool(pool)
+            workers = 1
+        finally:
+            # Budget erschöpft: wartende Kandidaten verwerfen, laufende nicht abwarten -
+            # der Pool bleibt für den nächsten Aufruf bestehen
+            for future in pending:
+                future.cancel()
+    if workers == 1:
+        while more():
+            better(_run_candidate((*problem, next(seeds), None)))
+
+    seed, rounds, extra, score = best
+    report = {'seed': seed, 'score': score, 'candidates': candidates, 'workers': workers,
+              'elapsed': round(time.perf_counter() - start, 2)}
+    return rounds, extra, report
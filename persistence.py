@@ -0,0 +1,657 @@
+"""
+Persistenz der Turnierdaten als Snapshot plus Ereignis-Journal.
+
+Statt bei jeder Änderung die komplette tournament_data.json neu zu schreiben,
+wird pro Änderung nur eine kleine JSON-Zeile an das Journal angehängt
+(z.B. "Ergebnis gesetzt", "Spieler nicht verfügbar", "Team zugewiesen").
+Nach COMPACT_AFTER Einträgen wird der Zustand wieder in den Snapshot
+geschrieben und das Journal geleert. Beim Laden gilt: Snapshot + Journal.
+
+Alle JSON-Dateien werden atomar geschrieben (temporäre Datei, fsync, rename).
+Von jeder Datei werden GENERATIONS ältere Stände mit Prüfsumme aufbewahrt;
+ist die aktuelle Datei beschädigt, wird beim Laden der letzte gültige Stand verwendet.
+
+Der AutosaveWorker schreibt im Hintergrund: Änderungen innerhalb eines kurzen
+Zeitfensters werden zusammengefasst und mit einem einzigen Schreibvorgang gespeichert.
+Veröffentlichte Ereignisse (live_state) hängt er direkt an das Journal an
+(mark_events) - der ganze Zustand wird dafür weder kopiert noch verglichen.
+Kompletten Zuständen (mark_dirty, z.B. nach dem Laden) bleiben Struktur-Hash und
+diff_states vorbehalten; unveränderte Zustände werden gar nicht erst geschrieben.
+save_stats zählt durchgeführte und übersprungene Schreibvorgänge.
+"""
+import atexit
+import copy
+import hashlib
+import json
+import os
+import shutil
+import threading
+import time
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+from schedule_utils import find_game, get_game, iter_games
+
+JOURNAL_SUFFIX = '.journal.jsonl'
+COMPACT_AFTER = 200
+GENERATIONS = 3
+CHECKSUM_KEY = '_checksum'
+
+
+class SaveStats:
+    """Zähler für durchgeführte und übersprungene Schreibvorgänge (prozessweit)"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.performed = 0
+        self.skipped = 0
+
+    def count(self, performed: bool) -> None:
+        with self._lock:
+            if performed:
+                self.performed += 1
+            else:
+                self.skipped += 1
+
+    def as_dict(self) -> Dict[str, int]:
+        with self._lock:
+            return {'performed': self.performed, 'skipped': self.skipped}
+
+
+save_stats = SaveStats()
+
+
+def state_fingerprint(state) -> str:
+    """Günstiger Struktur-Hash eines Zustands - gleicher Hash heißt: nichts zu speichern"""
+    payload = json.dumps(state, ensure_ascii=False, sort_keys=True, separators=(',', ':'), default=str)
+    return hashlib.blake2b(payload.encode('utf-8'), digest_size=16).hexdigest()
+
+
+def _checksum(data) -> str:
+    """Prüfsumme über eine kanonische Serialisierung der Daten"""
+    payload = json.dumps(data, ensure_ascii=False, sort_keys=True, separators=(',', ':'))
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+def _generation_path(path: Path, generation: int) -> Path:
+    return path.with_name(f"{path.name}.{generation}")
+
+
+def _fsync_dir(directory: Path) -> None:
+    """Macht das Umbenennen dauerhaft (unter Windows nicht möglich und nicht nötig)"""
+    try:
+        fd = os.open(directory, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+def _rotate_generations(path: Path, generations: int) -> None:
+    """Schiebt die bisherigen Stände eine Generation weiter (datei.json -> datei.json.1 -> ...)"""
+    if generations <= 0 or not path.exists():
+        return
+    for generation in range(generations - 1, 0, -1):
+        older = _generation_path(path, generation)
+        if older.exists():
+            os.replace(older, _generation_path(path, generation + 1))
+    newest = _generation_path(path, 1)
+    # Hardlink statt Verschieben, damit die Originaldatei nie fehlt
+    try:
+        os.link(path, newest)
+    except OSError:
+        shutil.copy2(path, newest)
+
+
+def _stored_checksum(path: Path) -> Optional[str]:
+    """Prüfsumme der Datei auf der Platte - None, wenn sie fehlt, keine hat oder nicht dazu passt"""
+    try:
+        with path.open('r', encoding='utf-8') as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if not isinstance(data, dict):
+        return None
+    stored = data.pop(CHECKSUM_KEY, None)
+    return stored if stored == _checksum(data) else None
+
+
+def atomic_write_json(path, data, generations: int = GENERATIONS, indent=2) -> None:
+    """Schreibt JSON-Daten atomar: temporäre Datei + fsync + rename, optional mit Prüfsumme und Generationen"""
+    path = Path(path)
+    if isinstance(data, dict):
+        data = {key: value for key, value in data.items() if key != CHECKSUM_KEY}
+        checksum = data[CHECKSUM_KEY] = _checksum(data)
+        if checksum == _stored_checksum(path):
+            # Die Datei auf der Platte hat schon genau diesen Inhalt
+            save_stats.count(False)
+            return
+    tmp_path = path.with_name(f".{path.name}.tmp")
+    with tmp_path.open('w', encoding='utf-8') as f:
+        json.dump(data, f, ensure_ascii=False, indent=indent)
+        f.flush()
+        os.fsync(f.fileno())
+    _rotate_generations(path, generations)
+    os.replace(tmp_path, path)
+    _fsync_dir(path.parent)
+    save_stats.count(True)
+
+
+def _read_verified(path: Path):
+    """Liest eine JSON-Datei und prüft die Prüfsumme (Dateien ohne Prüfsumme gelten als gültig)"""
+    with path.open('r', encoding='utf-8') as f:
+        data = json.load(f)
+    if isinstance(data, dict) and CHECKSUM_KEY in data:
+        stored = data.pop(CHECKSUM_KEY)
+        if stored != _checksum(data):
+            raise ValueError(f"Prüfsumme stimmt nicht: {path.name}")
+    return data
+
+
+def read_json_checked(path, generations: int = GENERATIONS):
+    """Liest eine JSON-Datei - bei Beschädigung wird die letzte gültige Generation geladen.
+
+    FileNotFoundError, wenn weder die Datei noch eine Generation existiert;
+    ValueError, wenn alle vorhandenen Stände beschädigt sind.
+    """
+    path = Path(path)
+    candidates = [path] + [_generation_path(path, g) for g in range(1, generations + 1)]
+    found = False
+    for candidate in candidates:
+        try:
+            return _read_verified(candidate)
+        except FileNotFoundError:
+            continue
+        except (ValueError, UnicodeDecodeError):
+            # json.JSONDecodeError ist ein ValueError
+            found = True
+            continue
+    if found:
+        raise ValueError(f"Keine gültige Version von {path.name} gefunden")
+    raise FileNotFoundError(path)
+
+
+# Listen und Dictionaries, deren Änderungen feingranular ins Journal geschrieben werden
+_LIST_EVENTS = {
+    'players': ('player_add', 'player_remove'),
+    'unavailable_players': ('player_unavailable', 'player_available'),
+}
+_DICT_EVENTS = {
+    'teams': ('team_set', 'team_remove'),
+    'team_colors': ('team_color', 'team_color_remove'),
+    'rating_log': ('rating_set', 'rating_remove'),
+}
+_DICT_KEY_FIELD = {
+    'teams': 'team',
+    'team_colors': 'team',
+    'rating_log': 'game',
+}
+_DICT_VALUE_FIELD = {
+    'teams': 'players',
+    'team_colors': 'color',
+    'rating_log': 'changes',
+}
+
+
+def _list_events(key: str, old: List, new: List) -> Optional[List[Dict]]:
+    """Beschreibt eine Listenänderung als Einfüge-/Lösch-Ereignisse (None wenn Reihenfolge geändert)"""
+    add_op, remove_op = _LIST_EVENTS[key]
+    old_set, new_set = set(old), set(new)
+    removed = [p for p in old if p not in new_set]
+    added = [p for p in new if p not in old_set]
+    # Nur wenn die Reihenfolge der übrigen Einträge erhalten bleibt
+    if [p for p in old if p in new_set] + added != list(new):
+        return None
+    events = [{'op': remove_op, 'player': p} for p in removed]
+    events += [{'op': add_op, 'player': p} for p in added]
+    return events
+
+
+def _schedule_skeleton(schedule: List[Dict]) -> List:
+    """Struktur des Spielplans ohne Ergebnisse"""
+    return [(list(path), game.get('id'), game.get('team1'), game.get('team2')) for path, game in iter_games(schedule)]
+
+
+def _without_score(game: Dict) -> Dict:
+    return {key: value for key, value in game.items() if key not in ('score1', 'score2')}
+
+
+def _schedule_events(old: List[Dict], new: List[Dict]) -> List[Dict]:
+    """Nur geänderte Ergebnisse speichern, solange sich sonst nichts am Spielplan ändert"""
+    if _schedule_skeleton(old) != _schedule_skeleton(new):
+        return [{'op': 'schedule_set', 'schedule': new}]
+    events = []
+    old_games = dict((tuple(path), game) for path, game in iter_games(old))
+    for path, game in iter_games(new):
+        old_game = old_games[tuple(path)]
+        if _without_score(game) != _without_score(old_game):
+            # z.B. Spielerlisten, Spielfelder oder Anstoßzeiten: ganzen Spielplan speichern
+            return [{'op': 'schedule_set', 'schedule': new}]
+        if game.get('score1') != old_game.get('score1') or game.get('score2') != old_game.get('score2'):
+            events.append(score_event(game, path))
+    return events
+
+
+def score_event(game: Dict, path=None) -> Dict:
+    """Ergebnis-Ereignis - adressiert über die stabile Spiel-ID, bei alten Spielplänen über den Pfad"""
+    event = {'op': 'score_set', 'score1': game.get('score1', ''), 'score2': game.get('score2', '')}
+    if 'id' in game:
+        event['game'] = game['id']
+    else:
+        event['path'] = list(path)
+    return event
+
+
+def rating_event(game_id: str, changes: Dict[str, float]) -> Dict:
+    """Elo-Wertung eines Spiels (leere Änderungen: Wertung zurückgenommen)"""
+    if not changes:
+        return {'op': 'rating_remove', 'game': game_id}
+    return {'op': 'rating_set', 'game': game_id, 'changes': changes}
+
+
+def changes_state(state: Dict, event: Dict) -> bool:
+    """Ändert das Ereignis den Zustand? Schon gespeicherte Ergebnisse und Wertungen nicht erneut anhängen"""
+    op = event.get('op')
+    if op == 'score_set' and 'game' in event:
+        game = find_game(state.get('schedule', []), event['game'])
+        return game is not None and (game.get('score1'), game.get('score2')) != (event['score1'], event['score2'])
+    if op == 'rating_set':
+        return state.get('rating_log', {}).get(event['game']) != event['changes']
+    if op == 'rating_remove':
+        return event['game'] in state.get('rating_log', {})
+    return True
+
+
+def diff_states(old: Dict, new: Dict) -> List[Dict]:
+    """Erzeugt die Ereignisse, die den Zustand old in den Zustand new überführen"""
+    events = []
+    for key in sorted(set(old) | set(new)):
+        old_value = old.get(key)
+        new_value = new.get(key)
+        if old_value == new_value:
+            continue
+        if key in _LIST_EVENTS and isinstance(old_value, list) and isinstance(new_value, list):
+            list_events = _list_events(key, old_value, new_value)
+            if list_events is not None:
+                events.extend(list_events)
+                continue
+        elif key in _DICT_EVENTS and isinstance(old_value, dict) and isinstance(new_value, dict):
+            set_op, remove_op = _DICT_EVENTS[key]
+            name, field = _DICT_KEY_FIELD[key], _DICT_VALUE_FIELD[key]
+            for entry in old_value:
+                if entry not in new_value:
+                    events.append({'op': remove_op, name: entry})
+            for entry, value in new_value.items():
+                if old_value.get(entry) != value or entry not in old_value:
+                    events.append({'op': set_op, name: entry, field: value})
+            continue
+        elif key == 'schedule' and isinstance(old_value, list) and isinstance(new_value, list):
+            events.extend(_schedule_events(old_value, new_value))
+            continue
+        events.append({'op': 'set', 'key': key, 'value': new_value})
+    return events
+
+
+def apply_event(state: Dict, event: Dict) -> None:
+    """Wendet ein Journal-Ereignis auf den Zustand an (alle Operationen sind idempotent)"""
+    op = event.get('op')
+    if op == 'set':
+        state[event['key']] = event['value']
+    elif op in ('player_add', 'player_unavailable'):
+        key = 'players' if op == 'player_add' else 'unavailable_players'
+        players = state.setdefault(key, [])
+        if event['player'] not in players:
+            players.append(event['player'])
+    elif op in ('player_remove', 'player_available'):
+        key = 'players' if op == 'player_remove' else 'unavailable_players'
+        players = state.setdefault(key, [])
+        if event['player'] in players:
+            players.remove(event['player'])
+    elif op == 'team_set':
+        state.setdefault('teams', {})[event['team']] = event['players']
+    elif op == 'team_remove':
+        state.setdefault('teams', {}).pop(event['team'], None)
+    elif op == 'team_color':
+        state.setdefault('team_colors', {})[event['team']] = event['color']
+    elif op == 'team_color_remove':
+        state.setdefault('team_colors', {}).pop(event['team'], None)
+    elif op == 'rating_set':
+        state.setdefault('rating_log', {})[event['game']] = event['changes']
+    elif op == 'rating_remove':
+        state.setdefault('rating_log', {}).pop(event['game'], None)
+    elif op == 'schedule_set':
+        state['schedule'] = event['schedule']
+    elif op == 'score_set':
+        if 'game' in event:
+            game = find_game(state.get('schedule', []), event['game'])
+        else:
+            game = get_game(state.get('schedule', []), event['path'])
+        if game is not None:
+            game['score1'] = event['score1']
+            game['score2'] = event['score2']
+
+
+class TournamentJournal:
+    """Snapshot-Datei plus angehängtes Ereignis-Journal für einen Turnierzustand"""
+
+    def __init__(self, snapshot_path, compact_after: int = COMPACT_AFTER):
+        self.snapshot_path = Path(snapshot_path)
+        self.journal_path = self.snapshot_path.with_name(self.snapshot_path.stem + JOURNAL_SUFFIX)
+        self.compact_after = compact_after
+        self._lock = threading.RLock()
+        self._state = None  # Zustand, wie er auf der Platte steht
+        self._seq = 0
+        self._entries_since_snapshot = 0
+
+    def _read_snapshot(self) -> Optional[Dict]:
+        try:
+            return read_json_checked(self.snapshot_path)
+        except FileNotFoundError:
+            return None
+
+    def _read_journal(self) -> List[Dict]:
+        events = []
+        try:
+            with self.journal_path.open('r', encoding='utf-8') as f:
+                for line in f:
+                    line = line.strip()
+                    if not line:
+                        continue
+                    try:
+                        events.append(json.loads(line))
+                    except json.JSONDecodeError:
+                        # Abgebrochene letzte Zeile (z.B. Absturz beim Schreiben) ignorieren
+                        break
+        except FileNotFoundError:
+            pass
+        return events
+
+    def load(self) -> Optional[Dict]:
+        """Lädt Snapshot und spielt das Journal ab - None wenn nichts gespeichert ist"""
+        with self._lock:
+            state = self._read_snapshot()
+            events = self._read_journal()
+            if state is None and not events:
+                self._state = None
+                return None
+            state = state or {}
+            snapshot_seq = state.pop('journal_seq', 0)
+            self._seq = snapshot_seq
+            self._entries_since_snapshot = 0
+            for event in events:
+                # Ereignisse, die schon im Snapshot enthalten sind, überspringen
+                if event.get('seq', 0) <= snapshot_seq:
+                    continue
+                apply_event(state, event)
+                self._seq = event['seq']
+                self._entries_since_snapshot += 1
+            self._state = copy.deepcopy(state)
+            return state
+
+    def record(self, state: Dict, sync: bool = True) -> int:
+        """Hängt die Änderungen gegenüber dem gespeicherten Zustand an - gibt die Anzahl Ereignisse zurück.
+
+        Alle Ereignisse eines Aufrufs werden mit einem einzigen fsync geschrieben;
+        mit sync=False wird das fsync auf den nächsten Aufruf von sync() verschoben.
+        """
+        with self._lock:
+            if self._state is None:
+                self.load()
+            if self._state is None:
+                # Noch nichts gespeichert: direkt einen Snapshot schreiben
+                self.compact(state)
+                return 1
+            events = diff_states(self._state, state)
+            if not events:
+                save_stats.count(False)
+                return 0
+            self._append(events, sync)
+            for event in events:
+                apply_event(self._state, copy.deepcopy(event))
+            if self._entries_since_snapshot >= self.compact_after:
+                self.compact()
+            return len(events)
+
+    def record_events(self, events: List[Dict], sync: bool = True) -> bool:
+        """Hängt bereits bekannte Ereignisse an (z.B. aus live_state) - ohne den Zustand zu vergleichen
+
+        False, wenn noch nichts gespeichert ist: dann speichert der Aufrufer den ganzen Zustand.
+        """
+        with self._lock:
+            if self._state is None:
+                self.load()
+            if self._state is None:
+                return False
+            # Eigene Kopien: _append vermerkt die Sequenznummer im Ereignis
+            events = [dict(event) for event in events if changes_state(self._state, event)]
+            if not events:
+                save_stats.count(False)
+                return True
+            self._append(events, sync)
+            for event in events:
+                apply_event(self._state, copy.deepcopy(event))
+            if self._entries_since_snapshot >= self.compact_after:
+                self.compact()
+            return True
+
+    def record_score(self, game_id: str, score1: str, score2: str,
+                     rating_changes: Optional[Dict[str, float]] = None) -> bool:
+        """Hängt ein einzelnes Ergebnis an - unabhängig von der Größe des Spielplans
+
+        rating_changes (falls angegeben) ist die Elo-Wertung des Spiels und wird
+        im selben Schreibvorgang festgehalten. Ohne gespeicherten Spielplan, der
+        das Spiel enthält, würde der Eintrag beim Abspielen ins Leere gehen: dann
+        wird nichts geschrieben und False zurückgegeben (der Aufrufer speichert
+        den ganzen Zustand).
+        """
+        with self._lock:
+            if self._state is None:
+                self.load()
+            if self._state is None or find_game(self._state.get('schedule', []), game_id) is None:
+                return False
+            events = [{'op': 'score_set', 'game': game_id, 'score1': score1, 'score2': score2}]
+            if rating_changes is not None:
+                events.append(rating_event(game_id, rating_changes))
+            self._append(events)
+            for event in events:
+                apply_event(self._state, copy.deepcopy(event))
+            if self._entries_since_snapshot >= self.compact_after:
+                self.compact()
+            return True
+
+    def _append(self, events: List[Dict], sync: bool = True) -> None:
+        lines = []
+        for event in events:
+            self._seq += 1
+            event['seq'] = self._seq
+            lines.append(json.dumps(event, ensure_ascii=False, separators=(',', ':')))
+        with self.journal_path.open('a', encoding='utf-8') as f:
+            f.write('\n'.join(lines) + '\n')
+            f.flush()
+            if sync:
+                os.fsync(f.fileno())
+        self._entries_since_snapshot += len(events)
+        save_stats.count(True)
+
+    def sync(self) -> None:
+        """Schreibt zurückgehaltene Journal-Einträge dauerhaft auf die Platte"""
+        with self._lock:
+            try:
+                with self.journal_path.open('a', encoding='utf-8') as f:
+                    os.fsync(f.fileno())
+            except FileNotFoundError:
+                pass
+
+    def compact(self, state: Optional[Dict] = None) -> None:
+        """Schreibt den aktuellen Zustand als Snapshot und leert das Journal"""
+        with self._lock:
+            if state is not None:
+                self._state = copy.deepcopy(state)
+            if self._state is None:
+                return
+            data = dict(self._state)
+            data['journal_seq'] = self._seq
+            atomic_write_json(self.snapshot_path, data)
+            # Erst nach dem Snapshot das Journal leeren
+            self.journal_path.unlink(missing_ok=True)
+            self._entries_since_snapshot = 0
+
+
+_journals: Dict[str, TournamentJournal] = {}
+_journals_lock = threading.Lock()
+
+
+def get_journal(snapshot_path) -> TournamentJournal:
+    """Ein Journal pro Datei und Prozess (Streamlit-Sessions teilen sich das Modul)"""
+    key = str(Path(snapshot_path).resolve())
+    with _journals_lock:
+        if key not in _journals:
+            _journals[key] = TournamentJournal(snapshot_path)
+        return _journals[key]
+
+
+class AutosaveWorker:
+    """Hintergrund-Thread, der Änderungen sammelt und nach `delay` Sekunden Ruhe einmal speichert
+
+    save_fn(state) speichert einen kompletten Zustand, append_fn(events) hängt
+    gesammelte Ereignisse an (nötig für mark_events).
+    """
+
+    def __init__(self, save_fn: Callable[[Dict], None], delay: float = 0.5,
+                 append_fn: Optional[Callable[[List[Dict]], None]] = None):
+        self.save_fn = save_fn
+        self.append_fn = append_fn
+        self.delay = delay
+        self._cond = threading.Condition()
+        self._write_lock = threading.Lock()  # nur ein Schreibvorgang gleichzeitig
+        self._pending = None  # zuletzt gemeldeter, noch nicht gespeicherter Zustand
+        self._events: List[Dict] = []  # danach gemeldete, noch nicht angehängte Ereignisse
+        self._deadline = 0.0
+        self._saving = False
+        self._stopped = False
+        self._fingerprint = None
+        self.writes = 0
+        self.skipped = 0
+        self.notifications = 0
+        self.last_saved_at = None
+        self.last_error = None
+        self._thread = threading.Thread(target=self._run, name='autosave', daemon=True)
+        self._thread.start()
+
+    def mark_dirty(self, state: Dict) -> None:
+        """Meldet einen geänderten Zustand - gespeichert wird erst nach dem Zeitfenster"""
+        fingerprint = state_fingerprint(state)
+        with self._cond:
+            if fingerprint == self._fingerprint:
+                # Nichts geändert seit dem letzten gemeldeten Zustand
+                self.skipped += 1
+                save_stats.count(False)
+                return
+            self._fingerprint = fingerprint
+        snapshot = copy.deepcopy(state)
+        with self._cond:
+            self._pending = snapshot
+            self._events = []  # im Zustand schon enthalten
+            self._deadline = time.monotonic() + self.delay
+            self.notifications += 1
+            self._cond.notify()
+
+    def mark_events(self, events: List[Dict]) -> None:
+        """Meldet veröffentlichte Ereignisse - angehängt werden sie gesammelt nach dem Zeitfenster
+
+        Die Ereignisse dürfen danach nicht mehr verändert werden (live_state gibt Kopien heraus).
+        """
+        with self._cond:
+            self._events.extend(events)
+            self._fingerprint = None  # der zuletzt gemeldete Zustand ist überholt
+            self._deadline = time.monotonic() + self.delay
+            self.notifications += 1
+            self._cond.notify()
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                while not self._stopped and (not self._dirty() or time.monotonic() < self._deadline):
+                    timeout = None if not self._dirty() else self._deadline - time.monotonic()
+                    self._cond.wait(timeout)
+                if self._stopped:
+                    return
+            self._write_pending()
+
+    def _dirty(self) -> bool:
+        return self._pending is not None or bool(self._events)
+
+    def _write_pending(self) -> None:
+        """Speichert den offenen Zustand und die Ereignisse - ohne die Sperre zu halten, damit die UI nicht wartet"""
+        with self._write_lock:
+            with self._cond:
+                state, self._pending = self._pending, None
+                events, self._events = self._events, []
+                if state is None and not events:
+                    return
+                self._saving = True
+            error = None
+            try:
+                if state is not None:
+                    self.save_fn(state)
+                if events:
+                    self.append_fn(events)
+            except Exception as e:
+                error = e
+            with self._cond:
+                self._saving = False
+                self.last_error = error
+                if error is None:
+                    self.writes += 1
+                    self.last_saved_at = time.time()
+                elif self._pending is None:
+                    # Beim nächsten Durchlauf erneut versuchen, falls kein neuer Zustand kommt
+                    self._pending = state
+                    self._events = events + self._events
+                    self._deadline = time.monotonic() + self.delay
+                self._cond.notify_all()
+
+    def flush(self) -> None:
+        """Speichert offene Änderungen sofort (z.B. vor dem Laden oder beim Beenden)"""
+        self._write_pending()
+
+    def stop(self) -> None:
+        self.flush()
+        with self._cond:
+            self._stopped = True
+            self._cond.notify_all()
+        self._thread.join(timeout=5)
+
+    def status(self) -> str:
+        """'pending' solange Änderungen offen sind, 'error' nach einem Fehler, sonst 'saved'"""
+        with self._cond:
+            if self._dirty() or self._saving:
+                return 'error' if self.last_error else 'pending'
+            return 'saved'
+
+
+_workers: Dict[str, AutosaveWorker] = {}
+_workers_lock = threading.Lock()
+
+
+def get_autosave_worker(key: str, save_fn: Callable[[Dict], None], delay: float = 0.5,
+                        append_fn: Optional[Callable[[List[Dict]], None]] = None) -> AutosaveWorker:
+    """Ein Autosave-Thread pro Turnier und Prozess"""
+    with _workers_lock:
+        worker = _workers.get(key)
+        if worker is None:
+            worker = _workers[key] = AutosaveWorker(save_fn, delay, append_fn)
+        return worker
+
+
+@atexit.register
+def flush_all_workers() -> None:
+    """Beim Beenden des Servers alle offenen Änderungen schreiben"""
+    with _workers_lock:
+        workers = list(_workers.values())
+    for worker in workers:
+        worker.flush()
@@ -0,0 +1,243 @@
+"""
+Spielplan nachträglich anpassen, wenn Spieler oder Teams ausfallen oder dazukommen.
+
+Statt den ganzen Plan neu zu generieren (und die Ergebnisse zu verlieren),
+werden nur die offenen Runden repariert:
+
+- Eingefroren sind alle Runden bis einschließlich der letzten Runde mit einem
+  eingetragenen Ergebnis. Sie bleiben unverändert.
+- Round Robin: Ein ausgefallener Spieler wird in jedem offenen Spiel durch einen
+  Spieler ersetzt, der in dieser Runde frei ist - den mit den wenigsten Spielen,
+  bei Gleichstand den mit den wenigsten bekannten Mit- und Gegenspielern. Findet
+  sich niemand, fällt das Spiel aus. Danach werden Spieler mit den meisten
+  Spielen in offenen Spielen durch Spieler mit den wenigsten ersetzt (z.B. neu
+  hinzugekommene), bis sich die Spielzahlen um höchstens eins unterscheiden.
+  Jeder Tausch ändert genau ein Spiel.
+- Feste Teams: Offene Spiele ausgefallener Teams entfallen, die Spielerlisten
+  der übrigen werden aktualisiert. Neue Teams bekommen ihre Spiele auf freien
+  Feldern offener Runden, der Rest wird als Nachholrunden angehängt.
+
+Alle Schritte sind Greedy-Durchläufe über die offenen Spiele - auch große Pläne
+sind in Millisekunden repariert.
+"""
+import copy
+from collections import Counter
+from typing import Dict, List, Tuple
+
+from rotation import Encounters
+from schedule_utils import iter_games
+from scheduling import resting_teams, schedule_games
+
+
+def is_scored(game: Dict) -> bool:
+    return game.get('score1') not in ('', None) or game.get('score2') not in ('', None)
+
+
+def _slot_games(schedule: List[Dict]) -> List[List[Dict]]:
+    """Spiele je Zeitfenster (Eintrag im Spielplan) - bei flachen Plänen ein Spiel pro Zeitfenster"""
+    slots: List[List[Dict]] = [[] for _ in schedule]
+    for path, game in iter_games(schedule):
+        slots[path[0]].append(game)
+    return slots
+
+
+def frozen_slots(schedule: List[Dict]) -> int:
+    """Anzahl eingefrorener Zeitfenster: alle bis zur letzten Runde mit Ergebnis"""
+    scored = [i for i, games in enumerate(_slot_games(schedule)) if any(is_scored(game) for game in games)]
+    return scored[-1] + 1 if scored else 0
+
+
+def _keep_games(schedule: List[Dict], keep: set) -> List[Dict]:
+    """Behält nur die Spiele, deren Objekt in keep ist (Runden bleiben zunächst stehen)"""
+    result = []
+    for entry in schedule:
+        if 'sub_rounds' in entry:
+            for sub_round in entry['sub_rounds']:
+                sub_round['games'] = [game for game in sub_round.get('games', []) if id(game) in keep]
+        elif 'games' in entry:
+            entry['games'] = [game for game in entry['games'] if id(game) in keep]
+        elif id(entry) not in keep:
+            continue
+        result.append(entry)
+    return result
+
+
+def _drop_empty(schedule: List[Dict], frozen: int) -> List[Dict]:
+    """Entfernt leere offene Runden und Felder, Round-Robin-Runden werden neu durchnummeriert"""
+    result = schedule[:frozen]
+    for entry in schedule[frozen:]:
+        if 'sub_rounds' in entry:
+            entry['sub_rounds'] = [sub for sub in entry['sub_rounds'] if sub.get('games')]
+            if not entry['sub_rounds']:
+                continue
+        elif 'games' in entry and not entry['games']:
+            continue
+        result.append(entry)
+    for number, entry in enumerate(result, 1):
+        if isinstance(entry.get('round'), int):
+            entry['round'] = number
+    return result
+
+
+def _report(frozen: int, changed: int, removed: int, added: int, counts: Counter, players: List[str]) -> Dict:
+    games = [counts[p] for p in players]
+    return {'frozen_rounds': frozen, 'changed_games': changed, 'removed_games': removed, 'added_games': added,
+            'games_min': min(games, default=0), 'games_max': max(games, default=0)}
+
+
+def repair_rotating(schedule: List[Dict], players: List[str]) -> Tuple[List[Dict], Dict]:
+    """Passt einen Round-Robin-Plan mit wechselnden Partnern an den neuen Kader an"""
+    schedule = copy.deepcopy(schedule)
+    frozen = frozen_slots(schedule)
+    slots = _slot_games(schedule)
+    roster = set(players)
+    counts = Counter({p: 0 for p in players})
+    seen = Encounters()
+    for games in slots:
+        for game in games:
+            counts.update(p for p in game['team1'] + game['team2'] if p in roster)
+        seen.add([(game['team1'], game['team2']) for game in games])
+
+    def busy(games):
+        return {p for game in games for p in game['team1'] + game['team2']}
+
+    def familiarity(candidate, game, side):
+        team, other = (game['team1'], game['team2']) if side == 'team1' else (game['team2'], game['team1'])
+        return sum(seen.cost(candidate, p) for p in team + other if p in roster)
+
+    changed, removed = set(), 0
+    # 1. Ausgefallene Spieler ersetzen
+    for games in slots[frozen:]:
+        for game in list(games):
+            for side in ('team1', 'team2'):
+                for i, player in enumerate(game[side]):
+                    if player in roster:
+                        continue
+                    free = [p for p in players if p not in busy(games)]
+                    if not free:
+                        break
+                    substitute = min(free, key=lambda p: (counts[p], familiarity(p, game, side)))
+                    game[side][i] = substitute
+                    counts[substitute] += 1
+                    changed.add(id(game))
+            if any(p not in roster for p in game['team1'] + game['team2']):
+                # Kein freier Ersatz in dieser Runde: Spiel fällt aus
+                games.remove(game)
+                counts.subtract(p for p in game['team1'] + game['team2'] if p in roster)
+                changed.discard(id(game))
+                removed += 1
+
+    # 2. Spielzahlen ausgleichen: Vielspieler in offenen Spielen durch Wenigspieler ersetzen
+    while players and max(counts[p] for p in players) - min(counts[p] for p in players) > 1:
+        low = min(players, key=lambda p: counts[p])
+        swap = None
+        # Späte Spiele zuerst - frühe Runden bleiben möglichst wie angekündigt
+        for games in reversed(slots[frozen:]):
+            if low in busy(games):
+                continue
+            for game in games:
+                for side in ('team1', 'team2'):
+                    for i, player in enumerate(game[side]):
+                        if counts[player] - counts[low] > 1 and (swap is None or counts[player] > counts[swap[3]]):
+                            swap = (game, side, i, player)
+            if swap:
+                break
+        if swap is None:
+            break
+        game, side, i, player = swap
+        game[side][i] = low
+        counts[low] += 1
+        counts[player] -= 1
+        changed.add(id(game))
+
+    schedule = _keep_games(schedule, {id(game) for games in slots for game in games})
+    return _drop_empty(schedule, frozen), _report(frozen, len(changed), removed, 0, counts, players)
+
+
+def _team_game(team1: str, team2: str, teams: Dict[str, List[str]]) -> Dict:
+    return {'team1': team1, 'team2': team2, 'players1': teams[team1], 'players2': teams[team2],
+            'score1': '', 'score2': ''}
+
+
+def repair_fixed_teams(schedule: List[Dict], teams: Dict[str, List[str]], num_fields: int = 1) -> Tuple[List[Dict], Dict]:
+    """Passt einen Plan mit festen Teams an geänderte Teams an (ausgefallene, neue, geänderte Spielerlisten)"""
+    schedule = copy.deepcopy(schedule)
+    frozen = frozen_slots(schedule)
+    slots = _slot_games(schedule)
+    active = {name: players for name, players in teams.items() if players}
+    names = list(active)
+
+    keep, changed, removed = set(), 0, 0
+    for index, games in enumerate(slots):
+        for game in games:
+            if index < frozen:
+                keep.add(id(game))
+            elif game['team1'] not in active or game['team2'] not in active:
+                removed += 1
+            else:
+                keep.add(id(game))
+                if [game.get('players1'), game.get('players2')] != [active[game['team1']], active[game['team2']]]:
+                    game['players1'], game['players2'] = active[game['team1']], active[game['team2']]
+                    changed += 1
+    schedule = _keep_games(schedule, keep)
+
+    # Neue Teams: je ein Spiel gegen jedes andere Team
+    known = {team for games in slots for game in games for team in (game['team1'], game['team2'])}
+    new_teams = [name for name in names if name not in known]
+    pending = []
+    for name in new_teams:
+        others = [other for other in names if other != name and (other not in new_teams or names.index(other) > names.index(name))]
+        pending += [(name, other) if k % 2 == 0 else (other, name) for k, other in enumerate(others)]
+    added = len(pending)
+
+    # Zuerst freie Felder offener Runden nutzen
+    for entry in schedule[frozen:]:
+        if 'games' not in entry:
+            continue
+        for pair in list(pending):
+            playing = {team for game in entry['games'] for team in (game['team1'], game['team2'])}
+            if len(entry['games']) < num_fields and not playing & set(pair):
+                entry['games'].append(_team_game(*pair, active))
+                pending.remove(pair)
+
+    # Rest als Nachholspiele bzw. Nachholrunden anhängen
+    if pending:
+        if schedule and all('games' not in entry for entry in schedule):
+            schedule += [dict(_team_game(*pair, active), round='Nachholspiele') for pair in pending]
+        else:
+            slots_new, _ = schedule_games(pending, num_fields)
+            for number, slot in enumerate(slots_new, 1):
+                schedule.append({'round': f"Nachholrunde {number}",
+                                 'games': [_team_game(*pending[index], active) for index in slot]})
+
+    for entry in schedule[frozen:]:
+        if 'resting_teams' in entry or str(entry.get('round', '')).startswith('Nachholrunde'):
+            entry['resting_teams'] = resting_teams([(g['team1'], g['team2']) for g in entry['games']], names)
+
+    schedule = _drop_empty(schedule, frozen)
+    counts = Counter({name: 0 for name in names})
+    counts.update(team for _, game in iter_games(schedule) for team in (game['team1'], game['team2']) if team in active)
+    return schedule, _report(frozen, changed, removed, added, counts, names)
+
+
+def roster_changed(schedule: List[Dict], players: List[str]) -> bool:
+    """Spielen in offenen Round-Robin-Spielen Spieler, die nicht mehr verfügbar sind - oder fehlen verfügbare Spieler?"""
+    frozen = frozen_slots(schedule)
+    open_players = {p for games in _slot_games(schedule)[frozen:] for game in games
+                    for p in game['team1'] + game['team2']}
+    planned = {p for _, game in iter_games(schedule) for p in game['team1'] + game['team2']}
+    return bool(open_players - set(players)) or bool(set(players) - planned)
+
+
+def teams_changed(schedule: List[Dict], teams: Dict[str, List[str]]) -> bool:
+    """Weichen die offenen Spiele fester Teams von den aktuellen Teams ab?"""
+    active = {name: players for name, players in teams.items() if players}
+    frozen = frozen_slots(schedule)
+    for games in _slot_games(schedule)[frozen:]:
+        for game in games:
+            if game['team1'] not in active or game['team2'] not in active:
+                return True
+            if [game.get('players1'), game.get('players2')] != [active[game['team1']], active[game['team2']]]:
+                return True
+    planned = {team for _, game in iter_games(schedule) for team in (game['team1'], game['team2'])}
+    return bool(set(active) - planned)
@@ -0,0 +1,201 @@
+"""
+Round Robin mit wechselnden Partnern (Spieler werden jede Runde neu zu Teams gemischt).
+
+Der Plan entsteht in zwei Schritten, beide ohne Zufall:
+
+1. Wer spielt wann: In jeder Runde spielen die Spieler mit den wenigsten
+   Spielen, bei Gleichstand bevorzugt die, die in der Vorrunde pausiert haben. Damit
+   unterscheiden sich die Spielzahlen nie um mehr als eins, und am Ende hat
+   jeder genau games_per_player Spiele - sofern Spieler * Spiele durch die
+   Spieler pro Spiel teilbar ist. Sonst bekommen möglichst wenige Spieler ein
+   Zusatzspiel. Unter gleichwertigen Kandidaten werden die gewählt, die in
+   dieser Runde auf möglichst wenige bekannte Partner und Gegner treffen.
+2. Wer mit wem: Die Spieler einer Runde werden nach der Kreismethode
+   (1-Faktorisierung, bei zwei Spielern pro Team trifft jeder jeden genau
+   einmal als Partner) auf Teams verteilt. Eine lokale Suche tauscht danach
+   Spieler zwischen Teams, solange wiederholte Partner (stark gewichtet) oder
+   Gegner seltener werden. Zum Schluss wird jede Runde noch einmal gegen den
+   restlichen Plan optimiert.
+
+Die Laufzeit hängt nur von der Anzahl Runden und Spieler pro Runde ab - es
+gibt weder Zufallsversuche noch eine Rundenobergrenze.
+"""
+import math
+import random
+from collections import defaultdict
+from typing import Dict, List, Optional, Tuple
+
+from scheduling import circle_rounds
+
+Team = List[str]
+Game = Tuple[Team, Team]
+
+PARTNER_WEIGHT = 4
+OPPONENT_WEIGHT = 1
+MAX_SWEEPS = 20
+POLISH_PASSES = 2
+
+
+class Encounters:
+    """Zählt, wie oft sich zwei Spieler als Partner bzw. Gegner begegnet sind"""
+
+    def __init__(self):
+        self.partner: Dict[str, Dict[str, int]] = defaultdict(lambda: defaultdict(int))
+        self.opponent: Dict[str, Dict[str, int]] = defaultdict(lambda: defaultdict(int))
+
+    def cost(self, a: str, b: str) -> int:
+        """Kosten, a und b ins selbe Spiel zu setzen (für die Auswahl der Spieler einer Runde)"""
+        return PARTNER_WEIGHT * self.partner[a][b] + OPPONENT_WEIGHT * self.opponent[a][b]
+
+    def add(self, games: List[Game], sign: int = 1) -> None:
+        for team1, team2 in games:
+            for team in (team1, team2):
+                for i, a in enumerate(team):
+                    for b in team[i + 1:]:
+                        self.partner[a][b] += sign
+                        self.partner[b][a] += sign
+            for a in team1:
+                for b in team2:
+                    self.opponent[a][b] += sign
+                    self.opponent[b][a] += sign
+
+
+def _pick_players(players: List[str], rank: Dict[str, tuple], size: int,
+                  seen: Encounters) -> Tuple[List[str], List[str]]:
+    """Spieler einer Runde: kleinster Rang zuerst, unter Gleichrangigen möglichst unbekannte Mitspieler
+
+    Gibt zusätzlich die gleichwertigen Spieler zurück, die auf der Bank bleiben -
+    die lokale Suche darf sie noch gegen gewählte Spieler gleichen Rangs tauschen.
+    """
+    order = sorted(players, key=rank.__getitem__)
+    border = rank[order[size - 1]]
+    chosen = [p for p in order if rank[p] < border]
+    tied = [p for p in order if rank[p] == border]
+    while len(chosen) < size:
+        best = min(tied, key=lambda p: sum(seen.cost(p, q) for q in chosen))
+        tied.remove(best)
+        chosen.append(best)
+    return chosen, tied
+
+
+def _initial_games(chosen: List[str], players_per_team: int, matching: List[Tuple[str, str]]) -> List[Game]:
+    """Startaufteilung: Paare der Kreismethode, deren beide Spieler in dieser Runde spielen, bleiben zusammen"""
+    playing = set(chosen)
+    order = [player for pair in matching if set(pair) <= playing for player in pair]
+    order += [player for player in chosen if player not in order]
+    teams = [order[i:i + players_per_team] for i in range(0, len(order), players_per_team)]
+    return [(teams[i], teams[i + 1]) for i in range(0, len(teams), 2)]
+
+
+def _game_cost(game: Game, seen: Encounters) -> int:
+    """Wie oft sich die Spieler eines Spiels schon als Partner und Gegner begegnet sind (gewichtet)"""
+    team1, team2 = game
+    partners = sum(seen.partner[a][b] for team in game for i, a in enumerate(team) for b in team[i + 1:])
+    rivals = sum(seen.opponent[a][b] for a in team1 for b in team2)
+    return PARTNER_WEIGHT * partners + OPPONENT_WEIGHT * rivals
+
+
+def _improve(games: List[Game], seen: Encounters, bench: List[str] = (), swappable=frozenset()) -> List[Game]:
+    """Lokale Suche: tauscht zwei Spieler verschiedener Teams, solange das die Wiederholungen senkt
+
+    Spieler aus `swappable` dürfen außerdem mit gleichwertigen Spielern von der Bank tauschen.
+    """
+    teams = [team for game in games for team in game]
+    bench = list(bench)
+
+    def cost(affected):
+        return sum(_game_cost((teams[2 * g], teams[2 * g + 1]), seen) for g in affected)
+
+    for _ in range(MAX_SWEEPS):
+        improved = False
+        for t1 in range(len(teams)):
+            for t2 in range(t1 + 1, len(teams)):
+                affected = {t1 // 2, t2 // 2}
+                for i in range(len(teams[t1])):
+                    for j in range(len(teams[t2])):
+                        before = cost(affected)
+                        teams[t1][i], teams[t2][j] = teams[t2][j], teams[t1][i]
+                        if cost(affected) < before:
+                            improved = True
+                        else:
+                            teams[t1][i], teams[t2][j] = teams[t2][j], teams[t1][i]
+        for t, team in enumerate(teams):
+            for i in range(len(team)):
+                if team[i] not in swappable:
+                    continue
+                for b in range(len(bench)):
+                    before = cost({t // 2})
+                    team[i], bench[b] = bench[b], team[i]
+                    if cost({t // 2}) < before:
+                        swappable = swappable | {team[i]}
+                        improved = True
+                    else:
+                        team[i], bench[b] = bench[b], team[i]
+        if not improved:
+            break
+    return [(teams[i], teams[i + 1]) for i in range(0, len(teams), 2)]
+
+
+def rotating_partner_rounds(players: List[str], players_per_team: int, num_fields: int,
+                            games_per_player: int, seed: Optional[int] = None) -> Tuple[List[List[Game]], List[str]]:
+    """Runden mit wechselnden Teams - jeder Spieler hat genau games_per_player Spiele
+
+    Gibt die Runden (je Runde höchstens num_fields Spiele) und die Spieler zurück,
+    die ein Zusatzspiel bekommen, weil die Spielzahl sonst nicht aufgeht. Mit
+    `seed` werden die Kreismethode und die Reihenfolge unter gleichrangigen
+    Spielern jeder Runde reproduzierbar gemischt - das ergibt eine andere,
+    ebenso gültige Konstruktion (nicht nur umbenannte Spieler). Seed 0 oder
+    None ist die Standard-Konstruktion.
+    """
+    rng = random.Random(seed) if seed else None
+    per_game = 2 * players_per_team
+    fields = min(num_fields, len(players) // per_game)
+    if fields < 1 or games_per_player < 1:
+        return [], []
+    total_games = math.ceil(len(players) * games_per_player / per_game)
+    num_rounds = math.ceil(total_games / fields)
+
+    count = {player: 0 for player in players}
+    last = {player: -1 for player in players}
+    seen = Encounters()
+    design = circle_rounds(rng.sample(players, len(players)) if rng else players)
+    rounds: List[List[Game]] = []
+    for r in range(num_rounds):
+        games_now = min(fields, total_games - r * fields)
+        # Rang: wenigste Spiele zuerst, wer in der Vorrunde gespielt hat, pausiert bevorzugt
+        rank = {p: (count[p], last[p] == r - 1) for p in players}
+        candidates = rng.sample(players, len(players)) if rng else players
+        chosen, bench = _pick_players(candidates, rank, games_now * per_game, seen)
+        games = _initial_games(chosen, players_per_team, design[r % len(design)])
+        tied = {p for p in chosen if bench and rank[p] == rank[bench[0]]}
+        games = _improve(games, seen, bench, frozenset(tied))
+        seen.add(games)
+        for player in (p for game in games for team in game for p in team):
+            count[player] += 1
+            last[player] = r
+        rounds.append(games)
+
+    # Nachbesserung: jede Runde gegen alle anderen (auch spätere) Runden optimieren
+    for _ in range(POLISH_PASSES):
+        for r, games in enumerate(rounds):
+            seen.add(games, -1)
+            rounds[r] = _improve(games, seen)
+            seen.add(rounds[r])
+
+    extra = [player for player in players if count[player] > games_per_player]
+    return rounds, extra
+
+
+def encounter_summary(rounds: List[List[Game]]) -> Dict[str, int]:
+    """Kennzahlen für Abwechslung: höchste Partner-/Gegnerzahl je Paar und Anzahl Wiederholungen"""
+    seen = Encounters()
+    for games in rounds:
+        seen.add(games)
+    partner = [n for row in seen.partner.values() for n in row.values()]
+    opponent = [n for row in seen.opponent.values() for n in row.values()]
+    return {
+        'max_partner': max(partner, default=0),
+        'max_opponent': max(opponent, default=0),
+        'repeated_partners': sum(n - 1 for n in partner if n > 1) // 2,
+        'repeated_opponents': sum(n - 1 for n in opponent if n > 1) // 2
+    }
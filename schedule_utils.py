@@ -0,0 +1,59 @@
+"""
+Hilfsfunktionen für die verschiedenen Spielplan-Formen der App.
+
+Die Generatoren erzeugen drei Strukturen:
+- flache Liste von Spielen (Feste Teams, ein Spielfeld)
+- Runden mit 'games' (Feste Teams mit mehreren Feldern, Round Robin mit einem Feld)
+- Runden mit 'sub_rounds', die wiederum 'games' enthalten (Round Robin mit mehreren Feldern)
+"""
+from typing import Dict, Iterator, List, Tuple
+
+
+def iter_games(schedule: List[Dict]) -> Iterator[Tuple[tuple, Dict]]:
+    """Liefert (Pfad, Spiel) für jedes Spiel im Spielplan - unabhängig von der Struktur"""
+    for i, entry in enumerate(schedule or []):
+        if not isinstance(entry, dict):
+            continue
+        if 'sub_rounds' in entry:
+            for s, sub_round in enumerate(entry['sub_rounds']):
+                for g, game in enumerate(sub_round.get('games', [])):
+                    yield (i, 'sub_rounds', s, 'games', g), game
+        elif 'games' in entry:
+            for g, game in enumerate(entry['games']):
+                yield (i, 'games', g), game
+        else:
+            yield (i,), entry
+
+
+def get_game(schedule: List[Dict], path) -> Dict:
+    """Gibt das Spiel an einem Pfad aus iter_games zurück"""
+    node = schedule
+    for step in path:
+        node = node[step]
+    return node
+
+
+def assign_game_ids(schedule: List[Dict]) -> int:
+    """Vergibt jedem Spiel ohne 'id' eine stabile ID (g1, g2, ...) - gibt die Anzahl neuer IDs zurück"""
+    games = [game for _, game in iter_games(schedule)]
+    used = {game['id'] for game in games if 'id' in game}
+    counter = 0
+    assigned = 0
+    for game in games:
+        if 'id' in game:
+            continue
+        counter += 1
+        while f"g{counter}" in used:
+            counter += 1
+        game['id'] = f"g{counter}"
+        used.add(game['id'])
+        assigned += 1
+    return assigned
+
+
+def find_game(schedule: List[Dict], game_id: str):
+    """Sucht ein Spiel über seine ID - None, wenn es nicht (mehr) existiert"""
+    for _, game in iter_games(schedule):
+        if game.get('id') == game_id:
+            return game
+    return None
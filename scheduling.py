@@ -0,0 +1,301 @@
+"""
+Spielplan-Erzeugung für feste Teams nach der Kreismethode (Berger-Tabellen).
+
+Jedes Team spielt einmal gegen jedes andere. Bei ungerader Teamzahl kommt ein
+spielfreies Team dazu. Die Runden der Kreismethode sind Paarungen (Matchings),
+in denen kein Team zweimal vorkommt. Reichen die Spielfelder nicht für eine
+ganze Runde, werden die Paarungen gleichmäßig auf mehr Zeitfenster verteilt:
+Alternierende Ketten zweier Zeitfenster werden getauscht (Kempe-Ketten), bis
+sich alle Zeitfenster höchstens um ein Spiel unterscheiden. Das ergibt
+max(ceil(Spiele / Felder), Teams - 1) Zeitfenster - weniger geht nicht, weil
+jedes Team in jedem Zeitfenster höchstens einmal spielt.
+
+Für beliebige Spiellisten (z.B. nur ein Teil der Paarungen oder Paarungen
+mehrfach) färbt schedule_games die Spiele als Kanten eines Graphen: jedes
+Zeitfenster ist eine Farbe. Danach wird genauso ausgeglichen, und der Bericht
+nennt den Abstand zur unteren Schranke.
+"""
+import math
+import random
+from collections import Counter
+from typing import Callable, Dict, List, Optional, Tuple
+
+Pairing = Tuple[str, str]
+
+
+def circle_rounds(teams: List[str]) -> List[List[Pairing]]:
+    """Runden der Kreismethode - bei ungerader Teamzahl pausiert pro Runde ein Team"""
+    circle: List[Optional[str]] = list(teams)
+    if len(circle) % 2:
+        circle.append(None)  # spielfrei
+    n = len(circle)
+    fixed, rotating = circle[-1], circle[:-1]
+    rounds = []
+    for r in range(n - 1):
+        current = rotating[r:] + rotating[:r]
+        pairs = [(current[0], fixed)] + [(current[i], current[n - 1 - i]) for i in range(1, n // 2)]
+        rounds.append([(a, b) for a, b in pairs if a is not None and b is not None])
+    return rounds
+
+
+def balance_home_away(slots: List[List[Pairing]]) -> List[List[Pairing]]:
+    """Verteilt das Heimrecht so, dass jedes Team höchstens ein Heimspiel mehr als Auswärtsspiele hat
+
+    Teams mit ungerader Spielzahl werden über Hilfskanten verbunden; danach
+    wird jede Kante entlang eines Euler-Kreises orientiert (Heim -> Auswärts).
+    """
+    edges = [pair for slot in slots for pair in slot]
+    degree: Dict[str, int] = {}
+    for a, b in edges:
+        degree[a] = degree.get(a, 0) + 1
+        degree[b] = degree.get(b, 0) + 1
+    odd = [team for team in degree if degree[team] % 2]
+    all_edges = edges + list(zip(odd[0::2], odd[1::2]))
+    adjacency: Dict[str, List[int]] = {}
+    for index, (a, b) in enumerate(all_edges):
+        adjacency.setdefault(a, []).append(index)
+        adjacency.setdefault(b, []).append(index)
+    used = [False] * len(all_edges)
+    oriented = {}
+    for start in adjacency:
+        # Hierholzer: jede Kante wird in Laufrichtung orientiert
+        stack = [start]
+        while stack:
+            team = stack[-1]
+            while adjacency[team] and used[adjacency[team][-1]]:
+                adjacency[team].pop()
+            if not adjacency[team]:
+                stack.pop()
+                continue
+            index = adjacency[team].pop()
+            used[index] = True
+            a, b = all_edges[index]
+            following = b if a == team else a
+            oriented[index] = (team, following)
+            stack.append(following)
+    position = 0
+    result = []
+    for slot in slots:
+        result.append([oriented[position + i] for i in range(len(slot))])
+        position += len(slot)
+    return result
+
+
+def minimal_slots(num_teams: int, num_fields: int) -> int:
+    """Untere Schranke der Zeitfenster für ein einfaches Jeder-gegen-jeden"""
+    if num_teams < 2:
+        return 0
+    games = num_teams * (num_teams - 1) // 2
+    capacity = min(num_fields, num_teams // 2)
+    return max(math.ceil(games / capacity), num_teams - 1 + num_teams % 2)
+
+
+def _pair_ends(item):
+    return item
+
+
+def _swap_kempe_chain(slots: List[list], big: int, small: int, ends: Callable = _pair_ends) -> bool:
+    """Verschiebt ein Spiel von Zeitfenster big nach small über eine alternierende Kette"""
+    partner = {}  # (Team, Zeitfenster) -> Spiel
+    for index in (big, small):
+        for item in slots[index]:
+            for team in ends(item):
+                partner[(team, index)] = item
+    seen = set()
+    for start in slots[big]:
+        if start in seen:
+            continue
+        # Komponente aus start ablaufen: abwechselnd Spiele aus big und small
+        component = {start: big}
+        stack = [start]
+        while stack:
+            item = stack.pop()
+            other = small if component[item] == big else big
+            for team in ends(item):
+                neighbour = partner.get((team, other))
+                if neighbour is not None and neighbour not in component:
+                    component[neighbour] = other
+                    stack.append(neighbour)
+        seen.update(item for item, index in component.items() if index == big)
+        from_big = sum(1 for index in component.values() if index == big)
+        if from_big > len(component) - from_big:
+            # Kette mit einem Spiel mehr in big: Farben tauschen
+            slots[big] = [item for item in slots[big] if item not in component] + \
+                         [item for item, index in component.items() if index == small]
+            slots[small] = [item for item in slots[small] if item not in component] + \
+                           [item for item, index in component.items() if index == big]
+            return True
+    return False
+
+
+def equalize_slots(slots: List[list], num_slots: int, ends: Callable = _pair_ends) -> List[list]:
+    """Verteilt die Spiele gleichmäßig auf num_slots Zeitfenster (Größen unterscheiden sich höchstens um 1)"""
+    slots = [list(slot) for slot in slots] + [[] for _ in range(num_slots - len(slots))]
+    target = math.ceil(sum(len(slot) for slot in slots) / max(num_slots, 1))
+    # Leere Zeitfenster zuerst direkt auffüllen - ein Teil einer Paarung ist wieder eine Paarung
+    for index in [i for i, slot in enumerate(slots) if not slot]:
+        big = max(range(len(slots)), key=lambda i: len(slots[i]))
+        if len(slots[big]) <= target:
+            break
+        move = min(target, len(slots[big]) - target)
+        slots[index], slots[big] = slots[big][-move:], slots[big][:-move]
+    while True:
+        big = max(range(len(slots)), key=lambda i: len(slots[i]))
+        small = min(range(len(slots)), key=lambda i: len(slots[i]))
+        if len(slots[big]) - len(slots[small]) <= 1 or not _swap_kempe_chain(slots, big, small, ends):
+            return slots
+
+
+def order_slots(slots: List[list], teams: List[str], ends: Callable = _pair_ends) -> List[list]:
+    """Ordnet die Zeitfenster so, dass Teams mit der längsten Pause als nächste spielen"""
+    last_played = {team: -1 for team in teams}
+    remaining = [(slot, [team for item in slot for team in ends(item)]) for slot in slots]
+    penalty = -len(teams)
+    ordered = []
+    for position in range(len(slots)):
+        best, best_score = 0, None
+        for i, (_, playing) in enumerate(remaining):
+            # Lange Wartezeiten zählen quadratisch, direkt aufeinanderfolgende Spiele sind teuer
+            score = 0
+            for team in playing:
+                gap = position - last_played[team]
+                score += gap * gap if gap > 1 else penalty
+            if best_score is None or score > best_score:
+                best, best_score = i, score
+        slot, playing = remaining.pop(best)
+        for team in playing:
+            last_played[team] = position
+        ordered.append(slot)
+    return ordered
+
+
+def round_robin_slots(teams: List[str], num_fields: int) -> List[List[Pairing]]:
+    """Jeder gegen jeden in der minimalen Anzahl Zeitfenster mit höchstens num_fields Spielen"""
+    if len(teams) < 2:
+        return []
+    rounds = circle_rounds(teams)
+    capacity = min(max(num_fields, 1), len(teams) // 2)
+    if capacity >= max(len(r) for r in rounds):
+        return balance_home_away(rounds)
+    slots = equalize_slots(rounds, minimal_slots(len(teams), capacity))
+    return balance_home_away(order_slots(slots, teams))
+
+
+def resting_teams(slot: List[Pairing], teams: List[str]) -> List[str]:
+    playing = {team for pair in slot for team in pair}
+    return [team for team in teams if team not in playing]
+
+
+def rest_profile(slots: List[List[Pairing]], teams: List[str]) -> Dict[str, int]:
+    """Längste Pause (in Zeitfenstern) je Team zwischen zwei Spielen"""
+    profile = {}
+    for team in teams:
+        played = [i for i, slot in enumerate(slots) if any(team in pair for pair in slot)]
+        profile[team] = max((b - a - 1 for a, b in zip(played, played[1:])), default=0)
+    return profile
+
+
+def slot_lower_bound(pairs: List[Pairing], num_fields: int) -> int:
+    """Untere Schranke der Zeitfenster für beliebige Spiele
+
+    Kein Team spielt zweimal im selben Zeitfenster (mindestens so viele
+    Zeitfenster wie Spiele des Teams mit den meisten Spielen), und pro
+    Zeitfenster finden höchstens min(Felder, Teams // 2) Spiele statt.
+    """
+    if not pairs:
+        return 0
+    degree = Counter(team for pair in pairs for team in pair)
+    capacity = max(1, min(num_fields, len(degree) // 2))
+    return max(math.ceil(len(pairs) / capacity), max(degree.values()))
+
+
+def _color_games(pairs: List[Pairing]) -> List[List[int]]:
+    """Kantenfärbung: jedes Spiel bekommt ein Zeitfenster, in dem beide Teams frei sind
+
+    Gibt es kein gemeinsames freies Zeitfenster, wird zuerst eine alternierende
+    Kette (Kempe-Kette) umgefärbt, bevor ein neues Zeitfenster eröffnet wird.
+    """
+    at: List[Dict[str, int]] = []  # je Zeitfenster: Team -> Spiel
+    color = [0] * len(pairs)
+
+    def chain(start, a, b):
+        # Pfad ab start über Spiele der Farben a, b, a, ...
+        path, team, current = [], start, a
+        while team in at[current]:
+            game = at[current][team]
+            path.append(game)
+            home, away = pairs[game]
+            team = away if home == team else home
+            current = b if current == a else a
+        return path
+
+    def recolor(home, away):
+        for a in [c for c in range(len(at)) if home not in at[c]]:
+            for b in [c for c in range(len(at)) if away not in at[c]]:
+                path = chain(away, a, b)
+                if any(home in pairs[g] for g in path):
+                    continue
+                # Kette tauschen: danach ist a bei beiden Teams frei
+                for g in path:
+                    del at[color[g]][pairs[g][0]], at[color[g]][pairs[g][1]]
+                for g in path:
+                    color[g] = b if color[g] == a else a
+                    at[color[g]][pairs[g][0]] = at[color[g]][pairs[g][1]] = g
+                return a
+        return None
+
+    for game, (home, away) in enumerate(pairs):
+        free = next((c for c in range(len(at)) if home not in at[c] and away not in at[c]), None)
+        if free is None:
+            free = recolor(home, away)
+        if free is None:
+            at.append({})
+            free = len(at) - 1
+        color[game] = free
+        at[free][home] = at[free][away] = game
+    slots = [[] for _ in at]
+    for game, c in enumerate(color):
+        slots[c].append(game)
+    return slots
+
+
+def _color_orders(pairs: List[Pairing], attempts: int):
+    """Reihenfolgen für die Färbung: wie übergeben, Teams mit vielen Spielen zuerst, dann gemischt"""
+    degree = Counter(team for pair in pairs for team in pair)
+    yield list(range(len(pairs)))
+    yield sorted(range(len(pairs)), key=lambda i: -(degree[pairs[i][0]] + degree[pairs[i][1]]))
+    rng = random.Random(len(pairs))
+    for _ in range(attempts):
+        order = list(range(len(pairs)))
+        rng.shuffle(order)
+        yield order
+
+
+def schedule_games(pairs: List[Pairing], num_fields: int, attempts: int = 8) -> Tuple[List[List[int]], Dict[str, int]]:
+    """Verteilt beliebige Spiele auf möglichst wenige Zeitfenster mit höchstens num_fields Spielen
+
+    Bleibt die Färbung über der unteren Schranke, wird sie mit bis zu `attempts`
+    weiteren (reproduzierbar gemischten) Reihenfolgen wiederholt. Gibt die
+    Zeitfenster (Indizes in pairs) und einen Bericht zurück: slots (erreicht),
+    lower_bound (untere Schranke) und gap (Abstand zum Optimum).
+    """
+    if not pairs:
+        return [], schedule_report(0, 0)
+    teams = list(dict.fromkeys(team for pair in pairs for team in pair))
+    lower_bound = slot_lower_bound(pairs, num_fields)
+    colored = None
+    for order in _color_orders(pairs, attempts):
+        attempt = _color_games([pairs[index] for index in order])
+        if colored is None or len(attempt) < len(colored):
+            colored = [[order[index] for index in slot] for slot in attempt]
+        if len(colored) <= lower_bound:
+            break
+    ends = pairs.__getitem__
+    slots = equalize_slots(colored, max(lower_bound, len(colored)), ends)
+    slots = order_slots([sorted(slot) for slot in slots], teams, ends)
+    return slots, schedule_report(len(slots), lower_bound)
+
+
+def schedule_report(num_slots: int, lower_bound: int) -> Dict[str, int]:
+    """Anzahl Zeitfenster im Vergleich zur unteren Schranke"""
+    return {'slots': num_slots, 'lower_bound': lower_bound, 'gap': num_slots - lower_bound}
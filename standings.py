@@ -0,0 +1,150 @@
+"""
+Tabelle (Punkte, Tore, Tordifferenz, Spiele) mit Aktualisierung pro Ergebnis.
+
+Standings wird einmal aus dem Spielplan aufgebaut. Danach ändert record(game)
+nur die Zeilen der beteiligten Teams bzw. Spieler: ein früher gewertetes
+Ergebnis desselben Spiels wird abgezogen, das neue addiert - konstanter
+Aufwand pro Ergebnis, unabhängig von der Größe des Spielplans. Gelesen wird
+mit table(); sortiert wird erst beim Lesen. version zählt die eingetragenen
+Ergebnisse (z.B. für den Cache der Kreuztabelle).
+
+- Feste Teams: eine Zeile pro Team
+- Round Robin (team1/team2 sind Spielerlisten): eine Zeile pro Spieler
+- Gruppenphase: getrennte Tabellen pro Gruppe (section = Gruppenname);
+  K.o.- und Platzierungsspiele zählen für keine Tabelle
+
+Sortierung über die Tie-Breaker aus tiebreak.py (Standard: Punkte (3/1/0),
+Tordifferenz, Tore, direkter Vergleich, Los). Für den direkten Vergleich führt
+die Tabelle die Ergebnisse je Teampaar mit, so dass Mini-Tabellen nur die Paare
+der gleichauf liegenden Teams lesen. formats.advance_bracket liest die
+Gruppenplätze aus derselben Tabelle (complete: alle Gruppenspiele eingetragen).
+"""
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from schedule_utils import iter_games
+from tiebreak import DEFAULT_TIE_BREAKERS, Meeting, rank
+
+POINTS = {'won': 3, 'drawn': 1, 'lost': 0}
+_NO_TABLE = ('knockout', 'placement')
+
+
+def game_goals(game: Dict) -> Optional[Tuple[int, int]]:
+    """Tore beider Seiten - None, solange kein Ergebnis eingetragen ist"""
+    try:
+        return int(game.get('score1')), int(game.get('score2'))
+    except (TypeError, ValueError):
+        return None
+
+
+def _units(team) -> Tuple[str, ...]:
+    return tuple(team) if isinstance(team, list) else (team,)
+
+
+class Standings:
+    """Tabellenzeilen pro (section, Team/Spieler), fortgeschrieben mit jedem Ergebnis"""
+
+    def __init__(self, schedule: List[Dict]):
+        self.schedule = schedule
+        self.rows: Dict[Tuple[Optional[str], str], Dict] = {}
+        self._applied: Dict = {}  # Spiel -> gewerteter Beitrag (section, Seite 1, Seite 2, Tore)
+        self._games: Dict[str, Dict] = {}
+        self._pairs: Dict[Tuple[Optional[str], str, str], Dict] = {}  # (section, Team, Team) -> Spiel -> Meeting
+        self._scheduled: Dict[Optional[str], int] = {}  # Spiele pro section
+        self._scored: Dict[Optional[str], int] = {}  # davon mit Ergebnis
+        self.version = 0
+        for _, game in iter_games(schedule):
+            if 'id' in game:
+                self._games[game['id']] = game
+            if game.get('phase') in _NO_TABLE:
+                continue
+            section = self._section(game)
+            self._scheduled[section] = self._scheduled.get(section, 0) + 1
+            for side in ('team1', 'team2'):
+                for unit in _units(game.get(side)):
+                    self._row(section, unit)
+            self.record(game)
+
+    def tracks(self, schedule: List[Dict]) -> bool:
+        """Gehört die Tabelle zu genau diesem Spielplan?"""
+        return schedule is self.schedule
+
+    def game(self, game_id: str) -> Optional[Dict]:
+        """Spiel über seine ID, ohne den Spielplan zu durchsuchen"""
+        return self._games.get(game_id)
+
+    @staticmethod
+    def _section(game: Dict) -> Optional[str]:
+        return game.get('group') if game.get('phase') == 'group' else None
+
+    def _row(self, section: Optional[str], unit: str) -> Dict:
+        key = (section, unit)
+        if key not in self.rows:
+            self.rows[key] = {'team': unit, 'played': 0, 'won': 0, 'drawn': 0, 'lost': 0,
+                              'goals_for': 0, 'goals_against': 0, 'diff': 0, 'points': 0}
+        return self.rows[key]
+
+    def _add(self, section, side1, side2, goals, sign: int) -> None:
+        for units, (scored, conceded) in ((side1, goals), (side2, goals[::-1])):
+            result = 'won' if scored > conceded else 'drawn' if scored == conceded else 'lost'
+            for unit in units:
+                row = self._row(section, unit)
+                row['played'] += sign
+                row[result] += sign
+                row['goals_for'] += sign * scored
+                row['goals_against'] += sign * conceded
+                row['diff'] += sign * (scored - conceded)
+                row['points'] += sign * POINTS[result]
+
+    def record(self, game: Dict) -> None:
+        """Übernimmt das (neue, geänderte oder gelöschte) Ergebnis eines Spiels"""
+        self.version += 1
+        key = game.get('id', id(game))
+        previous = self._applied.pop(key, None)
+        if previous:
+            self._add(*previous, -1)
+            self._pair(previous).pop(key, None)
+            self._scored[previous[0]] -= 1
+        goals = game_goals(game)
+        if goals is None or game.get('phase') in _NO_TABLE:
+            return
+        entry = (self._section(game), _units(game.get('team1')), _units(game.get('team2')), goals)
+        self._add(*entry, 1)
+        self._scored[entry[0]] = self._scored.get(entry[0], 0) + 1
+        self._applied[key] = entry
+        self._pair(entry)[key] = (entry[1][0], entry[2][0], *goals)
+
+    def _pair(self, entry) -> Dict:
+        """Ergebnisse einer Paarung für den direkten Vergleich (Round Robin: keine)"""
+        section, side1, side2, _ = entry
+        if len(side1) != 1 or len(side2) != 1:
+            return {}
+        return self._pairs.setdefault((section, *sorted((side1[0], side2[0]))), {})
+
+    def meetings(self, teams: List[str], section: Optional[str] = None) -> List[Meeting]:
+        """Gewertete Spiele der Teams untereinander - nur die Paare dieser Teams werden gelesen"""
+        teams = sorted(teams)
+        return [meeting for i, team in enumerate(teams) for opponent in teams[i + 1:]
+                for meeting in self._pairs.get((section, team, opponent), {}).values()]
+
+    def complete(self, section: Optional[str] = None) -> bool:
+        """Sind alle Spiele des Abschnitts (z.B. einer Gruppe) eingetragen?"""
+        return self._scored.get(section, 0) == self._scheduled.get(section, 0) > 0
+
+    def sections(self) -> List[Optional[str]]:
+        return sorted({section for section, _ in self.rows}, key=lambda section: (section is not None, section or ''))
+
+    def table(self, section: Optional[str] = None, tie_breakers: Sequence[str] = DEFAULT_TIE_BREAKERS,
+              seed: Optional[int] = None) -> List[Dict]:
+        """Sortierte Tabelle eines Abschnitts (None: Liga bzw. Spielerwertung)
+
+        seed: aufgezeichneter Seed für den Losentscheid (ohne Seed entscheidet der Name).
+        """
+        rows = [dict(row) for (row_section, _), row in self.rows.items() if row_section == section]
+        return rank(rows, lambda teams: self.meetings(teams, section), tie_breakers, seed, salt=section or '')
+
+
+def table_rows(table: List[Dict], label: str = 'Team') -> List[Dict]:
+    """Anzeigezeilen für App und PDF"""
+    return [{'Platz': rank, label: row['team'], 'Sp': row['played'], 'S': row['won'], 'U': row['drawn'],
+             'N': row['lost'], 'Tore': f"{row['goals_for']}:{row['goals_against']}", 'Diff': row['diff'],
+             'Pkt': row['points']} for rank, row in enumerate(table, 1)]
@@ -0,0 +1,728 @@
+"""
+Speicher-Backends für Spieler, Kader, Turniere und Ergebnisse.
+
+- JsonStorage: die bisherigen JSON-Dateien (players.json, U15.json, ...,
+  tournament_data.json mit Journal, turnier_<name>_<datum>.json)
+- SqliteStorage: eine lokale SQLite-Datenbank mit indizierten Tabellen
+
+Mehrere Turniere können gleichzeitig laufen: jedes hat eine eigene ID
+(DEFAULT_TOURNAMENT ist das bisherige tournament_data.json) und eigene Dateien
+unter turniere/<id>/ bzw. eigene Zeilen in der Datenbank.
+
+Welches Backend verwendet wird, bestimmt die Umgebungsvariable
+TURNIER_STORAGE ("json" oder "sqlite", Standard: "json"). Beim ersten Öffnen
+einer neuen Datenbank werden die vorhandenen JSON-Dateien in einem Durchgang übernommen.
+"""
+import copy
+import json
+import os
+import re
+import sqlite3
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from archive import TournamentArchive, age_group_of, read_upload
+from persistence import (apply_event, atomic_write_json, changes_state, diff_states, get_journal, rating_event,
+                         read_json_checked, save_stats)
+from schedule_utils import iter_games
+
+ROSTERS = ["U15", "U16", "U18", "JWR"]
+CURRENT_TOURNAMENT = 'current'
+DEFAULT_TOURNAMENT = 'default'
+TOURNAMENTS_DIR = 'turniere'
+EXPORT_PREFIX = 'turnier_'
+DB_FILENAME = 'turnier.db'
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+CREATE TABLE IF NOT EXISTS players (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL UNIQUE
+);
+CREATE TABLE IF NOT EXISTS rosters (
+    name TEXT PRIMARY KEY,
+    last_updated TEXT
+);
+CREATE TABLE IF NOT EXISTS roster_members (
+    roster TEXT NOT NULL REFERENCES rosters(name) ON DELETE CASCADE,
+    player_id INTEGER NOT NULL REFERENCES players(id),
+    position INTEGER NOT NULL,
+    rating REAL,
+    PRIMARY KEY (roster, player_id)
+);
+CREATE INDEX IF NOT EXISTS idx_roster_members_player ON roster_members(player_id);
+CREATE TABLE IF NOT EXISTS tournaments (
+    id INTEGER PRIMARY KEY,
+    key TEXT NOT NULL UNIQUE,
+    name TEXT,
+    date TEXT,
+    tournament_type TEXT,
+    settings TEXT NOT NULL,
+    frame TEXT NOT NULL,
+    saved_at TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_tournaments_date ON tournaments(date);
+CREATE INDEX IF NOT EXISTS idx_tournaments_name ON tournaments(name);
+CREATE TABLE IF NOT EXISTS games (
+    tournament_id INTEGER NOT NULL REFERENCES tournaments(id) ON DELETE CASCADE,
+    game_index INTEGER NOT NULL,
+    game_id TEXT,
+    path TEXT NOT NULL,
+    team1 TEXT,
+    team2 TEXT,
+    game TEXT NOT NULL,
+    score1 TEXT DEFAULT '',
+    score2 TEXT DEFAULT '',
+    PRIMARY KEY (tournament_id, game_index)
+);
+CREATE INDEX IF NOT EXISTS idx_games_id ON games(tournament_id, game_id);
+CREATE INDEX IF NOT EXISTS idx_games_team1 ON games(team1);
+CREATE INDEX IF NOT EXISTS idx_games_team2 ON games(team2);
+"""
+
+
+def _team_label(team) -> str:
+    """Team-Name (Feste Teams) oder Spielerliste (Round Robin) als durchsuchbarer Text"""
+    if isinstance(team, list):
+        return ', '.join(team)
+    return team or ''
+
+
+def export_key(tournament_name: str, tournament_date) -> str:
+    """Schlüssel bzw. Dateiname (ohne .json) eines exportierten Turniers"""
+    safe_name = "".join(c for c in tournament_name if c.isalnum() or c in (' ', '-', '_')).rstrip()
+    safe_name = safe_name.replace(' ', '_')
+    return f"{EXPORT_PREFIX}{safe_name}_{tournament_date.strftime('%Y%m%d')}"
+
+
+def sanitize_tournament_id(value) -> str:
+    """Turnier-ID aus der URL - nur Buchstaben, Ziffern, '-' und '_' (sonst Standardturnier)"""
+    value = (value or '').strip()
+    if not value or not re.fullmatch(r'[A-Za-z0-9_-]{1,64}', value):
+        return DEFAULT_TOURNAMENT
+    return value
+
+
+def make_tournament_id(name: str, existing) -> str:
+    """Lesbare, eindeutige ID aus dem Turniernamen (z.B. u15-turnier, u15-turnier-2)"""
+    base = re.sub(r'[^a-z0-9]+', '-', (name or 'turnier').lower()).strip('-')[:40] or 'turnier'
+    tournament_id = base
+    counter = 1
+    while tournament_id in existing or tournament_id == DEFAULT_TOURNAMENT:
+        counter += 1
+        tournament_id = f"{base}-{counter}"
+    return tournament_id
+
+
+def _live_key(tournament_id: str) -> str:
+    """Schlüssel eines laufenden Turniers in der Tabelle tournaments"""
+    if tournament_id == DEFAULT_TOURNAMENT:
+        return CURRENT_TOURNAMENT
+    return f"{CURRENT_TOURNAMENT}:{tournament_id}"
+
+
+def _contains_pattern(text: str) -> str:
+    """LIKE-Muster für "enthält text" - % und _ aus der Eingabe gelten wörtlich (ESCAPE '\\')"""
+    escaped = text.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+    return f"%{escaped}%"
+
+
+def _id_from_live_key(key: str) -> str:
+    if key == CURRENT_TOURNAMENT:
+        return DEFAULT_TOURNAMENT
+    return key.split(':', 1)[1]
+
+
+_registry_lock = threading.Lock()
+
+
+class JsonStorage:
+    """Bisheriges Verhalten: eine JSON-Datei pro Kader, Turnier und Export"""
+
+    name = 'json'
+
+    def __init__(self, base_dir):
+        self.base_dir = Path(base_dir)
+        self.archive = TournamentArchive(self.base_dir)
+
+    def _file(self, filename: str) -> Path:
+        return self.base_dir / filename
+
+    def load_roster(self, team_name: str) -> Optional[List[str]]:
+        try:
+            data = read_json_checked(self._file(f"{team_name}.json"))
+        except FileNotFoundError:
+            return None
+        if isinstance(data, dict):
+            return data.get('players', [])
+        # Alte Format - nur Spielerliste
+        return data
+
+    def save_roster(self, team_name: str, players: List[str]) -> None:
+        self._write_roster(team_name, players, self.load_ratings(team_name))
+
+    def _write_roster(self, team_name: str, players: List[str], ratings: Dict[str, float]) -> None:
+        data = {
+            'players': players,
+            'team_name': team_name,
+            'last_updated': datetime.now().isoformat()
+        }
+        if ratings:
+            data['ratings'] = ratings
+        atomic_write_json(self._file(f"{team_name}.json"), data)
+
+    def load_ratings(self, team_name: str) -> Dict[str, float]:
+        """Spielstärke der Spieler eines Kaders (nur bewertete Spieler)"""
+        try:
+            data = read_json_checked(self._file(f"{team_name}.json"))
+        except FileNotFoundError:
+            return {}
+        return dict(data.get('ratings', {})) if isinstance(data, dict) else {}
+
+    def save_ratings(self, team_name: str, ratings: Dict[str, float]) -> None:
+        """Ersetzt die Spielstärken eines Kaders, die Spielerliste bleibt unverändert"""
+        players = self.load_roster(team_name) or []
+        self._write_roster(team_name, players,
+                           {name: float(value) for name, value in ratings.items() if name in players})
+
+    def load_players(self) -> Tuple[List[str], List[str], Dict[str, str]]:
+        try:
+            data = read_json_checked(self._file('players.json'))
+        except FileNotFoundError:
+            return [], [], {}
+        if isinstance(data, dict):
+            return data.get('players', []), data.get('unavailable_players', []), data.get('team_colors', {})
+        # Alte Format - nur Spielerliste
+        return data, [], {}
+
+    def save_players(self, players, unavailable_players, team_colors) -> None:
+        atomic_write_json(self._file('players.json'), {
+            'players': players,
+            'unavailable_players': unavailable_players,
+            'team_colors': team_colors
+        })
+
+    def _tournament_file(self, tournament_id: str, create: bool = False) -> Path:
+        """Jedes Turnier hat eigene Dateien - das Standardturnier bleibt in tournament_data.json
+
+        Das Verzeichnis wird erst beim Speichern angelegt (create=True); Laden
+        einer unbekannten ID aus der URL hinterlässt nichts.
+        """
+        if tournament_id == DEFAULT_TOURNAMENT:
+            return self._file('tournament_data.json')
+        directory = self.base_dir / TOURNAMENTS_DIR / tournament_id
+        if create:
+            directory.mkdir(parents=True, exist_ok=True)
+        return directory / 'tournament_data.json'
+
+    def load_tournament(self, tournament_id: str = DEFAULT_TOURNAMENT) -> Optional[Dict]:
+        return get_journal(self._tournament_file(tournament_id)).load()
+
+    def save_tournament(self, state: Dict, compact: bool = False, tournament_id: str = DEFAULT_TOURNAMENT) -> None:
+        journal = get_journal(self._tournament_file(tournament_id, create=True))
+        journal.record(state)
+        if compact:
+            journal.compact()
+
+    def record_events(self, events: List[Dict], tournament_id: str = DEFAULT_TOURNAMENT) -> bool:
+        """Veröffentlichte Ereignisse ans Journal anhängen - False, wenn das Turnier noch nicht gespeichert ist"""
+        return get_journal(self._tournament_file(tournament_id)).record_events(events)
+
+    def save_score(self, game_id: str, score1: str, score2: str, tournament_id: str = DEFAULT_TOURNAMENT,
+                   rating_changes: Optional[Dict[str, float]] = None) -> bool:
+        """Ein Ergebnis (ggf. mit Elo-Wertung) als Journal-Eintrag - False, wenn das Spiel noch nicht gespeichert ist"""
+        return get_journal(self._tournament_file(tournament_id)).record_score(game_id, score1, score2, rating_changes)
+
+    def _registry_file(self) -> Path:
+        return self.base_dir / TOURNAMENTS_DIR / 'registry.json'
+
+    def list_live_tournaments(self) -> List[Dict]:
+        """Alle laufenden Turniere mit eigener ID (Standardturnier zuerst)"""
+        try:
+            registry = read_json_checked(self._registry_file())
+        except FileNotFoundError:
+            registry = {}
+        entries = [{'id': DEFAULT_TOURNAMENT, 'name': '', 'created': ''}]
+        entries += [dict(entry, id=tournament_id) for tournament_id, entry in registry.items()]
+        return entries
+
+    def create_tournament(self, name: str) -> str:
+        """Legt ein neues, leeres Turnier an und gibt seine ID zurück"""
+        with _registry_lock:
+            existing = {entry['id'] for entry in self.list_live_tournaments()}
+            tournament_id = make_tournament_id(name, existing)
+            registry = {entry['id']: {'name': entry['name'], 'created': entry['created']}
+                        for entry in self.list_live_tournaments() if entry['id'] != DEFAULT_TOURNAMENT}
+            registry[tournament_id] = {'name': name, 'created': datetime.now().isoformat()}
+            self._registry_file().parent.mkdir(parents=True, exist_ok=True)
+            atomic_write_json(self._registry_file(), registry)
+        self._tournament_file(tournament_id, create=True)
+        return tournament_id
+
+    def export_tournament(self, key: str, data: Dict) -> str:
+        filename = f"{key}.json"
+        atomic_write_json(self._file(filename), data)
+        self.archive.record(self._file(filename), data)
+        return filename
+
+    def import_tournament(self, uploaded_file, index: int = 0) -> Dict:
+        """JSON-Datei oder das index-te Turnier eines Saison-Archivs"""
+        return read_upload(uploaded_file, index)
+
+    def load_export(self, key: str) -> Dict:
+        return self.archive.load(key)
+
+    def list_tournaments(self) -> List[Dict]:
+        """Alle exportierten Turniere aus dem Archiv-Index"""
+        return self.search_tournaments()
+
+    def search_tournaments(self, query: str = '', age_group: str = '') -> List[Dict]:
+        """Sucht im Archiv-Index - gelesen werden nur neue oder geänderte Dateien"""
+        return self.archive.search(query, age_group)
+
+
+class SqliteStorage:
+    """Alle Daten in einer SQLite-Datenbank mit Indizes für saisonweite Abfragen"""
+
+    name = 'sqlite'
+
+    def __init__(self, db_path):
+        self.db_path = Path(db_path)
+        # Eine Verbindung pro Thread (Streamlit-Sessions laufen in eigenen Threads);
+        # WAL erlaubt gleichzeitiges Lesen, Schreiber warten höchstens kurz aufeinander
+        self._local = threading.local()
+        self._lock = threading.RLock()
+        self._tournament_locks: Dict[str, threading.RLock] = {}
+        conn = self._conn
+        conn.execute('PRAGMA journal_mode=WAL')
+        columns = [row[1] for row in conn.execute('PRAGMA table_info(games)')]
+        if columns and 'game_id' not in columns:
+            # Datenbanken aus der ersten Version ohne Spiel-ID
+            conn.execute('ALTER TABLE games ADD COLUMN game_id TEXT')
+        member_columns = [row[1] for row in conn.execute('PRAGMA table_info(roster_members)')]
+        if member_columns and 'rating' not in member_columns:
+            # Datenbanken ohne Spielstärke
+            conn.execute('ALTER TABLE roster_members ADD COLUMN rating REAL')
+        conn.executescript(_SCHEMA)
+        conn.commit()
+        self._states: Dict[str, Dict] = {}
+
+    @property
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(str(self.db_path), timeout=10)
+            conn.execute('PRAGMA foreign_keys=ON')
+            self._local.conn = conn
+        return conn
+
+    def _locked(self, key: str) -> threading.RLock:
+        """Sperre für genau ein Turnier - andere Turniere werden nicht blockiert"""
+        with self._lock:
+            if key not in self._tournament_locks:
+                self._tournament_locks[key] = threading.RLock()
+            return self._tournament_locks[key]
+
+    def close(self) -> None:
+        conn = getattr(self._local, 'conn', None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+
+    def is_empty(self) -> bool:
+        row = self._conn.execute("SELECT value FROM meta WHERE key = 'migrated_at'").fetchone()
+        return row is None
+
+    # --- Spieler und Kader ---
+
+    def _player_id(self, name: str) -> int:
+        self._conn.execute('INSERT OR IGNORE INTO players(name) VALUES (?)', (name,))
+        return self._conn.execute('SELECT id FROM players WHERE name = ?', (name,)).fetchone()[0]
+
+    def load_roster(self, team_name: str) -> Optional[List[str]]:
+        if self._conn.execute('SELECT 1 FROM rosters WHERE name = ?', (team_name,)).fetchone() is None:
+            return None
+        rows = self._conn.execute(
+            'SELECT p.name FROM roster_members m JOIN players p ON p.id = m.player_id '
+            'WHERE m.roster = ? ORDER BY m.position', (team_name,)
+        ).fetchall()
+        return [row[0] for row in rows]
+
+    def save_roster(self, team_name: str, players: List[str]) -> None:
+        ratings = self.load_ratings(team_name)
+        with self._conn:
+            self._conn.execute(
+                'INSERT INTO rosters(name, last_updated) VALUES (?, ?) '
+                'ON CONFLICT(name) DO UPDATE SET last_updated = excluded.last_updated',
+                (team_name, datetime.now().isoformat())
+            )
+            self._conn.execute('DELETE FROM roster_members WHERE roster = ?', (team_name,))
+            self._conn.executemany(
+                'INSERT OR IGNORE INTO roster_members(roster, player_id, position, rating) VALUES (?, ?, ?, ?)',
+                [(team_name, self._player_id(name), position, ratings.get(name))
+                 for position, name in enumerate(players)]
+            )
+        save_stats.count(True)
+
+    def load_ratings(self, team_name: str) -> Dict[str, float]:
+        rows = self._conn.execute(
+            'SELECT p.name, m.rating FROM roster_members m JOIN players p ON p.id = m.player_id '
+            'WHERE m.roster = ? AND m.rating IS NOT NULL', (team_name,)
+        ).fetchall()
+        return dict(rows)
+
+    def save_ratings(self, team_name: str, ratings: Dict[str, float]) -> None:
+        with self._conn:
+            self._conn.execute('UPDATE roster_members SET rating = NULL WHERE roster = ?', (team_name,))
+            self._conn.executemany(
+                'UPDATE roster_members SET rating = ? WHERE roster = ? '
+                'AND player_id = (SELECT id FROM players WHERE name = ?)',
+                [(float(value), team_name, name) for name, value in ratings.items()]
+            )
+        save_stats.count(True)
+
+    def rosters_of_player(self, player_name: str) -> List[str]:
+        """In welchen Kadern steht ein Spieler? (indizierte Abfrage)"""
+        rows = self._conn.execute(
+            'SELECT m.roster FROM roster_members m JOIN players p ON p.id = m.player_id '
+            'WHERE p.name = ? ORDER BY m.roster', (player_name,)
+        ).fetchall()
+        return [row[0] for row in rows]
+
+    def load_players(self) -> Tuple[List[str], List[str], Dict[str, str]]:
+        row = self._conn.execute("SELECT value FROM meta WHERE key = 'players'").fetchone()
+        if row is None:
+            return [], [], {}
+        data = json.loads(row[0])
+        return data.get('players', []), data.get('unavailable_players', []), data.get('team_colors', {})
+
+    def save_players(self, players, unavailable_players, team_colors) -> None:
+        value = json.dumps({
+            'players': players,
+            'unavailable_players': unavailable_players,
+            'team_colors': team_colors
+        }, ensure_ascii=False)
+        with self._conn:
+            self._conn.execute("INSERT OR REPLACE INTO meta(key, value) VALUES ('players', ?)", (value,))
+        save_stats.count(True)
+
+    # --- Turniere und Spiele ---
+
+    def _tournament_id(self, key: str) -> Optional[int]:
+        row = self._conn.execute('SELECT id FROM tournaments WHERE key = ?', (key,)).fetchone()
+        return row[0] if row else None
+
+    def _write_games(self, tournament_id: int, schedule: List[Dict]) -> None:
+        self._conn.execute('DELETE FROM games WHERE tournament_id = ?', (tournament_id,))
+        rows = []
+        for index, (path, game) in enumerate(iter_games(schedule)):
+            game_data = {k: v for k, v in game.items() if k not in ('score1', 'score2')}
+            rows.append((
+                tournament_id, index, game.get('id'), json.dumps(list(path)),
+                _team_label(game.get('team1')), _team_label(game.get('team2')),
+                json.dumps(game_data, ensure_ascii=False),
+                game.get('score1', ''), game.get('score2', '')
+            ))
+        self._conn.executemany(
+            'INSERT INTO games(tournament_id, game_index, game_id, path, team1, team2, game, score1, score2) '
+            'VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)', rows
+        )
+
+    @staticmethod
+    def _frame(schedule: List[Dict]) -> List:
+        """Spielplan-Gerüst ohne Spiele - die Spiele stehen in der Tabelle games"""
+        frame = copy.deepcopy(schedule or [])
+        for path, _ in list(iter_games(frame)):
+            node = frame
+            for step in path[:-1]:
+                node = node[step]
+            node[path[-1]] = None
+        return frame
+
+    def _write_tournament(self, key: str, state: Dict, saved_at: str = None) -> int:
+        settings = {k: v for k, v in state.items() if k != 'schedule'}
+        values = (
+            state.get('tournament_name', ''), state.get('tournament_date', ''),
+            state.get('tournament_type', ''), json.dumps(settings, ensure_ascii=False),
+            json.dumps(self._frame(state.get('schedule', [])), ensure_ascii=False),
+            saved_at or datetime.now().isoformat()
+        )
+        tournament_id = self._tournament_id(key)
+        if tournament_id is None:
+            cursor = self._conn.execute(
+                'INSERT INTO tournaments(key, name, date, tournament_type, settings, frame, saved_at) '
+                'VALUES (?, ?, ?, ?, ?, ?, ?)', (key,) + values
+            )
+            tournament_id = cursor.lastrowid
+        else:
+            self._conn.execute(
+                'UPDATE tournaments SET name = ?, date = ?, tournament_type = ?, settings = ?, frame = ?, saved_at = ? '
+                'WHERE id = ?', values + (tournament_id,)
+            )
+        self._write_games(tournament_id, state.get('schedule', []))
+        return tournament_id
+
+    def _read_tournament(self, key: str) -> Optional[Dict]:
+        row = self._conn.execute('SELECT id, settings, frame FROM tournaments WHERE key = ?', (key,)).fetchone()
+        if row is None:
+            return None
+        tournament_id, settings, frame = row
+        state = json.loads(settings)
+        schedule = json.loads(frame)
+        for path, game, score1, score2 in self._conn.execute(
+            'SELECT path, game, score1, score2 FROM games WHERE tournament_id = ? ORDER BY game_index',
+            (tournament_id,)
+        ):
+            path = json.loads(path)
+            game = json.loads(game)
+            game['score1'] = score1
+            game['score2'] = score2
+            node = schedule
+            for step in path[:-1]:
+                node = node[step]
+            node[path[-1]] = game
+        state['schedule'] = schedule
+        return state
+
+    def load_tournament(self, tournament_id: str = DEFAULT_TOURNAMENT) -> Optional[Dict]:
+        key = _live_key(tournament_id)
+        with self._locked(key):
+            state = self._read_tournament(key)
+            if state is not None:
+                self._states[key] = copy.deepcopy(state)
+            return state
+
+    def save_tournament(self, state: Dict, compact: bool = False, tournament_id: str = DEFAULT_TOURNAMENT) -> None:
+        """Schreibt nur die geänderten Zeilen (gleiche Ereignisse wie das JSON-Journal)"""
+        key = _live_key(tournament_id)
+        with self._locked(key), self._conn:
+            previous = self._states.get(key)
+            if previous is None:
+                previous = self._read_tournament(key)
+            if previous is None:
+                self._write_tournament(key, state)
+                self._states[key] = copy.deepcopy(state)
+                save_stats.count(True)
+                return
+            self._save_events(key, previous, diff_states(previous, state))
+
+    def record_events(self, events: List[Dict], tournament_id: str = DEFAULT_TOURNAMENT) -> bool:
+        """Veröffentlichte Ereignisse speichern, ohne den ganzen Zustand zu vergleichen
+
+        False, wenn das Turnier noch nicht gespeichert ist (dann speichert der Aufrufer den ganzen Zustand).
+        """
+        key = _live_key(tournament_id)
+        with self._locked(key), self._conn:
+            previous = self._states.get(key)
+            if previous is None:
+                previous = self._read_tournament(key)
+            if previous is None:
+                return False
+            self._save_events(key, previous, [event for event in events if changes_state(previous, event)])
+        return True
+
+    def _save_events(self, key: str, previous: Dict, events: List[Dict]) -> None:
+        """Wendet die Ereignisse auf den gespeicherten Stand an und schreibt nur, was sich geändert hat"""
+        save_stats.count(bool(events))
+        if not events:
+            self._states[key] = previous
+            return
+        for event in events:
+            apply_event(previous, copy.deepcopy(event))
+        row_id = self._tournament_id(key)
+        if all(e['op'] in ('score_set', 'rating_set', 'rating_remove') for e in events):
+            # Häufigster Fall: nur Ergebnisse (und ihre Wertung) geändert -> einzelne Zeilen aktualisieren
+            for event in events:
+                if event['op'] == 'score_set':
+                    self._update_score(row_id, event)
+            self._update_settings(row_id, [e for e in events if e['op'] != 'score_set'])
+        else:
+            self._write_tournament(key, previous)
+        self._states[key] = previous
+
+    def _update_score(self, row_id: int, event: Dict) -> int:
+        if 'game' in event:
+            return self._conn.execute(
+                'UPDATE games SET score1 = ?, score2 = ? WHERE tournament_id = ? AND game_id = ?',
+                (event['score1'], event['score2'], row_id, event['game'])
+            ).rowcount
+        return self._conn.execute(
+            'UPDATE games SET score1 = ?, score2 = ? WHERE tournament_id = ? AND path = ?',
+            (event['score1'], event['score2'], row_id, json.dumps(event['path']))
+        ).rowcount
+
+    def _update_settings(self, row_id: int, events: List[Dict]) -> None:
+        """Wendet Ereignisse auf die Einstellungen an (z.B. Elo-Wertung eines Spiels), ohne die Spiele anzufassen"""
+        if not events:
+            return
+        (settings,) = self._conn.execute('SELECT settings FROM tournaments WHERE id = ?', (row_id,)).fetchone()
+        settings = json.loads(settings)
+        for event in events:
+            apply_event(settings, copy.deepcopy(event))
+        self._conn.execute('UPDATE tournaments SET settings = ? WHERE id = ?',
+                           (json.dumps(settings, ensure_ascii=False), row_id))
+
+    def save_score(self, game_id: str, score1: str, score2: str, tournament_id: str = DEFAULT_TOURNAMENT,
+                   rating_changes: Optional[Dict[str, float]] = None) -> bool:
+        """Ein Ergebnis als einzelnes UPDATE über die Spiel-ID - False, wenn das Spiel noch nicht gespeichert ist
+
+        rating_changes (falls angegeben) ist die Elo-Wertung des Spiels; sie wird
+        in derselben Transaktion in den Einstellungen des Turniers gespeichert.
+        """
+        key = _live_key(tournament_id)
+        events = [{'op': 'score_set', 'game': game_id, 'score1': score1, 'score2': score2}]
+        if rating_changes is not None:
+            events.append(rating_event(game_id, rating_changes))
+        with self._locked(key), self._conn:
+            row_id = self._tournament_id(key)
+            if row_id is None or not self._update_score(row_id, events[0]):
+                return False
+            self._update_settings(row_id, events[1:])
+            save_stats.count(True)
+            if key in self._states:
+                for event in events:
+                    apply_event(self._states[key], copy.deepcopy(event))
+        return True
+
+    def list_live_tournaments(self) -> List[Dict]:
+        """Alle laufenden Turniere mit eigener ID"""
+        rows = self._conn.execute(
+            "SELECT key, name, saved_at FROM tournaments WHERE key = ? OR key LIKE ? ORDER BY saved_at",
+            (CURRENT_TOURNAMENT, CURRENT_TOURNAMENT + ':%')
+        ).fetchall()
+        registry = [{'id': _id_from_live_key(key), 'name': name, 'created': saved_at} for key, name, saved_at in rows]
+        if not any(entry['id'] == DEFAULT_TOURNAMENT for entry in registry):
+            registry.insert(0, {'id': DEFAULT_TOURNAMENT, 'name': '', 'created': ''})
+        return registry
+
+    def create_tournament(self, name: str) -> str:
+        """Legt ein neues, leeres Turnier an und gibt seine ID zurück"""
+        with self._lock:
+            existing = {entry['id'] for entry in self.list_live_tournaments()}
+            tournament_id = make_tournament_id(name, existing)
+            with self._conn:
+                self._write_tournament(_live_key(tournament_id), {'tournament_name': name, 'schedule': []})
+        return tournament_id
+
+    def export_tournament(self, key: str, data: Dict) -> str:
+        with self._conn:
+            self._write_tournament(key, data, data.get('saved_at'))
+        save_stats.count(True)
+        return key
+
+    def import_tournament(self, uploaded_file, index: int = 0) -> Dict:
+        data = read_upload(uploaded_file, index)
+        if isinstance(data, dict) and data.get('tournament_name') and data.get('tournament_date'):
+            key = export_key(data['tournament_name'], datetime.fromisoformat(data['tournament_date']))
+            with self._conn:
+                self._write_tournament(key, data, data.get('saved_at'))
+        return data
+
+    def load_export(self, key: str) -> Dict:
+        state = self._read_tournament(key)
+        if state is None:
+            raise FileNotFoundError(key)
+        return state
+
+    def list_tournaments(self, date_from: str = None, date_to: str = None) -> List[Dict]:
+        """Exportierte Turniere einer Saison über den Datumsindex"""
+        query = 'SELECT key, name, date, tournament_type, saved_at FROM tournaments WHERE key != ? AND key NOT LIKE ?'
+        params = [CURRENT_TOURNAMENT, CURRENT_TOURNAMENT + ':%']
+        if date_from:
+            query += ' AND date >= ?'
+            params.append(date_from)
+        if date_to:
+            query += ' AND date <= ?'
+            params.append(date_to)
+        rows = self._conn.execute(query + ' ORDER BY date, name', params).fetchall()
+        return [dict(zip(('key', 'name', 'date', 'tournament_type', 'saved_at'), row)) for row in rows]
+
+    def search_tournaments(self, query: str = '', age_group: str = '') -> List[Dict]:
+        """Sucht exportierte Turniere (neueste zuerst) - gleiche Felder wie der Archiv-Index"""
+        rows = self._conn.execute(
+            'SELECT t.key, t.name, t.date, t.tournament_type, t.saved_at, COUNT(g.game_index), '
+            "SUM(CASE WHEN g.score1 != '' THEN 1 ELSE 0 END), "
+            '(SELECT COUNT(*) FROM (SELECT team1 FROM games WHERE tournament_id = t.id '
+            'UNION SELECT team2 FROM games WHERE tournament_id = t.id)) '
+            'FROM tournaments t LEFT JOIN games g ON g.tournament_id = t.id '
+            "WHERE t.key != ? AND t.key NOT LIKE ? AND t.name LIKE ? ESCAPE '\\' "
+            'GROUP BY t.id ORDER BY t.date DESC, t.name DESC',
+            (CURRENT_TOURNAMENT, CURRENT_TOURNAMENT + ':%', _contains_pattern(query))
+        ).fetchall()
+        result = []
+        for key, name, date, tournament_type, saved_at, games, played, teams in rows:
+            group = age_group_of({'tournament_name': name})
+            if age_group and group != age_group:
+                continue
+            result.append({
+                'key': key, 'name': name, 'date': date, 'age_group': group,
+                'tournament_type': tournament_type, 'teams': teams,
+                'games': games, 'played': played or 0, 'saved_at': saved_at
+            })
+        return result
+
+    def games_of_team(self, team: str) -> List[Dict]:
+        """Alle Spiele eines Teams über alle exportierten Turniere (indizierte Abfrage statt Dateiscan)"""
+        rows = self._conn.execute(
+            'SELECT t.key, t.date, g.team1, g.team2, g.score1, g.score2 FROM games g '
+            'JOIN tournaments t ON t.id = g.tournament_id '
+            'WHERE (g.team1 = ? OR g.team2 = ?) AND t.key != ? AND t.key NOT LIKE ? ORDER BY t.date, g.game_index',
+            (team, team, CURRENT_TOURNAMENT, CURRENT_TOURNAMENT + ':%')
+        ).fetchall()
+        return [dict(zip(('key', 'date', 'team1', 'team2', 'score1', 'score2'), row)) for row in rows]
+
+    def mark_migrated(self) -> None:
+        with self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO meta(key, value) VALUES ('migrated_at', ?)", (datetime.now().isoformat(),)
+            )
+
+
+def migrate_json_to_sqlite(base_dir, target: SqliteStorage) -> Dict[str, int]:
+    """Übernimmt alle vorhandenen JSON-Dateien in einem Durchgang in die Datenbank"""
+    source = JsonStorage(base_dir)
+    counts = {'rosters': 0, 'tournaments': 0}
+    for roster in ROSTERS:
+        players = source.load_roster(roster)
+        if players is not None:
+            target.save_roster(roster, players)
+            target.save_ratings(roster, source.load_ratings(roster))
+            counts['rosters'] += 1
+    players, unavailable, colors = source.load_players()
+    if players:
+        target.save_players(players, unavailable, colors)
+    for entry in source.list_live_tournaments():
+        current = source.load_tournament(entry['id'])
+        if current is not None:
+            target.save_tournament(current, tournament_id=entry['id'])
+            counts['tournaments'] += 1
+    for entry in source.list_tournaments():
+        target.export_tournament(entry['key'], source.load_export(entry['key']))
+        counts['tournaments'] += 1
+    target.mark_migrated()
+    return counts
+
+
+_storages: Dict[Tuple[str, str], object] = {}
+_storages_lock = threading.Lock()
+
+
+def get_storage(base_dir, backend: str = None):
+    """Liefert das konfigurierte Backend (eine Instanz pro Prozess)"""
+    backend = (backend or os.environ.get('TURNIER_STORAGE', 'json')).lower()
+    key = (str(Path(base_dir).resolve()), backend)
+    with _storages_lock:
+        if key not in _storages:
+            if backend == 'sqlite':
+                storage = SqliteStorage(Path(base_dir) / DB_FILENAME)
+                if storage.is_empty():
+                    migrate_json_to_sqlite(base_dir, storage)
+            else:
+                storage = JsonStorage(base_dir)
+            _storages[key] = storage
+        return _storages[key]
@@ -0,0 +1,139 @@
+"""
+Schweizer System: feste Anzahl Runden, jede Runde wird aus dem aktuellen Stand gelost.
+
+Die Paarungen einer Runde sind ein Matching mit minimalen Kosten über alle
+möglichen Paarungen (matching.max_weight_matching). Die Kosten sind
+lexikographisch gestaffelt:
+
+1. Wiederholungen: ein erneutes Aufeinandertreffen ist teurer als jede
+   Kombination der folgenden Kosten - Rematches gibt es nur, wenn sie
+   unvermeidbar sind.
+2. Punkteabstand (quadratisch): Teams mit gleicher Bilanz spielen gegeneinander.
+3. Abstand in der Tabelle: unter Punktgleichen spielen Nachbarn gegeneinander.
+
+Bei ungerader Teamzahl bekommt ein Team ein Freilos (zählt als Sieg):
+bevorzugt das schwächste Team, das noch keines hatte. Heimrecht (team1)
+bekommt das Team, das bisher seltener team1 war.
+"""
+from typing import Dict, List, Tuple
+
+from matching import max_weight_matching
+from standings import POINTS, game_goals
+
+PHASE = 'swiss'
+BYE_POINTS = POINTS['won']
+
+
+def swiss_entries(schedule: List[Dict]) -> List[Dict]:
+    return [entry for entry in schedule if isinstance(entry, dict) and 'swiss_round' in entry]
+
+
+def swiss_table(schedule: List[Dict], teams: List[str]) -> List[Dict]:
+    """Tabelle: Punkte, dann Buchholz (Punkte der Gegner), Tordifferenz, Tore, Setzliste"""
+    rows = {team: {'team': team, 'played': 0, 'won': 0, 'drawn': 0, 'lost': 0, 'byes': 0,
+                   'goals_for': 0, 'goals_against': 0, 'points': 0, 'opponents': []} for team in teams}
+    for entry in swiss_entries(schedule):
+        for team in entry.get('bye', []):
+            if team in rows:
+                rows[team]['byes'] += 1
+                rows[team]['points'] += BYE_POINTS
+        for game in entry['games']:
+            goals = game_goals(game)
+            if goals is None or game['team1'] not in rows or game['team2'] not in rows:
+                continue
+            for team, opponent, scored, conceded in ((game['team1'], game['team2'], *goals),
+                                                     (game['team2'], game['team1'], *reversed(goals))):
+                row = rows[team]
+                row['played'] += 1
+                row['opponents'].append(opponent)
+                row['goals_for'] += scored
+                row['goals_against'] += conceded
+                result = 'won' if scored > conceded else 'drawn' if scored == conceded else 'lost'
+                row[result] += 1
+                row['points'] += POINTS[result]
+    seed = {team: i for i, team in enumerate(teams)}
+    for row in rows.values():
+        row['diff'] = row['goals_for'] - row['goals_against']
+        row['buchholz'] = sum(rows[opponent]['points'] for opponent in row.pop('opponents'))
+    return sorted(rows.values(), key=lambda r: (-r['points'], -r['buchholz'], -r['diff'], -r['goals_for'], seed[r['team']]))
+
+
+def round_complete(schedule: List[Dict]) -> bool:
+    """Sind alle Spiele der letzten Schweizer Runde eingetragen?"""
+    entries = swiss_entries(schedule)
+    if not entries:
+        return True
+    last = entries[-1]['swiss_round']
+    return all(game_goals(game) is not None for entry in entries if entry['swiss_round'] == last for game in entry['games'])
+
+
+def _history(schedule: List[Dict]) -> Tuple[Dict[frozenset, int], Dict[str, int]]:
+    met: Dict[frozenset, int] = {}
+    home: Dict[str, int] = {}
+    for entry in swiss_entries(schedule):
+        for game in entry['games']:
+            pair = frozenset((game['team1'], game['team2']))
+            met[pair] = met.get(pair, 0) + 1
+            home[game['team1']] = home.get(game['team1'], 0) + 1
+    return met, home
+
+
+def pair_next_round(schedule: List[Dict], teams: Dict[str, List[str]],
+                    num_fields: int) -> Tuple[List[Dict], Dict[str, int]]:
+    """Lost die nächste Runde aus dem aktuellen Stand
+
+    Gibt die neuen Einträge für den Spielplan (bei mehr Paarungen als Feldern
+    mehrere Durchgänge) und einen Bericht (round, rematches, point_gap) zurück.
+    """
+    active = [name for name, players in teams.items() if players]
+    table = swiss_table(schedule, active)
+    order = [row['team'] for row in table]
+    points = {row['team']: row['points'] for row in table}
+    byes = {row['team']: row['byes'] for row in table}
+    met, home = _history(schedule)
+    n = len(order)
+
+    # Kosten je Paarung; das Freilos ist ein zusätzlicher Knoten mit Index n
+    def cost(a, b):
+        return (points[order[a]] - points[order[b]]) ** 2 * n + abs(a - b)
+
+    def bye_cost(a):
+        return (n - 1 - a) * n  # schwächstes Team bevorzugt
+
+    base_costs = [cost(a, b) for a in range(n) for b in range(a + 1, n)] + [bye_cost(a) for a in range(n)]
+    rematch = 1 + (n // 2 + 1) * max(base_costs, default=0)
+    pairs = {}
+    for a in range(n):
+        for b in range(a + 1, n):
+            pairs[(a, b)] = cost(a, b) + rematch * met.get(frozenset((order[a], order[b])), 0)
+        if n % 2:
+            pairs[(a, n)] = bye_cost(a) + rematch * byes[order[a]]
+    # Gewicht = Obergrenze - Kosten: ein größtmögliches Matching mit maximalem Gewicht hat minimale Kosten
+    ceiling = 1 + max(pairs.values(), default=0)
+    mate = max_weight_matching([(a, b, ceiling - c) for (a, b), c in pairs.items()], max_cardinality=True)
+
+    games, bye, rematches, point_gap = [], [], 0, 0
+    for a in range(n):
+        b = mate[a] if a < len(mate) else -1
+        if b == n:
+            bye.append(order[a])
+        elif b > a:
+            team1, team2 = order[a], order[b]
+            if home.get(team1, 0) > home.get(team2, 0):
+                team1, team2 = team2, team1
+            rematches += met.get(frozenset((team1, team2)), 0) > 0
+            point_gap += abs(points[team1] - points[team2])
+            games.append({'team1': team1, 'team2': team2, 'players1': teams[team1], 'players2': teams[team2],
+                          'score1': '', 'score2': '', 'phase': PHASE})
+
+    number = 1 + max((entry['swiss_round'] for entry in swiss_entries(schedule)), default=0)
+    fields = max(1, num_fields)
+    blocks = [games[i:i + fields] for i in range(0, len(games), fields)]
+    entries = []
+    for part, block in enumerate(blocks, 1):
+        suffix = f" · Durchgang {part}" if len(blocks) > 1 else ""
+        playing = {team for game in block for team in (game['team1'], game['team2'])}
+        entries.append({'round': f"{number}. Runde (Schweizer System){suffix}", 'swiss_round': number,
+                        'games': block, 'resting_teams': [team for team in active if team not in playing],
+                        'bye': bye if part == 1 else []})
+    return entries, {'round': number, 'rematches': rematches, 'point_gap': point_gap}
@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+Test-Script für das Archiv der exportierten Turniere
+Prüft Index beim Export, Suche, das Neu-Einlesen nur geänderter Dateien
+und die komprimierten Saison-Archive
+"""
+import io
+import json
+import os
+import tempfile
+from pathlib import Path
+
+from archive import (INDEX_FILENAME, TournamentArchive, iter_season, read_upload, season_of,
+                     summarize, write_season)
+from storage import JsonStorage, SqliteStorage
+
+
+def make_tournament(name, date, scores=('2', '')):
+    teams = {'Team A': ['A1', 'A2'], 'Team B': ['B1', 'B2'], 'Team C': ['C1', 'C2']}
+    return {
+        'tournament_name': name,
+        'tournament_date': date,
+        'tournament_type': 'Feste Teams',
+        'teams': teams,
+        'schedule': [
+            {'id': 'g1', 'team1': 'Team A', 'team2': 'Team B', 'players1': teams['Team A'],
+             'players2': teams['Team B'], 'score1': scores[0], 'score2': '1'},
+            {'id': 'g2', 'team1': 'Team B', 'team2': 'Team C', 'players1': teams['Team B'],
+             'players2': teams['Team C'], 'score1': scores[1], 'score2': ''}
+        ]
+    }
+
+
+def test_summary():
+    """Eckdaten für den Index"""
+    entry = summarize(make_tournament('U18 Herbst-Cup', '2025-10-04'))
+    assert entry['age_group'] == 'U18'
+    assert (entry['teams'], entry['games'], entry['played']) == (3, 2, 1)
+    print("✅ Eckdaten eines Turniers")
+
+
+def test_index_on_export_and_search():
+    """Export aktualisiert den Index, die Suche liest keine Turnier-Dateien"""
+    with tempfile.TemporaryDirectory() as tmp:
+        for storage in (JsonStorage(tmp), SqliteStorage(Path(tmp) / 'turnier.db')):
+            storage.export_tournament('turnier_U15-Cup_20250913', make_tournament('U15-Cup', '2025-09-13'))
+            storage.export_tournament('turnier_U18-Cup_20250920', make_tournament('U18-Cup', '2025-09-20'))
+            storage.export_tournament('turnier_JWR-Finale_20251004', make_tournament('JWR-Finale', '2025-10-04'))
+            names = [entry['name'] for entry in storage.search_tournaments()]
+            assert names == ['JWR-Finale', 'U18-Cup', 'U15-Cup'], (storage.name, names)
+            assert [e['key'] for e in storage.search_tournaments('cup', 'U18')] == ['turnier_U18-Cup_20250920']
+            assert storage.search_tournaments('U1_') == storage.search_tournaments('%') == []  # keine Platzhalter
+            entry = storage.search_tournaments('finale')[0]
+            assert (entry['teams'], entry['games'], entry['played']) == (3, 2, 1)
+            assert storage.load_export(entry['key'])['tournament_name'] == 'JWR-Finale'
+            print(f"✅ Archiv durchsuchen ({storage.name})")
+        index = json.loads((Path(tmp) / INDEX_FILENAME).read_text(encoding='utf-8'))
+        assert len(index['entries']) == 3
+        assert all(entry['checksum'] for entry in index['entries'].values())
+
+
+def test_lazy_refresh():
+    """Nur Dateien mit geänderter Änderungszeit werden neu gelesen"""
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / 'turnier_Alt_20240101.json'
+        path.write_text(json.dumps(make_tournament('Alt', '2024-01-01')), encoding='utf-8')
+        archive = TournamentArchive(tmp)
+        assert archive.refresh()[path.name]['name'] == 'Alt'
+
+        # Gleiche Größe und Änderungszeit: der Index-Eintrag wird weiterverwendet
+        stat = path.stat()
+        path.write_text(json.dumps(make_tournament('Neu', '2024-01-01')), encoding='utf-8')
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+        assert TournamentArchive(tmp).refresh()[path.name]['name'] == 'Alt'
+
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+        assert TournamentArchive(tmp).refresh()[path.name]['name'] == 'Neu'
+
+        path.unlink()
+        assert TournamentArchive(tmp).refresh() == {}
+        print("✅ Index nur für geänderte Dateien neu aufgebaut")
+
+
+def test_season_archive_roundtrip():
+    """Saison-Archive (gzip und xz) liefern die Turniere unverändert zurück"""
+    assert season_of('2025-09-13') == '2025-26' and season_of('2026-03-07') == '2025-26'
+    tournaments = [make_tournament(f"U15-Spieltag {i}", f"2025-09-{i + 10:02d}") for i in range(20)]
+    with tempfile.TemporaryDirectory() as tmp:
+        for compression in ('gz', 'xz'):
+            path = Path(tmp) / f"archiv_2025-26.jsonl.{compression}"
+            assert write_season(path, iter(tournaments)) == 20
+            assert list(iter_season(path)) == tournaments
+            # Spielerlisten stehen nur einmal pro Team im Archiv
+            assert path.stat().st_size < len(json.dumps(tournaments)) / 5
+            upload = io.BytesIO(path.read_bytes())
+            assert read_upload(upload, 3) == tournaments[3]
+            print(f"✅ Saison-Archiv ({compression})")
+        assert read_upload(io.BytesIO(json.dumps(tournaments[0]).encode('utf-8'))) == tournaments[0]
+
+
+def test_pack_season():
+    """Exportierte Turniere einer Saison werden ins Archiv verschoben und bleiben auffindbar"""
+    with tempfile.TemporaryDirectory() as tmp:
+        storage = JsonStorage(tmp)
+        storage.export_tournament('turnier_U15-Cup_20250913', make_tournament('U15-Cup', '2025-09-13'))
+        storage.export_tournament('turnier_U18-Cup_20260307', make_tournament('U18-Cup', '2026-03-07'))
+        storage.export_tournament('turnier_U16-Cup_20240914', make_tournament('U16-Cup', '2024-09-14'))
+        path, count = storage.archive.pack_season('2025-26')
+        assert count == 2 and path.name == 'archiv_2025-26.jsonl.gz'
+        assert sorted(p.name for p in Path(tmp).glob('turnier_*.json')) == ['turnier_U16-Cup_20240914.json']
+
+        # Erneutes Packen ergänzt das Archiv, statt es zu ersetzen
+        storage.export_tournament('turnier_U15-Cup_20251011', make_tournament('U15-Cup', '2025-10-11', ('5', '5')))
+        assert storage.archive.pack_season('2025-26')[1] == 3
+
+        entries = storage.search_tournaments('u15')
+        assert [entry['date'] for entry in entries] == ['2025-10-11', '2025-09-13']
+        loaded = storage.load_export(entries[0]['key'])
+        assert loaded == make_tournament('U15-Cup', '2025-10-11', ('5', '5'))
+        print("✅ Saison archiviert und durchsuchbar")
+
+
+if __name__ == "__main__":
+    test_summary()
+    test_index_on_export_and_search()
+    test_lazy_refresh()
+    test_season_archive_roundtrip()
+    test_pack_season()
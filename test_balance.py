@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+Test-Script für ausgeglichene Teams nach Spielstärke
+Prüft Teamgrößen, die Stärke-Differenz gegenüber der gleichmäßigen Verteilung,
+Spieler ohne Bewertung und die Zahl der Täusche bei 60 Spielern und 8 Teams
+"""
+import itertools
+import random
+
+from balance import DEFAULT_RATING, balanced_teams, fill_ratings
+
+
+def averages(teams, ratings):
+    return [sum(fill_ratings(team, ratings)) / len(team) for team in teams if team]
+
+
+def test_sizes_and_all_players():
+    """Jeder Spieler genau einmal, Teamgrößen unterscheiden sich höchstens um eins"""
+    rng = random.Random(5)
+    for _ in range(200):
+        players = [f"P{i}" for i in range(rng.randint(0, 40))]
+        ratings = {p: rng.randint(800, 2200) for p in players}
+        num_teams = rng.randint(1, 8)
+        teams, report = balanced_teams(players, ratings, num_teams)
+        sizes = [len(team) for team in teams]
+        assert len(teams) == num_teams and max(sizes) - min(sizes) <= 1
+        assert sorted(itertools.chain(*teams)) == sorted(players)
+        assert all(team == sorted(team, key=players.index) for team in teams)
+    print("✅ Teamgrößen und Spieler korrekt")
+
+
+def test_swap_improves_seed():
+    """Karmarkar-Karp lässt 25 Differenz, ein Tausch macht die Teams gleich stark"""
+    ratings = dict(zip("ABCDEFGH", [1300, 1400, 1550, 1750, 1900, 1250, 1300, 1050]))
+    teams, report = balanced_teams(list(ratings), ratings, 2)
+    assert report['seed_spread'] == 25 and report['swaps'] == 1
+    assert [sum(ratings[p] for p in team) for team in teams] == [5750, 5750]
+    print("✅ Tausch verbessert die Startlösung")
+
+
+def test_better_than_round_robin_split():
+    """Deutlich kleinere Stärke-Differenz als die Verteilung nach Listenposition"""
+    rng = random.Random(11)
+    players = [f"P{i}" for i in range(30)]
+    ratings = {p: rng.gauss(1500, 250) for p in players}
+    teams, report = balanced_teams(players, ratings, 4)
+    even = [players[t::4] for t in range(4)]
+    even_spread = max(averages(even, ratings)) - min(averages(even, ratings))
+    assert abs(report['spread'] - (max(averages(teams, ratings)) - min(averages(teams, ratings)))) < 1e-9
+    assert report['spread'] < even_spread / 10, (report['spread'], even_spread)
+    print(f"✅ Differenz {report['spread']:.1f} statt {even_spread:.1f}")
+
+
+def test_unrated_players():
+    """Spieler ohne Bewertung zählen mit der Standardstärke"""
+    assert fill_ratings(['A', 'B'], {'A': 1700}) == [1700.0, DEFAULT_RATING]
+    teams, report = balanced_teams(['A', 'B', 'C', 'D'], {'A': 1900, 'B': 1100}, 2)
+    assert sorted(map(sorted, teams)) == [['A', 'B'], ['C', 'D']]
+    print("✅ Unbewertete Spieler")
+
+
+def test_few_swaps_from_karmarkar_karp():
+    """60 Spieler auf 8 Teams: die Startlösung ist so gut, dass wenige Tausch-Durchgänge reichen"""
+    rng = random.Random(2)
+    most = 0
+    for _ in range(10):
+        players = [f"P{i}" for i in range(60)]
+        ratings = {p: rng.gauss(1500, 200) for p in players}
+        teams, report = balanced_teams(players, ratings, 8)
+        assert report['spread'] < 1 and report['spread'] <= report['seed_spread']
+        # Jeder Durchgang prüft alle Paare (O(n²)) - es sind aber höchstens zwei Täusche pro Team nötig
+        assert report['swaps'] <= 2 * len(teams), report['swaps']
+        most = max(most, report['swaps'])
+    print(f"✅ 60 Spieler auf 8 Teams mit höchstens {most} Täuschen")
+
+
+if __name__ == "__main__":
+    test_sizes_and_all_players()
+    test_swap_improves_seed()
+    test_better_than_round_robin_split()
+    test_unrated_players()
+    test_few_swaps_from_karmarkar_karp()
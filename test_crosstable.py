@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+Test-Script für die Kreuztabelle
+Prüft alle Spielplan-Formen (ein Spielfeld mit Hin-/Rückrunde, Runden mit
+mehreren Feldern, Gruppen mit K.o.-Phase, Round Robin), den Cache pro
+Spielplan-Version und den Aufwand O(Spiele + Teams²)
+"""
+from crosstable import CrossTable
+from formats import plan_group_tournament
+from schedule_utils import iter_games
+from scheduling import round_robin_slots
+from standings import Standings
+from testing_utils import recorded_calls
+
+
+def game(team1, team2, score1='', score2='', **extra):
+    return dict({'team1': team1, 'team2': team2, 'score1': score1, 'score2': score2}, **extra)
+
+
+def test_flat_schedule_with_return_leg():
+    """Ein Spielfeld: round 'Hinrunde'/'Rückrunde' an jedem Spiel; Ergebnis aus Sicht des Zeilen-Teams"""
+    schedule = [game('A', 'B', '2', '1', round='Hinrunde'), game('B', 'C', round='Hinrunde'),
+                game('B', 'A', '0', '0', round='Rückrunde')]
+    hinrunde, ruckrunde = CrossTable(schedule).tables(0)
+    assert hinrunde == [['Hinrunde', 'A', 'B', 'C'],
+                        ['A', '-', '2:1', ''],
+                        ['B', '1:2', '-', '–:–'],
+                        ['C', '', '–:–', '-']]
+    assert ruckrunde[0][0] == 'Rückrunde' and ruckrunde[1][2] == '0:0' and ruckrunde[2][3] == ''
+    print("✅ Ein Spielfeld mit Hin- und Rückrunde")
+
+
+def test_rounds_with_fields():
+    """Runden 'Hinrunde n.Spieltag' / 'Rückrunde n.Spieltag' mit mehreren Spielen"""
+    teams = [f"Team {c}" for c in "ABCDE"]
+    slots = round_robin_slots(teams, 2)
+    schedule = [{'round': f"Hinrunde {r}.Spieltag", 'games': [game(t1, t2, '1', '0') for t1, t2 in slot]}
+                for r, slot in enumerate(slots, 1)]
+    schedule += [{'round': f"Rückrunde {r}.Spieltag", 'games': [game(t2, t1) for t1, t2 in slot]}
+                 for r, slot in enumerate(slots, 1)]
+    hinrunde, ruckrunde = CrossTable(schedule).tables(0)
+    cells = [cell for row in hinrunde[1:] for cell in row[1:]]
+    assert cells.count('1:0') == cells.count('0:1') == 10 and cells.count('-') == 5
+    assert all(cell in ('-', '–:–') for row in ruckrunde[1:] for cell in row[1:])
+    print("✅ Runden mit mehreren Spielfeldern")
+
+
+def test_groups_and_round_robin():
+    """Gruppen: eine Kreuztabelle pro Gruppe ohne K.o.-Spiele; Round Robin hat keine"""
+    teams = {f"T{i}": [f"S{i}"] for i in range(7)}
+    schedule, groups, _ = plan_group_tournament(teams, 2, 2, 2)
+    index = CrossTable(schedule)
+    assert index.sections() == sorted(groups)
+    for group, members in groups.items():
+        assert index.teams(group) == sorted(members)
+        assert len(index.tables(0, group)) == 1
+    assert CrossTable([{'round': 1, 'games': [game(['P1', 'P2'], ['P3', 'P4'], '1', '0')]}]).sections() == []
+    print("✅ Gruppen und Round Robin")
+
+
+def test_cache_follows_version():
+    """Tabellen werden erst mit einer neuen Version (neues Ergebnis) neu aufgebaut"""
+    schedule = [{'round': 'Hinrunde 1.Spieltag', 'games': [game('A', 'B', id='g1')]}]
+    standings = Standings(schedule)
+    index = CrossTable(schedule)
+    first = index.tables(standings.version)
+    assert index.tables(standings.version) is first
+    g = schedule[0]['games'][0]
+    g['score1'], g['score2'] = '4', '2'
+    standings.record(g)
+    second = index.tables(standings.version)
+    assert second is not first and second[0][1][2] == '4:2' and second[0][2][1] == '2:4'
+    print("✅ Cache pro Spielplan-Version")
+
+
+def test_one_lookup_per_cell():
+    """40 Teams mit Hin- und Rückrunde (1560 Spiele): höchstens eine Nachschlag-Operation je Zelle"""
+    teams = [f"Team {i:02d}" for i in range(40)]
+    slots = round_robin_slots(teams, 2)
+    schedule = [{'round': f"{leg} {r}.Spieltag", 'games': [game(t1, t2, '1', '1') for t1, t2 in slot]}
+                for leg in ('Hinrunde', 'Rückrunde') for r, slot in enumerate(slots, 1)]
+    assert sum(1 for _ in iter_games(schedule)) == 1560
+    with recorded_calls(CrossTable, '_cell') as lookups:
+        index = CrossTable(schedule)
+        tables = index.tables(0)
+        assert index.tables(0) is tables  # gleiche Version: aus dem Cache
+    cells = sum(len(row) - 1 for table in tables for row in table[1:])
+    assert len(tables) == 2 and cells == 2 * 40 * 40  # Hin- und Rückrunde, je 40 x 40 Zellen
+    assert len(lookups) <= cells, len(lookups)  # O(G + T²): höchstens ein Nachschlagen je Zelle
+    assert all(cell == '1:1' for table in tables for row in table[1:] for cell in row[1:] if cell != '-')
+    print(f"✅ 40 Teams, 1560 Spiele: {len(lookups)} Nachschlag-Operationen für {cells} Zellen")
+
+
+if __name__ == "__main__":
+    test_flat_schedule_with_return_leg()
+    test_rounds_with_fields()
+    test_groups_and_round_robin()
+    test_cache_follows_version()
+    test_one_lookup_per_cell()
@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+Test-Script für die Elo-Wertung
+Prüft Teamwertung und Verteilung auf die Spieler, das Zurücknehmen korrigierter
+Ergebnisse und die Neuberechnung aus dem Archiv (gleiches Ergebnis wie Spiel für Spiel)
+"""
+import random
+
+from elo import K_FACTOR, expected_score, outcome, recompute_ratings, update_from_game
+from formats import source_label
+from schedule_utils import assign_game_ids, iter_games
+
+
+def game(team1, team2, score1='', score2=''):
+    return {'team1': team1, 'team2': team2, 'score1': score1, 'score2': score2}
+
+
+def test_fixed_teams_and_round_robin():
+    """Feste Teams: jeder Spieler bekommt die Teamänderung; Round Robin: Spielerlisten direkt"""
+    teams = {'Team A': ['A1', 'A2'], 'Team B': ['B1', 'B2']}
+    ratings, log = {'A1': 1600, 'A2': 1400}, {}
+    fixed = dict(game('Team A', 'Team B', '2', '0'), id='g1')
+    changes = update_from_game(ratings, log, fixed, teams)
+    assert changes['A1'] == changes['A2'] == -changes['B1'] == K_FACTOR / 2  # gleich starke Teams
+    rotating = dict(game(['A1', 'B1'], ['A2', 'B2'], '1', '1'), id='g2')
+    update_from_game(ratings, log, rotating, teams)
+    assert abs(sum(ratings.values()) - 4 * 1500) < 1e-9  # Elo verteilt nur um
+    assert outcome(game('X', 'Y')) is None and outcome(game('X', 'Y', '0', '3')) == 0.0
+    assert update_from_game(ratings, log, dict(game('Team A', 'Team B'), id='g3'), teams) == {}
+    print("✅ Feste Teams und Round Robin")
+
+
+def test_corrected_result_is_reverted():
+    """Ein geändertes Ergebnis ersetzt die alte Wertung, ein gelöschtes nimmt sie zurück"""
+    teams = {'Team A': ['A1'], 'Team B': ['B1']}
+    ratings, log = {}, {}
+    g = dict(game('Team A', 'Team B', '3', '0'), id='g1')
+    update_from_game(ratings, log, g, teams)
+    assert ratings['A1'] == 1500 + K_FACTOR / 2
+    g['score1'], g['score2'] = '0', '1'
+    update_from_game(ratings, log, g, teams)
+    assert ratings['A1'] == 1500 - K_FACTOR / 2
+    g['score1'] = g['score2'] = ''
+    update_from_game(ratings, log, g, teams)
+    assert ratings == {'A1': 1500, 'B1': 1500} and log == {}
+    print("✅ Korrigierte Ergebnisse")
+
+
+def test_placeholder_teams_not_rated():
+    """K.o.-Spiel mit Platzhaltern ("1. Gruppe A"): keine Wertung, Platzhalter landen nicht im Kader"""
+    teams = {'Team A': ['A1'], 'Team B': ['B1']}
+    ratings, log = {}, {}
+    final = dict(game(source_label({'group': 'A', 'rank': 1}), 'Team B', '2', '1'),
+                 id='f', phase='knockout', players1=[], players2=['B1'])
+    assert update_from_game(ratings, log, final, teams) == {} and ratings == {} and log == {}
+    # Teams stehen fest und werden später wieder zu Platzhaltern: alte Wertung wird zurückgenommen
+    final.update(team1='Team A', players1=['A1'])
+    update_from_game(ratings, log, final, teams)
+    assert ratings['A1'] == 1500 + K_FACTOR / 2
+    final.update(team1=source_label({'group': 'A', 'rank': 1}), players1=[])
+    update_from_game(ratings, log, final, teams)
+    assert ratings == {'A1': 1500, 'B1': 1500} and log == {}
+    final['team2'], final['players2'] = source_label({'winner': 'Halbfinale 1'}), []
+    ratings, report = recompute_ratings([{'teams': teams, 'schedule': [final]}])
+    assert ratings == {} and report['games'] == 0
+    print("✅ Platzhalter-Spiele ohne Wertung")
+
+
+def make_tournament(rng, date, num_rounds=6):
+    players = [f"P{i}" for i in range(16)]
+    schedule = []
+    for r in range(num_rounds):
+        rng.shuffle(players)
+        schedule.append({'round': r + 1, 'sub_rounds': [
+            {'round': f + 1, 'games': [game(players[8 * f:8 * f + 2], players[8 * f + 2:8 * f + 4],
+                                            str(rng.randint(0, 3)), str(rng.randint(0, 3))),
+                                       game(players[8 * f + 4:8 * f + 6], players[8 * f + 6:8 * f + 8],
+                                            str(rng.randint(0, 3)), str(rng.randint(0, 3)))]}
+            for f in range(2)]})
+    assign_game_ids(schedule)
+    return {'tournament_date': date, 'schedule': schedule}
+
+
+def test_recompute_matches_incremental():
+    """Neuberechnung (rundenweise vektorisiert) = Eintragen Spiel für Spiel"""
+    rng = random.Random(4)
+    tournaments = [make_tournament(rng, date) for date in ('2025-10-04', '2025-09-13', '2026-03-07')]
+    ratings = {'P0': 1700.0}
+    for data in sorted(tournaments, key=lambda data: data['tournament_date']):
+        log = {}
+        for _, g in iter_games(data['schedule']):
+            update_from_game(ratings, log, g, {})
+    recomputed, report = recompute_ratings(tournaments, initial={'P0': 1700.0})
+    assert report == {'tournaments': 3, 'games': 72, 'rounds': 18}
+    assert max(abs(ratings[p] - recomputed[p]) for p in ratings) < 1e-9
+    assert recomputed['P0'] != 1700.0 and 0 < expected_score(recomputed['P0'], 1500) < 1
+    print("✅ Neuberechnung stimmt mit inkrementeller Wertung überein")
+
+
+def test_season_rated_round_by_round():
+    """Eine Saison mit 100 Turnieren und 4800 Spielen: ein NumPy-Schritt je Runde, gleiches Ergebnis wie Spiel für Spiel"""
+    rng = random.Random(8)
+    tournaments = [make_tournament(rng, f"2025-{m:02d}-{d:02d}", 12) for m in range(1, 11) for d in range(1, 11)]
+    ratings, report = recompute_ratings(tournaments)
+    assert report == {'tournaments': 100, 'games': 4800, 'rounds': 1200} and len(ratings) == 16
+    incremental = {}
+    for data in tournaments:
+        log = {}
+        for _, g in iter_games(data['schedule']):
+            update_from_game(incremental, log, g, {})
+    assert max(abs(incremental[p] - ratings[p]) for p in ratings) < 1e-6
+    print(f"✅ {report['games']} Spiele in {report['rounds']} Runden-Schritten neu gewertet")
+
+
+if __name__ == "__main__":
+    test_fixed_teams_and_round_robin()
+    test_corrected_result_is_reverted()
+    test_placeholder_teams_not_rated()
+    test_recompute_matches_incremental()
+    test_season_rated_round_by_round()
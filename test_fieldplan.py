@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+Test-Script für den gemeinsamen Platzplan
+Prüft, dass kein Platz doppelt belegt ist, erlaubte Plätze, Pausen und die
+Reihenfolge der Zeitfenster eingehalten werden und der Aufwand linear bleibt
+"""
+import fieldplan
+from fieldplan import apply_shared_plan, plan_shared_fields
+from testing_utils import recorded_calls
+from timeline import parse_clock
+
+
+def game(a, b):
+    return {'team1': a, 'team2': b, 'score1': '', 'score2': ''}
+
+
+def rounds(prefix, num_rounds, games_per_round):
+    return [{'round': f"{r + 1}. Runde", 'games': [game(f"{prefix}{r}{g}a", f"{prefix}{r}{g}b")
+                                                   for g in range(games_per_round)]} for r in range(num_rounds)]
+
+
+def check_plan(rows, changeover, breaks=()):
+    """Kein Platz doppelt belegt, kein Spiel in einer Pause"""
+    by_field = {}
+    for row in rows:
+        by_field.setdefault(row['field'], []).append((parse_clock(row['kickoff']), parse_clock(row['end'])))
+        for begin, length in breaks:
+            assert parse_clock(row['end']) <= begin or parse_clock(row['kickoff']) >= begin + length, row
+    for times in by_field.values():
+        times.sort()
+        for (_, end), (kickoff, _) in zip(times, times[1:]):
+            assert kickoff >= end + changeover
+
+
+def test_shared_fields_without_conflicts():
+    """Drei Turniere auf 4 Plätzen: U18 nur auf Platz 1-2, JWR erst ab 10:00"""
+    tournaments = [
+        {'name': 'U15', 'schedule': rounds('A', 5, 2), 'game_minutes': 10},
+        {'name': 'U18', 'schedule': rounds('B', 4, 2), 'game_minutes': 15, 'fields': [1, 2]},
+        {'name': 'JWR', 'schedule': rounds('C', 3, 3), 'game_minutes': 8, 'max_fields': 2, 'start': '10:00'},
+    ]
+    rows, report = plan_shared_fields(tournaments, 4, '09:00', changeover=2)
+    assert len(rows) == 10 + 8 + 9 and report['unplaced'] == 0
+    check_plan(rows, 2)
+    assert all(row['field'] in (1, 2) for row in rows if row['tournament'] == 'U18')
+    assert all(row['kickoff'] >= '10:00' for row in rows if row['tournament'] == 'JWR')
+    # Höchstens zwei JWR-Spiele gleichzeitig
+    jwr = [(parse_clock(row['kickoff']), parse_clock(row['end'])) for row in rows if row['tournament'] == 'JWR']
+    assert all(sum(k <= t < e for k, e in jwr) <= 2 for t, _ in jwr)
+    assert report['gap'] >= 0 and report['end'] >= report['lower_bound']
+    print(f"✅ Kein Platz doppelt belegt, Ende {report['end']} (Schranke {report['lower_bound']})")
+
+
+def test_rounds_stay_in_order():
+    """Ein Zeitfenster beginnt erst, wenn das vorige beendet ist"""
+    schedule = rounds('A', 4, 3)
+    rows, _ = plan_shared_fields([{'name': 'U15', 'schedule': schedule, 'game_minutes': 12}], 2, '09:00', 3)
+    apply_shared_plan(rows)
+    for earlier, later in zip(schedule, schedule[1:]):
+        last_end = max(parse_clock(g['kickoff']) + 12 for g in earlier['games'])
+        assert min(parse_clock(g['kickoff']) for g in later['games']) >= last_end + 3
+    assert all('field' in g for entry in schedule for g in entry['games'])
+    print("✅ Zeitfenster in Reihenfolge, Zeiten übernommen")
+
+
+def test_break_and_lower_bound():
+    """Mittagspause wird eingehalten und in der unteren Schranke berücksichtigt"""
+    breaks = [(parse_clock('10:00'), 30)]
+    tournaments = [{'name': 'U15', 'schedule': rounds('A', 6, 2), 'game_minutes': 15},
+                   {'name': 'U16', 'schedule': rounds('B', 6, 2), 'game_minutes': 15}]
+    rows, report = plan_shared_fields(tournaments, 4, '09:00', 0, breaks)
+    check_plan(rows, 0, breaks)
+    # 24 Spiele à 15 Min. auf 4 Plätzen: 90 Min. Spielzeit + 30 Min. Pause
+    assert report['lower_bound'] == '11:00' and report['end'] == '11:00' and report['gap'] == 0
+    print("✅ Pause eingehalten, Schranke erreicht")
+
+
+def test_work_grows_linearly():
+    """Vier Turniere mit zusammen 800 Spielen auf 8 Plätzen: je Spiel höchstens eine Probe pro Turnier und Platz"""
+    tournaments = [{'name': f"T{t}", 'schedule': rounds(f"T{t}", 50, 4), 'game_minutes': 8 + t} for t in range(4)]
+    breaks = [(parse_clock('12:00'), 45)]
+    with recorded_calls(fieldplan, '_after_breaks') as probes:
+        rows, report = plan_shared_fields(tournaments, 8, '08:00', 2, breaks)
+    assert len(rows) == 800 and report['unplaced'] == 0
+    check_plan(rows, 2, breaks)
+    assert len(probes) <= (len(rows) + 1) * len(tournaments) * 8, len(probes)
+    print(f"✅ 800 Spiele mit {len(probes)} Proben, Ende {report['end']} (Schranke {report['lower_bound']})")
+
+
+if __name__ == "__main__":
+    test_shared_fields_without_conflicts()
+    test_rounds_stay_in_order()
+    test_break_and_lower_bound()
+    test_work_grows_linearly()
@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Test-Script für Gruppenphase, K.o.-Runde und Platzierungsspiele
+Prüft Setzliste, Turnierbaum, Zeitplanung über alle Phasen und das
+Eintragen der Teams aus den Ergebnissen
+"""
+from collections import Counter
+
+from formats import advance_bracket, plan_group_tournament, seed_groups, source_label, teams_pending
+from schedule_utils import iter_games
+from standings import Standings
+
+
+def make_teams(count):
+    return {f"T{i:02d}": [f"S{i}a", f"S{i}b"] for i in range(1, count + 1)}
+
+
+def play_groups(schedule):
+    """Besser gesetztes Team (kleinere Nummer) gewinnt 2:0"""
+    for _, game in iter_games(schedule):
+        if game['phase'] == 'group':
+            first = game['team1'] < game['team2']
+            game['score1'], game['score2'] = ('2', '0') if first else ('0', '2')
+
+
+def test_seeding():
+    """Schlangenlinie: jede Gruppe bekommt gleich starke Teams"""
+    groups = seed_groups([f"T{i}" for i in range(1, 9)], 2)
+    assert groups == {'A': ['T1', 'T4', 'T5', 'T8'], 'B': ['T2', 'T3', 'T6', 'T7']}
+    print("✅ Setzliste")
+
+
+def test_schedule_all_phases():
+    """16 Teams, 4 Gruppen, 4 Felder: untere Schranke erreicht, nie ein Team doppelt pro Runde"""
+    schedule, groups, report = plan_group_tournament(make_teams(16), 4, 2, 4)
+    assert report['gap'] == 0, report
+    games = [game for _, game in iter_games(schedule)]
+    phases = Counter(game['phase'] for game in games)
+    assert phases == {'group': 24, 'knockout': 8, 'placement': 4}, phases
+    for entry in schedule:
+        assert len(entry['games']) <= 4
+        teams = [team for game in entry['games'] for team in (game['team1'], game['team2'])]
+        assert len(teams) == len(set(teams)), entry['round']
+    # Viertelfinale: keine Gruppe trifft auf sich selbst
+    quarters = [game for game in games if game.get('stage') == 'Viertelfinale']
+    assert all(g['source1']['group'] != g['source2']['group'] for g in quarters)
+    assert any(game.get('label') == 'Finale' for game in schedule[-1]['games'])
+    print(f"✅ {len(games)} Spiele in {report['slots']} Runden (Schranke {report['lower_bound']})")
+
+
+def test_byes_and_placement_start_early():
+    """12 Teams, 3 Gruppen, 3 Felder: Freilose für Gruppensieger, Platzierungsspiele für alle übrigen Teams"""
+    schedule, groups, report = plan_group_tournament(make_teams(12), 3, 2, 3)
+    later = [game for _, game in iter_games(schedule) if game['phase'] != 'group']
+    quarters = [game for game in later if game['stage'] == 'Viertelfinale']
+    assert len(quarters) == 2  # 6 Teams im Baum für 8: zwei Freilose
+    semis = [game for game in later if game['stage'] == 'Halbfinale']
+    assert sum('group' in g['source1'] for g in semis) == 2
+    assert report['gap'] == 0, report
+    # Drei Gruppen: das übrige Team spielt gegen das beste des nächsten Platzes, keiner geht leer aus
+    placement = {game['label']: (source_label(game['source1']), source_label(game['source2']))
+                 for game in later if game['phase'] == 'placement'}
+    assert placement == {'Platz 7': ('3. Gruppe A', '3. Gruppe B'), 'Platz 9': ('3. Gruppe C', '4. Gruppe A'),
+                         'Platz 11': ('4. Gruppe B', '4. Gruppe C')}, placement
+    print(f"✅ Freilose und Platzierungsspiele ({report['slots']} Runden)")
+
+
+def test_advance_bracket():
+    """Nach der Gruppenphase stehen die Viertelfinals fest, nach dem Halbfinale Finale und Platz 3"""
+    teams = make_teams(16)
+    schedule, groups, _ = plan_group_tournament(teams, 4, 2, 4)
+    assert advance_bracket(schedule, teams) == 0
+    play_groups(schedule)
+    assert [row['team'] for row in Standings(schedule).table('A')] == sorted(groups['A'])
+    advance_bracket(schedule, teams)
+    later = {game['label']: game for _, game in iter_games(schedule) if game['phase'] != 'group'}
+    assert later['Viertelfinale 1']['team1'] == groups['A'][0]
+    assert later['Viertelfinale 1']['players1'] == teams[groups['A'][0]]
+    assert later['Platz 9']['team1'] == groups['A'][2]
+    assert later['Halbfinale 1']['team1'] == 'Sieger Viertelfinale 1'
+    assert not teams_pending(later['Viertelfinale 1'], teams) and teams_pending(later['Halbfinale 1'], teams)
+
+    for stage in ('Viertelfinale', 'Halbfinale'):
+        for game in later.values():
+            if game.get('stage') == stage:
+                game['score1'], game['score2'] = '1', '0'
+        advance_bracket(schedule, teams)
+    final, third = later['Finale'], later['Spiel um Platz 3']
+    assert final['team1'] == groups['A'][0] and final['team2'] in teams
+    assert third['team1'] in teams and third['team2'] in teams
+    assert {final['team1'], final['team2']}.isdisjoint({third['team1'], third['team2']})
+
+    # Unentschieden im K.o.-Spiel: Finalteilnehmer bleibt offen
+    later['Halbfinale 1']['score2'] = '1'
+    advance_bracket(schedule, teams)
+    assert final['team1'] == 'Sieger Halbfinale 1' and final['players1'] == [] and teams_pending(final, teams)
+    print("✅ Turnierbaum wird aus den Ergebnissen befüllt")
+
+
+if __name__ == "__main__":
+    test_seeding()
+    test_schedule_all_phases()
+    test_byes_and_placement_start_early()
+    test_advance_bracket()
@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+Test-Script für den gemeinsamen Turnierzustand mehrerer Sitzungen
+Prüft Versionen, Deltas, Neuladen nach langem Offline-Sein und Abonnenten
+"""
+import copy
+import threading
+
+from live_state import SharedTournament, apply_events, rebase
+from persistence import diff_states
+
+
+def make_state():
+    return {
+        'players': ['Anna', 'Ben', 'Cem', 'Dana'],
+        'unavailable_players': [],
+        'schedule': [
+            {'id': 'g1', 'team1': 'Team A', 'team2': 'Team B', 'score1': '', 'score2': ''},
+            {'id': 'g2', 'team1': 'Team C', 'team2': 'Team D', 'score1': '', 'score2': ''}
+        ]
+    }
+
+
+def test_two_referees():
+    """Zwei Sitzungen tragen Ergebnisse ein und sehen gegenseitig nur die Deltas"""
+    shared = SharedTournament()
+    version = shared.replace(make_state())
+    sessions = [{'version': version, 'base': make_state(), 'local': make_state()} for _ in range(2)]
+
+    def edit(session, game_index, score):
+        session['local']['schedule'][game_index].update(score1=score, score2='0')
+        events = diff_states(session['base'], session['local'])
+        shared.publish(events)
+        session['base'] = apply_events(session['base'], events)
+
+    def pull(session):
+        version, events = shared.changes_since(session['version'])
+        assert events is not None
+        session['base'], session['local'] = rebase(session['base'], session['local'], events)
+        session['version'] = version
+        return events
+
+    edit(sessions[0], 0, '3')
+    edit(sessions[1], 1, '5')
+    # Nur das eine fremde Ergebnis wird übertragen (das eigene ist idempotent)
+    assert [e['game'] for e in pull(sessions[0])] == ['g1', 'g2']
+    pull(sessions[1])
+    for session in sessions:
+        assert session['local'] == session['base'] == shared.snapshot()[1]
+        assert [g['score1'] for g in session['local']['schedule']] == ['3', '5']
+    assert shared.changes_since(shared.version) == (shared.version, [])
+    print("✅ Ergebnisse zwischen Sitzungen übertragen")
+
+
+def test_rating_log_from_two_devices():
+    """Elo-Wertungen zweier Geräte gehen nicht verloren - jedes Spiel ist ein eigenes Ereignis"""
+    shared = SharedTournament()
+    base = dict(make_state(), rating_log={'g0': {'Anna': 8.0}})
+    version = shared.replace(copy.deepcopy(base))
+    events = []
+    for game_id, player in (('g1', 'Ben'), ('g2', 'Cem')):
+        local = copy.deepcopy(base)
+        local['rating_log'][game_id] = {player: 12.5}
+        events.append(diff_states(base, local))
+        shared.publish(events[-1])
+    assert [event['op'] for batch in events for event in batch] == ['rating_set', 'rating_set']
+    assert shared.snapshot()[1]['rating_log'] == {'g0': {'Anna': 8.0}, 'g1': {'Ben': 12.5}, 'g2': {'Cem': 12.5}}
+    # Zurückgenommene Wertung (Ergebnis gelöscht) entfernt nur dieses Spiel
+    local = copy.deepcopy(shared.snapshot()[1])
+    del local['rating_log']['g0']
+    shared.publish(diff_states(shared.snapshot()[1], local))
+    assert set(shared.snapshot()[1]['rating_log']) == {'g1', 'g2'} and shared.version == version + 3
+    print("✅ Elo-Wertungen beider Geräte zusammengeführt")
+
+
+def test_resync_after_history_overflow():
+    """Wer zu lange nicht abgeglichen hat, bekommt den kompletten Zustand"""
+    shared = SharedTournament(history=3)
+    version = shared.replace(make_state())
+    for i in range(5):
+        shared.publish([{'op': 'player_add', 'player': f"Neu{i}"}])
+    assert shared.changes_since(version)[1] is None
+    assert len(shared.changes_since(shared.version - 2)[1]) == 2
+    assert shared.snapshot()[1]['players'][-1] == 'Neu4'
+    print("✅ Vollständiger Abgleich nach verpassten Änderungen")
+
+
+def test_subscribers_and_wait():
+    """Abonnenten werden benachrichtigt, wartende Sitzungen wachen auf"""
+    shared = SharedTournament()
+    version = shared.replace(make_state())
+    received = []
+    shared.subscribe('test', lambda v, events: received.append((v, events)))
+    woke = []
+    waiter = threading.Thread(target=lambda: woke.append(shared.wait_for_change(version, timeout=5)))
+    waiter.start()
+    event = {'op': 'score_set', 'game': 'g2', 'score1': '1', 'score2': '1'}
+    shared.publish([copy.deepcopy(event)])
+    waiter.join()
+    assert woke == [True]
+    assert received == [(version + 1, [event])]
+    shared.unsubscribe('test')
+    shared.publish([{'op': 'player_remove', 'player': 'Ben'}])
+    assert len(received) == 1
+    assert shared.wait_for_change(shared.version, timeout=0.01) is False
+    print("✅ Abonnenten und Warten auf Änderungen")
+
+
+if __name__ == "__main__":
+    test_two_referees()
+    test_rating_log_from_two_devices()
+    test_resync_after_history_overflow()
+    test_subscribers_and_wait()
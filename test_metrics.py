@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+Test-Script für die Spielplan-Kennzahlen
+Prüft alle drei Spielplan-Strukturen, Partner- und Gegnermatrizen,
+Pausen, Gruppenturniere mit Platzhaltern und 1000 Spiele gegen eine naive Zählung
+"""
+import random
+from collections import Counter
+
+import numpy as np
+
+from formats import advance_bracket, plan_group_tournament
+from schedule_utils import iter_games
+from metrics import ScheduleMatrices, analyze_schedule, fairness_metrics, metrics_summary
+
+
+def game(team1, team2, **extra):
+    return dict(team1=team1, team2=team2, score1='', score2='', **extra)
+
+
+def test_flat_fixed_teams():
+    """Flache Liste fester Teams: jedes Spiel ist eine eigene Runde, Pausen pro Team"""
+    teams = {'A': ['a1', 'a2'], 'B': ['b1', 'b2'], 'C': ['c1', 'c2']}
+    schedule = [game('A', 'B'), game('A', 'C'), game('B', 'C'), game('A', 'B')]
+    m = ScheduleMatrices(schedule, teams)
+    assert m.units == ['A', 'B', 'C'] and m.num_rounds == 4
+    assert m.participation.sum(axis=1).tolist() == [3, 3, 3, 3, 2, 2]
+    metrics = fairness_metrics(m)
+    # A, B und C spielen je zweimal hintereinander - bei drei Teams auf einem Feld unvermeidbar
+    assert metrics['back_to_back'] == 0
+    assert metrics['max_rest'] == 1 and metrics['max_play_streak'] == 2
+    assert 'Partner' not in metrics_summary(metrics)
+    print("✅ Flacher Spielplan fester Teams")
+
+
+def test_rotating_partners_sub_rounds():
+    """Round Robin mit sub_rounds: Partner- und Gegnermatrix, Felder aus den sub_rounds"""
+    schedule = [
+        {'round': 1, 'sub_rounds': [{'round': 1, 'games': [game(['a', 'b'], ['c', 'd'])]},
+                                    {'round': 2, 'games': [game(['e', 'f'], ['g', 'h'])]}]},
+        {'round': 2, 'sub_rounds': [{'round': 1, 'games': [game(['a', 'c'], ['b', 'e'])]},
+                                    {'round': 2, 'games': [game(['a', 'b'], ['f', 'g'])]}]},
+    ]
+    m = ScheduleMatrices(schedule)
+    i = {p: k for k, p in enumerate(m.players)}
+    assert m.partner[i['a'], i['b']] == 2 and m.opponent[i['a'], i['b']] == 1
+    assert np.array_equal(m.partner, m.partner.T) and m.partner.trace() == 0
+    assert m.fields[i['a']].tolist() == [2, 1]
+    metrics = fairness_metrics(m)
+    assert metrics['repeated_partners'] == 1 and metrics['max_partner'] == 2
+    assert metrics['games_max'] == 3 and metrics['games_min'] == 1
+    print("✅ Round Robin mit mehreren Feldern")
+
+
+def test_rounds_with_games():
+    """Runden mit 'games' (feste Teams, mehrere Felder): Spielindex ist das Feld"""
+    schedule = [{'round': '1. Runde', 'games': [game('A', 'B'), game('C', 'D')]},
+                {'round': '2. Runde', 'games': [game('A', 'C')]},
+                {'round': '3. Runde', 'games': [game('B', 'D'), game('A', 'D')]}]
+    metrics = analyze_schedule(schedule)
+    assert metrics['rounds'] == 3 and metrics['games'] == 5
+    assert metrics['max_rest'] == 1  # B und D pausieren in Runde 2
+    assert metrics['field_spread'] == 4  # A 2:1, B 2:0, C 1:1, D 1:2
+    print("✅ Runden mit mehreren Feldern")
+
+
+def test_group_tournament_placeholders():
+    """Gruppenturnier: K.o.- und Platzierungsspiele mit Platzhaltern zählen erst, wenn die Teams feststehen"""
+    teams = {f"T{i:02d}": [f"S{i}a", f"S{i}b"] for i in range(1, 13)}
+    schedule, _, _ = plan_group_tournament(teams, 3, 2, 3)
+    metrics = analyze_schedule(schedule, teams)
+    assert (metrics['players'], metrics['units'], metrics['games']) == (24, 12, 18), metrics
+    assert metrics['games_min'] == metrics['games_max'] == 3 and metrics['game_spread'] == 0
+    for _, g in iter_games(schedule):
+        if g['phase'] == 'group':
+            g['score1'], g['score2'] = '1', '0'
+    advance_bracket(schedule, teams)
+    metrics = analyze_schedule(schedule, teams)
+    # Viertelfinals und Platzierungsspiele stehen fest, Halbfinals und Finale noch nicht
+    assert (metrics['players'], metrics['units']) == (24, 12) and 18 < metrics['games'] < 18 + 6 + 4, metrics
+    assert metrics['games_min'] == 3 and metrics['games_max'] == 4
+    print(f"✅ Gruppenturnier: {metrics['games']} Spiele mit feststehenden Teams")
+
+
+def test_thousand_games_in_one_pass():
+    """1000 Spiele mit 120 Spielern: Matrizen wie paarweise gezählt"""
+    rng = random.Random(3)
+    players = [f"S{i}" for i in range(120)]
+    schedule = []
+    for r in range(250):
+        picked = rng.sample(players, 16)
+        schedule.append({'round': r + 1, 'games': [game(picked[k:k + 2], picked[k + 2:k + 4]) for k in range(0, 16, 4)]})
+    m = ScheduleMatrices(schedule)
+    result = fairness_metrics(m)
+    assert result['games'] == 1000 and result['players'] == 120
+    # Vergleich mit der naiven Zählung über alle Spiele und Spielerpaare
+    i = {p: k for k, p in enumerate(m.players)}
+    partner, opponent = Counter(), Counter()
+    for entry in schedule:
+        for g in entry['games']:
+            for team in (g['team1'], g['team2']):
+                partner[frozenset(team)] += 1
+            opponent.update(frozenset((a, b)) for a in g['team1'] for b in g['team2'])
+    for counts, matrix in ((partner, m.partner), (opponent, m.opponent)):
+        assert sum(counts.values()) == int(np.triu(matrix, 1).sum())
+        for pair, n in counts.items():
+            a, b = pair
+            assert matrix[i[a], i[b]] == n, (a, b)
+    print(f"✅ 1000 Spiele ausgewertet, {len(partner)} Partnerpaare")
+
+
+if __name__ == "__main__":
+    test_flat_fixed_teams()
+    test_rotating_partners_sub_rounds()
+    test_rounds_with_games()
+    test_group_tournament_placeholders()
+    test_thousand_games_in_one_pass()
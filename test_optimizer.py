@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Test-Script für die parallele Mehrfachstart-Optimierung
+Prüft Bewertung, Reproduzierbarkeit über den Seed und das Zeitbudget
+"""
+import time
+from concurrent.futures import Future
+
+import optimizer
+from optimizer import balance_fields, build_candidate, optimize_round_robin, score_rounds
+from rotation import rotating_partner_rounds
+from testing_utils import patched
+
+PLAYERS = [f"S{i}" for i in range(16)]
+
+
+def test_score_components():
+    """Bewertung erkennt wiederholte Partner und Doppelrunden"""
+    a, b, c, d, e, f, g, h = "ABCDEFGH"
+    rounds = [[([a, b], [c, d])], [([a, b], [e, f])], [([g, h], [c, d])]]
+    score = score_rounds(rounds, [a, b, c, d, e, f, g, h])
+    assert score['repeated_partners'] == 2 and score['repeated_opponents'] == 0
+    assert score['back_to_back'] == 2  # a und b spielen Runde 1 und 2
+    assert score['game_spread'] == 0  # 12 Einsätze für 8 Spieler: ein Unterschied ist unvermeidbar
+    print("✅ Bewertung eines Spielplans")
+
+
+def test_field_balance():
+    """Feldausgleich verschlechtert nichts und bleibt eine gültige Runde"""
+    rounds, _ = rotating_partner_rounds(PLAYERS, 2, 4, 8)
+    balanced = balance_fields(rounds)
+    assert [sorted(map(str, games)) for games in balanced] == [sorted(map(str, games)) for games in rounds]
+    assert score_rounds(balanced, PLAYERS)['field_spread'] <= score_rounds(rounds, PLAYERS)['field_spread']
+    print("✅ Spielfelder gleichmäßig verteilt")
+
+
+def test_best_candidate_reproducible():
+    """Der beste Kandidat lässt sich mit seinem Seed exakt wiederherstellen"""
+    for workers in (1, 2):
+        rounds, extra, report = optimize_round_robin(PLAYERS, 2, 2, 5, budget=30, workers=workers, max_candidates=12)
+        assert report['candidates'] >= 12
+        baseline = build_candidate(PLAYERS, 2, 2, 5, 0)[2]['total']
+        assert report['score']['total'] <= baseline
+        again, extra_again, score = build_candidate(PLAYERS, 2, 2, 5, report['seed'])
+        assert (again, extra_again, score) == (rounds, extra, report['score'])
+        print(f"✅ Bester Kandidat mit Seed {report['seed']} reproduzierbar ({workers} Prozesse)")
+
+
+class StuckPool:
+    """Prozess-Pool, dessen Kandidaten nie fertig werden - merkt sich die ausgegebenen Futures"""
+
+    def __init__(self):
+        self.futures = []
+
+    def submit(self, fn, *args):
+        self.futures.append(Future())
+        return self.futures[-1]
+
+
+def test_budget_does_not_wait_for_running_candidates():
+    """Nach dem Budget werden laufende Kandidaten nicht abgewartet, wartende verworfen"""
+    pool = StuckPool()
+    with patched(optimizer, '_process_pool', lambda workers: pool):
+        rounds, _, report = optimize_round_robin(PLAYERS, 2, 2, 5, budget=0.2, workers=2)
+    assert pool.futures and all(future.cancelled() for future in pool.futures)
+    assert report['candidates'] == 1  # nur die Standard-Konstruktion
+    assert (rounds, report['seed']) == (build_candidate(PLAYERS, 2, 2, 5, 0)[0], 0)
+    print(f"✅ Budget eingehalten, {len(pool.futures)} wartende Kandidaten verworfen")
+
+
+def test_shared_pool_and_deadline():
+    """Ein Pool für alle Aufrufe; ein Kandidat nach Ablauf des Budgets rechnet nicht mehr"""
+    optimize_round_robin(PLAYERS, 2, 2, 5, budget=30, workers=2, max_candidates=4)
+    pool = optimizer._process_pool(2)
+    optimize_round_robin(PLAYERS, 2, 2, 5, budget=30, workers=2, max_candidates=4)
+    assert optimizer._process_pool(2) is pool
+    assert pool.submit(optimizer._run_candidate, (PLAYERS, 2, 2, 5, 1, time.time() - 1)).result() is None
+    assert pool.submit(optimizer._run_candidate, (PLAYERS, 2, 2, 5, 1, time.time() + 60)).result()[0] == 1
+    print("✅ Gemeinsamer Prozess-Pool, Kandidaten nach dem Budget übersprungen")
+
+
+if __name__ == "__main__":
+    test_score_components()
+    test_field_balance()
+    test_best_candidate_reproducible()
+    test_budget_does_not_wait_for_running_candidates()
+    test_shared_pool_and_deadline()
@@ -0,0 +1,240 @@
+#!/usr/bin/env python3
+"""
+Test-Script für die Journal-Persistenz der Turnierdaten
+Prüft, dass Snapshot + Journal wieder genau den gespeicherten Zustand ergeben
+"""
+import copy
+import json
+import tempfile
+import time
+from pathlib import Path
+
+from persistence import (AutosaveWorker, TournamentJournal, apply_event, atomic_write_json, diff_states,
+                         read_json_checked, save_stats)
+
+
+def make_state():
+    return {
+        'players': ['A1', 'A2', 'B1', 'B2'],
+        'unavailable_players': [],
+        'teams': {'Team A': ['A1', 'A2'], 'Team B': ['B1', 'B2']},
+        'team_colors': {'Team A': 'gelb', 'Team B': 'blau'},
+        'tournament_type': 'Feste Teams',
+        'schedule': [
+            {'round': 'Hinrunde 1.Spieltag', 'games': [
+                {'team1': 'Team A', 'team2': 'Team B', 'score1': '', 'score2': ''}
+            ], 'resting_teams': []}
+        ],
+        'tournament_name': 'U15-Turnier',
+        'tournament_date': '2024-05-01',
+        'num_teams': 2,
+        'home_away': False,
+        'players_per_team': 2,
+        'num_fields': 2
+    }
+
+
+def test_journal_replay():
+    """Änderungen landen als kleine Ereignisse im Journal und werden beim Laden abgespielt"""
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / 'tournament_data.json'
+        journal = TournamentJournal(path)
+        state = make_state()
+        journal.record(state)
+
+        state['unavailable_players'].append('A1')
+        state['players'].append('C1')
+        state['schedule'][0]['games'][0]['score1'] = '2'
+        state['schedule'][0]['games'][0]['score2'] = '1'
+        events = journal.record(state)
+        print(f"Ereignisse: {events}")
+        assert events == 3
+
+        ops = [line for line in journal.journal_path.read_text(encoding='utf-8').splitlines() if line]
+        assert len(ops) == 3
+        assert all(len(line) < 200 for line in ops)
+
+        # Keine Änderung -> kein Ereignis
+        assert journal.record(state) == 0
+
+        loaded = TournamentJournal(path).load()
+        assert loaded == state
+        print("✅ Snapshot + Journal ergeben den gespeicherten Zustand")
+
+
+def test_compaction():
+    """Nach compact_after Einträgen wird ein neuer Snapshot geschrieben"""
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / 'tournament_data.json'
+        journal = TournamentJournal(path, compact_after=5)
+        state = make_state()
+        journal.record(state)
+        for i in range(12):
+            state['players'].append(f"P{i}")
+            journal.record(state)
+        assert len(journal.journal_path.read_text(encoding='utf-8').splitlines()) < 5
+        assert TournamentJournal(path).load() == state
+        print("✅ Kompaktierung erhält den Zustand")
+
+
+def test_team_and_schedule_changes():
+    """Team-Zuweisungen und neue Spielpläne werden als eigene Ereignisse erkannt"""
+    old = make_state()
+    new = copy.deepcopy(old)
+    new['teams']['Team A'] = ['A1']
+    new['schedule'] = []
+    ops = sorted(event['op'] for event in diff_states(old, new))
+    assert ops == ['schedule_set', 'team_set']
+    print("✅ Team- und Spielplan-Änderungen erkannt")
+
+
+def test_game_changes_besides_scores_are_saved():
+    """Spielerlisten, Feld und Anstoßzeit ändern den Spielplan, auch wenn die Paarungen gleich bleiben"""
+    old = make_state()
+    for change in ({'players1': ['A1', 'B1']}, {'field': 2}, {'kickoff': '09:15'}):
+        new = copy.deepcopy(old)
+        new['schedule'][0]['games'][0].update(change)
+        events = diff_states(old, new)
+        assert [event['op'] for event in events] == ['schedule_set'], change
+        replayed = copy.deepcopy(old)
+        for event in events:
+            apply_event(replayed, event)
+        assert replayed == new
+    new = copy.deepcopy(old)
+    new['schedule'][0]['games'][0].update(kickoff='09:15', field=2)
+    scored = copy.deepcopy(new)
+    scored['schedule'][0]['games'][0].update(score1='1', score2='0')
+    assert [event['op'] for event in diff_states(new, scored)] == ['score_set']
+    print("✅ Änderungen neben den Ergebnissen werden gespeichert")
+
+
+def test_atomic_write_generations():
+    """Eine beschädigte Datei wird beim Laden durch die letzte gültige Generation ersetzt"""
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / 'players.json'
+        for i in range(5):
+            atomic_write_json(path, {'players': [f"P{j}" for j in range(i + 1)]})
+        assert sorted(p.name for p in Path(tmp).iterdir()) == ['players.json', 'players.json.1', 'players.json.2', 'players.json.3']
+        assert read_json_checked(path) == {'players': ['P0', 'P1', 'P2', 'P3', 'P4']}
+
+        # Abgeschnittene Datei (Absturz mitten im Schreiben)
+        path.write_text(path.read_text(encoding='utf-8')[:20], encoding='utf-8')
+        assert read_json_checked(path) == {'players': ['P0', 'P1', 'P2', 'P3']}
+
+        # Inhalt verändert, Prüfsumme passt nicht mehr
+        generation = Path(tmp) / 'players.json.1'
+        generation.write_text(generation.read_text(encoding='utf-8').replace('P3', 'XX'), encoding='utf-8')
+        assert read_json_checked(path) == {'players': ['P0', 'P1', 'P2']}
+        print("✅ Fallback auf letzte gültige Generation")
+
+
+def test_journal_recovers_from_torn_snapshot():
+    """load() wirft nicht, wenn der Snapshot beschädigt ist"""
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / 'tournament_data.json'
+        journal = TournamentJournal(path)
+        state = make_state()
+        journal.compact(state)
+        state['players'].append('C1')
+        journal.compact(state)
+        path.write_text('{"players": [', encoding='utf-8')
+        loaded = TournamentJournal(path).load()
+        assert loaded['players'] == ['A1', 'A2', 'B1', 'B2']
+        print("✅ Beschädigter Snapshot wird übersprungen")
+
+
+def test_autosave_coalesces():
+    """Viele schnelle Änderungen führen zu einem einzigen Schreibvorgang"""
+    saved = []
+    worker = AutosaveWorker(saved.append, delay=0.2)
+    state = make_state()
+    for player in state['players']:
+        state['unavailable_players'].append(player)
+        worker.mark_dirty(state)
+    assert worker.status() == 'pending'
+    time.sleep(0.5)
+    assert worker.status() == 'saved'
+    assert len(saved) == 1 and saved[0]['unavailable_players'] == state['players']
+
+    # flush() schreibt sofort, stop() hinterlässt nichts Offenes
+    state['players'].append('C1')
+    worker.mark_dirty(state)
+    worker.flush()
+    assert len(saved) == 2
+    worker.stop()
+    print(f"✅ {worker.notifications} Änderungen, {worker.writes} Schreibvorgänge")
+
+
+def test_autosave_appends_events():
+    """Veröffentlichte Ereignisse werden gesammelt angehängt, ein neuer Zustand ersetzt offene Ereignisse"""
+    saved, appended = [], []
+    worker = AutosaveWorker(saved.append, delay=0.05, append_fn=appended.extend)
+    state = make_state()
+    events = [{'op': 'player_unavailable', 'player': p} for p in state['players']]
+    for event in events:
+        worker.mark_events([event])
+    assert worker.status() == 'pending'
+    worker.flush()
+    assert appended == events and saved == [] and worker.writes == 1
+
+    worker.mark_dirty(state)
+    worker.flush()
+    worker.mark_events([{'op': 'player_add', 'player': 'C1'}])
+    worker.mark_dirty(state)  # gleicher Zustand wie zuvor, aber inzwischen gab es Ereignisse
+    worker.flush()
+    assert len(saved) == 2 and appended == events and worker.status() == 'saved'
+
+    with tempfile.TemporaryDirectory() as tmp:
+        journal = TournamentJournal(Path(tmp) / 'tournament_data.json')
+        assert not journal.record_events(events)  # noch nichts gespeichert
+        journal.compact(state)
+        assert journal.record_events(events) and journal.record_events([{'op': 'set', 'key': 'num_teams', 'value': 3}])
+        expected = copy.deepcopy(state)
+        expected.update(unavailable_players=state['players'], num_teams=3)
+        assert TournamentJournal(journal.snapshot_path).load() == expected
+        assert len(journal.journal_path.read_text(encoding='utf-8').splitlines()) == len(events) + 1
+    worker.stop()
+    print(f"✅ {len(appended)} Ereignisse angehängt, ohne den Zustand zu kopieren")
+
+
+def test_unchanged_state_is_skipped():
+    """Unveränderte Zustände werden nicht geschrieben und als übersprungen gezählt"""
+    saved = []
+    worker = AutosaveWorker(saved.append, delay=0.05)
+    state = make_state()
+    before = save_stats.as_dict()
+    worker.mark_dirty(state)
+    for _ in range(10):
+        worker.mark_dirty(copy.deepcopy(state))
+    worker.flush()
+    assert len(saved) == 1 and worker.skipped == 10
+    assert save_stats.as_dict()['skipped'] - before['skipped'] == 10
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / 'players.json'
+        atomic_write_json(path, {'players': ['A1']})
+        performed = save_stats.as_dict()['performed']
+        atomic_write_json(path, {'players': ['A1']})
+        assert save_stats.as_dict()['performed'] == performed
+        # Datei inzwischen von außen geändert (anderer Prozess, Wiederherstellung): wieder schreiben
+        path.write_text(json.dumps({'players': ['B1']}), encoding='utf-8')
+        atomic_write_json(path, {'players': ['A1']})
+        assert read_json_checked(path) == {'players': ['A1']}
+        path.unlink()
+        atomic_write_json(path, {'players': ['A1']})
+        assert read_json_checked(path) == {'players': ['A1']}
+        assert save_stats.as_dict()['performed'] == performed + 2
+    worker.stop()
+    print(f"✅ Zähler: {save_stats.as_dict()}")
+
+
+if __name__ == "__main__":
+    test_journal_replay()
+    test_compaction()
+    test_team_and_schedule_changes()
+    test_game_changes_besides_scores_are_saved()
+    test_atomic_write_generations()
+    test_journal_recovers_from_torn_snapshot()
+    test_autosave_coalesces()
+    test_autosave_appends_events()
+    test_unchanged_state_is_skipped()
@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""
+Test-Script für das Anpassen laufender Turniere
+Prüft eingefrorene Runden, Ersatzspieler, ausgeglichene Spielzahlen,
+ausgefallene und neue Teams sowie den Umfang großer Reparaturen
+"""
+import copy
+from collections import Counter
+
+from repair import frozen_slots, repair_fixed_teams, repair_rotating, roster_changed, teams_changed
+from rotation import rotating_partner_rounds
+from schedule_utils import iter_games
+from scheduling import resting_teams, round_robin_slots
+
+
+def rotating_schedule(players, num_fields, games_per_player, played_rounds):
+    rounds, _ = rotating_partner_rounds(players, 2, num_fields, games_per_player)
+    schedule = [{'round': r, 'sub_rounds': [{'round': f, 'games': [{'team1': list(t1), 'team2': list(t2), 'score1': '', 'score2': ''}]}
+                                            for f, (t1, t2) in enumerate(games, 1)]}
+                for r, games in enumerate(rounds, 1)]
+    for entry in schedule[:played_rounds]:
+        for sub_round in entry['sub_rounds']:
+            sub_round['games'][0].update(score1='3', score2='1')
+    return schedule
+
+
+def game_counts(schedule):
+    return Counter(p for _, game in iter_games(schedule) for p in game['team1'] + game['team2'])
+
+
+def test_dropout_keeps_played_rounds():
+    """Ausfall: gespielte Runden bleiben, nur Spiele des Ausgefallenen ändern sich"""
+    players = [f"S{i}" for i in range(16)]
+    schedule = rotating_schedule(players, 2, 6, 4)
+    assert frozen_slots(schedule) == 4
+    roster = [p for p in players if p != 'S5']
+    assert roster_changed(schedule, roster)
+    repaired, report = repair_rotating(schedule, roster)
+    assert repaired[:4] == schedule[:4]
+    future = [game for _, game in iter_games(repaired[4:])]
+    assert all('S5' not in game['team1'] + game['team2'] for game in future)
+    planned_with_s5 = sum('S5' in g['team1'] + g['team2'] for _, g in iter_games(schedule[4:]))
+    assert report['changed_games'] == planned_with_s5 and report['removed_games'] == 0
+    counts = game_counts(repaired)
+    assert max(counts[p] for p in roster) - min(counts[p] for p in roster) <= 1
+    assert not roster_changed(repaired, roster)
+    print(f"✅ Ausfall repariert ({report['changed_games']} Spiele geändert)")
+
+
+def test_new_player_gets_games():
+    """Neuer Spieler übernimmt Spiele der Vielspieler, bis die Spielzahlen ausgeglichen sind"""
+    players = [f"S{i}" for i in range(12)]
+    schedule = rotating_schedule(players, 1, 4, 3)
+    roster = players + ['Neu']
+    repaired, report = repair_rotating(schedule, roster)
+    counts = game_counts(repaired)
+    assert counts['Neu'] >= 2 and report['games_max'] - report['games_min'] <= 1
+    for entry in repaired:
+        playing = [p for _, g in iter_games([entry]) for p in g['team1'] + g['team2']]
+        assert len(playing) == len(set(playing))
+    print("✅ Neuer Spieler eingeplant")
+
+
+def test_no_substitute_drops_game():
+    """Spielen alle in jeder Runde, fällt das Spiel ohne Ersatz aus"""
+    players = [f"S{i}" for i in range(8)]
+    schedule = rotating_schedule(players, 2, 4, 1)
+    repaired, report = repair_rotating(schedule, players[1:])
+    assert report['removed_games'] == 3
+    assert all('S0' not in g['team1'] + g['team2'] for _, g in iter_games(repaired[1:]))
+    print("✅ Spiel ohne Ersatzspieler entfällt")
+
+
+def fixed_schedule(teams, num_fields):
+    names = list(teams)
+    return [{'round': f"Hinrunde {n}.Spieltag",
+             'games': [{'team1': a, 'team2': b, 'players1': teams[a], 'players2': teams[b], 'score1': '', 'score2': ''}
+                       for a, b in slot],
+             'resting_teams': resting_teams(slot, names)}
+            for n, slot in enumerate(round_robin_slots(names, num_fields), 1)]
+
+
+def test_fixed_teams_dropout_and_new_team():
+    """Feste Teams: offene Spiele des ausgefallenen Teams entfallen, das neue Team bekommt alle Paarungen"""
+    teams = {f"Team {c}": [f"{c}1", f"{c}2"] for c in "ABCDEF"}
+    schedule = fixed_schedule(teams, 2)
+    schedule[1]['games'][0].update(score1='2', score2='2')
+    changed = {name: players for name, players in teams.items() if name != 'Team C'}
+    changed['Team G'] = ['G1', 'G2']
+    changed['Team A'] = ['A1', 'A3']
+    assert teams_changed(schedule, changed)
+    repaired, report = repair_fixed_teams(schedule, changed, 2)
+    assert repaired[:2] == schedule[:2]
+    pairs = [frozenset((g['team1'], g['team2'])) for _, g in iter_games(repaired)]
+    assert len(pairs) == len(set(pairs))
+    assert all(frozenset(('Team G', other)) in pairs for other in changed if other != 'Team G')
+    assert report['added_games'] == 5
+    for entry in repaired[2:]:
+        assert len(entry['games']) <= 2
+        assert all('Team C' not in (g['team1'], g['team2']) for g in entry['games'])
+        assert all(g['players1'] == ['A1', 'A3'] for g in entry['games'] if g['team1'] == 'Team A')
+    assert not teams_changed(repaired, changed)
+    print("✅ Feste Teams: Ausfall und neues Team")
+
+
+def test_large_repair_touches_only_affected_games():
+    """60 Spieler, 4 Felder: nur Spiele der Ausgefallenen und die für Neue geänderten Spiele werden angefasst"""
+    players = [f"S{i}" for i in range(60)]
+    schedule = rotating_schedule(players, 4, 12, 10)
+    roster = players[3:] + ['Neu1', 'Neu2']
+    original = copy.deepcopy(schedule)
+    repaired, report = repair_rotating(schedule, roster)
+    assert schedule == original, "Eingabe darf nicht verändert werden"
+    assert report['games_max'] - report['games_min'] <= 1 and report['removed_games'] == 0
+    before = [game for _, game in iter_games(schedule)]
+    after = [game for _, game in iter_games(repaired)]
+    differing = sum(old != new for old, new in zip(before, after))
+    open_games = [game for _, game in iter_games(schedule[report['frozen_rounds']:])]
+    with_dropouts = sum(any(p not in roster for p in g['team1'] + g['team2']) for g in open_games)
+    counts = game_counts(repaired)
+    assert len(after) == len(before) and differing == report['changed_games']
+    assert with_dropouts <= differing <= with_dropouts + counts['Neu1'] + counts['Neu2']
+    print(f"✅ {differing} von {len(before)} Spielen geändert")
+
+
+if __name__ == "__main__":
+    test_dropout_keeps_played_rounds()
+    test_new_player_gets_games()
+    test_no_substitute_drops_game()
+    test_fixed_teams_dropout_and_new_team()
+    test_large_repair_touches_only_affected_games()
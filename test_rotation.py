@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Test-Script für Round Robin mit wechselnden Partnern
+Prüft genaue Spielzahlen, Abwechslung bei Partnern und Gegnern,
+Reproduzierbarkeit und den Aufwand für große Gruppen
+"""
+from collections import Counter
+
+import rotation
+from rotation import encounter_summary, rotating_partner_rounds
+from testing_utils import recorded_calls
+
+
+def check_rounds(rounds, players_per_team, num_fields):
+    for games in rounds:
+        playing = [p for team1, team2 in games for p in team1 + team2]
+        assert len(playing) == len(set(playing)), "Spieler zweimal in derselben Runde"
+        assert 1 <= len(games) <= num_fields
+        assert all(len(team1) == len(team2) == players_per_team for team1, team2 in games)
+    return Counter(p for games in rounds for team1, team2 in games for p in team1 + team2)
+
+
+def test_exact_games_per_player():
+    """Jeder Spieler hat genau games_per_player Spiele, wenn die Rechnung aufgeht"""
+    for n in range(4, 25):
+        players = [f"S{i}" for i in range(n)]
+        for players_per_team in (2, 3):
+            for num_fields in (1, 2, 3):
+                for games_per_player in (1, 3, 5):
+                    rounds, extra = rotating_partner_rounds(players, players_per_team, num_fields, games_per_player)
+                    per_game = 2 * players_per_team
+                    if n < per_game:
+                        assert rounds == []
+                        continue
+                    counts = check_rounds(rounds, players_per_team, num_fields)
+                    surplus = -(n * games_per_player) % per_game
+                    assert len(extra) == surplus, (n, players_per_team, num_fields, games_per_player)
+                    assert all(counts[p] == games_per_player + (p in extra) for p in players)
+    print("✅ Genaue Spielzahl für 4-24 Spieler")
+
+
+def test_partner_variety():
+    """Bei zwei Spielern pro Team wiederholt sich kein Partner, solange es genug Spieler gibt"""
+    for n, num_fields, games_per_player in ((12, 1, 3), (16, 2, 5), (20, 2, 6), (40, 4, 10)):
+        players = [f"S{i}" for i in range(n)]
+        rounds, extra = rotating_partner_rounds(players, 2, num_fields, games_per_player)
+        summary = encounter_summary(rounds)
+        assert not extra and summary['max_partner'] == 1, (n, summary)
+        assert summary['max_opponent'] <= 3, (n, summary)
+    print("✅ Keine wiederholten Partner")
+
+
+def test_deterministic():
+    """Gleiche Eingabe, gleicher Spielplan"""
+    players = [f"S{i}" for i in range(18)]
+    assert rotating_partner_rounds(players, 2, 2, 4) == rotating_partner_rounds(players, 2, 2, 4)
+    print("✅ Reproduzierbarer Spielplan")
+
+
+def test_large_groups():
+    """60 Spieler mit 12 Spielen: keine Rundenobergrenze; doppelt so viele Spieler verlängern nur die Bank, nicht die Suche"""
+    players = [f"S{i}" for i in range(60)]
+    with recorded_calls(rotation, '_game_cost') as evaluations:
+        rounds, extra = rotating_partner_rounds(players, 2, 4, 12)
+    counts = check_rounds(rounds, 2, 4)
+    assert len(rounds) == 45 and not extra
+    assert set(counts.values()) == {12}
+    more = [f"S{i}" for i in range(120)]
+    with recorded_calls(rotation, '_game_cost') as evaluations_more:
+        rounds, _ = rotating_partner_rounds(more, 2, 4, 6)
+    assert len(rounds) == 45 and len(evaluations_more) < 2 * len(evaluations), (len(evaluations), len(evaluations_more))
+    print(f"✅ 60 Spieler: {len(evaluations)} Bewertungen ({len(evaluations_more)} bei 120 Spielern)")
+
+
+if __name__ == "__main__":
+    test_exact_games_per_player()
+    test_partner_variety()
+    test_deterministic()
+    test_large_groups()
@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+Test-Script für die Kreismethode (Berger-Tabellen)
+Prüft vollständige Paarungen, minimale Anzahl Zeitfenster, Pausen und Heimrecht
+für alle Teamzahlen und Spielfelder
+"""
+import itertools
+import random
+from collections import Counter
+
+from scheduling import (circle_rounds, minimal_slots, rest_profile, resting_teams, round_robin_slots,
+                        schedule_games, slot_lower_bound)
+
+
+def check_slots(slots, teams, num_fields):
+    pairs = [frozenset(pair) for slot in slots for pair in slot]
+    assert len(pairs) == len(set(pairs)) == len(teams) * (len(teams) - 1) // 2
+    for slot in slots:
+        playing = [team for pair in slot for team in pair]
+        assert len(playing) == len(set(playing)), "Team spielt zweimal im selben Zeitfenster"
+        assert len(slot) <= num_fields
+
+
+def test_circle_rounds():
+    """Kreismethode: jede Runde ist eine Paarung, bei ungerader Zahl pausiert je ein Team"""
+    for n in range(2, 13):
+        teams = [f"Team {i}" for i in range(n)]
+        rounds = circle_rounds(teams)
+        check_slots(rounds, teams, n)
+        assert len(rounds) == n - 1 + n % 2
+        if n % 2:
+            byes = Counter(team for r in rounds for team in resting_teams(r, teams))
+            assert all(count == 1 for count in byes.values()) and len(byes) == n
+    print("✅ Kreismethode mit spielfreien Teams")
+
+
+def test_minimal_slots_for_all_sizes():
+    """Für jede Teamzahl und Feldanzahl wird die untere Schranke erreicht"""
+    for n in range(2, 33):
+        teams = [f"T{i}" for i in range(n)]
+        for num_fields in range(1, 9):
+            slots = round_robin_slots(teams, num_fields)
+            check_slots(slots, teams, num_fields)
+            assert len(slots) == minimal_slots(n, num_fields), (n, num_fields, len(slots))
+            homes = Counter(pair[0] for slot in slots for pair in slot)
+            counts = [homes.get(team, 0) for team in teams]
+            assert max(counts) - min(counts) <= 1, (n, num_fields, counts)
+    print("✅ Minimale Anzahl Zeitfenster für 2-32 Teams und 1-8 Felder")
+
+
+def test_former_special_cases():
+    """4 und 5 Teams auf 2 Feldern: 3 bzw. 5 Runden wie die früheren Sonderfälle"""
+    teams = ["Team A", "Team B", "Team C", "Team D"]
+    slots = round_robin_slots(teams, 2)
+    assert len(slots) == 3 and all(len(slot) == 2 for slot in slots)
+
+    teams = ["Team A", "Team B", "Team C", "Team D", "Team E"]
+    slots = round_robin_slots(teams, 2)
+    assert len(slots) == 5 and all(len(slot) == 2 for slot in slots)
+    assert sorted(team for slot in slots for team in resting_teams(slot, teams)) == teams
+
+    # 6 Teams auf 2 Feldern: 8 Zeitfenster statt der früheren greedy-Verteilung, niemand wartet lange
+    teams = [f"Team {c}" for c in "ABCDEF"]
+    slots = round_robin_slots(teams, 2)
+    assert len(slots) == 8
+    assert max(rest_profile(slots, teams).values()) <= 2
+    print("✅ Sonderfälle 4 und 5 Teams als normale Instanzen")
+
+
+def check_indexed_slots(slots, pairs, num_fields):
+    assert sorted(index for slot in slots for index in slot) == list(range(len(pairs)))
+    for slot in slots:
+        playing = [team for index in slot for team in pairs[index]]
+        assert len(playing) == len(set(playing)) and len(slot) <= num_fields
+
+
+def test_schedule_arbitrary_games():
+    """Beliebige Spiellisten (Teilmengen, Hin- und Rückspiel) erreichen die untere Schranke"""
+    rng = random.Random(7)
+    for _ in range(200):
+        teams = [f"T{i}" for i in range(rng.randint(2, 30))]
+        num_fields = rng.randint(1, 6)
+        all_pairs = list(itertools.combinations(teams, 2))
+        pairs = rng.sample(all_pairs, rng.randint(1, len(all_pairs)))
+        if rng.random() < 0.3:
+            pairs += [(away, home) for home, away in pairs]
+        slots, report = schedule_games(pairs, num_fields)
+        check_indexed_slots(slots, pairs, num_fields)
+        assert report['lower_bound'] == slot_lower_bound(pairs, num_fields)
+        assert report['slots'] == len(slots) and report['gap'] == 0, report
+    print("✅ Beliebige Spiellisten ohne Abstand zur unteren Schranke")
+
+
+def test_full_round_robin_needs_one_coloring():
+    """32 Teams jeder gegen jeden: die Schranke wird ohne gemischte Wiederholungen der Färbung erreicht"""
+    pairs = list(itertools.combinations([f"T{i}" for i in range(32)], 2))
+    for num_fields in (2, 3, 8):
+        slots, report = schedule_games(pairs, num_fields, attempts=0)
+        check_indexed_slots(slots, pairs, num_fields)
+        assert report['gap'] == 0, (num_fields, report)
+    print(f"✅ 32 Teams ohne Wiederholung der Färbung ({len(pairs)} Spiele)")
+
+
+if __name__ == "__main__":
+    test_circle_rounds()
+    test_minimal_slots_for_all_sizes()
+    test_former_special_cases()
+    test_schedule_arbitrary_games()
+    test_full_round_robin_needs_one_coloring()
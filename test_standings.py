@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Test-Script für die Tabelle
+Prüft Punkte und Tore für feste Teams, Spielerwertung beim Round Robin,
+Gruppentabellen, korrigierte Ergebnisse
+und dass ein Ergebnis nur die Zeilen der beteiligten Teams ändert
+"""
+import random
+
+from formats import plan_group_tournament
+from schedule_utils import assign_game_ids, iter_games
+from standings import Standings, table_rows
+from testing_utils import recorded_calls
+
+
+def game(team1, team2, score1='', score2=''):
+    return {'team1': team1, 'team2': team2, 'score1': score1, 'score2': score2}
+
+
+def test_fixed_teams_table():
+    """Sieg 3, Unentschieden 1; Reihenfolge nach Punkten, Tordifferenz, Toren"""
+    schedule = [{'round': 'Hinrunde 1.Spieltag', 'games': [game('A', 'B', '2', '0'), game('C', 'D', '1', '1')]},
+                {'round': 'Hinrunde 2.Spieltag', 'games': [game('A', 'C', '0', '1'), game('B', 'D')]}]
+    assign_game_ids(schedule)
+    table = Standings(schedule).table()
+    assert [(row['team'], row['points'], row['diff'], row['played']) for row in table] == \
+        [('C', 4, 1, 2), ('A', 3, 1, 2), ('D', 1, 0, 1), ('B', 0, -2, 1)]
+    assert table_rows(table)[0] == {'Platz': 1, 'Team': 'C', 'Sp': 2, 'S': 1, 'U': 1, 'N': 0, 'Tore': '2:1',
+                                    'Diff': 1, 'Pkt': 4}
+    print("✅ Tabelle für feste Teams")
+
+
+def test_round_robin_players_and_corrections():
+    """Spielerlisten werden pro Spieler gewertet; Korrektur und Löschen ersetzen die alte Wertung"""
+    g = dict(game(['P1', 'P2'], ['P3', 'P4'], '2', '1'), id='g1')
+    standings = Standings([g])
+    assert [row['team'] for row in standings.table()[:2]] == ['P1', 'P2']
+    g['score1'], g['score2'] = '0', '4'
+    standings.record(g)
+    rows = {row['team']: row for row in standings.table()}
+    assert rows['P3']['points'] == 3 and rows['P1']['goals_against'] == 4 and rows['P1']['played'] == 1
+    g['score1'] = g['score2'] = ''
+    standings.record(g)
+    assert all(row['played'] == row['points'] == row['goals_for'] == 0 for row in standings.table())
+    assert standings.game('g1') is g
+    print("✅ Spielerwertung und Korrekturen")
+
+
+def test_group_tables():
+    """Gruppentabellen aus den Gruppenspielen; K.o.-Spiele zählen nicht; complete nach dem letzten Gruppenspiel"""
+    rng = random.Random(6)
+    teams = {f"T{i}": [f"S{i}"] for i in range(10)}
+    schedule, groups, _ = plan_group_tournament(teams, 2, 2, 3)
+    assign_game_ids(schedule)
+    standings = Standings(schedule)
+    expected = {team: [0, 0, 0] for team in teams}  # Punkte, Tordifferenz, Spiele
+    group_games = [g for _, g in iter_games(schedule) if g['phase'] == 'group']
+    for g in group_games:
+        assert not standings.complete(g['group'])
+        g['score1'], g['score2'] = str(rng.randint(0, 3)), str(rng.randint(0, 3))
+        standings.record(g)
+        s1, s2 = int(g['score1']), int(g['score2'])
+        for team, diff in ((g['team1'], s1 - s2), (g['team2'], s2 - s1)):
+            expected[team][0] += 3 if diff > 0 else 1 if diff == 0 else 0
+            expected[team][1] += diff
+            expected[team][2] += 1
+    for _, g in iter_games(schedule):
+        if g['phase'] != 'group':
+            g['score1'], g['score2'] = '1', '0'
+            standings.record(g)
+    for group, members in groups.items():
+        assert standings.complete(group)
+        table = standings.table(group)
+        assert sorted(r['team'] for r in table) == sorted(members)
+        assert all([r['points'], r['diff'], r['played']] == expected[r['team']] for r in table)
+        assert [r['points'] for r in table] == sorted((r['points'] for r in table), reverse=True)
+    assert standings.sections() == sorted(groups)
+    group_games[0]['score1'] = ''
+    standings.record(group_games[0])
+    assert not standings.complete(group_games[0]['group'])
+    print("✅ Gruppentabellen")
+
+
+def test_update_is_constant_time():
+    """Ein Ergebnis eintragen liest nur die Zeilen der beiden Teams - bei 4000 Spielen wie bei 40"""
+    touched_per_size = []
+    for num_games in (40, 4000):
+        schedule = [{'round': str(r), 'games': [game(f"T{2 * g}", f"T{2 * g + 1}") for g in range(4)]}
+                    for r in range(num_games // 4)]
+        assign_game_ids(schedule)
+        standings = Standings(schedule)
+        games = [g for _, g in iter_games(schedule)][:40]
+        with recorded_calls(Standings, '_row') as touched:
+            for score in ('1', '2'):  # zweiter Durchgang: korrigierte Ergebnisse
+                for g in games:
+                    before = len(touched)
+                    g['score1'], g['score2'] = score, '0'
+                    standings.record(g)
+                    # Abziehen und neu addieren: höchstens zwei Zugriffe je Team
+                    assert len(touched) - before <= 4
+                    assert {unit for _, _, unit in touched[before:]} <= {g['team1'], g['team2']}
+        touched_per_size.append(len(touched))
+        assert sum(row['points'] for row in standings.table()) == 3 * len(games)
+    assert touched_per_size[0] == touched_per_size[1], touched_per_size
+    print(f"✅ 80 Ergebnisse: {touched_per_size[0]} Zeilenzugriffe - unabhängig von der Spielplangröße")
+
+
+if __name__ == "__main__":
+    test_fixed_teams_table()
+    test_round_robin_players_and_corrections()
+    test_group_tables()
+    test_update_is_constant_time()
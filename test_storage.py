@@ -0,0 +1,227 @@
+#!/usr/bin/env python3
+"""
+Test-Script für das SQLite-Speicher-Backend
+Prüft Kader, Turnierzustand mit allen Spielplan-Formen und die Migration der JSON-Dateien
+"""
+import io
+import json
+import shutil
+import tempfile
+import threading
+from pathlib import Path
+
+from persistence import TournamentJournal
+from schedule_utils import assign_game_ids, find_game
+from storage import DEFAULT_TOURNAMENT, JsonStorage, SqliteStorage, migrate_json_to_sqlite, sanitize_tournament_id
+
+SCHEDULES = {
+    'flach': [
+        {'team1': 'Team A', 'team2': 'Team B', 'players1': ['A1'], 'players2': ['B1'], 'score1': '', 'score2': ''},
+        {'team1': 'Team B', 'team2': 'Team A', 'players1': ['B1'], 'players2': ['A1'], 'score1': '', 'score2': ''}
+    ],
+    'runden': [
+        {'round': 'Hinrunde 1.Spieltag', 'games': [
+            {'team1': 'Team A', 'team2': 'Team B', 'score1': '', 'score2': ''},
+            {'team1': 'Team C', 'team2': 'Team D', 'score1': '', 'score2': ''}
+        ], 'resting_teams': []}
+    ],
+    'sub_rounds': [
+        {'round': 1, 'sub_rounds': [
+            {'round': 1, 'games': [{'team1': ['P1', 'P2'], 'team2': ['P3', 'P4'], 'score1': '', 'score2': ''}]},
+            {'round': 2, 'games': [{'team1': ['P1', 'P3'], 'team2': ['P2', 'P4'], 'score1': '', 'score2': ''}]}
+        ]}
+    ]
+}
+
+
+def make_state(schedule):
+    return {
+        'players': ['A1', 'B1'], 'unavailable_players': [], 'teams': {'Team A': ['A1'], 'Team B': ['B1']},
+        'team_colors': {}, 'tournament_type': 'Feste Teams', 'schedule': schedule,
+        'tournament_name': 'U15-Turnier', 'tournament_date': '2024-05-01', 'num_teams': 2,
+        'home_away': False, 'players_per_team': 2, 'num_fields': 2
+    }
+
+
+def test_sqlite_roundtrip():
+    """Alle Spielplan-Formen kommen unverändert aus der Datenbank zurück"""
+    with tempfile.TemporaryDirectory() as tmp:
+        for label, schedule in SCHEDULES.items():
+            storage = SqliteStorage(Path(tmp) / f"{label}.db")
+            state = make_state(json.loads(json.dumps(schedule)))
+            storage.save_tournament(state)
+            # Nur ein Ergebnis ändern
+            for entry in state['schedule']:
+                game = entry['sub_rounds'][1]['games'][0] if 'sub_rounds' in entry else entry.get('games', [entry])[0]
+                game['score1'], game['score2'] = '3', '1'
+                break
+            storage.save_tournament(state)
+            storage.close()
+            assert SqliteStorage(Path(tmp) / f"{label}.db").load_tournament() == state, label
+            print(f"✅ Spielplan '{label}' korrekt gespeichert")
+
+
+def test_migration():
+    """Vorhandene JSON-Dateien werden in einem Durchgang übernommen"""
+    repo = Path(__file__).resolve().parent
+    with tempfile.TemporaryDirectory() as tmp:
+        for name in ('U15.json', 'U16.json', 'JWR.json', 'players.json', 'tournament_data.json'):
+            shutil.copy(repo / name, tmp)
+        source = JsonStorage(tmp)
+        exported = make_state(SCHEDULES['runden'])
+        source.export_tournament('turnier_U15-Turnier_20240501', exported)
+
+        target = SqliteStorage(Path(tmp) / 'turnier.db')
+        counts = migrate_json_to_sqlite(tmp, target)
+        print(f"Migriert: {counts}")
+        assert counts == {'rosters': 3, 'tournaments': 2}
+        assert target.load_roster('U15') == source.load_roster('U15')
+        assert target.load_roster('U18') is None
+        assert target.load_tournament() == source.load_tournament()
+        assert target.load_export('turnier_U15-Turnier_20240501') == exported
+        assert [t['key'] for t in target.list_tournaments(date_from='2024-01-01')] == ['turnier_U15-Turnier_20240501']
+        assert len(target.games_of_team('Team A')) == 1
+        assert target.rosters_of_player('Aktas') == ['U15']
+
+        imported = target.import_tournament(io.StringIO(json.dumps(make_state(SCHEDULES['flach']))))
+        assert imported['schedule'] == SCHEDULES['flach']
+        print("✅ Migration vollständig")
+
+
+def test_score_by_game_id():
+    """Ein Ergebnis wird über die Spiel-ID gespeichert - für jede Spielplan-Form und jedes Backend"""
+    with tempfile.TemporaryDirectory() as tmp:
+        for label, schedule in SCHEDULES.items():
+            backends = [JsonStorage(Path(tmp) / label), SqliteStorage(Path(tmp) / f"{label}.db")]
+            (Path(tmp) / label).mkdir()
+            for storage in backends:
+                state = make_state(json.loads(json.dumps(schedule)))
+                assign_game_ids(state['schedule'])
+                # Noch kein Spielplan gespeichert: kein Eintrag, der beim Laden ins Leere ginge
+                assert storage.save_score('g2', '4', '2') is False and storage.load_tournament() is None
+                storage.save_tournament(state)
+                assert storage.save_score('g2', '4', '2') is True
+                assert storage.save_score('g99', '1', '0') is False
+                loaded = storage.load_tournament()
+                game = find_game(loaded['schedule'], 'g2')
+                assert (game['score1'], game['score2']) == ('4', '2'), (label, storage.name)
+                # Späteres Speichern des Zustands überschreibt das Ergebnis nicht
+                find_game(state['schedule'], 'g2').update(score1='4', score2='2')
+                storage.save_tournament(state)
+                assert storage.load_tournament() == state
+            journal = Path(tmp) / label / 'tournament_data.journal.jsonl'
+            assert journal.read_text(encoding='utf-8').count('\n') == 1
+            print(f"✅ Ergebnis über ID gespeichert ({label})")
+
+
+def test_rating_saved_with_score():
+    """Die Elo-Wertung eines Spiels wird zusammen mit dem Ergebnis geschrieben, nicht erst vom Autosave"""
+    with tempfile.TemporaryDirectory() as tmp:
+        for storage in (JsonStorage(tmp), SqliteStorage(Path(tmp) / 'turnier.db')):
+            state = make_state(json.loads(json.dumps(SCHEDULES['runden'])))
+            assign_game_ids(state['schedule'])
+            state['rating_log'] = {'g1': {'A1': 8.0, 'B1': -8.0}}
+            storage.save_tournament(state)
+            assert storage.save_score('g2', '2', '0', rating_changes={'A1': 10.0, 'B1': -10.0})
+            assert storage.load_tournament()['rating_log'] == {'g1': {'A1': 8.0, 'B1': -8.0}, 'g2': {'A1': 10.0, 'B1': -10.0}}
+            # Ergebnis gelöscht: Wertung zurückgenommen; ohne rating_changes bleibt die Wertung unberührt
+            assert storage.save_score('g1', '', '', rating_changes={})
+            assert storage.save_score('g2', '3', '0')
+            # Von der Platte lesen, nicht aus dem Journal bzw. Zustand im Speicher
+            if storage.name == 'json':
+                loaded = TournamentJournal(Path(tmp) / 'tournament_data.json').load()
+            else:
+                loaded = SqliteStorage(Path(tmp) / 'turnier.db').load_tournament()
+            assert loaded['rating_log'] == {'g2': {'A1': 10.0, 'B1': -10.0}}, storage.name
+            assert find_game(loaded['schedule'], 'g2')['score1'] == '3'
+            print(f"✅ Elo-Wertung mit dem Ergebnis gespeichert ({storage.name})")
+
+
+def test_published_events():
+    """Veröffentlichte Ereignisse werden ohne Vergleich des ganzen Zustands gespeichert"""
+    with tempfile.TemporaryDirectory() as tmp:
+        for storage in (JsonStorage(tmp), SqliteStorage(Path(tmp) / 'turnier.db')):
+            state = make_state(json.loads(json.dumps(SCHEDULES['runden'])))
+            assign_game_ids(state['schedule'])
+            scored = [{'op': 'score_set', 'game': 'g1', 'score1': '1', 'score2': '1'},
+                      {'op': 'rating_set', 'game': 'g1', 'changes': {'A1': 0.5}}]
+            assert not storage.record_events(scored)  # noch nichts gespeichert
+            storage.save_tournament(state)
+            assert storage.record_events(scored)
+            assert storage.record_events(scored + [{'op': 'team_set', 'team': 'Team C', 'players': ['C1']}])
+            if storage.name == 'json':
+                journal = TournamentJournal(Path(tmp) / 'tournament_data.json')
+                # Ergebnis und Wertung standen schon im Journal: nur das Team kommt dazu
+                assert len(journal.journal_path.read_text(encoding='utf-8').splitlines()) == 3
+                loaded = journal.load()
+            else:
+                loaded = SqliteStorage(Path(tmp) / 'turnier.db').load_tournament()
+            assert find_game(loaded['schedule'], 'g1')['score1'] == '1' and loaded['rating_log'] == {'g1': {'A1': 0.5}}
+            assert loaded['teams']['Team C'] == ['C1'], storage.name
+            print(f"✅ Veröffentlichte Ereignisse gespeichert ({storage.name})")
+
+
+def test_parallel_tournaments():
+    """Mehrere Turniere laufen gleichzeitig, ohne sich gegenseitig zu überschreiben"""
+    assert sanitize_tournament_id('u15-herbst') == 'u15-herbst'
+    assert sanitize_tournament_id('../etc') == DEFAULT_TOURNAMENT
+    assert sanitize_tournament_id(None) == DEFAULT_TOURNAMENT
+    with tempfile.TemporaryDirectory() as tmp:
+        for storage in (JsonStorage(tmp), SqliteStorage(Path(tmp) / 'turnier.db')):
+            ids = [storage.create_tournament(f"U{age}-Turnier") for age in (15, 16, 18)]
+            assert storage.create_tournament("U15-Turnier") == 'u15-turnier-2'
+            listed = [entry['id'] for entry in storage.list_live_tournaments()]
+            assert listed[0] == DEFAULT_TOURNAMENT and set(ids) <= set(listed)
+
+            def run(tournament_id, label):
+                state = make_state(json.loads(json.dumps(SCHEDULES[label])))
+                assign_game_ids(state['schedule'])
+                state['tournament_name'] = tournament_id
+                storage.save_tournament(state, tournament_id=tournament_id)
+                for i in range(5):
+                    storage.save_score('g1', str(i), '0', tournament_id=tournament_id)
+
+            threads = [threading.Thread(target=run, args=(tid, label)) for tid, label in zip(ids, SCHEDULES)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+            for tournament_id, label in zip(ids, SCHEDULES):
+                loaded = storage.load_tournament(tournament_id)
+                assert loaded['tournament_name'] == tournament_id
+                assert find_game(loaded['schedule'], 'g1')['score1'] == '4'
+                assert len(loaded['schedule']) == len(SCHEDULES[label])
+            assert storage.load_tournament() is None
+            # Unbekannte ID aus der URL: nichts laden, nichts anlegen
+            assert storage.load_tournament('tippfehler') is None
+            assert not (Path(tmp) / 'turniere' / 'tippfehler').exists()
+            print(f"✅ Parallele Turniere getrennt gespeichert ({storage.name})")
+
+
+
+def test_ratings_beside_roster():
+    """Spielstärken liegen im Kader und bleiben beim Speichern der Spielerliste erhalten"""
+    with tempfile.TemporaryDirectory() as tmp:
+        for storage in (JsonStorage(tmp), SqliteStorage(Path(tmp) / 'turnier.db')):
+            storage.save_roster('U15', ['A1', 'A2', 'A3'])
+            assert storage.load_ratings('U15') == {}
+            storage.save_ratings('U15', {'A1': 1650, 'A3': 1400, 'X': 1000})
+            storage.save_roster('U15', ['A3', 'A1', 'A4'])
+            assert storage.load_ratings('U15') == {'A1': 1650.0, 'A3': 1400.0}
+            assert storage.load_roster('U15') == ['A3', 'A1', 'A4']
+        assert json.loads((Path(tmp) / 'U15.json').read_text(encoding='utf-8'))['ratings'] == {'A1': 1650.0, 'A3': 1400.0}
+
+        target = SqliteStorage(Path(tmp) / 'migriert.db')
+        migrate_json_to_sqlite(tmp, target)
+        assert target.load_ratings('U15') == {'A1': 1650.0, 'A3': 1400.0}
+        print("✅ Spielstärken im Kader gespeichert")
+
+
+if __name__ == "__main__":
+    test_sqlite_roundtrip()
+    test_migration()
+    test_score_by_game_id()
+    test_rating_saved_with_score()
+    test_published_events()
+    test_parallel_tournaments()
+    test_ratings_beside_roster()
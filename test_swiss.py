@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+Test-Script für das Schweizer System
+Prüft das gewichtete Matching gegen Ausprobieren, Paarungen ohne
+Wiederholungen, Freilose, die Tabelle und ein Matching je Runde bei 64 Teams
+"""
+import itertools
+import random
+
+import swiss
+from matching import max_weight_matching
+from schedule_utils import iter_games
+from swiss import pair_next_round, round_complete, swiss_table
+from testing_utils import recorded_calls
+
+
+def brute_force(n, edges, max_cardinality):
+    """Bestes (Anzahl, Gewicht) durch Ausprobieren aller Matchings"""
+    weight = {frozenset((i, j)): w for i, j, w in edges}
+    best = (0, 0)
+    for size in range(n // 2 + 1):
+        for chosen in itertools.combinations(weight, size):
+            if len(set().union(*chosen)) == 2 * size:
+                key = (size if max_cardinality else 0, sum(weight[pair] for pair in chosen))
+                best = max(best, key)
+    return best
+
+
+def play(entries, rng):
+    for entry in entries:
+        for game in entry['games']:
+            game['score1'], game['score2'] = str(rng.randint(0, 3)), str(rng.randint(0, 3))
+
+
+def test_matching_is_optimal():
+    """Kleine Zufallsgraphen (auch negative Gewichte): Ergebnis gleich dem Optimum"""
+    rng = random.Random(7)
+    for _ in range(300):
+        n = rng.randint(2, 7)
+        edges = [(i, j, rng.randint(-5, 20)) for i in range(n) for j in range(i + 1, n) if rng.random() < 0.7]
+        if not edges:
+            continue
+        weight = {frozenset((i, j)): w for i, j, w in edges}
+        for max_cardinality in (False, True):
+            mate = max_weight_matching(edges, max_cardinality)
+            pairs = {frozenset((v, m)) for v, m in enumerate(mate) if m >= 0}
+            assert all(mate[m] == v for v, m in enumerate(mate) if m >= 0)
+            found = (len(pairs) if max_cardinality else 0, sum(weight[pair] for pair in pairs))
+            assert found == brute_force(n, edges, max_cardinality), (edges, max_cardinality)
+    print("✅ Matching optimal")
+
+
+def test_no_rematches_and_byes():
+    """11 Teams, 5 Runden: keine Wiederholung, jedes Freilos an ein anderes Team"""
+    rng = random.Random(1)
+    teams = {f"T{i:02d}": [f"S{i}"] for i in range(11)}
+    schedule = []
+    for number in range(1, 6):
+        assert round_complete(schedule)
+        entries, report = pair_next_round(schedule, teams, 2)
+        assert report['round'] == number and report['rematches'] == 0
+        assert not round_complete(schedule + entries)
+        play(entries, rng)
+        schedule += entries
+    pairs = [frozenset((g['team1'], g['team2'])) for _, g in iter_games(schedule)]
+    assert len(pairs) == len(set(pairs)) == 25
+    byes = [team for entry in schedule for team in entry['bye']]
+    assert len(byes) == len(set(byes)) == 5
+    assert all(len(entry['games']) <= 2 for entry in schedule)
+    print("✅ Keine Wiederholungen, Freilose verteilt")
+
+
+def test_table_and_pairing_by_points():
+    """Nach Runde 1 spielen Sieger gegen Sieger; Tabelle mit Punkten und Buchholz"""
+    teams = {f"T{i}": [f"S{i}"] for i in range(1, 9)}
+    schedule, _ = pair_next_round([], teams, 4)
+    for game in schedule[0]['games']:
+        game['score1'], game['score2'] = '2', '1'
+    winners = {game['team1'] for game in schedule[0]['games']}
+    table = swiss_table(schedule, list(teams))
+    assert {row['team'] for row in table[:4]} == winners
+    assert all(row['points'] == 3 and row['buchholz'] == 0 for row in table[:4])
+    entries, report = pair_next_round(schedule, teams, 4)
+    for game in entries[0]['games']:
+        assert (game['team1'] in winners) == (game['team2'] in winners)
+    assert report['point_gap'] == 0
+    print("✅ Paarungen nach Punkten")
+
+
+def test_64_teams_one_matching_per_round():
+    """64 Teams, 7 Runden: jede Auslosung ist genau ein Matching über alle Paarungen, ohne Wiederholungen"""
+    rng = random.Random(3)
+    teams = {f"T{i:02d}": [f"S{i}"] for i in range(64)}
+    schedule = []
+    with recorded_calls(swiss, 'max_weight_matching') as matchings:
+        for _ in range(7):
+            entries, report = pair_next_round(schedule, teams, 8)
+            assert report['rematches'] == 0 and sum(len(entry['games']) for entry in entries) == 32
+            play(entries, rng)
+            schedule += entries
+    # Höchstens ein Matching je Runde, nie mehr Kanten als Paarungen
+    assert len(matchings) <= 7 and all(len(edges) <= 64 * 63 // 2 for edges, *_ in matchings), len(matchings)
+    print(f"✅ 64 Teams: 7 Runden ohne Wiederholung, {len(matchings)} Matchings")
+
+
+if __name__ == "__main__":
+    test_matching_is_optimal()
+    test_no_rematches_and_byes()
+    test_table_and_pairing_by_points()
+    test_64_teams_one_matching_per_round()
@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+Test-Script für die Tie-Breaker
+Prüft die Reihenfolge der Kriterien, den rekursiven direkten Vergleich,
+den reproduzierbaren Losentscheid und Mini-Tabellen nur bei Gleichstand
+"""
+from formats import advance_bracket
+from standings import Standings
+from testing_utils import recorded_calls
+from tiebreak import mini_table, rank
+
+
+def row(team, points=4, diff=0, goals_for=3):
+    return {'team': team, 'points': points, 'diff': diff, 'goals_for': goals_for}
+
+
+def test_criteria_order():
+    """Punkte, Tordifferenz, Tore - oder direkter Vergleich vor der Tordifferenz; Punkte immer zuerst"""
+    rows = [row('A', 4, 1, 3), row('B', 6, -1, 2), row('C', 4, 1, 5), row('D', 4, 3, 4)]
+    meetings = [('A', 'D', 2, 0), ('C', 'D', 1, 0), ('A', 'C', 1, 1)]
+    ranked = rank(rows, lambda teams: meetings)
+    assert [r['team'] for r in ranked] == ['B', 'D', 'C', 'A']
+    assert [r['decided_by'] for r in ranked] == [None, 'diff', 'goals_for', 'goals_for']
+    uefa = rank(rows, lambda teams: meetings, ('points', 'head_to_head', 'diff', 'goals_for'))
+    assert [r['team'] for r in uefa] == ['B', 'A', 'C', 'D']  # direkter Vergleich: A 4 Punkte (+2), C 4 Punkte (+1), D 0
+    # Die Punkte zählen immer zuerst, auch wenn die Liste leer ist oder sie nicht enthält
+    assert [r['team'] for r in rank(rows, lambda teams: meetings, ())] == ['B', 'A', 'C', 'D']
+    assert [r['team'] for r in rank(rows, lambda teams: meetings, ('diff', 'points'))] == ['B', 'D', 'A', 'C']
+    try:
+        rank(rows, lambda teams: meetings, ('points', 'fairplay'))
+        assert False, "unbekanntes Kriterium"
+    except ValueError:
+        pass
+    print("✅ Reihenfolge der Kriterien")
+
+
+def test_recursive_head_to_head():
+    """Vier Teams gleichauf: A gewinnt die Mini-Tabelle, B und C werden nur untereinander verglichen"""
+    meetings = [('B', 'A', 1, 0), ('C', 'B', 1, 0), ('B', 'D', 1, 0),
+                ('A', 'C', 1, 0), ('C', 'D', 1, 0), ('A', 'D', 3, 0)]
+    assert mini_table(['A', 'B', 'C', 'D'], meetings) == {'A': (6, 3, 4), 'B': (6, 1, 2), 'C': (6, 1, 2), 'D': (0, -5, 0)}
+    asked = []
+
+    def lookup(teams):
+        asked.append(sorted(teams))
+        return meetings
+
+    ranked = rank([row(team) for team in 'ABCD'], lookup)
+    assert [r['team'] for r in ranked] == ['A', 'C', 'B', 'D']  # ohne Rekursion stünde B (Name) vor C
+    assert all(r['decided_by'] == 'head_to_head' for r in ranked)
+    assert asked == [['A', 'B', 'C', 'D'], ['B', 'C']]
+    print("✅ Rekursiver direkter Vergleich")
+
+
+def test_lots_with_recorded_seed():
+    """Gleicher Seed: gleiche Auslosung; ohne Seed entscheidet der Name"""
+    teams = [f"Team {c}" for c in "ABCDEFGH"]
+    draws = {tuple(r['team'] for r in rank([row(t) for t in teams], lambda teams: [], seed=seed))
+             for seed in range(1, 21)}
+    assert len(draws) > 1
+    first = [r['team'] for r in rank([row(t) for t in teams], lambda teams: [], seed=4711)]
+    again = [r['team'] for r in rank([row(t) for t in reversed(teams)], lambda teams: [], seed=4711)]
+    assert first == again
+    # A und B in derselben Reihenfolge, egal ob weitere Teams gleichauf liegen
+    for seed in range(1, 11):
+        pairs = set()
+        for others in ([], teams[2:4], teams[2:]):
+            ranked = rank([row(t) for t in teams[:2] + others], lambda teams: [], seed=seed)
+            pairs.add(tuple(r['team'] for r in ranked if r['team'] in teams[:2]))
+        assert len(pairs) == 1, (seed, pairs)
+    ranked = rank([row(t) for t in teams], lambda teams: [], seed=4711)
+    assert all(r['decided_by'] == 'lots' for r in ranked)
+    unseeded = rank([row(t) for t in teams], lambda teams: [])
+    assert [r['team'] for r in unseeded] == teams and all(r['decided_by'] is None for r in unseeded)
+    print("✅ Losentscheid mit Seed")
+
+
+def test_standings_and_bracket_agree():
+    """Die K.o.-Runde übernimmt die Gruppenplätze mit denselben Tie-Breakern wie die Tabelle"""
+    results = [('A', 'B', '1', '0'), ('B', 'C', '1', '0'), ('C', 'A', '1', '0'), ('A', 'D', '2', '0'),
+               ('B', 'D', '2', '0'), ('C', 'D', '3', '1')]
+    schedule = [{'round': i, 'games': [{'team1': t1, 'team2': t2, 'score1': s1, 'score2': s2,
+                                        'phase': 'group', 'group': 'A', 'id': f"g{i}"}]}
+                for i, (t1, t2, s1, s2) in enumerate(results)]
+    final = {'phase': 'knockout', 'stage': 'Finale', 'label': 'Finale', 'team1': '', 'team2': '',
+             'source1': {'group': 'A', 'rank': 1}, 'source2': {'group': 'A', 'rank': 2}}
+    schedule.append({'round': len(results), 'games': [final]})
+    options = (('head_to_head', 'diff', 'goals_for', 'lots'), 99)
+    standings = [r['team'] for r in Standings(schedule).table('A', *options)]
+    advance_bracket(schedule, {team: [team.lower()] for team in 'ABCD'}, *options)
+    assert [final['team1'], final['team2']] == standings[:2]
+    assert standings[-1] == 'D' and sorted(standings[:3]) == ['A', 'B', 'C']
+    print("✅ Gleiche Reihenfolge in Tabelle und K.o.-Runde")
+
+
+def test_mini_tables_only_for_ties():
+    """32 Teams, doppelte Runde: Mini-Tabelle nur für gleichauf liegende Teams, ohne Gleichstand gar keine"""
+    teams = [f"Team {i:02d}" for i in range(32)]
+
+    def season(score):
+        games = [{'team1': a, 'team2': b, 'score1': score(i, j), 'score2': '1', 'id': f"g{i}_{j}"}
+                 for i, a in enumerate(teams) for j, b in enumerate(teams) if a != b]
+        standings = Standings(games)
+        with recorded_calls(standings, 'meetings') as asked:
+            return standings.table(seed=1), asked
+
+    # Nur Unentschieden: direkter Vergleich aller 32 (jedes Paar zweimal), dann das Los
+    table, asked = season(lambda i, j: '1')
+    assert len(table) == 32 and all(r['decided_by'] == 'lots' for r in table)
+    assert sum(len(block) for block, *_ in asked) <= 2 * 32, asked  # Mini-Tabellen nur über die Gleichauf-Gruppe
+    # Das Team mit der kleineren Nummer gewinnt: alle Punktzahlen verschieden, keine Mini-Tabelle
+    table, asked = season(lambda i, j: '2' if i < j else '0')
+    assert [r['team'] for r in table] == teams and asked == []
+    print("✅ Mini-Tabellen nur bei Gleichstand")
+
+
+if __name__ == "__main__":
+    test_criteria_order()
+    test_recursive_head_to_head()
+    test_lots_with_recorded_seed()
+    test_standings_and_bracket_agree()
+    test_mini_tables_only_for_ties()
@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+Test-Script für den Zeitplan
+Prüft Zeitfenster aller Spielplan-Strukturen, Anstoßzeiten mit Wechselzeit
+und Pausen sowie die Suche nach Feldanzahl und Spieldauer
+"""
+import math
+
+import timeline
+from testing_utils import recorded_calls
+from timeline import apply_timeline, day_end, fit_configurations, parse_clock, plan_timeline, slot_starts, time_slots
+
+
+def game(a, b):
+    return {'team1': a, 'team2': b, 'score1': '', 'score2': ''}
+
+
+def test_time_slots_for_all_structures():
+    """Flache Liste, Runden mit 'games' und mit 'sub_rounds'; zu volle Runden werden geteilt"""
+    flat = [game('A', 'B'), game('C', 'D')]
+    assert [[field for field, _ in slot] for slot in time_slots(flat)] == [[1], [1]]
+    rounds = [{'round': '1', 'games': [game('A', 'B'), game('C', 'D'), game('E', 'F')]}]
+    assert len(time_slots(rounds)) == 1
+    assert [[field for field, _ in slot] for slot in time_slots(rounds, num_fields=2)] == [[1, 2], [1]]
+    sub_rounds = [{'round': 1, 'sub_rounds': [{'round': 1, 'games': [game('A', 'B')]},
+                                              {'round': 2, 'games': [game('C', 'D')]}]}]
+    assert [field for field, _ in time_slots(sub_rounds)[0]] == [1, 2]
+    print("✅ Zeitfenster")
+
+
+def test_kickoffs_with_break():
+    """12 Min. Spiel + 3 Min. Wechsel ab 9:00, Mittagspause 9:40-10:00"""
+    starts = slot_starts(5, parse_clock('09:00'), 12, 3, [(parse_clock('09:40'), 20)])
+    assert starts == [540, 555, 600, 615, 630]  # 9:30 würde bis 9:42 laufen -> nach der Pause
+    rounds = [{'round': str(r), 'games': [game('A', 'B'), game('C', 'D')]} for r in range(3)]
+    rows, report = plan_timeline(rounds, '09:00', 12, 3)
+    assert report == {'start': '09:00', 'end': '09:42', 'slots': 3, 'games': 6}
+    assert [(row['kickoff'], row['field']) for row in rows[:3]] == [('09:00', 1), ('09:00', 2), ('09:15', 1)]
+    assert 'kickoff' not in rounds[0]['games'][0]
+    apply_timeline(rows)
+    assert rounds[2]['games'][1]['kickoff'] == '09:30' and rounds[2]['games'][1]['field'] == 2
+    print("✅ Anstoßzeiten mit Pause")
+
+
+def test_fit_configurations():
+    """Bis 12:00: je mehr Felder, desto länger dürfen die Spiele dauern"""
+    options = fit_configurations({1: 28, 2: 14, 4: 7}, '09:00', '12:00', changeover=2)
+    by_fields = {o['fields']: o for o in options}
+    assert by_fields[1]['game_minutes'] is None
+    assert by_fields[2]['game_minutes'] == 11  # 14 * 11 + 13 * 2 = 180
+    assert by_fields[4]['game_minutes'] == 24  # 7 * 24 + 6 * 2 = 180
+    assert options[0]['fields'] == 4
+    for o in options:
+        if o['game_minutes']:
+            assert day_end(o['slots'], 540, o['game_minutes'], 2) <= 720 < day_end(o['slots'], 540, o['game_minutes'] + 1, 2) \
+                or o['game_minutes'] == 30
+    print("✅ Suche nach Feldern und Spieldauer")
+
+
+def test_search_is_logarithmic():
+    """1000 Spiele, 8 Feldanzahlen: Binärsuche über die Spieldauer, der Plan selbst wird nie durchlaufen"""
+    rounds = [{'round': str(r), 'games': [game(f"T{4 * r + f}", f"U{4 * r + f}") for f in range(4)]} for r in range(250)]
+    rows, report = plan_timeline(rounds, '08:00', 8, 2, [(parse_clock('12:00'), 45)])
+    assert len(rows) == 1000 and report['slots'] == 250
+    assert [row['kickoff'] for row in rows[::4][:2]] == ['08:00', '08:10']
+    with recorded_calls(timeline, 'day_end') as probes:
+        options = fit_configurations({fields: 1000 // fields for fields in range(1, 9)}, '08:00', '20:00', 2)
+    # Spieldauer 5..30: höchstens 5 Proben je Feldanzahl, dazu das Ende der gewählten Dauer
+    assert len(options) == 8 and len(probes) <= 8 * (math.floor(math.log2(30 - 5 + 1)) + 1 + 1), len(probes)
+    print(f"✅ 1000 Spiele geplant, {len(probes)} Proben für 8 Feldanzahlen")
+
+
+if __name__ == "__main__":
+    test_time_slots_for_all_structures()
+    test_kickoffs_with_break()
+    test_fit_configurations()
+    test_search_is_logarithmic()
@@ -0,0 +1,38 @@
+"""
+Hilfen für die Test-Scripts: eine Funktion eines Moduls, einer Klasse oder eines
+Objekts vorübergehend ersetzen oder ihre Aufrufe aufzeichnen. Am Ende des
+with-Blocks wird das Original immer wiederhergestellt.
+"""
+from contextlib import contextmanager
+
+_MISSING = object()
+
+
+@contextmanager
+def patched(owner, name, replacement):
+    """Ersetzt owner.name innerhalb des with-Blocks"""
+    original = vars(owner).get(name, _MISSING)
+    if isinstance(original, staticmethod):
+        replacement = staticmethod(replacement)
+    setattr(owner, name, replacement)
+    try:
+        yield replacement
+    finally:
+        if original is _MISSING:
+            delattr(owner, name)  # z.B. Methode eines Objekts: wieder die der Klasse
+        else:
+            setattr(owner, name, original)
+
+
+@contextmanager
+def recorded_calls(owner, name):
+    """Liste der Argumente jedes Aufrufs von owner.name - die Funktion selbst läuft unverändert"""
+    function = getattr(owner, name)
+    calls = []
+
+    def recording(*args, **kwargs):
+        calls.append(args)
+        return function(*args, **kwargs)
+
+    with patched(owner, name, recording):
+        yield calls
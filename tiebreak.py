@@ -0,0 +1,115 @@
+"""
+Platzierung bei Gleichstand (Tie-Breaker) für Tabellen.
+
+Zuerst zählen immer die Punkte, danach werden die Tie-Breaker der Reihe
+nach angewendet; jedes weitere Kriterium sieht nur noch die Teams, die nach
+allen vorherigen gleichauf liegen:
+
+- 'diff', 'goals_for': Tordifferenz, erzielte Tore
+- 'head_to_head': direkter Vergleich - Mini-Tabelle (Punkte, Tordifferenz,
+  Tore) nur aus den Spielen der gleichauf liegenden Teams untereinander.
+  Trennt sie die Teams nur teilweise, wird der direkte Vergleich für die
+  verbleibenden Teams erneut gerechnet; trennt er gar nicht, geht es mit
+  dem nächsten Kriterium weiter
+- 'lots': Losentscheid mit aufgezeichnetem Seed - derselbe Seed ergibt
+  dieselbe Auslosung, unabhängig davon, welche anderen Teams gleichauf liegen
+
+Ohne Seed (oder wenn kein Kriterium mehr übrig ist) entscheidet der Name.
+Mini-Tabellen werden nur für Teilmengen mit Gleichstand gerechnet, die
+Platzierung einer ganzen Tabelle kostet daher im Normalfall nur das Sortieren.
+
+Jede Zeile bekommt 'decided_by': das Kriterium, das sie zuletzt von
+gleichauf liegenden Teams getrennt hat (None, wenn es keinen Gleichstand gab).
+"""
+import random
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+CRITERIA = {
+    'points': "Punkte",
+    'diff': "Tordifferenz",
+    'goals_for': "Tore",
+    'head_to_head': "Direkter Vergleich",
+    'lots': "Los",
+}
+# Wählbar sind nur die Kriterien nach den Punkten
+TIE_BREAKERS = tuple(name for name in CRITERIA if name != 'points')
+DEFAULT_TIE_BREAKERS = ('diff', 'goals_for', 'head_to_head', 'lots')
+
+# Spiele der Teams untereinander: (team1, team2, Tore team1, Tore team2)
+Meeting = Tuple[str, str, int, int]
+
+
+def mini_table(teams: Sequence[str], meetings: Iterable[Meeting]) -> Dict[str, Tuple[int, int, int]]:
+    """(Punkte, Tordifferenz, Tore) je Team nur aus den Spielen untereinander"""
+    stats = {team: [0, 0, 0] for team in teams}
+    for team1, team2, goals1, goals2 in meetings:
+        if team1 not in stats or team2 not in stats:
+            continue
+        for team, scored, conceded in ((team1, goals1, goals2), (team2, goals2, goals1)):
+            row = stats[team]
+            row[0] += 3 if scored > conceded else 1 if scored == conceded else 0
+            row[1] += scored - conceded
+            row[2] += scored
+    return {team: tuple(row) for team, row in stats.items()}
+
+
+def _split(rows: List[Dict], key: Callable[[Dict], tuple]) -> List[List[Dict]]:
+    """Teilt gleichauf liegende Zeilen nach key (absteigend) in Blöcke"""
+    blocks: List[List[Dict]] = []
+    for row in sorted(rows, key=key, reverse=True):
+        if blocks and key(blocks[-1][0]) == key(row):
+            blocks[-1].append(row)
+        else:
+            blocks.append([row])
+    return blocks
+
+
+def rank(rows: List[Dict], meetings: Callable[[List[str]], Iterable[Meeting]],
+         tie_breakers: Sequence[str] = DEFAULT_TIE_BREAKERS, seed: Optional[int] = None,
+         salt: str = '') -> List[Dict]:
+    """Sortiert Tabellenzeilen ('team', 'points', 'diff', 'goals_for') nach den Tie-Breakern
+
+    meetings(teams) liefert die Spiele dieser Teams untereinander; salt trennt
+    die Auslosungen verschiedener Tabellen (z.B. Gruppenname). 'points' in
+    tie_breakers wird übergangen - die Punkte stehen immer an erster Stelle.
+    """
+    unknown = [name for name in tie_breakers if name not in CRITERIA]
+    if unknown:
+        raise ValueError(f"Unbekannte Tie-Breaker: {', '.join(unknown)}")
+    for row in rows:
+        row['decided_by'] = None
+
+    def mark(block: List[Dict], criterion: str) -> None:
+        for row in block:
+            row['decided_by'] = criterion
+
+    def resolve(block: List[Dict], criteria: Sequence[str], tied: bool = True) -> List[Dict]:
+        if len(block) <= 1:
+            return block
+        if not criteria:
+            return sorted(block, key=lambda row: row['team'])
+        criterion, rest = criteria[0], criteria[1:]
+        if criterion == 'head_to_head':
+            return head_to_head(block, rest)
+        if criterion == 'lots':
+            if seed is None:
+                return resolve(block, rest)
+            # Jedes Team zieht sein eigenes Los - unabhängig davon, wer noch gleichauf liegt
+            mark(block, 'lots')
+            return sorted(block, key=lambda row: (random.Random(f"{seed}|{salt}|{row['team']}").random(), row['team']))
+        blocks = _split(block, lambda row: row[criterion])
+        if len(blocks) > 1 and tied:
+            mark(block, criterion)
+        return [row for part in blocks for row in resolve(part, rest)]
+
+    def head_to_head(block: List[Dict], rest: Sequence[str]) -> List[Dict]:
+        teams = [row['team'] for row in block]
+        stats = mini_table(teams, meetings(teams))
+        blocks = _split(block, lambda row: stats[row['team']])
+        if len(blocks) == 1:
+            return resolve(block, rest)
+        mark(block, 'head_to_head')
+        # Kleinere Gruppen erneut untereinander vergleichen
+        return [row for part in blocks for row in (head_to_head(part, rest) if len(part) > 1 else part)]
+
+    return resolve(list(rows), ['points'] + [name for name in tie_breakers if name != 'points'], tied=False)
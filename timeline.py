@@ -0,0 +1,115 @@
+"""
+Zeitplan: konkrete Anstoßzeiten und Spielfelder für jeden Spielplan.
+
+Jeder Spielplan der App (flache Liste, Runden mit 'games' oder mit
+'sub_rounds', siehe schedule_utils) besteht aus Zeitfenstern, in denen die
+Spiele parallel auf den Feldern laufen. Ein Zeitfenster dauert Spieldauer +
+Wechselzeit; Pausen sind feste Uhrzeiten (z.B. Mittagspause 12:00, 30 Min.) -
+kein Spiel läuft in eine Pause hinein, das nächste Zeitfenster beginnt danach.
+
+fit_configurations sucht für jede Feldanzahl per Binärsuche die längste
+Spieldauer, mit der das Turnier bis zu einer festen Uhrzeit fertig ist. Die
+Rechnung braucht nur die Anzahl Zeitfenster und ist damit schnell genug, um
+bei jeder Änderung eines Reglers neu zu laufen.
+"""
+from typing import Dict, List, Optional, Sequence, Tuple
+
+Break = Tuple[int, int]  # (Beginn in Minuten ab Mitternacht, Dauer in Minuten)
+
+
+def parse_clock(text: str) -> int:
+    hours, minutes = text.split(':')
+    return int(hours) * 60 + int(minutes)
+
+
+def format_clock(minutes: int) -> str:
+    return f"{minutes // 60:02d}:{minutes % 60:02d}"
+
+
+def time_slots(schedule: List[Dict], num_fields: Optional[int] = None) -> List[List[Tuple[int, Dict]]]:
+    """Zeitfenster eines Spielplans als Listen von (Feld, Spiel)
+
+    Mit num_fields werden Zeitfenster mit mehr Spielen als Feldern in
+    aufeinanderfolgende Durchgänge geteilt.
+    """
+    slots = []
+    for entry in schedule:
+        if 'team1' in entry:
+            slots.append([(1, entry)])  # flache Liste: ein Spielfeld, Spiele nacheinander
+        elif 'sub_rounds' in entry:
+            slots.append([(sub_round['round'] if isinstance(sub_round.get('round'), int) else k, game)
+                          for k, sub_round in enumerate(entry['sub_rounds'], 1) for game in sub_round['games']])
+        else:
+            slots.append([(k, game) for k, game in enumerate(entry.get('games', []), 1)])
+    if num_fields:
+        slots = [[(k, game) for k, (_, game) in enumerate(slot[i:i + num_fields], 1)]
+                 for slot in slots for i in range(0, len(slot), num_fields)]
+    return [slot for slot in slots if slot]
+
+
+def slot_starts(num_slots: int, start: int, game_minutes: int, changeover: int = 0,
+                breaks: Sequence[Break] = ()) -> List[int]:
+    """Anstoßzeiten (Minuten) der Zeitfenster - ein Spiel, das in eine Pause liefe, beginnt nach der Pause"""
+    starts = []
+    pending = sorted(breaks)
+    b, t = 0, start
+    for _ in range(num_slots):
+        while b < len(pending) and pending[b][0] < t + game_minutes:
+            t = max(t, pending[b][0] + pending[b][1])
+            b += 1
+        starts.append(t)
+        t += game_minutes + changeover
+    return starts
+
+
+def day_end(num_slots: int, start: int, game_minutes: int, changeover: int = 0, breaks: Sequence[Break] = ()) -> int:
+    """Ende des letzten Spiels (Minuten)"""
+    if num_slots == 0:
+        return start
+    return slot_starts(num_slots, start, game_minutes, changeover, breaks)[-1] + game_minutes
+
+
+def plan_timeline(schedule: List[Dict], start: str, game_minutes: int, changeover: int = 0,
+                  breaks: Sequence[Break] = (), num_fields: Optional[int] = None) -> Tuple[List[Dict], Dict]:
+    """Anstoßzeit und Feld für jedes Spiel, ohne den Spielplan zu verändern
+
+    Gibt Zeilen (slot, kickoff, field, game) und einen Bericht (start, end,
+    slots, games) zurück. apply_timeline schreibt die Zeiten in die Spiele.
+    """
+    slots = time_slots(schedule, num_fields)
+    begin = parse_clock(start)
+    starts = slot_starts(len(slots), begin, game_minutes, changeover, breaks)
+    rows = [{'slot': s, 'kickoff': format_clock(starts[s]), 'field': field, 'game': game}
+            for s, slot in enumerate(slots) for field, game in slot]
+    end = starts[-1] + game_minutes if starts else begin
+    return rows, {'start': start, 'end': format_clock(end), 'slots': len(slots), 'games': len(rows)}
+
+
+def apply_timeline(rows: List[Dict]) -> None:
+    for row in rows:
+        row['game']['kickoff'] = row['kickoff']
+        row['game']['field'] = row['field']
+
+
+def fit_configurations(slot_counts: Dict[int, int], start: str, deadline: str, changeover: int = 0,
+                       breaks: Sequence[Break] = (), min_minutes: int = 5, max_minutes: int = 30) -> List[Dict]:
+    """Längste Spieldauer je Feldanzahl, mit der das Turnier bis deadline endet
+
+    slot_counts: Feldanzahl -> benötigte Zeitfenster. Ergebnis sortiert nach
+    Eignung: machbar, dann längste Spieldauer, dann wenigste Felder. Für nicht
+    machbare Feldanzahlen ist game_minutes None und end das Ende bei min_minutes.
+    """
+    begin, limit = parse_clock(start), parse_clock(deadline)
+    options = []
+    for fields, num_slots in slot_counts.items():
+        # Das Ende wächst monoton mit der Spieldauer: Binärsuche nach der längsten passenden
+        low, high, best = min_minutes, max_minutes, None
+        while low <= high:
+            minutes = (low + high) // 2
+            if day_end(num_slots, begin, minutes, changeover, breaks) <= limit:
+                best, low = minutes, minutes + 1
+            else:
+                high = minutes - 1
+        end = day_end(num_slots, begin, best or min_minutes, changeover, breaks)
+        options.append({'fields': fields, 'slots': num_slots, 'game_minutes': best, 'end': format_clock(end)})
+    return sorted(options, key=lambda o: (o['game_minutes'] is None, -(o['game_minutes'] or 0), o['fields']))